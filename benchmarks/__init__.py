@@ -0,0 +1 @@
+"""Performance benchmarks for the games platform (not part of the pytest suite)."""
@@ -0,0 +1,119 @@
+#!/usr/bin/env python
+"""Benchmark QuizImportService.import_release on a synthetic release.
+
+Generates a synthetic release (default: 100 units x 100 questions = 10k
+questions), imports it three times (cold insert, unchanged re-import, forced
+re-import) and prints timings. Runs against QUIZ_DATABASE_URL - use a disposable database, the
+benchmark topics are deleted afterwards.
+
+Usage:
+    QUIZ_DATABASE_URL=postgresql+psycopg2://... \\
+        python benchmarks/bench_import_release.py --units 100 --questions 100
+"""
+
+from __future__ import annotations
+
+import argparse
+import logging
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from sqlalchemy import create_engine  # noqa: E402
+from sqlalchemy.orm import sessionmaker  # noqa: E402
+
+from benchmarks.synthetic import write_synthetic_release  # noqa: E402
+
+logging.basicConfig(
+    level=logging.WARNING,
+    format="[%(asctime)s] %(levelname)s: %(message)s",
+)
+logger = logging.getLogger(__name__)
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Benchmark quiz release import")
+    parser.add_argument("--units", type=int, default=100, help="Number of units")
+    parser.add_argument("--questions", type=int, default=100, help="Questions per unit")
+    parser.add_argument(
+        "--database-url",
+        default=os.environ.get("QUIZ_DATABASE_URL"),
+        help="Quiz database URL (default: $QUIZ_DATABASE_URL)",
+    )
+    parser.add_argument("--release-id", default="bench_import_release")
+    parser.add_argument("--keep", action="store_true", help="Keep imported rows")
+    args = parser.parse_args()
+
+    if not args.database_url:
+        logger.error("No database URL (set QUIZ_DATABASE_URL or pass --database-url)")
+        return 2
+
+    from game_modules.quiz.import_service import QuizImportService
+    from game_modules.quiz.models import QuizBase, QuizQuestion, QuizTopic
+    from game_modules.quiz.release_model import QuizContentRelease
+
+    from scripts.init_quiz_db import apply_quiz_migrations
+
+    engine = create_engine(args.database_url, future=True)
+    QuizBase.metadata.create_all(bind=engine)
+    apply_quiz_migrations(engine)
+    Session = sessionmaker(bind=engine, future=True)
+
+    total_questions = args.units * args.questions
+    print(f"Synthetic release: {args.units} units x {args.questions} questions = {total_questions}")
+
+    with tempfile.TemporaryDirectory(prefix="bench_import_") as tmp:
+        tmp_root = Path(tmp)
+        units_dir = tmp_root / "units"
+        audio_dir = tmp_root / "audio"
+        audio_dir.mkdir(parents=True)
+        write_synthetic_release(units_dir, args.units, args.questions)
+        service = QuizImportService(project_root=tmp_root)
+
+        try:
+            runs = (
+                ("cold import", False),
+                ("re-import", False),  # unchanged units are skipped
+                ("forced", True),  # rewrite every row
+            )
+            for label, force in runs:
+                with Session() as session:
+                    started = time.perf_counter()
+                    result = service.import_release(
+                        session=session,
+                        units_path=str(units_dir),
+                        audio_path=str(audio_dir),
+                        release_id=args.release_id,
+                        request_id="bench",
+                        force=force,
+                    )
+                    elapsed = time.perf_counter() - started
+                if not result.success:
+                    logger.error("Import failed: %s", result.errors[:5])
+                    return 1
+                rate = result.questions_imported / elapsed if elapsed else 0.0
+                print(f"{label:12s}: {elapsed:8.3f}s  ({rate:,.0f} questions/s)")
+        finally:
+            if not args.keep:
+                with Session() as session:
+                    session.query(QuizQuestion).filter(
+                        QuizQuestion.release_id == args.release_id
+                    ).delete(synchronize_session=False)
+                    session.query(QuizTopic).filter(
+                        QuizTopic.release_id == args.release_id
+                    ).delete(synchronize_session=False)
+                    session.query(QuizContentRelease).filter(
+                        QuizContentRelease.release_id == args.release_id
+                    ).delete(synchronize_session=False)
+                    session.commit()
+            engine.dispose()
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
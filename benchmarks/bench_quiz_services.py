@@ -0,0 +1,586 @@
+#!/usr/bin/env python
+"""Microbenchmarks for the quiz service hot paths, with JSON baselines.
+
+Times each function on synthetic datasets of increasing size:
+
+- pure: validate_quiz_unit (questions per unit), hash_pin, verify_pin
+- DB-bound: _build_run_questions (questions in the topic),
+  calculate_running_score and finish_run (runs in the table),
+  get_leaderboard (scores for the topic), import_release (questions in
+  the release), cleanup_anonymous_data (stale anonymous players)
+
+DB benchmarks need a PostgreSQL URL (``QUIZ_DATABASE_URL`` or
+``--database-url``); they are skipped without one. All benchmark rows are
+written inside one transaction that is rolled back at the end, and every
+call that writes runs in a savepoint that is rolled back after timing, so
+each call sees the same data.
+
+Every case is called ``--repeat`` times after a warm-up; the median is
+compared with the baseline file. A case more than ``--tolerance`` slower
+(default 25%) is a regression and the exit code is 1. Baselines depend on
+the machine: record them on the machine that runs the comparison.
+
+Usage:
+    python benchmarks/bench_quiz_services.py --save-baseline
+    python benchmarks/bench_quiz_services.py --tolerance 0.15
+    python benchmarks/bench_quiz_services.py --only validate --quick
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import logging
+import os
+import platform
+import statistics
+import sys
+import tempfile
+import time
+import uuid
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Sequence
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from sqlalchemy import create_engine, insert  # noqa: E402
+from sqlalchemy.engine import Connection, Engine  # noqa: E402
+from sqlalchemy.orm import Session  # noqa: E402
+
+from benchmarks.synthetic import build_synthetic_unit, write_synthetic_release  # noqa: E402
+
+logging.basicConfig(
+    level=logging.WARNING,
+    format="[%(asctime)s] %(levelname)s: %(message)s",
+)
+logger = logging.getLogger(__name__)
+
+DEFAULT_BASELINE = Path(__file__).resolve().parent / "baselines" / "quiz_services.json"
+TOPIC_ID = "bench_micro_topic"
+PIN = "AB12"
+
+
+@dataclass
+class Case:
+    """One benchmark at one size.
+
+    ``prepare`` runs untimed before every call and its result is passed to
+    ``call``; ``cleanup`` runs untimed after every call.
+    """
+    call: Callable[[Any], Any]
+    prepare: Callable[[], Any] = lambda: None
+    cleanup: Callable[[], None] = lambda: None
+    close: Callable[[], None] = lambda: None
+
+
+@dataclass
+class Benchmark:
+    name: str
+    setup: Callable[..., Case]
+    sizes: Sequence[Optional[int]] = (None,)
+    needs_db: bool = False
+    # Upper bound for --repeat (slow cases)
+    max_repeat: Optional[int] = None
+
+
+@dataclass
+class DbFixture:
+    """Connection with an outer transaction that is rolled back on close."""
+    connection: Connection
+    outer: Any = None
+
+    @classmethod
+    def open(cls, engine: Engine) -> "DbFixture":
+        connection = engine.connect()
+        return cls(connection=connection, outer=connection.begin())
+
+    def session(self) -> Session:
+        # session.commit() only releases a savepoint inside the outer transaction
+        return Session(bind=self.connection, join_transaction_mode="create_savepoint")
+
+    def savepoint(self) -> Any:
+        return self.connection.begin_nested()
+
+    def close(self) -> None:
+        self.outer.rollback()
+        self.connection.close()
+
+
+# ============================================================================
+# Synthetic data
+# ============================================================================
+
+def _seed_topic(session: Session, questions: int, topic_id: str = TOPIC_ID) -> List[Dict[str, Any]]:
+    from game_modules.quiz.models import QuizQuestion, QuizTopic
+
+    session.add(QuizTopic(id=topic_id, title_key="Benchmark topic", is_active=True))
+    session.flush()
+    rows = [
+        {
+            "id": f"{topic_id}_q{idx:05d}",
+            "topic_id": topic_id,
+            "difficulty": (idx % 3) + 1,
+            "type": "single_choice",
+            "prompt_key": f"Prompt {idx}",
+            "explanation_key": f"Explanation {idx}",
+            "answers": [
+                {"id": f"a{n}", "text": f"Answer {n}", "correct": n == 1} for n in range(1, 5)
+            ],
+            "is_active": True,
+        }
+        for idx in range(max(questions, 10))
+    ]
+    session.execute(insert(QuizQuestion), rows)
+    return rows
+
+
+def _run_questions(questions: List[Dict[str, Any]], offset: int) -> List[Dict[str, Any]]:
+    by_difficulty = {d: [q for q in questions if q["difficulty"] == d] for d in (1, 2, 3)}
+    picked = by_difficulty[1][:4] + by_difficulty[2][:4] + by_difficulty[3][:2]
+    rotate = offset % len(picked)
+    picked = picked[rotate:] + picked[:rotate]
+    picked.sort(key=lambda q: q["difficulty"])
+    return [
+        {"question_id": q["id"], "difficulty": q["difficulty"], "answers_order": ["a1", "a2", "a3", "a4"], "joker_disabled": []}
+        for q in picked
+    ]
+
+
+def _seed_players_and_runs(
+    session: Session,
+    questions: List[Dict[str, Any]],
+    players: int,
+    runs_per_player: int,
+    anonymous: bool = False,
+    age: timedelta = timedelta(0),
+    scores: bool = False,
+    prefix: str = "bench",
+) -> List[Dict[str, Any]]:
+    """Insert finished runs with 10 answers each. Returns the run rows."""
+    from game_modules.quiz.models import QuizPlayer, QuizRun, QuizRunAnswer, QuizScore, QuizSession
+
+    now = datetime.now(timezone.utc) - age
+    player_rows = [
+        {
+            "id": str(uuid.uuid4()),
+            "name": f"{prefix}_p{idx}",
+            "normalized_name": f"{prefix}_p{idx}",
+            "is_anonymous": anonymous,
+            "created_at": now,
+            "last_seen_at": now,
+        }
+        for idx in range(players)
+    ]
+    session.execute(insert(QuizPlayer), player_rows)
+    if anonymous:
+        session.execute(insert(QuizSession), [
+            {"id": str(uuid.uuid4()), "player_id": p["id"], "token_hash": uuid.uuid4().hex, "created_at": now, "expires_at": now}
+            for p in player_rows
+        ])
+
+    run_rows, answer_rows, score_rows = [], [], []
+    for p_idx, player in enumerate(player_rows):
+        for r_idx in range(runs_per_player):
+            run_id = str(uuid.uuid4())
+            run_questions = _run_questions(questions, p_idx + r_idx)
+            run_rows.append({
+                "id": run_id,
+                "player_id": player["id"],
+                "topic_id": TOPIC_ID,
+                "status": "finished",
+                "created_at": now - timedelta(minutes=r_idx),
+                "finished_at": now - timedelta(minutes=r_idx),
+                "current_index": 10,
+                "run_questions": run_questions,
+                "joker_used_on": [],
+            })
+            for q_idx, question in enumerate(run_questions):
+                answer_rows.append({
+                    "id": str(uuid.uuid4()),
+                    "run_id": run_id,
+                    "question_id": question["question_id"],
+                    "question_index": q_idx,
+                    "selected_answer_id": "a1" if (q_idx + r_idx) % 3 else "a2",
+                    "result": "correct" if (q_idx + r_idx) % 3 else "wrong",
+                    "answered_at_ms": 0,
+                    "created_at": now,
+                })
+            if scores:
+                score_rows.append({
+                    "id": str(uuid.uuid4()),
+                    "run_id": run_id,
+                    "player_name": player["name"],
+                    "topic_id": TOPIC_ID,
+                    "total_score": (p_idx * 37 + r_idx * 11) % 1000,
+                    "tokens_count": 0,
+                    "created_at": now,
+                })
+    session.execute(insert(QuizRun), run_rows)
+    for start in range(0, len(answer_rows), 10000):
+        session.execute(insert(QuizRunAnswer), answer_rows[start:start + 10000])
+    if score_rows:
+        session.execute(insert(QuizScore), score_rows)
+    return run_rows
+
+
+def _in_progress_run(session: Session, questions: List[Dict[str, Any]], answered: int):
+    """A run of the first benchmark player with ``answered`` answers recorded."""
+    from game_modules.quiz.models import QuizPlayer, QuizRun, QuizRunAnswer
+
+    player = QuizPlayer(name="bench_runner", normalized_name="bench_runner")
+    session.add(player)
+    session.flush()
+    run = QuizRun(player_id=player.id, topic_id=TOPIC_ID, run_questions=_run_questions(questions, 0))
+    session.add(run)
+    session.flush()
+    for q_idx in range(answered):
+        session.add(QuizRunAnswer(
+            run_id=run.id,
+            question_id=run.run_questions[q_idx]["question_id"],
+            question_index=q_idx,
+            selected_answer_id="a1",
+            result="correct",
+        ))
+    run.current_index = answered
+    return run
+
+
+# ============================================================================
+# Benchmarks
+# ============================================================================
+
+def setup_validate_quiz_unit(size: int) -> Case:
+    from game_modules.quiz.validation import validate_quiz_unit
+
+    data = build_synthetic_unit("bench_validate", size)
+    return Case(call=lambda _: validate_quiz_unit(data, "bench_validate.json"))
+
+
+def setup_hash_pin(size: None) -> Case:
+    from game_modules.quiz.services import hash_pin
+
+    return Case(call=lambda _: hash_pin(PIN))
+
+
+def setup_verify_pin(size: None) -> Case:
+    from game_modules.quiz.services import hash_pin, verify_pin
+
+    hashed = hash_pin(PIN)
+    return Case(call=lambda _: verify_pin(PIN, hashed))
+
+
+def setup_build_run_questions(size: int, db: DbFixture) -> Case:
+    from game_modules.quiz.services import _build_run_questions
+
+    session = db.session()
+    questions = _seed_topic(session, size)
+    runs = _seed_players_and_runs(session, questions, players=1, runs_per_player=3)
+    session.commit()
+    player_id = runs[0]["player_id"]
+    return Case(
+        call=lambda _: _build_run_questions(session, player_id, TOPIC_ID),
+        close=session.close,
+    )
+
+
+def setup_calculate_running_score(size: int, db: DbFixture) -> Case:
+    from game_modules.quiz.services import calculate_running_score
+
+    session = db.session()
+    questions = _seed_topic(session, 30)
+    _seed_players_and_runs(session, questions, players=size, runs_per_player=1)
+    run = _in_progress_run(session, questions, answered=4)
+    session.commit()
+    return Case(
+        call=lambda _: calculate_running_score(session, run, 3, "correct"),
+        close=session.close,
+    )
+
+
+def setup_finish_run(size: int, db: DbFixture) -> Case:
+    from game_modules.quiz.models import QuizRun
+    from game_modules.quiz.services import finish_run
+
+    setup_session = db.session()
+    questions = _seed_topic(setup_session, 30)
+    _seed_players_and_runs(setup_session, questions, players=size, runs_per_player=1)
+    run_id = _in_progress_run(setup_session, questions, answered=10).id
+    setup_session.commit()
+    setup_session.close()
+    state: Dict[str, Any] = {}
+
+    def prepare() -> Any:
+        state["savepoint"] = db.savepoint()
+        state["session"] = db.session()
+        run = state["session"].get(QuizRun, run_id)
+        run.player  # loaded untimed, like the route's ownership check
+        return run
+
+    def call(run: Any) -> Any:
+        result = finish_run(state["session"], run)
+        state["session"].flush()
+        return result
+
+    def cleanup() -> None:
+        state["session"].close()
+        state["savepoint"].rollback()
+
+    return Case(call=call, prepare=prepare, cleanup=cleanup)
+
+
+def setup_get_leaderboard(size: int, db: DbFixture) -> Case:
+    from game_modules.quiz.services import get_leaderboard
+
+    session = db.session()
+    questions = _seed_topic(session, 30)
+    _seed_players_and_runs(session, questions, players=size, runs_per_player=1, scores=True)
+    session.commit()
+    return Case(call=lambda _: get_leaderboard(session, TOPIC_ID), close=session.close)
+
+
+def setup_import_release(size: int, db: DbFixture) -> Case:
+    from game_modules.quiz.import_service import QuizImportService
+    from game_modules.quiz.validation_cache import clear_validation_cache
+
+    units = max(1, size // 100)
+    tmp = tempfile.TemporaryDirectory(prefix="bench_micro_import_")
+    tmp_root = Path(tmp.name)
+    units_dir = tmp_root / "units"
+    audio_dir = tmp_root / "audio"
+    audio_dir.mkdir(parents=True)
+    write_synthetic_release(units_dir, units, size // units, prefix="bench_micro_unit")
+    service = QuizImportService(project_root=tmp_root)
+    state: Dict[str, Any] = {}
+
+    def prepare() -> Any:
+        clear_validation_cache()  # every call is a cold first import
+        state["savepoint"] = db.savepoint()
+        state["session"] = db.session()
+        return state["session"]
+
+    def call(session: Session) -> Any:
+        result = service.import_release(
+            session=session,
+            units_path=str(units_dir),
+            audio_path=str(audio_dir),
+            release_id="bench_micro_release",
+            request_id="bench",
+        )
+        if not result.success:
+            raise RuntimeError(f"Import failed: {result.errors[:3]}")
+        return result
+
+    def cleanup() -> None:
+        state["session"].close()
+        state["savepoint"].rollback()
+
+    return Case(call=call, prepare=prepare, cleanup=cleanup, close=tmp.cleanup)
+
+
+def setup_cleanup_anonymous_data(size: int, db: DbFixture) -> Case:
+    from game_modules.quiz.services import cleanup_anonymous_data
+
+    setup_session = db.session()
+    questions = _seed_topic(setup_session, 30)
+    _seed_players_and_runs(setup_session, questions, players=size // 2, runs_per_player=1, prefix="bench_active")
+    _seed_players_and_runs(
+        setup_session, questions, players=size // 2, runs_per_player=1,
+        anonymous=True, age=timedelta(days=2), prefix="bench_anon",
+    )
+    setup_session.commit()
+    setup_session.close()
+    state: Dict[str, Any] = {}
+
+    def prepare() -> Any:
+        state["savepoint"] = db.savepoint()
+        state["session"] = db.session()
+        return state["session"]
+
+    def call(session: Session) -> Any:
+        result = cleanup_anonymous_data(session)
+        session.flush()
+        return result
+
+    def cleanup() -> None:
+        state["session"].close()
+        state["savepoint"].rollback()
+
+    return Case(call=call, prepare=prepare, cleanup=cleanup)
+
+
+BENCHMARKS: List[Benchmark] = [
+    Benchmark("validate_quiz_unit", setup_validate_quiz_unit, sizes=(20, 200, 2000)),
+    Benchmark("hash_pin", setup_hash_pin, max_repeat=10),
+    Benchmark("verify_pin", setup_verify_pin, max_repeat=10),
+    Benchmark("_build_run_questions", setup_build_run_questions, sizes=(30, 300, 3000), needs_db=True),
+    Benchmark("calculate_running_score", setup_calculate_running_score, sizes=(100, 1000, 10000), needs_db=True),
+    Benchmark("finish_run", setup_finish_run, sizes=(100, 1000, 10000), needs_db=True),
+    Benchmark("get_leaderboard", setup_get_leaderboard, sizes=(100, 1000, 10000), needs_db=True),
+    Benchmark("import_release", setup_import_release, sizes=(100, 1000, 5000), needs_db=True, max_repeat=5),
+    Benchmark("cleanup_anonymous_data", setup_cleanup_anonymous_data, sizes=(100, 500, 2000), needs_db=True),
+]
+
+
+# ============================================================================
+# Runner
+# ============================================================================
+
+@dataclass
+class Result:
+    key: str
+    samples: List[float] = field(default_factory=list)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "median_ms": round(statistics.median(self.samples) * 1000, 4),
+            "min_ms": round(min(self.samples) * 1000, 4),
+            "samples": len(self.samples),
+        }
+
+
+def case_key(name: str, size: Optional[int]) -> str:
+    return name if size is None else f"{name}[{size}]"
+
+
+def time_case(case: Case, repeat: int, warmup: int = 1) -> List[float]:
+    samples = []
+    for idx in range(warmup + repeat):
+        arg = case.prepare()
+        started = time.perf_counter()
+        case.call(arg)
+        elapsed = time.perf_counter() - started
+        case.cleanup()
+        if idx >= warmup:
+            samples.append(elapsed)
+    return samples
+
+
+def run_benchmarks(
+    benchmarks: Sequence[Benchmark],
+    repeat: int,
+    quick: bool,
+    engine: Optional[Engine],
+) -> Dict[str, Dict[str, Any]]:
+    results: Dict[str, Dict[str, Any]] = {}
+    for bench in benchmarks:
+        if bench.needs_db and engine is None:
+            print(f"{bench.name:34s} skipped (no database URL)")
+            continue
+        sizes = bench.sizes[:1] if quick else bench.sizes
+        for size in sizes:
+            key = case_key(bench.name, size)
+            db = DbFixture.open(engine) if bench.needs_db else None
+            try:
+                case = bench.setup(size, db) if db else bench.setup(size)
+                try:
+                    samples = time_case(case, min(repeat, bench.max_repeat or repeat))
+                finally:
+                    case.close()
+            except Exception as exc:
+                print(f"{key:34s} ERROR {type(exc).__name__}: {str(exc).splitlines()[0][:120]}")
+                continue
+            finally:
+                if db is not None:
+                    db.close()
+            results[key] = Result(key, samples).to_dict()
+            row = results[key]
+            print(f"{key:34s} median {row['median_ms']:10.3f} ms   min {row['min_ms']:10.3f} ms")
+    return results
+
+
+def compare(results: Dict[str, Dict[str, Any]], baseline: Dict[str, Dict[str, Any]], tolerance: float) -> List[str]:
+    """Print the comparison table; return the keys that regressed."""
+    regressions = []
+    print()
+    print(f"{'case':34s} {'baseline ms':>12s} {'current ms':>12s} {'change':>8s}")
+    for key, row in results.items():
+        base = baseline.get(key)
+        if base is None:
+            print(f"{key:34s} {'-':>12s} {row['median_ms']:12.3f} {'new':>8s}")
+            continue
+        change = row["median_ms"] / base["median_ms"] - 1 if base["median_ms"] else 0.0
+        status = ""
+        if change > tolerance:
+            status = "  REGRESSION"
+            regressions.append(key)
+        elif change < -tolerance:
+            status = "  faster"
+        print(f"{key:34s} {base['median_ms']:12.3f} {row['median_ms']:12.3f} {change:+8.1%}{status}")
+    return regressions
+
+
+def load_baseline(path: Path) -> Dict[str, Dict[str, Any]]:
+    if not path.exists():
+        return {}
+    return json.loads(path.read_text(encoding="utf-8")).get("results", {})
+
+
+def save_baseline(path: Path, results: Dict[str, Dict[str, Any]]) -> None:
+    merged = {**load_baseline(path), **results}
+    payload = {
+        "updated_at": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "machine": platform.machine(),
+        "results": dict(sorted(merged.items())),
+    }
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps(payload, indent=2) + "\n", encoding="utf-8")
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Quiz service microbenchmarks")
+    parser.add_argument(
+        "--database-url",
+        default=os.environ.get("QUIZ_DATABASE_URL"),
+        help="Quiz database URL for DB benchmarks (default: $QUIZ_DATABASE_URL)",
+    )
+    parser.add_argument("--only", action="append", default=[], help="Run benchmarks whose name contains this (repeatable)")
+    parser.add_argument("--quick", action="store_true", help="Smallest dataset only")
+    parser.add_argument("--repeat", type=int, default=15, help="Timed calls per case")
+    parser.add_argument("--baseline", type=Path, default=DEFAULT_BASELINE, help="Baseline JSON file")
+    parser.add_argument("--save-baseline", action="store_true", help="Store these results in the baseline file")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="Allowed slowdown before failing (0.25 = 25%%)")
+    parser.add_argument("--output", type=Path, help="Also write this run's results as JSON")
+    args = parser.parse_args()
+
+    benchmarks = [b for b in BENCHMARKS if not args.only or any(o in b.name for o in args.only)]
+
+    engine = None
+    if args.database_url and any(b.needs_db for b in benchmarks):
+        from game_modules.quiz.models import QuizBase
+
+        from scripts.init_quiz_db import apply_quiz_migrations
+
+        engine = create_engine(args.database_url, future=True)
+        QuizBase.metadata.create_all(bind=engine)
+        apply_quiz_migrations(engine)
+
+    try:
+        results = run_benchmarks(benchmarks, args.repeat, args.quick, engine)
+    finally:
+        if engine is not None:
+            engine.dispose()
+
+    if args.output:
+        args.output.write_text(json.dumps({"results": results}, indent=2) + "\n", encoding="utf-8")
+
+    if args.save_baseline:
+        save_baseline(args.baseline, results)
+        print(f"\nBaseline written: {args.baseline}")
+        return 0
+
+    baseline = load_baseline(args.baseline)
+    if not baseline:
+        print(f"\nNo baseline at {args.baseline} (record one with --save-baseline)")
+        return 0
+    regressions = compare(results, baseline, args.tolerance)
+    if regressions:
+        print(f"\n{len(regressions)} regression(s) above {args.tolerance:.0%}: {', '.join(regressions)}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
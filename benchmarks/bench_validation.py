@@ -0,0 +1,88 @@
+#!/usr/bin/env python
+"""Benchmark unit validation with and without the validation cache.
+
+Generates a synthetic release (default: 100 units x 100 questions) and runs
+the import's phase 1 (load, fingerprint, validate every unit file) serially:
+
+- uncached: validate_quiz_unit on every unit (behaviour without the cache)
+- cold cache: validate and store every unit (first upload of a unit)
+- warm cache: every unit served from the cache (import after upload,
+  re-imports)
+
+No database is needed.
+
+Usage:
+    python benchmarks/bench_validation.py --units 100 --questions 100
+"""
+
+from __future__ import annotations
+
+import argparse
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from benchmarks.synthetic import write_synthetic_release  # noqa: E402
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Benchmark quiz unit validation cache")
+    parser.add_argument("--units", type=int, default=100, help="Number of units")
+    parser.add_argument("--questions", type=int, default=100, help="Questions per unit")
+    parser.add_argument("--repeat", type=int, default=3, help="Best of N runs per mode")
+    args = parser.parse_args()
+
+    from game_modules.quiz.import_service import _load_and_validate_unit
+    from game_modules.quiz.validation_cache import clear_validation_cache
+
+    total_questions = args.units * args.questions
+    print(f"Synthetic release: {args.units} units x {args.questions} questions = {total_questions}")
+
+    with tempfile.TemporaryDirectory(prefix="bench_validation_") as tmp:
+        tmp_root = Path(tmp)
+        units_dir = tmp_root / "units"
+        write_synthetic_release(units_dir, args.units, args.questions)
+        json_files = sorted(units_dir.glob("*.json"))
+
+        def run(use_cache):
+            started = time.perf_counter()
+            for json_file in json_files:
+                unit, _, error, _, cached = _load_and_validate_unit(json_file, use_cache)
+                if error is not None:
+                    raise SystemExit(f"Validation failed for {json_file.name}: {error}")
+            return time.perf_counter() - started, cached
+
+        timings = []
+        uncached = min(run(False)[0] for _ in range(args.repeat))
+        timings.append(("uncached", uncached))
+        cold = []
+        for _ in range(args.repeat):
+            clear_validation_cache()
+            elapsed, cached = run(True)
+            assert not cached
+            cold.append(elapsed)
+        timings.append(("cold cache", min(cold)))
+        warm = []
+        for _ in range(args.repeat):
+            elapsed, cached = run(True)
+            assert cached
+            warm.append(elapsed)
+        timings.append(("warm cache", min(warm)))
+
+        for label, elapsed in timings:
+            rate = total_questions / elapsed if elapsed else 0.0
+            print(f"{label:12s}: {elapsed:8.3f}s  ({rate:,.0f} questions/s)")
+
+        # Upload + import of the same unit: two validations before, one after
+        print(
+            f"upload+import: {2 * uncached:.3f}s -> {min(cold) + min(warm):.3f}s"
+        )
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,186 @@
+#!/usr/bin/env python
+"""Compare gunicorn worker modes (sync vs gthread vs gevent) on the quiz API.
+
+For every mode, starts gunicorn with ``gunicorn.conf.py`` (mode passed via
+``GUNICORN_WORKER_CLASS``/``GUNICORN_THREADS``/``GUNICORN_WORKERS``), plays
+a classroom scenario against it with ``load_classroom.run_scenario`` and
+stops it again. A benchmark topic is seeded into QUIZ_DATABASE_URL first and
+deleted afterwards (use a disposable database; the load-test players stay).
+
+The app runs with the environment of this process (FLASK_ENV, secrets,
+AUTH_DATABASE_URL, QUIZ_DATABASE_URL). Think time is off by default
+(``--time-scale 0``), so the numbers are the throughput limit; the
+simultaneous logins (argon2 PIN hashing) are where sync workers queue.
+
+Usage:
+    QUIZ_DATABASE_URL=postgresql+psycopg2://... \\
+        python benchmarks/bench_worker_modes.py --modes sync gthread:4 --players 30
+"""
+
+from __future__ import annotations
+
+import argparse
+import logging
+import os
+import subprocess
+import sys
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Tuple
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import httpx  # noqa: E402
+from sqlalchemy import create_engine, delete  # noqa: E402
+from sqlalchemy.orm import Session  # noqa: E402
+
+from benchmarks.bench_quiz_services import _seed_topic  # noqa: E402
+from benchmarks.load_classroom import load_scenario, run_scenario  # noqa: E402
+
+logging.basicConfig(
+    level=logging.WARNING,
+    format="[%(asctime)s] %(levelname)s: %(message)s",
+)
+logger = logging.getLogger(__name__)
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+DEFAULT_SCENARIO = PROJECT_ROOT / "benchmarks" / "scenarios" / "classroom_30_simultaneous.yaml"
+TOPIC_ID = "bench_workers_topic"
+
+
+def parse_mode(spec: str) -> Tuple[str, int]:
+    """``gthread:4`` -> ("gthread", 4); ``sync`` -> ("sync", 1)."""
+    worker_class, _, threads = spec.partition(":")
+    return worker_class, int(threads or 1)
+
+
+def start_gunicorn(worker_class: str, threads: int, workers: int, port: int) -> subprocess.Popen:
+    env = {
+        **os.environ,
+        "GUNICORN_WORKER_CLASS": worker_class,
+        "GUNICORN_THREADS": str(threads),
+        "GUNICORN_WORKERS": str(workers),
+    }
+    if worker_class == "gevent":
+        env["GUNICORN_CMD_ARGS"] = f"--worker-connections {max(threads, 100)}"
+    return subprocess.Popen(
+        [
+            sys.executable, "-m", "gunicorn",
+            "-c", "gunicorn.conf.py",
+            "--bind", f"127.0.0.1:{port}",
+            "--log-level", "warning",
+            "src.app.main:app",
+        ],
+        cwd=PROJECT_ROOT,
+        env=env,
+    )
+
+
+def wait_until_healthy(base_url: str, process: subprocess.Popen, timeout: float = 60.0) -> bool:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if process.poll() is not None:
+            return False
+        try:
+            if httpx.get(f"{base_url}/health", timeout=2.0).status_code == 200:
+                return True
+        except httpx.HTTPError:
+            pass
+        time.sleep(0.5)
+    return False
+
+
+def stop(process: subprocess.Popen) -> None:
+    process.terminate()
+    try:
+        process.wait(timeout=30)
+    except subprocess.TimeoutExpired:
+        process.kill()
+        process.wait()
+
+
+def seed(database_url: str, questions: int) -> None:
+    engine = create_engine(database_url, future=True)
+    try:
+        with Session(engine) as session:
+            cleanup(session)
+            _seed_topic(session, questions, topic_id=TOPIC_ID)
+            session.commit()
+    finally:
+        engine.dispose()
+
+
+def cleanup(session: Session) -> None:
+    from game_modules.quiz.models import QuizTopic
+
+    # Questions, runs and scores cascade
+    session.execute(delete(QuizTopic).where(QuizTopic.id == TOPIC_ID))
+    session.commit()
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Compare gunicorn worker modes on the quiz API")
+    parser.add_argument("--modes", nargs="+", default=["sync", "gthread:4"], help="worker_class[:threads]")
+    parser.add_argument("--workers", type=int, default=2, help="gunicorn workers per mode")
+    parser.add_argument("--scenario", type=Path, default=DEFAULT_SCENARIO, help="Scenario YAML file")
+    parser.add_argument("--players", type=int, help="Override the scenario's player count")
+    parser.add_argument("--time-scale", type=float, default=0.0, help="Think/ramp-up time factor (0 = none)")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--questions", type=int, default=30, help="Questions in the benchmark topic")
+    parser.add_argument(
+        "--database-url",
+        default=os.environ.get("QUIZ_DATABASE_URL"),
+        help="Quiz database URL (default: $QUIZ_DATABASE_URL)",
+    )
+    args = parser.parse_args()
+
+    if not args.database_url:
+        logger.error("No database URL (set QUIZ_DATABASE_URL or pass --database-url)")
+        return 2
+
+    scenario = load_scenario(args.scenario)
+    scenario.topic_id = TOPIC_ID
+    if args.players is not None:
+        scenario.players = args.players
+
+    base_url = f"http://127.0.0.1:{args.port}"
+    results: List[Tuple[str, Dict[str, Any]]] = []
+    seed(args.database_url, args.questions)
+    try:
+        for spec in args.modes:
+            worker_class, threads = parse_mode(spec)
+            process = start_gunicorn(worker_class, threads, args.workers, args.port)
+            try:
+                if not wait_until_healthy(base_url, process):
+                    logger.error("gunicorn (%s) did not become healthy", spec)
+                    return 1
+                print(f"{spec}: {scenario.players} players ...", flush=True)
+                results.append((spec, run_scenario(scenario, base_url, args.time_scale)))
+            finally:
+                stop(process)
+    finally:
+        engine = create_engine(args.database_url, future=True)
+        with Session(engine) as session:
+            cleanup(session)
+        engine.dispose()
+
+    print()
+    print(
+        f"{'mode':12s} {'req/s':>8s} {'login p95':>10s} {'answer p50':>11s} "
+        f"{'answer p95':>11s} {'max ms':>8s} {'errors':>7s}"
+    )
+    for spec, summary in results:
+        endpoints = summary["endpoints"]
+        login = endpoints.get("POST /auth/name-pin", {})
+        answer = endpoints.get("POST /run/<id>/answer", {})
+        slowest = max((row["max_ms"] for row in endpoints.values()), default=0.0)
+        print(
+            f"{spec:12s} {summary['requests_per_second']:8.1f} {login.get('p95_ms', 0):10.1f} "
+            f"{answer.get('p50_ms', 0):11.1f} {answer.get('p95_ms', 0):11.1f} {slowest:8.1f} "
+            f"{sum(summary['errors'].values()):7d}"
+        )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
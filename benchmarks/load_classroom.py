@@ -0,0 +1,338 @@
+#!/usr/bin/env python
+"""Load test: a classroom of quiz players against a running app.
+
+Every simulated player is a thread with its own HTTP client (cookies). A
+player logs in (name + PIN, or anonymous), loads the topics, plays
+``runs_per_player`` runs (run/start, then per question: load question,
+question/start, think, optional joker, answer, optional /state refresh),
+finishes the run and loads the leaderboard. The scenario file
+(``benchmarks/scenarios/*.yaml``) sets the player count, ramp-up and
+behaviour; ``ramp_up_seconds: 0`` starts every player at the same moment.
+
+Report: throughput, latency p50/p95/p99/max per endpoint, error codes and
+SQL statements per run. The statement counts come from the ``X-DB-Queries``
+header, so the server needs ``DB_QUERY_STATS_HEADER=true`` (on in
+DevConfig); without it they are reported as n/a.
+
+Start the app locally first (``make dev``, or gunicorn with
+``gunicorn.conf.py`` to measure the production worker setup). Rate
+limiting is per client IP; players send their own ``X-Forwarded-For``
+unless the scenario sets ``shared_ip: true`` (one school NAT address).
+
+Usage:
+    python benchmarks/load_classroom.py benchmarks/scenarios/classroom_30_simultaneous.yaml
+    python benchmarks/load_classroom.py SCENARIO --base-url http://localhost:8000 --time-scale 0.2 --json out.json
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import random
+import sys
+import threading
+import time
+from collections import Counter, defaultdict
+from dataclasses import asdict, dataclass, field, fields
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+import httpx
+import yaml
+
+
+@dataclass
+class Scenario:
+    name: str = "classroom"
+    players: int = 30
+    # Seconds over which player starts are spread (0 = all at once)
+    ramp_up_seconds: float = 0.0
+    # Share of players that play anonymously instead of name + PIN
+    anonymous_ratio: float = 0.0
+    topic_id: Optional[str] = None  # None: first topic from /api/quiz/topics
+    runs_per_player: int = 1
+    # Seconds a player reads/thinks before answering, uniform [min, max]
+    think_time_seconds: Tuple[float, float] = (3.0, 12.0)
+    correct_probability: float = 0.7
+    joker_probability: float = 0.1
+    # Chance of a /state request after an answer (tab refresh, reconnect)
+    state_refresh_probability: float = 0.1
+    leaderboard: bool = True
+    # All players behind one address (rate limits are per client IP)
+    shared_ip: bool = False
+    seed: int = 1
+
+
+def load_scenario(path: Path) -> Scenario:
+    data = yaml.safe_load(path.read_text(encoding="utf-8")) or {}
+    known = {f.name for f in fields(Scenario)}
+    unknown = set(data) - known
+    if unknown:
+        raise ValueError(f"Unknown scenario keys: {', '.join(sorted(unknown))}")
+    if "think_time_seconds" in data:
+        low, high = data["think_time_seconds"]
+        data["think_time_seconds"] = (float(low), float(high))
+    return Scenario(**data)
+
+
+@dataclass
+class Recorder:
+    """Thread-safe collection of request timings and outcomes."""
+    latencies: Dict[str, List[float]] = field(default_factory=lambda: defaultdict(list))
+    errors: Counter = field(default_factory=Counter)
+    run_queries: List[int] = field(default_factory=list)
+    runs_finished: int = 0
+    lock: threading.Lock = field(default_factory=threading.Lock)
+
+    def request(self, endpoint: str, seconds: float, error: Optional[str]) -> None:
+        with self.lock:
+            self.latencies[endpoint].append(seconds)
+            if error:
+                self.errors[(endpoint, error)] += 1
+
+    def run_done(self, queries: Optional[int]) -> None:
+        with self.lock:
+            self.runs_finished += 1
+            if queries is not None:
+                self.run_queries.append(queries)
+
+
+class Player:
+    def __init__(self, index: int, scenario: Scenario, base_url: str, recorder: Recorder, time_scale: float):
+        self.index = index
+        self.scenario = scenario
+        self.recorder = recorder
+        self.time_scale = time_scale
+        self.rng = random.Random(scenario.seed * 100003 + index)
+        headers = {}
+        if not scenario.shared_ip:
+            headers["X-Forwarded-For"] = f"10.{index // 65536 % 256}.{index // 256 % 256}.{index % 256}"
+        self.client = httpx.Client(base_url=base_url, headers=headers, timeout=30.0)
+        # Statements of the current run (None once a response lacks X-DB-Queries)
+        self.run_queries: Optional[int] = 0
+
+    def call(self, method: str, endpoint: str, url: str, **kwargs: Any) -> Optional[Dict[str, Any]]:
+        """Send a request; record it under ``endpoint``. Returns the JSON body on 2xx."""
+        started = time.perf_counter()
+        try:
+            response = self.client.request(method, url, **kwargs)
+        except httpx.HTTPError as exc:
+            self.recorder.request(endpoint, time.perf_counter() - started, type(exc).__name__)
+            return None
+        elapsed = time.perf_counter() - started
+
+        queries = response.headers.get("X-DB-Queries")
+        if queries is None:
+            self.run_queries = None
+        elif self.run_queries is not None:
+            self.run_queries += int(queries)
+
+        body: Optional[Dict[str, Any]] = None
+        try:
+            body = response.json()
+        except ValueError:
+            pass
+        error = None
+        if response.status_code >= 400:
+            code = (body or {}).get("code") if isinstance(body, dict) else None
+            error = f"{response.status_code} {code}" if code else str(response.status_code)
+        self.recorder.request(endpoint, elapsed, error)
+        return body if error is None else None
+
+    def think(self) -> None:
+        low, high = self.scenario.think_time_seconds
+        time.sleep(self.rng.uniform(low, high) * self.time_scale)
+
+    def login(self) -> bool:
+        if self.rng.random() < self.scenario.anonymous_ratio:
+            body = self.call("POST", "POST /auth/register", "/api/quiz/auth/register", json={"anonymous": True})
+        else:
+            credentials = {"name": f"Load{self.scenario.seed}x{self.index:04d}", "pin": "LOAD"}
+            body = self.call("POST", "POST /auth/name-pin", "/api/quiz/auth/name-pin", json=credentials)
+        return body is not None
+
+    def play_run(self, topic_id: str) -> None:
+        self.run_queries = 0
+        body = self.call(
+            "POST", "POST /<topic>/run/start", f"/api/quiz/{topic_id}/run/start", json={"force_new": True}
+        )
+        if body is None:
+            return
+        run = body["run"]
+        run_id = run["run_id"]
+        questions = run["run_questions"]
+
+        for index, entry in enumerate(questions):
+            question = self.call("GET", "GET /questions/<id>", f"/api/quiz/questions/{entry['question_id']}")
+            if question is None:
+                return
+            now_ms = int(time.time() * 1000)
+            started = self.call(
+                "POST",
+                "POST /run/<id>/question/start",
+                f"/api/quiz/run/{run_id}/question/start",
+                json={"question_index": index, "started_at_ms": now_ms},
+            )
+            if started is None:
+                return
+            self.think()
+            if self.rng.random() < self.scenario.joker_probability:
+                self.call("POST", "POST /run/<id>/joker", f"/api/quiz/run/{run_id}/joker", json={"question_index": index})
+
+            answers = question.get("answers") or []
+            correct = [a["id"] for a in answers if a.get("correct")]
+            wrong = [a["id"] for a in answers if not a.get("correct")]
+            if correct and (not wrong or self.rng.random() < self.scenario.correct_probability):
+                selected = self.rng.choice(correct)
+            else:
+                selected = self.rng.choice(wrong) if wrong else None
+            result = self.call(
+                "POST",
+                "POST /run/<id>/answer",
+                f"/api/quiz/run/{run_id}/answer",
+                json={
+                    "question_index": index,
+                    "selected_answer_id": selected,
+                    "answered_at_ms": int(time.time() * 1000),
+                },
+            )
+            if result is None:
+                return
+            if self.rng.random() < self.scenario.state_refresh_probability:
+                self.call("GET", "GET /run/<id>/state", f"/api/quiz/run/{run_id}/state")
+            if result.get("finished"):
+                break
+
+        if self.call("POST", "POST /run/<id>/finish", f"/api/quiz/run/{run_id}/finish") is None:
+            return
+        if self.scenario.leaderboard:
+            self.call("GET", "GET /topics/<topic>/leaderboard", f"/api/quiz/topics/{topic_id}/leaderboard")
+        self.recorder.run_done(self.run_queries)
+
+    def play(self, start_at: float) -> None:
+        time.sleep(max(0.0, start_at - time.monotonic()))
+        try:
+            if not self.login():
+                return
+            body = self.call("GET", "GET /topics", "/api/quiz/topics")
+            if body is None:
+                return
+            topic_id = self.scenario.topic_id
+            if topic_id is None:
+                topics = body.get("topics") or []
+                if not topics:
+                    self.recorder.request("GET /topics", 0.0, "no topics")
+                    return
+                topic_id = topics[0]["topic_id"]
+            for _ in range(self.scenario.runs_per_player):
+                self.play_run(topic_id)
+        finally:
+            self.client.close()
+
+
+def percentile(sorted_values: List[float], pct: float) -> float:
+    """Nearest-rank percentile of an ascending list."""
+    if not sorted_values:
+        return 0.0
+    rank = max(1, round(pct / 100 * len(sorted_values) + 0.5))
+    return sorted_values[min(rank, len(sorted_values)) - 1]
+
+
+def summarize(scenario: Scenario, recorder: Recorder, elapsed: float) -> Dict[str, Any]:
+    endpoints = {}
+    total = 0
+    for endpoint, values in sorted(recorder.latencies.items()):
+        values = sorted(values)
+        total += len(values)
+        endpoints[endpoint] = {
+            "count": len(values),
+            "p50_ms": round(percentile(values, 50) * 1000, 1),
+            "p95_ms": round(percentile(values, 95) * 1000, 1),
+            "p99_ms": round(percentile(values, 99) * 1000, 1),
+            "max_ms": round(values[-1] * 1000, 1),
+        }
+    run_queries = sorted(recorder.run_queries)
+    return {
+        "scenario": asdict(scenario),
+        "elapsed_seconds": round(elapsed, 2),
+        "requests": total,
+        "requests_per_second": round(total / elapsed, 2) if elapsed else 0.0,
+        "runs_finished": recorder.runs_finished,
+        "endpoints": endpoints,
+        "errors": {f"{endpoint}: {error}": count for (endpoint, error), count in recorder.errors.most_common()},
+        "sql_per_run": {
+            "mean": round(sum(run_queries) / len(run_queries), 1),
+            "p50": percentile(run_queries, 50),
+            "max": run_queries[-1],
+        } if run_queries else None,
+    }
+
+
+def print_report(summary: Dict[str, Any]) -> None:
+    scenario = summary["scenario"]
+    print(f"Scenario {scenario['name']}: {scenario['players']} players, ramp-up {scenario['ramp_up_seconds']}s")
+    print(
+        f"{summary['requests']} requests in {summary['elapsed_seconds']}s "
+        f"({summary['requests_per_second']} req/s), {summary['runs_finished']} runs finished"
+    )
+    print()
+    print(f"{'endpoint':34s} {'count':>6s} {'p50 ms':>8s} {'p95 ms':>8s} {'p99 ms':>8s} {'max ms':>8s}")
+    for endpoint, row in summary["endpoints"].items():
+        print(
+            f"{endpoint:34s} {row['count']:6d} {row['p50_ms']:8.1f} {row['p95_ms']:8.1f} "
+            f"{row['p99_ms']:8.1f} {row['max_ms']:8.1f}"
+        )
+    print()
+    if summary["errors"]:
+        print("Errors:")
+        for key, count in summary["errors"].items():
+            print(f"  {count:5d}  {key}")
+    else:
+        print("Errors: none")
+    sql = summary["sql_per_run"]
+    if sql:
+        print(f"SQL statements per run: mean {sql['mean']}, p50 {sql['p50']}, max {sql['max']}")
+    else:
+        print("SQL statements per run: n/a (server without DB_QUERY_STATS_HEADER)")
+
+
+def run_scenario(scenario: Scenario, base_url: str, time_scale: float = 1.0) -> Dict[str, Any]:
+    """Play ``scenario`` against ``base_url``; return the summary."""
+    recorder = Recorder()
+    ramp_up = scenario.ramp_up_seconds * time_scale
+    # Short delay so every thread is waiting before the first start
+    first_start = time.monotonic() + 0.5
+    threads = []
+    for index in range(scenario.players):
+        offset = ramp_up * index / scenario.players if scenario.players > 1 else 0.0
+        player = Player(index, scenario, base_url, recorder, time_scale)
+        thread = threading.Thread(target=player.play, args=(first_start + offset,), daemon=True)
+        threads.append(thread)
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return summarize(scenario, recorder, time.monotonic() - first_start)
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Simulate a classroom of quiz players")
+    parser.add_argument("scenario", type=Path, help="Scenario YAML file")
+    parser.add_argument("--base-url", default="http://localhost:8000", help="App URL")
+    parser.add_argument("--players", type=int, help="Override the scenario's player count")
+    parser.add_argument("--time-scale", type=float, default=1.0, help="Multiply think and ramp-up times (0.1 = 10x faster)")
+    parser.add_argument("--json", type=Path, help="Also write the summary as JSON")
+    args = parser.parse_args()
+
+    scenario = load_scenario(args.scenario)
+    if args.players is not None:
+        scenario.players = args.players
+
+    summary = run_scenario(scenario, args.base_url, args.time_scale)
+    print_report(summary)
+    if args.json:
+        args.json.write_text(json.dumps(summary, indent=2), encoding="utf-8")
+    return 1 if summary["errors"] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
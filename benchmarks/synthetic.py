@@ -0,0 +1,80 @@
+"""Synthetic quiz content for benchmarks.
+
+Generates quiz_unit_v2 JSON files that pass ``validate_quiz_unit`` so that
+import/validation code paths can be exercised at arbitrary scale without
+touching real content.
+"""
+
+from __future__ import annotations
+
+import json
+from pathlib import Path
+from typing import Any, Dict, List
+
+
+def build_synthetic_unit(slug: str, questions_per_unit: int = 11) -> Dict[str, Any]:
+    """Build a valid quiz_unit_v2 dict.
+
+    Difficulties are assigned round-robin (1, 2, 3), so at least 11 questions
+    are required to satisfy the 4/4/2 per-difficulty minimum (with 10,
+    difficulty 2 gets only 3).
+
+    Args:
+        slug: Unit slug (lowercase [a-z0-9_])
+        questions_per_unit: Number of questions to generate
+
+    Returns:
+        Unit dict ready to be written as JSON
+    """
+    questions: List[Dict[str, Any]] = []
+    for idx in range(questions_per_unit):
+        questions.append({
+            "id": f"{slug}_q{idx + 1:04d}",
+            "difficulty": (idx % 3) + 1,
+            "type": "single_choice",
+            "prompt": f"Synthetic prompt {idx + 1} for {slug}?",
+            "explanation": f"Synthetic explanation {idx + 1} for {slug}.",
+            "answers": [
+                {"id": "a1", "text": "Correct answer", "correct": True},
+                {"id": "a2", "text": "Wrong answer one", "correct": False},
+                {"id": "a3", "text": "Wrong answer two", "correct": False},
+                {"id": "a4", "text": "Wrong answer three", "correct": False},
+            ],
+            "sources": [],
+            "meta": {"synthetic": True},
+        })
+
+    return {
+        "schema_version": "quiz_unit_v2",
+        "slug": slug,
+        "title": f"Synthetic unit {slug}",
+        "description": f"Synthetic benchmark unit {slug}.",
+        "authors": ["Benchmark"],
+        "is_active": True,
+        "order_index": 0,
+        "questions": questions,
+    }
+
+
+def write_synthetic_release(
+    units_dir: Path,
+    units: int,
+    questions_per_unit: int,
+    prefix: str = "bench_unit",
+) -> List[Path]:
+    """Write ``units`` synthetic unit files into ``units_dir``.
+
+    Returns:
+        List of written JSON paths
+    """
+    units_dir.mkdir(parents=True, exist_ok=True)
+    written: List[Path] = []
+    for idx in range(units):
+        slug = f"{prefix}_{idx + 1:04d}"
+        path = units_dir / f"{slug}.json"
+        path.write_text(
+            json.dumps(build_synthetic_unit(slug, questions_per_unit), ensure_ascii=False),
+            encoding="utf-8",
+        )
+        written.append(path)
+    return written
@@ -3,6 +3,7 @@
 from __future__ import annotations
 
 import os
+from pathlib import Path
 from typing import Final
 
 from flask import current_app
@@ -10,6 +11,35 @@ from flask import current_app
 QUIZ_MECHANICS_VERSION_ENV: Final[str] = "QUIZ_MECHANICS_VERSION"
 QUIZ_MECHANICS_ALLOWED: Final[set[str]] = {"v1", "v2"}
 
+QUIZ_IMPORT_WORKERS_ENV: Final[str] = "QUIZ_IMPORT_WORKERS"
+QUIZ_IMPORT_POOL_ENV: Final[str] = "QUIZ_IMPORT_POOL"
+QUIZ_IMPORT_POOL_ALLOWED: Final[set[str]] = {"thread", "process"}
+QUIZ_IMPORT_MAX_AUTO_WORKERS: Final[int] = 8
+
+QUIZ_UPLOAD_MAX_FILE_BYTES_ENV: Final[str] = "QUIZ_UPLOAD_MAX_FILE_BYTES"
+QUIZ_UPLOAD_MAX_REQUEST_BYTES_ENV: Final[str] = "QUIZ_UPLOAD_MAX_REQUEST_BYTES"
+QUIZ_UPLOAD_DEFAULT_MAX_FILE_BYTES: Final[int] = 50 * 1024 * 1024
+QUIZ_UPLOAD_DEFAULT_MAX_REQUEST_BYTES: Final[int] = 200 * 1024 * 1024
+
+QUIZ_CONTENT_SNAPSHOT_DIR_ENV: Final[str] = "QUIZ_CONTENT_SNAPSHOT_DIR"
+
+QUIZ_MEDIA_ACCEL_REDIRECT_ENV: Final[str] = "QUIZ_MEDIA_ACCEL_REDIRECT"
+
+QUIZ_MEDIA_TRANSCODE_ENV: Final[str] = "QUIZ_MEDIA_TRANSCODE"
+
+
+def _get_setting(key: str) -> object:
+    """Read a setting from Flask config (if available), else the environment."""
+    value = None
+    try:
+        if current_app:
+            value = current_app.config.get(key)
+    except Exception:
+        value = None
+    if value is None or value == "":
+        value = os.getenv(key)
+    return value
+
 
 def get_quiz_mechanics_version() -> str:
     """Return validated quiz mechanics version.
@@ -40,3 +70,113 @@ def get_quiz_mechanics_version() -> str:
         return "v2"
 
     return value
+
+
+def get_import_workers() -> int:
+    """Return the worker count for content import pools.
+
+    Sources:
+    - Flask config: QUIZ_IMPORT_WORKERS
+    - Environment: QUIZ_IMPORT_WORKERS
+
+    0/missing/invalid -> auto (min(8, cpu_count)). Always >= 1.
+    """
+    value = _get_setting(QUIZ_IMPORT_WORKERS_ENV)
+    try:
+        workers = int(value) if value is not None else 0
+    except (TypeError, ValueError):
+        workers = 0
+
+    if workers <= 0:
+        workers = min(QUIZ_IMPORT_MAX_AUTO_WORKERS, os.cpu_count() or 1)
+
+    return max(1, workers)
+
+
+def get_import_pool_kind() -> str:
+    """Return the executor kind for content import pools ("thread" or "process").
+
+    Falls back to "thread" on missing/invalid values.
+    """
+    value = _get_setting(QUIZ_IMPORT_POOL_ENV)
+    value = str(value).strip().lower() if value is not None else "thread"
+    if value not in QUIZ_IMPORT_POOL_ALLOWED:
+        return "thread"
+    return value
+
+
+def _get_byte_limit(key: str, default: int) -> int | None:
+    value = _get_setting(key)
+    try:
+        limit = int(value) if value is not None else default
+    except (TypeError, ValueError):
+        limit = default
+    return limit if limit > 0 else None
+
+
+def get_upload_max_file_bytes() -> int | None:
+    """Return the per-file size limit for dashboard media uploads.
+
+    Sources: Flask config / environment QUIZ_UPLOAD_MAX_FILE_BYTES.
+    Default 50 MiB; 0 or negative -> unlimited (None).
+    """
+    return _get_byte_limit(QUIZ_UPLOAD_MAX_FILE_BYTES_ENV, QUIZ_UPLOAD_DEFAULT_MAX_FILE_BYTES)
+
+
+def get_upload_max_request_bytes() -> int | None:
+    """Return the per-request size limit for dashboard uploads (all files).
+
+    Sources: Flask config / environment QUIZ_UPLOAD_MAX_REQUEST_BYTES.
+    Default 200 MiB; 0 or negative -> unlimited (None).
+    """
+    return _get_byte_limit(QUIZ_UPLOAD_MAX_REQUEST_BYTES_ENV, QUIZ_UPLOAD_DEFAULT_MAX_REQUEST_BYTES)
+
+
+def get_content_snapshot_dir() -> Path | None:
+    """Return the directory of published content snapshots, or None if disabled.
+
+    Sources: Flask config / environment QUIZ_CONTENT_SNAPSHOT_DIR.
+    Unset, empty or "off" -> disabled (game routes read the database).
+    """
+    value = _get_setting(QUIZ_CONTENT_SNAPSHOT_DIR_ENV)
+    if value is None:
+        return None
+    value = str(value).strip()
+    if not value or value.lower() in {"0", "off", "false", "none"}:
+        return None
+    return Path(value)
+
+
+def get_media_root() -> Path:
+    """Return the media volume root (Flask config MEDIA_DIR, else runtime default)."""
+    value = _get_setting("MEDIA_DIR")
+    if value:
+        return Path(str(value))
+    from src.app.config.runtime_paths import get_media_dir  # avoid import cycle via src.app
+
+    return get_media_dir()
+
+
+def get_media_accel_prefix() -> str | None:
+    """Return the nginx internal location for media offload, or None.
+
+    Sources: Flask config / environment QUIZ_MEDIA_ACCEL_REDIRECT
+    (e.g. "/_quiz_media/"). Unset or empty -> Flask serves media itself.
+    """
+    value = _get_setting(QUIZ_MEDIA_ACCEL_REDIRECT_ENV)
+    if value is None:
+        return None
+    value = str(value).strip()
+    return value or None
+
+
+def get_media_transcode_enabled() -> bool:
+    """Return whether the import transcodes audio and derives resized images.
+
+    Sources: Flask config / environment QUIZ_MEDIA_TRANSCODE.
+    Default on; "0", "false", "no" or "off" -> disabled.
+    """
+    value = _get_setting(QUIZ_MEDIA_TRANSCODE_ENV)
+    if value is None:
+        return True
+    return str(value).strip().lower() not in {"0", "false", "no", "off"}
@@ -0,0 +1,527 @@
+"""Immutable, memory-mapped snapshot of the published quiz content.
+
+Publishing compiles topics, questions (answers incl. answer keys, media
+metadata) into one binary file; gunicorn workers mmap it, so all workers
+share one page-cache copy and the hot quiz paths (topic list, run setup,
+start/answer/joker) do not query quiz_topics / quiz_questions at all.
+
+Layout (``<snapshot_dir>``):
+- ``<content_hash>.snap``: the compiled content (content-addressed, never
+  modified; identical content reuses the file)
+- ``releases/<release_id>``: symlink to the snapshot published for a release
+- ``current``: symlink to the active snapshot, replaced atomically
+
+Publish points ``current`` at the release's snapshot (compiling it if the
+release was imported since it was last published), unpublish removes the
+pointer (the hot paths
+then fall back to the database), re-publishing an older release is a
+pointer change. Workers re-read the ``current`` link at most once per
+CHECK_INTERVAL_SECONDS.
+
+File format: ``MAGIC`` | header length (u32 LE) | JSON header | question
+records (JSON, one per question). The header holds the topics and a
+question index ``{question_id: [offset, length, topic_id, difficulty,
+is_active]}``; records are decoded lazily from the mapping.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import mmap
+import os
+import struct
+import threading
+import time
+import uuid
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from functools import lru_cache
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from .config import get_content_snapshot_dir
+from .fs_utils import exclusive_lock
+from .models import QuizQuestion, QuizTopic
+
+logger = logging.getLogger(__name__)
+
+MAGIC = b"HQSNAP01"
+FORMAT_VERSION = 1
+CURRENT_LINK = "current"
+RELEASES_DIRNAME = "releases"
+CHECK_INTERVAL_SECONDS = 1.0
+QUESTION_CACHE_SIZE = 2048
+KEEP_UNREFERENCED = 3
+
+_HEADER_LEN = struct.Struct("<I")
+
+_TOPIC_FIELDS = (
+    "id", "title_key", "description_key", "authors", "based_on",
+    "release_id", "is_active", "order_index",
+)
+_QUESTION_FIELDS = (
+    "id", "topic_id", "difficulty", "type", "prompt_key", "explanation_key",
+    "answers", "media", "sources", "meta", "release_id", "is_active",
+)
+
+
+class SnapshotError(Exception):
+    """Raised for unreadable/corrupt snapshot files."""
+
+
+@dataclass(frozen=True)
+class TopicRecord:
+    """Read-only topic (attribute-compatible with QuizTopic for the game routes)."""
+    id: str
+    title_key: str
+    description_key: Optional[str]
+    authors: Optional[List[str]]
+    based_on: Optional[dict]
+    release_id: Optional[str]
+    is_active: bool
+    order_index: int
+
+
+@dataclass(frozen=True)
+class QuestionRecord:
+    """Read-only question (attribute-compatible with QuizQuestion)."""
+    id: str
+    topic_id: str
+    difficulty: int
+    type: str
+    prompt_key: str
+    explanation_key: str
+    answers: Any
+    media: Any
+    sources: Any
+    meta: Any
+    release_id: Optional[str]
+    is_active: bool
+
+
+@dataclass
+class SnapshotInfo:
+    """Result of compiling/activating a snapshot."""
+    path: Path
+    content_hash: str
+    release_id: Optional[str]
+    topics: int = 0
+    questions: int = 0
+    reused: bool = False
+    errors: List[str] = field(default_factory=list)
+
+
+# ============================================================================
+# Reader
+# ============================================================================
+
+class ContentSnapshot:
+    """Memory-mapped view of one snapshot file."""
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        with open(self.path, "rb") as f:
+            try:
+                self._mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            except ValueError as e:  # empty file
+                raise SnapshotError(f"Empty snapshot: {self.path}") from e
+        if self._mm[: len(MAGIC)] != MAGIC:
+            raise SnapshotError(f"Not a content snapshot: {self.path}")
+        (header_len,) = _HEADER_LEN.unpack_from(self._mm, len(MAGIC))
+        header_start = len(MAGIC) + _HEADER_LEN.size
+        try:
+            header = json.loads(self._mm[header_start: header_start + header_len])
+        except ValueError as e:
+            raise SnapshotError(f"Corrupt snapshot header: {self.path}") from e
+        if header.get("format") != FORMAT_VERSION:
+            raise SnapshotError(f"Unsupported snapshot format {header.get('format')}: {self.path}")
+
+        self._data_start = header_start + header_len
+        self.release_id: Optional[str] = header.get("release_id")
+        self.content_hash: str = header.get("content_hash", "")
+        self.compiled_at: Optional[str] = header.get("compiled_at")
+        self.source_imported_at: Optional[str] = header.get("source_imported_at")
+        self._topics = [TopicRecord(**t) for t in header["topics"]]
+        self._topics_by_id = {t.id: t for t in self._topics}
+        self._index: Dict[str, List[Any]] = header["questions"]
+        self._topic_questions: Dict[str, List[str]] = {}
+        for question_id, (_off, _len, topic_id, _difficulty, _active) in self._index.items():
+            self._topic_questions.setdefault(topic_id, []).append(question_id)
+        self._decode = lru_cache(maxsize=QUESTION_CACHE_SIZE)(self._decode_question)
+
+    def _decode_question(self, question_id: str) -> Optional[QuestionRecord]:
+        entry = self._index.get(question_id)
+        if entry is None:
+            return None
+        start = self._data_start + entry[0]
+        return QuestionRecord(**json.loads(self._mm[start: start + entry[1]]))
+
+    def topics(self) -> List[TopicRecord]:
+        """All topics (active and inactive) ordered by order_index."""
+        return list(self._topics)
+
+    def active_topics(self) -> List[TopicRecord]:
+        return [t for t in self._topics if t.is_active]
+
+    def get_topic(self, topic_id: str) -> Optional[TopicRecord]:
+        return self._topics_by_id.get(topic_id)
+
+    def get_question(self, question_id: str) -> Optional[QuestionRecord]:
+        return self._decode(question_id)
+
+    def topic_questions(self, topic_id: str, active_only: bool = True) -> List[QuestionRecord]:
+        """Questions of a topic (decoded from the mapping, cached per worker)."""
+        ids = self._topic_questions.get(topic_id, [])
+        if active_only:
+            ids = [qid for qid in ids if self._index[qid][4]]
+        return [self._decode(qid) for qid in ids]
+
+    def question_ids(self) -> List[str]:
+        return list(self._index)
+
+    @property
+    def question_count(self) -> int:
+        return len(self._index)
+
+    def close(self) -> None:
+        self._decode.cache_clear()
+        self._mm.close()
+
+
+class _ActiveSnapshot:
+    """Per-process holder for the snapshot ``current`` points at."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._snapshot: Optional[ContentSnapshot] = None
+        self._key: Optional[Tuple[str, str]] = None  # (snapshot_dir, link target)
+        self._checked_at = 0.0
+        self._checked_dir: Optional[str] = None
+
+    def get(self, snapshot_dir: Path) -> Optional[ContentSnapshot]:
+        now = time.monotonic()
+        dir_key = str(snapshot_dir)
+        if dir_key == self._checked_dir and now - self._checked_at < CHECK_INTERVAL_SECONDS:
+            return self._snapshot
+        with self._lock:
+            try:
+                target = os.readlink(Path(snapshot_dir) / CURRENT_LINK)
+            except OSError:
+                target = None
+            key = (dir_key, target) if target else None
+            if key != self._key:
+                snapshot = None
+                if target:
+                    try:
+                        snapshot = ContentSnapshot(Path(snapshot_dir) / target)
+                    except (OSError, SnapshotError) as e:
+                        logger.error(f"Cannot load content snapshot {target}: {e}")
+                        key = None
+                # Older mappings are released once no request holds them
+                self._snapshot = snapshot
+                self._key = key
+                if snapshot is not None:
+                    logger.info(
+                        f"Content snapshot loaded: {snapshot.path.name} "
+                        f"(release {snapshot.release_id}, {snapshot.question_count} questions)"
+                    )
+            self._checked_dir = dir_key
+            self._checked_at = now
+            return self._snapshot
+
+    def reset(self) -> None:
+        with self._lock:
+            self._snapshot = None
+            self._key = None
+            self._checked_dir = None
+            self._checked_at = 0.0
+
+
+_active = _ActiveSnapshot()
+
+
+def get_active_snapshot() -> Optional[ContentSnapshot]:
+    """Return the active snapshot, or None (snapshots disabled / nothing published)."""
+    snapshot_dir = get_content_snapshot_dir()
+    if snapshot_dir is None:
+        return None
+    return _active.get(snapshot_dir)
+
+
+def reset_active_snapshot() -> None:
+    """Forget the cached mapping (next access re-reads ``current``)."""
+    _active.reset()
+
+
+# ============================================================================
+# Writer
+# ============================================================================
+
+def _topic_dict(topic: Any) -> Dict[str, Any]:
+    data = {name: getattr(topic, name) for name in _TOPIC_FIELDS}
+    data["authors"] = list(data["authors"] or [])
+    data["is_active"] = bool(data["is_active"])
+    data["order_index"] = int(data["order_index"] or 0)
+    return data
+
+
+def _question_dict(question: Any) -> Dict[str, Any]:
+    data = {name: getattr(question, name) for name in _QUESTION_FIELDS}
+    data["is_active"] = bool(data["is_active"])
+    return data
+
+
+def _write_snapshot(
+    snapshot_dir: Path,
+    topics: List[Dict[str, Any]],
+    questions: List[Dict[str, Any]],
+    release_id: Optional[str],
+    source_imported_at: Optional[str],
+) -> SnapshotInfo:
+    """Serialize content into a content-addressed snapshot file."""
+    topics = sorted(topics, key=lambda t: (t["order_index"], t["id"]))
+    questions = sorted(questions, key=lambda q: q["id"])
+
+    digest = hashlib.sha256()
+    digest.update(json.dumps(topics, sort_keys=True, separators=(",", ":")).encode("utf-8"))
+    records: List[bytes] = []
+    index: Dict[str, List[Any]] = {}
+    offset = 0
+    for question in questions:
+        blob = json.dumps(question, sort_keys=True, separators=(",", ":")).encode("utf-8")
+        digest.update(blob)
+        records.append(blob)
+        index[question["id"]] = [
+            offset, len(blob), question["topic_id"], question["difficulty"], question["is_active"],
+        ]
+        offset += len(blob)
+    content_hash = digest.hexdigest()
+
+    snapshot_dir.mkdir(parents=True, exist_ok=True)
+    path = snapshot_dir / f"{content_hash[:32]}.snap"
+    info = SnapshotInfo(
+        path=path,
+        content_hash=content_hash,
+        release_id=release_id,
+        topics=len(topics),
+        questions=len(questions),
+    )
+    if path.exists():
+        info.reused = True
+        return info
+
+    header = json.dumps({
+        "format": FORMAT_VERSION,
+        "release_id": release_id,
+        "content_hash": content_hash,
+        "compiled_at": datetime.now(timezone.utc).isoformat(),
+        "source_imported_at": source_imported_at,
+        "topics": topics,
+        "questions": index,
+    }, separators=(",", ":")).encode("utf-8")
+
+    tmp_path = snapshot_dir / f".{path.name}.{uuid.uuid4().hex}.tmp"
+    try:
+        with open(tmp_path, "wb") as f:
+            f.write(MAGIC)
+            f.write(_HEADER_LEN.pack(len(header)))
+            f.write(header)
+            for blob in records:
+                f.write(blob)
+            f.flush()
+            os.fsync(f.fileno())
+        os.chmod(tmp_path, 0o444)
+        os.replace(tmp_path, path)
+    finally:
+        tmp_path.unlink(missing_ok=True)
+    return info
+
+
+def compile_snapshot(
+    session: Session,
+    snapshot_dir: Path,
+    release_id: Optional[str] = None,
+    source_imported_at: Optional[str] = None,
+) -> SnapshotInfo:
+    """Compile the current database content (all topics and questions).
+
+    Inactive topics/questions are included with their flag so in-flight runs
+    and admin lookups keep working; the game paths filter on is_active.
+    """
+    topics = [_topic_dict(t) for t in session.execute(select(QuizTopic)).scalars()]
+    questions = [_question_dict(q) for q in session.execute(select(QuizQuestion)).scalars()]
+    info = _write_snapshot(Path(snapshot_dir), topics, questions, release_id, source_imported_at)
+    logger.info(
+        f"[OK] Content snapshot {info.path.name}: {info.topics} topics, {info.questions} questions"
+        f"{' (unchanged, reused)' if info.reused else ''}"
+    )
+    return info
+
+
+def _replace_symlink(link: Path, target: str) -> None:
+    """Point ``link`` at ``target`` atomically (symlink to temp name + rename)."""
+    tmp_link = link.with_name(f".{link.name}.{uuid.uuid4().hex}")
+    os.symlink(target, tmp_link)
+    try:
+        os.replace(tmp_link, link)
+    except OSError:
+        tmp_link.unlink(missing_ok=True)
+        raise
+
+
+def _snapshot_lock(snapshot_dir: Path):
+    snapshot_dir.mkdir(parents=True, exist_ok=True)
+    return exclusive_lock(snapshot_dir / ".lock")
+
+
+def activate_snapshot(snapshot_dir: Path, snapshot_path: Path, release_id: Optional[str] = None) -> None:
+    """Make a snapshot current (and record it for the release)."""
+    snapshot_dir = Path(snapshot_dir)
+    with _snapshot_lock(snapshot_dir):
+        _activate(snapshot_dir, snapshot_path, release_id)
+
+
+def _activate(snapshot_dir: Path, snapshot_path: Path, release_id: Optional[str]) -> None:
+    if release_id:
+        releases_dir = snapshot_dir / RELEASES_DIRNAME
+        releases_dir.mkdir(parents=True, exist_ok=True)
+        _replace_symlink(releases_dir / release_id, f"../{snapshot_path.name}")
+    _replace_symlink(snapshot_dir / CURRENT_LINK, snapshot_path.name)
+    logger.info(f"[OK] Active content snapshot -> {snapshot_path.name} (release {release_id})")
+    prune_snapshots(snapshot_dir)
+
+
+def deactivate_snapshot(snapshot_dir: Path, release_id: Optional[str] = None) -> bool:
+    """Remove the ``current`` pointer (only if it belongs to ``release_id``, when given).
+
+    Returns:
+        True if the pointer was removed
+    """
+    snapshot_dir = Path(snapshot_dir)
+    link = snapshot_dir / CURRENT_LINK
+    if not link.is_symlink():
+        return False
+    with _snapshot_lock(snapshot_dir):
+        if release_id is not None:
+            try:
+                current = ContentSnapshot(link)
+                current_release = current.release_id
+                current.close()
+                if current_release != release_id:
+                    return False
+            except (OSError, SnapshotError):
+                pass
+        link.unlink(missing_ok=True)
+    logger.info(f"[OK] Content snapshot deactivated (release {release_id})")
+    return True
+
+
+def release_snapshot(snapshot_dir: Path, release_id: str) -> Optional[ContentSnapshot]:
+    """Snapshot previously published for a release (None if missing/unreadable)."""
+    link = Path(snapshot_dir) / RELEASES_DIRNAME / release_id
+    if not link.exists():
+        return None
+    try:
+        return ContentSnapshot(link.resolve())
+    except (OSError, SnapshotError) as e:
+        logger.warning(f"Ignoring snapshot of release {release_id}: {e}")
+        return None
+
+
+def prepare_release_snapshot(
+    session: Session,
+    snapshot_dir: Path,
+    release_id: str,
+    imported_at: Optional[datetime],
+) -> SnapshotInfo:
+    """Return the snapshot to publish for a release, compiling it if needed.
+
+    Re-publishing a release whose snapshot still matches its last import
+    reuses that file, so rollback is a pointer change; otherwise the
+    database content is compiled. Call activate_snapshot() once the
+    release status is committed.
+    """
+    snapshot_dir = Path(snapshot_dir)
+    imported_iso = imported_at.isoformat() if imported_at else None
+    existing = release_snapshot(snapshot_dir, release_id)
+    if existing is not None:
+        try:
+            if existing.source_imported_at == imported_iso:
+                logger.info(f"Reusing content snapshot {existing.path.name} of release {release_id}")
+                return SnapshotInfo(
+                    path=existing.path,
+                    content_hash=existing.content_hash,
+                    release_id=release_id,
+                    topics=len(existing.topics()),
+                    questions=existing.question_count,
+                    reused=True,
+                )
+        finally:
+            existing.close()
+    return compile_snapshot(session, snapshot_dir, release_id, imported_iso)
+
+
+def apply_topic_updates(snapshot_dir: Path, updates: Dict[str, Dict[str, Any]]) -> Optional[SnapshotInfo]:
+    """Apply dashboard unit edits (is_active, order_index) to the active snapshot.
+
+    Derives a new snapshot from the active one (question records are copied
+    as-is) so visibility toggles take effect without re-publishing and
+    without pulling unpublished drafts from the database.
+
+    Returns:
+        SnapshotInfo of the new snapshot, or None if no snapshot is active
+    """
+    snapshot_dir = Path(snapshot_dir)
+    link = snapshot_dir / CURRENT_LINK
+    if not link.is_symlink():
+        return None
+    with _snapshot_lock(snapshot_dir):
+        current = ContentSnapshot(link.resolve())
+        try:
+            topics = []
+            for topic in current.topics():
+                data = dict(vars(topic))
+                for key in ("is_active", "order_index"):
+                    if key in updates.get(topic.id, {}):
+                        data[key] = updates[topic.id][key]
+                topics.append(data)
+            questions = [vars(current.get_question(qid)) for qid in current.question_ids()]
+            info = _write_snapshot(
+                snapshot_dir, topics, questions, current.release_id, current.source_imported_at,
+            )
+        finally:
+            current.close()
+        _activate(snapshot_dir, info.path, info.release_id)
+    return info
+
+
+def prune_snapshots(snapshot_dir: Path, keep_unreferenced: int = KEEP_UNREFERENCED) -> int:
+    """Delete snapshot files no release/current link points at (keeps the newest few).
+
+    Workers that still map a deleted file keep reading it until they switch.
+
+    Returns:
+        Number of files deleted
+    """
+    snapshot_dir = Path(snapshot_dir)
+    links = [snapshot_dir / CURRENT_LINK]
+    releases_dir = snapshot_dir / RELEASES_DIRNAME
+    if releases_dir.is_dir():
+        links.extend(releases_dir.iterdir())
+    referenced = {link.resolve().name for link in links if link.is_symlink() and link.exists()}
+
+    unreferenced = sorted(
+        (p for p in snapshot_dir.glob("*.snap") if p.name not in referenced),
+        key=lambda p: p.stat().st_mtime,
+        reverse=True,
+    )
+    deleted = 0
+    for path in unreferenced[keep_unreferenced:]:
+        path.unlink(missing_ok=True)
+        deleted += 1
+    return deleted
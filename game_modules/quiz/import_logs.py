@@ -0,0 +1,274 @@
+"""Import log index, bounded tail reader and rotation.
+
+Log files are written by QuizImportService to ``data/import_logs`` as
+``<timestamp>_<command>_<release_id>_<request_id>.log``. Finding the latest
+log of a release used to glob and stat the whole (never rotated) directory.
+
+Design:
+- ``index/<release_id>.json`` lists a release's log files (oldest first);
+  it is appended when a log is created and rewritten by rotation
+- Releases without an index (logs from before the index existed) are
+  globbed once and the index is written
+- ``tail_lines`` reads backwards in blocks from the end of the file, so
+  memory is bounded by ``max_bytes`` regardless of log size
+- ``rotate_import_logs`` gzips logs older than N days and deletes logs
+  older than M days (run from cron via ``manage.py rotate-import-logs``)
+"""
+
+from __future__ import annotations
+
+import gzip
+import json
+import logging
+import os
+import re
+import shutil
+import time
+from collections import deque
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+from .fs_utils import atomic_write_text, exclusive_lock
+
+logger = logging.getLogger(__name__)
+
+INDEX_DIRNAME = "index"
+TAIL_BLOCK_SIZE = 64 * 1024
+DEFAULT_TAIL_LINES = 200
+DEFAULT_TAIL_MAX_BYTES = 1024 * 1024
+DEFAULT_COMPRESS_AFTER_DAYS = 7
+DEFAULT_DELETE_AFTER_DAYS = 180
+
+
+def safe_request_id(request_id: str) -> str:
+    """Filesystem-safe request id (same normalization as QuizImportService)."""
+    return re.sub(r"[^a-zA-Z0-9._-]+", "-", request_id).strip("-")
+
+
+def _index_dir(logs_dir: Path) -> Path:
+    return Path(logs_dir) / INDEX_DIRNAME
+
+
+def _index_path(logs_dir: Path, release_id: str) -> Path:
+    return _index_dir(logs_dir) / f"{release_id}.json"
+
+
+def _ensure_index_dir(logs_dir: Path) -> Path:
+    index_dir = _index_dir(logs_dir)
+    index_dir.mkdir(parents=True, exist_ok=True)
+    return index_dir
+
+
+def _load_index(logs_dir: Path, release_id: str) -> Optional[List[Dict[str, Any]]]:
+    try:
+        data = json.loads(_index_path(logs_dir, release_id).read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return None
+    entries = data.get("logs") if isinstance(data, dict) else None
+    return entries if isinstance(entries, list) else None
+
+
+def _write_index(logs_dir: Path, release_id: str, entries: List[Dict[str, Any]]) -> None:
+    _ensure_index_dir(logs_dir)
+    atomic_write_text(
+        _index_path(logs_dir, release_id),
+        json.dumps({"release_id": release_id, "logs": entries}, indent=2),
+    )
+
+
+def _scan_release_logs(logs_dir: Path, release_id: str) -> List[Dict[str, Any]]:
+    """Glob a release's logs (one-time fallback for releases without an index)."""
+    logs_dir = Path(logs_dir)
+    files = [
+        *logs_dir.glob(f"*_{release_id}_*.log"),
+        *logs_dir.glob(f"*_{release_id}_*.log.gz"),
+        *logs_dir.glob(f"*_{release_id}.log"),  # legacy naming (no request_id suffix)
+        *logs_dir.glob(f"*_{release_id}.log.gz"),
+    ]
+    entries = []
+    for path in sorted(set(files), key=lambda p: p.stat().st_mtime):
+        entries.append({
+            "filename": path.name,
+            "command": None,
+            "request_id": None,
+            "created_at": datetime.fromtimestamp(path.stat().st_mtime, timezone.utc).isoformat(),
+        })
+    return entries
+
+
+def register_log(
+    logs_dir: Path,
+    release_id: str,
+    filename: str,
+    command: str,
+    request_id: str,
+) -> None:
+    """Append a newly created log file to the release's index."""
+    logs_dir = Path(logs_dir)
+    with exclusive_lock(_ensure_index_dir(logs_dir) / ".lock"):
+        entries = _load_index(logs_dir, release_id)
+        if entries is None:
+            entries = [e for e in _scan_release_logs(logs_dir, release_id) if e["filename"] != filename]
+        entries.append({
+            "filename": filename,
+            "command": command,
+            "request_id": request_id,
+            "created_at": datetime.now(timezone.utc).isoformat(),
+        })
+        _write_index(logs_dir, release_id, entries)
+
+
+def find_latest_log(
+    logs_dir: Path,
+    release_id: str,
+    request_id: Optional[str] = None,
+) -> Optional[Path]:
+    """Latest log file of a release (optionally of one request), via the index."""
+    logs_dir = Path(logs_dir)
+    entries = _load_index(logs_dir, release_id)
+    if entries is None:
+        entries = _scan_release_logs(logs_dir, release_id)
+        if entries:
+            with exclusive_lock(_ensure_index_dir(logs_dir) / ".lock"):
+                if _load_index(logs_dir, release_id) is None:
+                    _write_index(logs_dir, release_id, entries)
+
+    wanted = safe_request_id(request_id) if request_id else None
+    for entry in reversed(entries):
+        filename = entry.get("filename") or ""
+        if wanted and entry.get("request_id") != wanted and f"_{wanted}" not in filename:
+            continue
+        path = logs_dir / filename
+        if path.exists():
+            return path
+    return None
+
+
+def tail_lines(
+    path: Path,
+    max_lines: int = DEFAULT_TAIL_LINES,
+    max_bytes: int = DEFAULT_TAIL_MAX_BYTES,
+) -> Tuple[str, int]:
+    """Return the last ``max_lines`` lines of a log and the file's end offset.
+
+    Plain files are read backwards in TAIL_BLOCK_SIZE blocks, never more
+    than ``max_bytes``. Gzipped (rotated) logs are streamed through a
+    bounded deque.
+
+    Returns:
+        (text, end_offset) - end_offset is the byte size for plain files
+        (start point for following), 0 for compressed files
+    """
+    path = Path(path)
+    if path.suffix == ".gz":
+        with gzip.open(path, "rt", encoding="utf-8", errors="replace") as f:
+            return "".join(deque(f, maxlen=max_lines)), 0
+
+    with open(path, "rb") as f:
+        f.seek(0, os.SEEK_END)
+        end = f.tell()
+        position = end
+        chunks: List[bytes] = []
+        newlines = 0
+        read = 0
+        # One extra newline: the file usually ends with "\n"
+        while position > 0 and newlines <= max_lines and read < max_bytes:
+            size = min(TAIL_BLOCK_SIZE, position, max_bytes - read)
+            position -= size
+            f.seek(position)
+            chunk = f.read(size)
+            chunks.append(chunk)
+            newlines += chunk.count(b"\n")
+            read += size
+
+    data = b"".join(reversed(chunks))
+    lines = data.splitlines(keepends=True)
+    if position > 0 and lines:
+        lines = lines[1:]  # first line is partial
+    return b"".join(lines[-max_lines:]).decode("utf-8", errors="replace"), end
+
+
+def read_from(path: Path, offset: int, max_bytes: int = DEFAULT_TAIL_MAX_BYTES) -> Tuple[str, int]:
+    """Read complete lines appended after ``offset``.
+
+    Returns:
+        (text, new_offset) - a trailing partial line is left for the next call
+    """
+    with open(path, "rb") as f:
+        f.seek(0, os.SEEK_END)
+        end = f.tell()
+        if offset > end:  # truncated/replaced
+            offset = 0
+        f.seek(offset)
+        data = f.read(min(end - offset, max_bytes))
+    cut = data.rfind(b"\n") + 1
+    return data[:cut].decode("utf-8", errors="replace"), offset + cut
+
+
+@dataclass
+class LogRotationResult:
+    compressed: int = 0
+    deleted: int = 0
+    bytes_freed: int = 0
+
+
+def rotate_import_logs(
+    logs_dir: Path,
+    compress_after_days: int = DEFAULT_COMPRESS_AFTER_DAYS,
+    delete_after_days: int = DEFAULT_DELETE_AFTER_DAYS,
+    now: Optional[float] = None,
+) -> LogRotationResult:
+    """Gzip old logs, delete very old ones and update the per-release indexes."""
+    logs_dir = Path(logs_dir)
+    now = now or time.time()
+    compress_cutoff = now - compress_after_days * 86400
+    delete_cutoff = now - delete_after_days * 86400
+    result = LogRotationResult()
+    renamed: Dict[str, Optional[str]] = {}  # old filename -> new filename (None = deleted)
+
+    for entry in os.scandir(logs_dir):
+        if not entry.is_file() or not (entry.name.endswith(".log") or entry.name.endswith(".log.gz")):
+            continue
+        st = entry.stat()
+        path = Path(entry.path)
+        if st.st_mtime < delete_cutoff:
+            path.unlink(missing_ok=True)
+            renamed[entry.name] = None
+            result.deleted += 1
+            result.bytes_freed += st.st_size
+        elif entry.name.endswith(".log") and st.st_mtime < compress_cutoff:
+            gz_path = path.with_name(entry.name + ".gz")
+            with open(path, "rb") as src, gzip.open(gz_path, "wb") as dst:
+                shutil.copyfileobj(src, dst)
+            os.utime(gz_path, (st.st_atime, st.st_mtime))
+            path.unlink()
+            renamed[entry.name] = gz_path.name
+            result.compressed += 1
+            result.bytes_freed += st.st_size - gz_path.stat().st_size
+
+    index_dir = _index_dir(logs_dir)
+    if renamed and index_dir.is_dir():
+        with exclusive_lock(index_dir / ".lock"):
+            for index_file in index_dir.glob("*.json"):
+                release_id = index_file.stem
+                entries = _load_index(logs_dir, release_id)
+                if entries is None:
+                    continue
+                updated = []
+                for log_entry in entries:
+                    filename = log_entry.get("filename")
+                    if filename in renamed:
+                        if renamed[filename] is None:
+                            continue
+                        log_entry = dict(log_entry, filename=renamed[filename])
+                    updated.append(log_entry)
+                if updated != entries:
+                    _write_index(logs_dir, release_id, updated)
+
+    logger.info(
+        f"Import log rotation: {result.compressed} compressed, {result.deleted} deleted, "
+        f"{result.bytes_freed} bytes freed"
+    )
+    return result
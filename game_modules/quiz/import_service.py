@@ -19,19 +19,44 @@ from __future__ import annotations
 import hashlib
 import json
 import logging
+import os
 import re
 import uuid
-from dataclasses import dataclass, field
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from dataclasses import asdict, dataclass, field
 from datetime import datetime, timezone
 from pathlib import Path
-from typing import List, Dict, Any, Optional
+from typing import Any, Callable, Dict, Iterator, List, Optional, Sequence, Tuple, TypeVar
 
+from sqlalchemy import select, update
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 from sqlalchemy.orm import Session
 
+from .config import (
+    get_media_transcode_enabled,
+    get_content_snapshot_dir,
+    get_import_pool_kind,
+    get_import_workers,
+)
+from .content_snapshot import activate_snapshot, deactivate_snapshot, prepare_release_snapshot
+from .fs_utils import atomic_write_text
+from .import_logs import register_log
+from .media_delivery import store_media_url
+from .media_store import add_file_to_store, get_media_store_root
+from .media_transcode import (
+    ProcessedMedia,
+    TranscodeJob,
+    ffmpeg_available,
+    is_usable,
+    load_cached_media,
+    media_fields,
+    transcode_media,
+)
 from .models import QuizTopic, QuizQuestion
 from .release_model import QuizContentRelease
-from .validation import validate_quiz_unit, ValidationError, QuizUnitSchema
-from src.app.config.runtime_paths import get_data_dir, get_runtime_root
+from .validation import ValidationError, QuizUnitSchema
+from .validation_cache import validate_unit_cached
+from src.app.config.runtime_paths import get_data_dir, get_media_dir, get_runtime_root
 
 
 def to_jsonable(obj: Any) -> Any:
@@ -77,6 +102,191 @@ def to_jsonable(obj: Any) -> Any:
 # Configure module logger
 logger = logging.getLogger(__name__)
 
+# Rows per INSERT ... ON CONFLICT statement (bounds statement size and memory)
+UPSERT_CHUNK_SIZE = 500
+
+# Columns overwritten when an existing row is re-imported.
+# Topics: is_active/order_index are admin decisions and are never touched.
+TOPIC_UPSERT_COLUMNS = (
+    "title_key",
+    "description_key",
+    "authors",
+    "based_on",
+    "release_id",
+    "content_hash",
+)
+QUESTION_UPSERT_COLUMNS = (
+    "topic_id",
+    "difficulty",
+    "type",
+    "prompt_key",
+    "explanation_key",
+    "answers",
+    "media",
+    "sources",
+    "meta",
+    "is_active",
+    "release_id",
+)
+
+# Question columns compared by the release diff (release_id is bookkeeping only)
+QUESTION_DIFF_COLUMNS = tuple(c for c in QUESTION_UPSERT_COLUMNS if c != "release_id")
+
+# Bump when _build_topic_row/_build_question_row change, so every unit is
+# treated as changed on the next import even if its JSON did not change.
+UNIT_FINGERPRINT_VERSION = 1
+
+# Emit a progress line at most every N items (and always at the end)
+PROGRESS_MIN_STEP = 10
+
+# Overall progress range (percent) per import phase, for progress callbacks
+IMPORT_PROGRESS_PHASES: Dict[str, Tuple[int, int]] = {
+    "validate": (0, 25),
+    "audio": (25, 40),
+    "transcode": (40, 55),
+    "diff": (55, 60),
+    "write": (60, 95),
+    "commit": (95, 100),
+}
+
+# progress(phase, percent, message); may raise ImportCancelled to abort
+ProgressCallback = Callable[[str, int, str], None]
+
+# Audio checksum manifest (filename -> size, mtime_ns, sha256).
+# Stored in QuizContentRelease.checksum_manifest and as a sidecar file in the
+# release directory (parent of audio/). Entries whose size and mtime_ns still
+# match are reused instead of rehashing the file.
+CHECKSUM_MANIFEST_FILENAME = "checksum_manifest.json"
+CHECKSUM_MANIFEST_VERSION = 1
+# How many other releases' manifests are consulted for reusable hashes
+CHECKSUM_CACHE_RELEASES = 5
+
+_T = TypeVar("_T")
+_R = TypeVar("_R")
+
+
+def _sha256_file(path: Path) -> str:
+    """Return hex SHA256 of a file (module-level so process pools can pickle it)."""
+    with open(path, 'rb') as f:
+        return hashlib.file_digest(f, "sha256").hexdigest()
+
+
+class ImportCancelled(Exception):
+    """Raised by a progress callback to abort a running import/publish."""
+
+
+def fingerprint_unit_data(data: Any) -> str:
+    """Fingerprint a unit's parsed JSON (SHA256 of canonical JSON).
+
+    Key order and whitespace do not affect the fingerprint; any content
+    change does.
+    """
+    canonical = json.dumps(data, sort_keys=True, separators=(",", ":"), ensure_ascii=False)
+    payload = f"v{UNIT_FINGERPRINT_VERSION}:{canonical}".encode("utf-8")
+    return hashlib.sha256(payload).hexdigest()
+
+
+def unit_content_hash(fingerprint: str, media_hashes: Sequence[str]) -> str:
+    """Hash stored in ``quiz_topics.content_hash``: unit JSON plus its media.
+
+    Question rows embed media fields derived from the media files (store
+    URL, duration, variants, image derivatives), so replacing a file or
+    adding variants must mark the unit as changed even if its JSON did not
+    change. ``media_hashes`` holds one key per referenced media file
+    (``_media_key``). Units without media files keep the plain fingerprint.
+    """
+    if not media_hashes:
+        return fingerprint
+    payload = f"{fingerprint}:{','.join(sorted(set(media_hashes)))}".encode("utf-8")
+    return hashlib.sha256(payload).hexdigest()
+
+
+def _media_key(fields: Dict[str, Any]) -> str:
+    """Hash of the media JSON fields of one media file (for unit_content_hash)."""
+    return hashlib.sha256(json.dumps(fields, sort_keys=True).encode("utf-8")).hexdigest()
+
+
+def _load_and_validate_unit(
+    json_path: Path,
+    use_cache: bool = True,
+) -> Tuple[Optional[QuizUnitSchema], Optional[int], Optional[str], Optional[str], bool]:
+    """Load, fingerprint and validate one unit file inside a pool worker.
+
+    Validation errors are returned as text instead of raised, so results can
+    be collected in submission order without pickling exception objects.
+    Units already validated in this process (on upload or by an earlier
+    import) are served from the validation cache.
+
+    Returns:
+        (unit, file_size, error, fingerprint, cached) - exactly one of
+        unit/error is set
+    """
+    file_size = None
+    try:
+        file_size = json_path.stat().st_size
+    except OSError:
+        pass
+    try:
+        with open(json_path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+        fingerprint = fingerprint_unit_data(data)
+        validated = validate_unit_cached(data, fingerprint, json_path.stem, use_cache)
+        return validated.unit, file_size, None, fingerprint, validated.cached
+    except (ValidationError, json.JSONDecodeError) as e:
+        return None, file_size, str(e), None, False
+
+
+def _correct_answer_id(answers: Any) -> Optional[str]:
+    """Return the id of the correct answer in an answers JSON list."""
+    for answer in answers or []:
+        if isinstance(answer, dict) and answer.get("correct"):
+            return answer.get("id")
+    return None
+
+
+@dataclass
+class ReleaseDiff:
+    """Difference between a release's units and the current DB content.
+
+    ``questions_removed`` lists questions that are in the DB for a changed
+    unit but no longer in its JSON. Import does not delete them.
+    """
+    units_added: List[str] = field(default_factory=list)
+    units_changed: List[str] = field(default_factory=list)
+    units_unchanged: List[str] = field(default_factory=list)
+    questions_added: List[str] = field(default_factory=list)
+    questions_changed: List[str] = field(default_factory=list)
+    questions_removed: List[str] = field(default_factory=list)
+    answer_keys_changed: List[Dict[str, Any]] = field(default_factory=list)
+
+    @property
+    def has_changes(self) -> bool:
+        return bool(
+            self.units_added or self.units_changed or self.questions_added
+            or self.questions_changed or self.questions_removed
+        )
+
+    def summary(self) -> str:
+        return (
+            f"units +{len(self.units_added)} ~{len(self.units_changed)} "
+            f"={len(self.units_unchanged)}; questions +{len(self.questions_added)} "
+            f"~{len(self.questions_changed)} -{len(self.questions_removed)}; "
+            f"answer keys changed: {len(self.answer_keys_changed)}"
+        )
+
+    def to_dict(self) -> Dict[str, Any]:
+        data = asdict(self)
+        data["summary"] = {
+            "units_added": len(self.units_added),
+            "units_changed": len(self.units_changed),
+            "units_unchanged": len(self.units_unchanged),
+            "questions_added": len(self.questions_added),
+            "questions_changed": len(self.questions_changed),
+            "questions_removed": len(self.questions_removed),
+            "answer_keys_changed": len(self.answer_keys_changed),
+        }
+        return data
+
 
 @dataclass
 class ImportResult:
@@ -89,8 +299,12 @@ class ImportResult:
     audio_files_processed: int = 0
     errors: List[str] = field(default_factory=list)
     warnings: List[str] = field(default_factory=list)
+    audio_hashes_reused: int = 0
+    units_skipped: int = 0
+    diff: Optional[Dict[str, Any]] = None
     skipped: bool = False
     dry_run: bool = False
+    cancelled: bool = False
 
 
 @dataclass
@@ -99,17 +313,27 @@ class PublishResult:
     success: bool
     release_id: str
     units_affected: int = 0
+    snapshot: Optional[str] = None  # content snapshot file now served (if enabled)
     errors: List[str] = field(default_factory=list)
 
 
 class QuizImportService:
     """Service for importing and managing quiz content releases."""
     
-    def __init__(self, project_root: Optional[Path] = None):
+    def __init__(
+        self,
+        project_root: Optional[Path] = None,
+        workers: Optional[int] = None,
+        pool: Optional[str] = None,
+        transcode: Optional[bool] = None,
+    ):
         """Initialize import service.
-        
+
         Args:
             project_root: Project root directory (auto-detected if not provided)
+            workers: Pool size for validation/hashing/transcoding (default: QUIZ_IMPORT_WORKERS)
+            pool: "thread" or "process" (default: QUIZ_IMPORT_POOL)
+            transcode: Transcode audio / derive resized images (default: QUIZ_MEDIA_TRANSCODE)
         """
         if project_root is None:
             # Auto-detect: service is in game_modules/quiz/, root is 2 levels up
@@ -119,7 +343,11 @@ class QuizImportService:
         self.runtime_root = get_runtime_root(self.project_root)
         self.import_logs_dir = get_data_dir(self.project_root) / "import_logs"
         self.import_logs_dir.mkdir(parents=True, exist_ok=True)
-    
+        self.media_store_root = get_media_store_root(get_media_dir(self.project_root))
+        self.workers = max(1, workers) if workers else get_import_workers()
+        self.pool = pool if pool in ("thread", "process") else get_import_pool_kind()
+        self.transcode = get_media_transcode_enabled() if transcode is None else transcode
+
     def _normalize_request_id(self, request_id: Optional[str]) -> str:
         if not request_id:
             return uuid.uuid4().hex
@@ -155,6 +383,11 @@ class QuizImportService:
         
         logger.addHandler(file_handler)
         logger.info(f"Logging to: {log_path}")
+
+        try:
+            register_log(self.import_logs_dir, release_id, log_filename, command, safe_request_id)
+        except OSError as e:
+            logger.warning(f"Could not update import log index: {e}")
         
         return file_handler
     
@@ -167,31 +400,70 @@ class QuizImportService:
         Returns:
             Hex-encoded SHA256 hash
         """
-        sha256 = hashlib.sha256()
-        with open(audio_path, 'rb') as f:
-            for chunk in iter(lambda: f.read(8192), b''):
-                sha256.update(chunk)
-        return sha256.hexdigest()
-    
-    def _validate_unit_file(self, json_path: Path) -> QuizUnitSchema:
-        """Load and validate a quiz unit JSON file.
-        
+        return _sha256_file(audio_path)
+
+    def _report_progress(
+        self,
+        progress: Optional[ProgressCallback],
+        phase: str,
+        done: int,
+        total: int,
+        message: str = "",
+    ) -> None:
+        """Map ``done/total`` within ``phase`` to an overall percentage and report it."""
+        if progress is None:
+            return
+        start, end = IMPORT_PROGRESS_PHASES[phase]
+        fraction = done / total if total else 1.0
+        progress(phase, start + int((end - start) * fraction), message)
+
+    def _map_ordered(
+        self,
+        fn: Callable[[_T], _R],
+        items: Sequence[_T],
+        label: str,
+    ) -> Iterator[_R]:
+        """Apply ``fn`` to ``items`` on the configured pool, yielding in input order.
+
+        Results come back in submission order regardless of completion order,
+        so callers produce the same log lines and error ordering as a serial
+        loop. Progress is logged every ~10% (at least every PROGRESS_MIN_STEP
+        items).
+
         Args:
-            json_path: Path to JSON file
-            
-        Returns:
-            Validated QuizUnitSchema
-            
-        Raises:
-            ValidationError: If validation fails
-            json.JSONDecodeError: If JSON is malformed
+            fn: Module-level callable (must be picklable for process pools)
+            items: Work items
+            label: Progress label for the log
+
+        Yields:
+            fn(item) for each item, in order
         """
-        with open(json_path, 'r', encoding='utf-8') as f:
-            data = json.load(f)
-        
-        # Use existing validator from validation.py
-        unit = validate_quiz_unit(data, json_path.stem)
-        return unit
+        total = len(items)
+        step = max(PROGRESS_MIN_STEP, total // 10)
+        executor: Optional[Executor] = None
+
+        if self.workers <= 1 or total <= 1:
+            results: Iterator[_R] = map(fn, items)
+        else:
+            max_workers = min(self.workers, total)
+            if self.pool == "process":
+                executor = ProcessPoolExecutor(max_workers=max_workers)
+                chunksize = max(1, total // (max_workers * 4))
+                results = executor.map(fn, items, chunksize=chunksize)
+            else:
+                executor = ThreadPoolExecutor(
+                    max_workers=max_workers, thread_name_prefix="quiz-import"
+                )
+                results = executor.map(fn, items)
+
+        try:
+            for done, item_result in enumerate(results, 1):
+                if done % step == 0 or done == total:
+                    logger.info(f"  {label}: {done}/{total}")
+                yield item_result
+        finally:
+            if executor is not None:
+                executor.shutdown(wait=True, cancel_futures=True)
     
     def _collect_audio_refs(self, unit: QuizUnitSchema) -> List[str]:
         """Collect all audio file references from a unit.
@@ -218,6 +490,397 @@ class QuizImportService:
         
         return audio_refs
     
+    def _collect_image_refs(self, unit: QuizUnitSchema) -> List[str]:
+        """Collect image file references (seed_src) from a unit's questions and answers."""
+        image_refs = []
+        for question in unit.questions:
+            media_items = list(question.media)
+            for answer in question.answers:
+                media_items.extend(answer.media)
+            for media in media_items:
+                if media.type == 'image' and media.seed_src and not media.src:
+                    image_refs.append(media.seed_src)
+        return image_refs
+
+    def _checksum_manifest_path(self, audio_dir: Path) -> Path:
+        """Sidecar manifest location: the release directory (parent of audio/)."""
+        return audio_dir.parent / CHECKSUM_MANIFEST_FILENAME
+
+    def _parse_checksum_manifest(self, raw: Optional[str]) -> Dict[str, Dict[str, Any]]:
+        """Parse manifest JSON into filename -> entry; tolerate missing/invalid data."""
+        if not raw:
+            return {}
+        try:
+            data = json.loads(raw)
+        except (TypeError, ValueError):
+            return {}
+        files = data.get("files") if isinstance(data, dict) else None
+        return self._valid_checksum_entries(files)
+
+    def _valid_checksum_entries(self, files: Any) -> Dict[str, Dict[str, Any]]:
+        """Keep only well-formed filename -> {size, mtime_ns, sha256} entries."""
+        if not isinstance(files, dict):
+            return {}
+        return {
+            name: entry
+            for name, entry in files.items()
+            if isinstance(entry, dict)
+            and isinstance(entry.get("size"), int)
+            and isinstance(entry.get("mtime_ns"), int)
+            and isinstance(entry.get("sha256"), str)
+        }
+
+    def _load_checksum_cache(
+        self,
+        session: Optional[Session],
+        release_id: str,
+        manifest_path: Path,
+    ) -> Dict[str, Dict[str, Any]]:
+        """Collect known audio checksums for reuse.
+
+        Precedence (highest first): sidecar file of this release directory,
+        release manifest written by dashboard uploads, DB manifest of this
+        release, DB manifests of the most recent other releases (covers
+        releases derived by copying/hardlinking audio).
+
+        Returns:
+            filename -> {"size", "mtime_ns", "sha256"}
+        """
+        from .release_manifest import load_release_manifest
+
+        sources: List[Dict[str, Dict[str, Any]]] = []
+
+        try:
+            sources.append(self._parse_checksum_manifest(manifest_path.read_text(encoding="utf-8")))
+        except OSError:
+            pass
+
+        release_manifest = load_release_manifest(manifest_path.parent)
+        if release_manifest is not None:
+            sources.append(self._valid_checksum_entries(release_manifest["media"]))
+
+        if session is not None:
+            rows = (
+                session.query(QuizContentRelease.release_id, QuizContentRelease.checksum_manifest)
+                .filter(QuizContentRelease.checksum_manifest.isnot(None))
+                .order_by(QuizContentRelease.imported_at.desc().nullslast())
+                .limit(CHECKSUM_CACHE_RELEASES + 1)
+                .all()
+            )
+            own = [raw for rid, raw in rows if rid == release_id]
+            others = [raw for rid, raw in rows if rid != release_id][:CHECKSUM_CACHE_RELEASES]
+            for raw in own + others:
+                sources.append(self._parse_checksum_manifest(raw))
+
+        cache: Dict[str, Dict[str, Any]] = {}
+        for source in reversed(sources):
+            cache.update(source)
+        return cache
+
+    def _write_checksum_manifest(self, manifest_path: Path, manifest_json: str) -> None:
+        """Atomically write the sidecar manifest (temp file + rename)."""
+        atomic_write_text(manifest_path, manifest_json)
+
+    def _build_topic_row(
+        self,
+        unit: QuizUnitSchema,
+        release_id: str,
+        now: datetime,
+        content_hash: Optional[str] = None,
+    ) -> Dict[str, Any]:
+        """Build the quiz_topics row for a validated unit."""
+        return {
+            "id": unit.slug,
+            "title_key": unit.title,
+            "description_key": unit.description,
+            "authors": unit.authors or [],
+            "based_on": to_jsonable(unit.based_on),
+            "release_id": release_id,
+            "content_hash": content_hash,
+            "is_active": True,
+            "order_index": 0,
+            "created_at": now,
+        }
+
+    def _media_json(
+        self,
+        media: List[Any],
+        file_media: Optional[Dict[str, Dict[str, Any]]] = None,
+    ) -> List[Dict[str, Any]]:
+        """Media JSON for a row; imported files get their store URL and derived fields."""
+        items = []
+        for m in media:
+            item = {"type": m.type, "src": m.src or m.seed_src}
+            if not m.src and m.seed_src and file_media:
+                item.update(file_media.get(Path(m.seed_src).name, {}))
+            items.append(item)
+        return items
+
+    def _build_question_row(
+        self,
+        topic_id: str,
+        q: Any,
+        release_id: str,
+        now: datetime,
+        file_media: Optional[Dict[str, Dict[str, Any]]] = None,
+    ) -> Dict[str, Any]:
+        """Build the quiz_questions row for a validated unit question.
+
+        Args:
+            file_media: media filename -> media JSON fields (store URL ``src``,
+                ``bytes``; audio ``duration``/``variants``; image
+                ``width``/``height``/``srcset``)
+        """
+        answers_json = []
+        for ans in q.answers:
+            ans_dict = {
+                "id": ans.id,
+                "text": ans.text,  # Plaintext
+                "correct": ans.correct,
+            }
+            # Add media if present
+            if ans.media:
+                ans_dict["media"] = self._media_json(ans.media, file_media)
+            answers_json.append(ans_dict)
+
+        media_json = self._media_json(q.media or [], file_media)
+
+        return {
+            "id": q.id,
+            "topic_id": topic_id,
+            "difficulty": q.difficulty,
+            "type": q.type,
+            "prompt_key": q.prompt,
+            "explanation_key": q.explanation,
+            "answers": answers_json,
+            "media": media_json if media_json else None,
+            "sources": q.sources,
+            "meta": q.meta,
+            "is_active": True,
+            "release_id": release_id,
+            "created_at": now,
+        }
+
+    def _compute_release_diff(
+        self,
+        session: Session,
+        units: List[Tuple[Path, QuizUnitSchema]],
+        fingerprints: Dict[str, str],
+        question_rows: Dict[str, Dict[str, Any]],
+        force: bool = False,
+    ) -> Tuple[ReleaseDiff, set[str], List[str]]:
+        """Diff the release against the DB and decide what needs writing.
+
+        Units whose stored ``content_hash`` equals the new content hash
+        (``unit_content_hash``) are unchanged and their questions are not
+        even loaded. For the other
+        units each question row is compared column by column with the DB.
+
+        Args:
+            session: SQLAlchemy session
+            units: Validated (json_file, unit) pairs
+            fingerprints: unit slug -> content hash (unit JSON + audio)
+            question_rows: question id -> row built by _build_question_row
+            force: Treat every unit/question as needing a write
+
+        Returns:
+            (diff, slugs of topics to write, ids of questions to write)
+        """
+        diff = ReleaseDiff()
+        slugs = [unit.slug for _, unit in units]
+        stored_hashes = dict(
+            session.execute(
+                select(QuizTopic.id, QuizTopic.content_hash).where(QuizTopic.id.in_(slugs))
+            ).all()
+        )
+
+        dirty_slugs: set[str] = set()
+        for _, unit in units:
+            if unit.slug not in stored_hashes:
+                diff.units_added.append(unit.slug)
+                dirty_slugs.add(unit.slug)
+            elif force or stored_hashes[unit.slug] != fingerprints.get(unit.slug):
+                diff.units_changed.append(unit.slug)
+                dirty_slugs.add(unit.slug)
+            else:
+                diff.units_unchanged.append(unit.slug)
+
+        candidate_ids = [
+            qid for qid, row in question_rows.items() if row["topic_id"] in dirty_slugs
+        ]
+        table = QuizQuestion.__table__
+        columns = [table.c.id] + [table.c[name] for name in QUESTION_DIFF_COLUMNS]
+        stored_rows: Dict[str, Any] = {}
+        for offset in range(0, len(candidate_ids), UPSERT_CHUNK_SIZE):
+            chunk = candidate_ids[offset:offset + UPSERT_CHUNK_SIZE]
+            for row in session.execute(select(*columns).where(table.c.id.in_(chunk))).mappings():
+                stored_rows[row["id"]] = row
+
+        if dirty_slugs:
+            stored_ids = session.execute(
+                select(table.c.id).where(table.c.topic_id.in_(dirty_slugs))
+            ).scalars()
+            diff.questions_removed = sorted(qid for qid in stored_ids if qid not in question_rows)
+
+        write_ids: List[str] = []
+        for qid in candidate_ids:
+            new_row = question_rows[qid]
+            old_row = stored_rows.get(qid)
+            if old_row is None:
+                diff.questions_added.append(qid)
+                write_ids.append(qid)
+                continue
+
+            changed = any(old_row[name] != new_row[name] for name in QUESTION_DIFF_COLUMNS)
+            if changed:
+                diff.questions_changed.append(qid)
+                old_key = _correct_answer_id(old_row["answers"])
+                new_key = _correct_answer_id(new_row["answers"])
+                if old_key != new_key:
+                    diff.answer_keys_changed.append(
+                        {"question_id": qid, "old": old_key, "new": new_key}
+                    )
+            if changed or force:
+                write_ids.append(qid)
+
+        return diff, dirty_slugs, write_ids
+
+    def _upsert_rows(
+        self,
+        session: Session,
+        table: Any,
+        rows: List[Dict[str, Any]],
+        update_columns: tuple[str, ...],
+        on_chunk: Optional[Callable[[int], None]] = None,
+    ) -> None:
+        """Write rows with chunked INSERT ... ON CONFLICT (id) DO UPDATE.
+
+        Only ``update_columns`` are overwritten for existing rows; all other
+        columns (e.g. ``is_active`` on topics, ``created_at``) keep their
+        stored values. ``on_chunk(rows_written)`` is called after each chunk.
+        """
+        for offset in range(0, len(rows), UPSERT_CHUNK_SIZE):
+            chunk = rows[offset:offset + UPSERT_CHUNK_SIZE]
+            stmt = pg_insert(table).values(chunk)
+            stmt = stmt.on_conflict_do_update(
+                index_elements=[table.c.id],
+                set_={name: stmt.excluded[name] for name in update_columns},
+            )
+            session.execute(stmt)
+            logger.debug(
+                f"Upserted {len(chunk)} rows into {table.name} "
+                f"({offset + len(chunk)}/{len(rows)})"
+            )
+            if on_chunk is not None:
+                on_chunk(len(chunk))
+
+    def _upsert_topics(
+        self,
+        session: Session,
+        rows: List[Dict[str, Any]],
+        on_chunk: Optional[Callable[[int], None]] = None,
+    ) -> None:
+        """UPSERT topics (admin-controlled is_active/order_index are preserved)."""
+        self._upsert_rows(session, QuizTopic.__table__, rows, TOPIC_UPSERT_COLUMNS, on_chunk)
+
+    def _upsert_questions(
+        self,
+        session: Session,
+        rows: List[Dict[str, Any]],
+        on_chunk: Optional[Callable[[int], None]] = None,
+    ) -> None:
+        """UPSERT questions (re-imported questions are re-activated)."""
+        self._upsert_rows(session, QuizQuestion.__table__, rows, QUESTION_UPSERT_COLUMNS, on_chunk)
+
+    def _stamp_release(
+        self,
+        session: Session,
+        release_id: str,
+        slugs: List[str],
+        question_ids: List[str],
+    ) -> None:
+        """Set ``release_id`` on rows the diff skipped as unchanged.
+
+        Rows that were written already carry it; this only touches rows
+        still pointing at an older release (removed questions keep theirs).
+        """
+        topics = QuizTopic.__table__
+        questions = QuizQuestion.__table__
+        for offset in range(0, len(slugs), UPSERT_CHUNK_SIZE):
+            chunk = slugs[offset:offset + UPSERT_CHUNK_SIZE]
+            session.execute(
+                update(topics)
+                .where(topics.c.id.in_(chunk), topics.c.release_id.is_distinct_from(release_id))
+                .values(release_id=release_id)
+            )
+        for offset in range(0, len(question_ids), UPSERT_CHUNK_SIZE):
+            chunk = question_ids[offset:offset + UPSERT_CHUNK_SIZE]
+            session.execute(
+                update(questions)
+                .where(questions.c.id.in_(chunk), questions.c.release_id.is_distinct_from(release_id))
+                .values(release_id=release_id)
+            )
+
+    def _transcode_media(
+        self,
+        media_files: Dict[str, Path],
+        media_hashes: Dict[str, str],
+        result: ImportResult,
+        dry_run: bool = False,
+        progress: Optional[ProgressCallback] = None,
+    ) -> Dict[str, ProcessedMedia]:
+        """Audio variants / image derivatives per media filename (phase 2b).
+
+        Cached results (by file hash) are always used. Missing ones are
+        produced on the pool, except in dry runs or without ffmpeg; those
+        files are served as uploaded and failures are warnings, not errors.
+        """
+        if not media_files or not self.transcode:
+            return {}
+
+        processed: Dict[str, ProcessedMedia] = {}
+        missing: List[TranscodeJob] = []
+        for name, path in media_files.items():
+            job = TranscodeJob(path, media_hashes[name], self.media_store_root)
+            record = load_cached_media(job)
+            if record is not None:
+                processed[name] = record
+            else:
+                missing.append(job)
+
+        if missing and dry_run:
+            logger.info(f"DRY-RUN: {len(missing)} media file(s) not transcoded yet")
+            missing = []
+        elif missing and not ffmpeg_available():
+            msg = f"ffmpeg not found: {len(missing)} media file(s) served untranscoded"
+            logger.warning(msg)
+            result.warnings.append(msg)
+            missing = []
+
+        if missing:
+            logger.info(
+                f"Phase 2b: Transcoding {len(missing)} media file(s) "
+                f"({self.workers} worker(s), {self.pool} pool)..."
+            )
+        outcomes = self._map_ordered(transcode_media, missing, "Transcoded media files")
+        for done, (job, outcome) in enumerate(zip(missing, outcomes), 1):
+            name = job.source.name
+            self._report_progress(progress, "transcode", done, len(missing), name)
+            if outcome.error:
+                msg = f"Transcoding failed for {name}: {outcome.error}"
+                logger.warning(msg)
+                result.warnings.append(msg)
+            if is_usable(outcome):
+                processed[name] = outcome
+
+        if processed:
+            cached = sum(1 for p in processed.values() if p.cached)
+            logger.info(
+                f"[OK] Media variants: {len(processed)}/{len(media_files)} file(s) "
+                f"({cached} cached)"
+            )
+        return processed
+
     def import_release(
         self,
         session: Session,
@@ -226,6 +889,9 @@ class QuizImportService:
         release_id: str,
         dry_run: bool = False,
         request_id: Optional[str] = None,
+        verify: bool = False,
+        force: bool = False,
+        progress: Optional[ProgressCallback] = None,
     ) -> ImportResult:
         """Import a content release from JSON files.
         
@@ -233,6 +899,7 @@ class QuizImportService:
         1. Validates all JSON files
         2. Checks audio file references
         3. Computes audio hashes
+        3b. Transcodes audio / derives resized images (cached by hash)
         4. Imports topics and questions (UPSERT)
         5. Updates release metadata
         
@@ -242,6 +909,10 @@ class QuizImportService:
             audio_path: Path to audio directory (contains *.mp3 files)
             release_id: Release identifier (e.g., "2026-01-06_1430")
             dry_run: If True, validate only (no DB writes)
+            verify: If True, ignore the checksum manifest and rehash every audio file
+            force: If True, rewrite all units even if their fingerprint is unchanged
+            progress: Optional callback ``(phase, percent, message)``; it may
+                raise ImportCancelled to abort (transaction is rolled back)
             
         Returns:
             ImportResult with counts and errors
@@ -294,86 +965,278 @@ class QuizImportService:
             logger.info(f"Found {len(json_files)} JSON files")
             
             # Phase 1: Validate all units
-            logger.info("Phase 1: Validating units...")
+            # Files are validated on the pool; results are consumed in sorted
+            # file order so errors/logs are identical to a serial run.
+            logger.info(
+                f"Phase 1: Validating units ({self.workers} worker(s), {self.pool} pool)..."
+            )
             units = []
             audio_refs_map = {}  # unit_slug -> [audio_refs]
-            
-            for json_file in sorted(json_files):
-                try:
-                    logger.debug(f"Validating {json_file.name}...")
-                    file_size = None
-                    try:
-                        file_size = json_file.stat().st_size
-                    except OSError:
-                        pass
-                    unit = self._validate_unit_file(json_file)
-                    
-                    # Check slug matches filename
-                    expected_filename = f"{unit.slug}.json"
-                    if json_file.name != expected_filename:
-                        msg = f"Filename mismatch: {json_file.name} (expected: {expected_filename})"
-                        logger.error(msg)
-                        result.errors.append(msg)
-                        result.success = False
-                        continue
-                    
-                    units.append((json_file, unit))
-                    audio_refs = self._collect_audio_refs(unit)
-                    audio_refs_map[unit.slug] = audio_refs
-                    
-                    size_note = f", {file_size} bytes" if file_size is not None else ""
-                    logger.info(
-                        f"[OK] {json_file.name}: {len(unit.questions)} questions, "
-                        f"{len(audio_refs)} audio refs{size_note} (slug={unit.slug})"
-                    )
-                    
-                except (ValidationError, json.JSONDecodeError) as e:
-                    msg = f"Validation failed for {json_file.name}: {e}"
+            image_refs_map: Dict[str, List[str]] = {}  # unit_slug -> [image_refs]
+            unit_fingerprints: Dict[str, str] = {}  # unit_slug -> canonical JSON hash
+            sorted_json_files = sorted(json_files)
+
+            validated = self._map_ordered(
+                _load_and_validate_unit, sorted_json_files, "Validated units"
+            )
+            cache_hits = 0
+            for done, (json_file, (unit, file_size, error, fingerprint, cached)) in enumerate(
+                zip(sorted_json_files, validated), 1
+            ):
+                self._report_progress(
+                    progress, "validate", done, len(sorted_json_files), json_file.name
+                )
+                if error is not None:
+                    msg = f"Validation failed for {json_file.name}: {error}"
+                    logger.error(msg)
+                    result.errors.append(msg)
+                    result.success = False
+                    continue
+
+                # Check slug matches filename
+                expected_filename = f"{unit.slug}.json"
+                if json_file.name != expected_filename:
+                    msg = f"Filename mismatch: {json_file.name} (expected: {expected_filename})"
                     logger.error(msg)
                     result.errors.append(msg)
                     result.success = False
+                    continue
+
+                units.append((json_file, unit))
+                unit_fingerprints[unit.slug] = fingerprint
+                cache_hits += cached
+                audio_refs = self._collect_audio_refs(unit)
+                audio_refs_map[unit.slug] = audio_refs
+                image_refs_map[unit.slug] = self._collect_image_refs(unit)
+
+                size_note = f", {file_size} bytes" if file_size is not None else ""
+                logger.info(
+                    f"[OK] {json_file.name}: {len(unit.questions)} questions, "
+                    f"{len(audio_refs)} audio refs{size_note} (slug={unit.slug})"
+                )
             
+            if cache_hits:
+                logger.info(f"  {cache_hits}/{len(sorted_json_files)} unit(s) served from validation cache")
+
             if not result.success:
                 logger.error(f"Validation failed: {len(result.errors)} error(s)")
                 return result
             
             # Phase 2: Check audio files
             logger.info("Phase 2: Checking audio files...")
-            audio_hashes = {}  # relative_path -> sha256
-            
+            audio_files: Dict[str, Path] = {}  # filename -> path (first-reference order)
+            media_stats: Dict[str, os.stat_result] = {}
+
             for unit_slug, audio_refs in audio_refs_map.items():
                 for ref in audio_refs:
                     # Audio refs are relative to JSON file location
                     # For production imports, audio is in separate audio/ dir
                     # So we look for just the filename
                     audio_filename = Path(ref).name
+                    if audio_filename in audio_files:
+                        continue
                     audio_file = audio_dir / audio_filename
-                    
-                    if not audio_file.exists():
+
+                    try:
+                        media_stats[audio_filename] = audio_file.stat()
+                    except OSError:
                         msg = f"Audio file not found: {audio_file} (ref: {ref} in {unit_slug})"
                         logger.error(msg)
                         result.errors.append(msg)
                         result.success = False
                         continue
-                    
-                    # Compute hash (cached)
-                    if audio_filename not in audio_hashes:
-                        sha256 = self._compute_audio_hash(audio_file)
-                        audio_hashes[audio_filename] = sha256
-                        logger.debug(f"Audio {audio_filename}: SHA256={sha256[:16]}...")
-            
+
+                    audio_files[audio_filename] = audio_file
+
             if not result.success:
                 logger.error(f"Audio validation failed: {len(result.errors)} error(s)")
                 return result
+
+            # Images live next to the audio files; a missing image only warns
+            # and keeps its seed_src (images were never required by the import)
+            image_files: Dict[str, Path] = {}
+            for unit_slug, image_refs in image_refs_map.items():
+                for ref in image_refs:
+                    image_filename = Path(ref).name
+                    if image_filename in image_files or image_filename in audio_files:
+                        continue
+                    image_file = audio_dir / image_filename
+                    try:
+                        media_stats[image_filename] = image_file.stat()
+                    except OSError:
+                        msg = f"Image file not found: {image_file} (ref: {ref} in {unit_slug})"
+                        logger.warning(msg)
+                        result.warnings.append(msg)
+                        continue
+                    image_files[image_filename] = image_file
+            media_files: Dict[str, Path] = {**audio_files, **image_files}
+
+            # Reuse manifest hashes whose size + mtime_ns still match (unless verify)
+            manifest_path = self._checksum_manifest_path(audio_dir)
+            checksum_cache = (
+                self._load_checksum_cache(session, release_id, manifest_path)
+                if media_files else {}
+            )
+            media_hashes = {}  # filename -> sha256 (audio and images)
+            to_hash: List[str] = []
+            for audio_filename, st in media_stats.items():
+                cached = checksum_cache.get(audio_filename)
+                unchanged = (
+                    cached is not None
+                    and cached["size"] == st.st_size
+                    and cached["mtime_ns"] == st.st_mtime_ns
+                )
+                if unchanged and not verify:
+                    media_hashes[audio_filename] = cached["sha256"]
+                else:
+                    to_hash.append(audio_filename)
+            result.audio_hashes_reused = len(media_hashes)
+            if verify:
+                logger.info("Verify mode: rehashing all media files")
+
+            # Hash remaining media files on the pool
+            hashed = self._map_ordered(
+                _sha256_file, [media_files[name] for name in to_hash], "Hashed media files"
+            )
+            for done, (audio_filename, sha256) in enumerate(zip(to_hash, hashed), 1):
+                self._report_progress(progress, "audio", done, len(to_hash), audio_filename)
+                cached = checksum_cache.get(audio_filename)
+                st = media_stats[audio_filename]
+                if (
+                    verify
+                    and cached is not None
+                    and cached["size"] == st.st_size
+                    and cached["mtime_ns"] == st.st_mtime_ns
+                    and cached["sha256"] != sha256
+                ):
+                    msg = f"Checksum changed without size/mtime change: {audio_filename}"
+                    logger.warning(msg)
+                    result.warnings.append(msg)
+                media_hashes[audio_filename] = sha256
+                logger.debug(f"Audio {audio_filename}: SHA256={sha256[:16]}...")
+
+            # Keep manifest entries in the same (first-reference) order as media_files
+            checksum_manifest = json.dumps(
+                {
+                    "version": CHECKSUM_MANIFEST_VERSION,
+                    "algorithm": "sha256",
+                    "release_id": release_id,
+                    "generated_at": datetime.now(timezone.utc).isoformat(),
+                    "files": {
+                        name: {
+                            "size": media_stats[name].st_size,
+                            "mtime_ns": media_stats[name].st_mtime_ns,
+                            "sha256": media_hashes[name],
+                        }
+                        for name in media_files
+                    },
+                },
+                ensure_ascii=False,
+                indent=2,
+            )
+            
+            result.audio_files_processed = len(audio_files)
+            logger.info(
+                f"[OK] Media files: {len(audio_files)} audio, {len(image_files)} image(s) "
+                f"({result.audio_hashes_reused} hashes reused, {len(to_hash)} computed)"
+            )
+
+            processed = self._transcode_media(
+                media_files, media_hashes, result, dry_run=dry_run, progress=progress
+            )
+
+            # Media files are served from the content-addressed store (immutable URLs)
+            file_media: Dict[str, Dict[str, Any]] = {}
+            for name in media_files:
+                fields: Dict[str, Any] = {
+                    "src": store_media_url(media_hashes[name], Path(name).suffix)
+                }
+                if name in processed:
+                    fields.update(media_fields(processed[name], store_media_url))
+                file_media[name] = fields
+            media_keys = {name: _media_key(fields) for name, fields in file_media.items()}
+            content_hashes = {
+                slug: unit_content_hash(
+                    fingerprint,
+                    [
+                        media_keys[name]
+                        for name in (
+                            Path(ref).name
+                            for ref in audio_refs_map.get(slug, []) + image_refs_map.get(slug, [])
+                        )
+                        if name in media_keys
+                    ],
+                )
+                for slug, fingerprint in unit_fingerprints.items()
+            }
             
-            result.audio_files_processed = len(audio_hashes)
-            logger.info(f"[OK] Audio files: {result.audio_files_processed} unique files")
+            # Build all topic/question rows in memory; phase 3 writes the
+            # changed ones with batched INSERT ... ON CONFLICT DO UPDATE.
+            now = datetime.now(timezone.utc)
+            topic_rows: Dict[str, Dict[str, Any]] = {}
+            question_rows: Dict[str, Dict[str, Any]] = {}
+            question_owner: Dict[str, str] = {}
+
+            for json_file, unit in units:
+                topic_rows[unit.slug] = self._build_topic_row(
+                    unit, release_id, now, content_hashes.get(unit.slug)
+                )
+                for q in unit.questions:
+                    previous_owner = question_owner.get(q.id)
+                    if previous_owner is not None:
+                        msg = (
+                            f"Duplicate question id '{q.id}' in {unit.slug} "
+                            f"(already defined in {previous_owner}); last definition wins"
+                        )
+                        logger.warning(msg)
+                        result.warnings.append(msg)
+                    question_owner[q.id] = unit.slug
+                    question_rows[q.id] = self._build_question_row(
+                        unit.slug, q, release_id, now, file_media
+                    )
+
+            # Diff against current DB content (unchanged units are skipped)
+            dirty_slugs: set[str] = set(topic_rows)
+            write_question_ids: List[str] = list(question_rows)
+            diff: Optional[ReleaseDiff] = None
+            if session is not None:
+                self._report_progress(progress, "diff", 0, 1, "Comparing with database")
+                diff, dirty_slugs, write_question_ids = self._compute_release_diff(
+                    session, units, content_hashes, question_rows, force=force
+                )
+                result.diff = diff.to_dict()
+                logger.info(f"Diff: {diff.summary()}")
+                for entry in diff.answer_keys_changed:
+                    logger.info(
+                        f"  Answer key changed: {entry['question_id']} "
+                        f"{entry['old']} -> {entry['new']}"
+                    )
+                if diff.questions_removed:
+                    logger.warning(
+                        f"{len(diff.questions_removed)} question(s) no longer in their unit "
+                        f"(kept in DB): {', '.join(diff.questions_removed[:20])}"
+                    )
             
             if dry_run:
                 logger.info("DRY-RUN: Skipping database writes")
                 logger.info(f"Would import {len(units)} units with {sum(len(u.questions) for _, u in units)} questions")
                 return result
             
+            # Make sure every imported media file is in the media store
+            # (uploads already are; CLI/rsync release files are copied in)
+            for media_filename, media_file in media_files.items():
+                try:
+                    add_file_to_store(media_file, media_hashes[media_filename], self.media_store_root)
+                except OSError as e:
+                    msg = f"Could not add {media_filename} to the media store: {e}"
+                    logger.error(msg)
+                    result.errors.append(msg)
+                    result.success = False
+            if not result.success:
+                return result
+            if media_files:
+                logger.info(f"[OK] Media store: {len(media_files)} media file(s) available")
+
             # Phase 3: Database import (UPSERT)
             logger.info("Phase 3: Importing to database...")
             
@@ -399,132 +1262,92 @@ class QuizImportService:
                 release.updated_at = datetime.now(timezone.utc)
                 logger.info(f"Updated release record: {release_id}")
             
-            # Import units
+            topics_to_write = [row for slug, row in topic_rows.items() if slug in dirty_slugs]
+            questions_to_write = [question_rows[qid] for qid in write_question_ids]
+            rows_total = len(topics_to_write) + len(questions_to_write)
+            rows_written = 0
+
+            def on_chunk(count: int) -> None:
+                nonlocal rows_written
+                rows_written += count
+                self._report_progress(
+                    progress, "write", rows_written, rows_total,
+                    f"{rows_written}/{rows_total} rows",
+                )
+
+            try:
+                session.flush()  # write the release record before the bulk statements
+                self._upsert_topics(session, topics_to_write, on_chunk)
+                self._upsert_questions(session, questions_to_write, on_chunk)
+                self._stamp_release(session, release_id, list(topic_rows), list(question_rows))
+            except ImportCancelled:
+                raise
+            except Exception as e:
+                msg = f"Failed to import release {release_id}: {e}"
+                logger.error(msg, exc_info=True)
+                result.errors.append(msg)
+                result.success = False
+                session.rollback()
+                return result
+
+            written_per_unit: Dict[str, int] = {}
+            for qid in write_question_ids:
+                topic_id = question_rows[qid]["topic_id"]
+                written_per_unit[topic_id] = written_per_unit.get(topic_id, 0) + 1
+
             for json_file, unit in units:
-                try:
-                    # UPSERT topic
-                    topic = session.query(QuizTopic).filter(QuizTopic.id == unit.slug).first()
-                    
-                    if topic:
-                        # Update existing (preserve is_active if manually set to false)
-                        topic.title_key = unit.title
-                        topic.description_key = unit.description
-                        topic.authors = unit.authors or []
-                        topic.based_on = to_jsonable(unit.based_on)
-                        # Do NOT override is_active if set to false (soft-delete semantics)
-                        # topic.is_active = True  # ← REMOVED: Admin decision has priority
-                        topic.release_id = release_id
-                        logger.debug(f"Updated topic: {unit.slug}")
-                    else:
-                        # Create new
-                        topic = QuizTopic(
-                            id=unit.slug,
-                            title_key=unit.title,
-                            description_key=unit.description,
-                            authors=unit.authors or [],
-                            based_on=to_jsonable(unit.based_on),
-                            is_active=True,
-                            release_id=release_id,
-                            created_at=datetime.now(timezone.utc)
-                        )
-                        session.add(topic)
-                        logger.debug(f"Created topic: {unit.slug}")
-                    
-                    # UPSERT questions
-                    questions_in_unit = []
-                    for q in unit.questions:
-                        # Build answers JSON
-                        answers_json = []
-                        for ans in q.answers:
-                            ans_dict = {
-                                "id": ans.id,
-                                "text": ans.text,  # Plaintext
-                                "correct": ans.correct,
-                            }
-                            # Add media if present
-                            if ans.media:
-                                ans_dict["media"] = [
-                                    {"type": m.type, "src": m.src or m.seed_src}
-                                    for m in ans.media
-                                ]
-                            answers_json.append(ans_dict)
-                        
-                        # Build media JSON
-                        media_json = []
-                        if q.media:
-                            for m in q.media:
-                                media_json.append({
-                                    "type": m.type,
-                                    "src": m.src or m.seed_src
-                                })
-                        
-                        # UPSERT question
-                        question = session.query(QuizQuestion).filter(QuizQuestion.id == q.id).first()
-                        
-                        if question:
-                            # Update existing
-                            question.topic_id = unit.slug
-                            question.difficulty = q.difficulty
-                            question.type = q.type
-                            question.prompt_key = q.prompt
-                            question.explanation_key = q.explanation
-                            question.answers = answers_json
-                            question.media = media_json if media_json else None
-                            question.sources = q.sources
-                            question.meta = q.meta
-                            question.is_active = True
-                            question.release_id = release_id
-                            logger.debug(f"Updated question: {q.id}")
-                        else:
-                            # Create new
-                            question = QuizQuestion(
-                                id=q.id,
-                                topic_id=unit.slug,
-                                difficulty=q.difficulty,
-                                type=q.type,
-                                prompt_key=q.prompt,
-                                explanation_key=q.explanation,
-                                answers=answers_json,
-                                media=media_json if media_json else None,
-                                sources=q.sources,
-                                meta=q.meta,
-                                is_active=True,
-                                release_id=release_id,
-                                created_at=datetime.now(timezone.utc)
-                            )
-                            session.add(question)
-                            logger.debug(f"Created question: {q.id}")
-                        
-                        questions_in_unit.append(q.id)
-                    
-                    result.units_imported += 1
-                    result.questions_imported += len(questions_in_unit)
-                    logger.info(f"[OK] Imported {unit.slug}: {len(questions_in_unit)} questions")
-                    
-                except Exception as e:
-                    msg = f"Failed to import {unit.slug}: {e}"
-                    logger.error(msg, exc_info=True)
-                    result.errors.append(msg)
-                    result.success = False
-                    session.rollback()
-                    return result
+                result.units_imported += 1
+                result.questions_imported += len(unit.questions)
+                if unit.slug in dirty_slugs:
+                    logger.info(
+                        f"[OK] Imported {unit.slug}: {len(unit.questions)} questions "
+                        f"({written_per_unit.get(unit.slug, 0)} written)"
+                    )
+                else:
+                    result.units_skipped += 1
+                    logger.info(f"[SKIP] {unit.slug}: unchanged")
             
             # Update release counts
             release.units_count = result.units_imported
             release.questions_count = result.questions_imported
             release.audio_count = result.audio_files_processed
+            release.checksum_manifest = checksum_manifest
+            release.import_diff = json.dumps(result.diff) if result.diff is not None else None
             release.imported_at = datetime.now(timezone.utc)
             
-            # Commit transaction
+            # Commit transaction (last point where a cancel is honoured)
+            self._report_progress(progress, "commit", 0, 1, "Committing")
             session.commit()
+
+            # Sidecar manifest is a cache; failure to write it must not fail the import
+            try:
+                self._write_checksum_manifest(manifest_path, checksum_manifest)
+                logger.info(f"[OK] Checksum manifest: {manifest_path}")
+            except OSError as e:
+                msg = f"Could not write checksum manifest {manifest_path}: {e}"
+                logger.warning(msg)
+                result.warnings.append(msg)
             
             logger.info("[OK] Import completed successfully")
-            logger.info(f"  Units: {result.units_imported}")
+            logger.info(f"  Units: {result.units_imported} ({result.units_skipped} unchanged)")
             logger.info(f"  Questions: {result.questions_imported}")
             logger.info(f"  Audio files: {result.audio_files_processed}")
             
             return result
             
+        except ImportCancelled:
+            logger.warning("Import cancelled; rolling back")
+            if session is not None:
+                session.rollback()
+            return ImportResult(
+                success=False,
+                release_id=release_id,
+                errors=["Import cancelled"],
+                request_id=request_id,
+                dry_run=dry_run,
+                cancelled=True,
+            )
+
         except Exception as e:
             logger.error(f"Import failed with exception: {e}", exc_info=True)
             session.rollback()  # Clean up transaction on unexpected errors
@@ -608,8 +1431,18 @@ class QuizImportService:
             
             result.units_affected = units
             
+            # Compile before committing so a failed snapshot leaves the release unpublished
+            snapshot_dir = get_content_snapshot_dir()
+            snapshot = None
+            if snapshot_dir is not None:
+                snapshot = prepare_release_snapshot(session, snapshot_dir, release_id, release.imported_at)
+            
             session.commit()
             
+            if snapshot is not None:
+                activate_snapshot(snapshot_dir, snapshot.path, release_id)
+                result.snapshot = snapshot.path.name
+            
             logger.info(f"[OK] Published release {release_id} ({units} units)")
             
             return result
@@ -682,6 +1515,10 @@ class QuizImportService:
             
             session.commit()
             
+            snapshot_dir = get_content_snapshot_dir()
+            if snapshot_dir is not None and deactivate_snapshot(snapshot_dir, release_id):
+                logger.info("Content snapshot removed; game routes read from the database")
+            
             logger.info(f"[OK] Unpublished release {release_id}")
             
             return result
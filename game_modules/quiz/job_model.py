@@ -0,0 +1,55 @@
+"""Quiz content job model (background import/publish/unpublish runs)."""
+
+from __future__ import annotations
+
+from datetime import datetime
+from typing import Optional
+
+from sqlalchemy import Boolean, DateTime, Index, Integer, String, Text
+from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy.orm import Mapped, mapped_column
+
+from .models import QuizBase
+
+
+class QuizJob(QuizBase):
+    """Background job for a content operation on a release.
+
+    Jobs are queued by the admin API / CLI and executed by a local worker
+    (thread in the web process or ``manage.py run-quiz-jobs``). Workers claim
+    jobs with ``SELECT ... FOR UPDATE SKIP LOCKED``; no external queue.
+
+    status: queued -> running -> succeeded | failed | cancelled
+    """
+    __tablename__ = "quiz_jobs"
+
+    id: Mapped[str] = mapped_column(String(36), primary_key=True)  # UUID
+    kind: Mapped[str] = mapped_column(String(20), nullable=False)  # import, publish, unpublish
+    release_id: Mapped[str] = mapped_column(String(50), nullable=False)
+    status: Mapped[str] = mapped_column(String(20), nullable=False, default="queued")
+
+    # Progress (per phase, 0-100 overall)
+    phase: Mapped[Optional[str]] = mapped_column(String(30), nullable=True)
+    progress: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    message: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
+
+    # Input / output
+    params: Mapped[Optional[dict]] = mapped_column(JSONB, nullable=True)
+    result: Mapped[Optional[dict]] = mapped_column(JSONB, nullable=True)
+    error: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
+
+    cancel_requested: Mapped[bool] = mapped_column(Boolean, nullable=False, default=False)
+    request_id: Mapped[Optional[str]] = mapped_column(String(100), nullable=True)
+    created_by: Mapped[Optional[str]] = mapped_column(String(100), nullable=True)
+    worker_id: Mapped[Optional[str]] = mapped_column(String(100), nullable=True)  # host:pid:thread
+
+    # Timestamps
+    created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False, default=datetime.utcnow)
+    started_at: Mapped[Optional[datetime]] = mapped_column(DateTime(timezone=True), nullable=True)
+    finished_at: Mapped[Optional[datetime]] = mapped_column(DateTime(timezone=True), nullable=True)
+    heartbeat_at: Mapped[Optional[datetime]] = mapped_column(DateTime(timezone=True), nullable=True)
+
+    __table_args__ = (
+        Index("ix_quiz_jobs_status_created", "status", "created_at"),
+        Index("ix_quiz_jobs_release_created", "release_id", "created_at"),
+    )
@@ -0,0 +1,528 @@
+"""Background job runner for quiz content operations.
+
+Import, publish and unpublish run as jobs stored in ``quiz_jobs`` instead of
+inside the HTTP request (gunicorn sync workers, --timeout 120).
+
+Design:
+- Jobs are rows in the quiz DB; no external queue service
+- A local worker claims queued jobs with SELECT ... FOR UPDATE SKIP LOCKED,
+  so several gunicorn workers / CLI runners never execute the same job
+- Workers: a daemon thread in the web process (started on enqueue, exits
+  when idle) or ``manage.py run-quiz-jobs`` as a dedicated process
+- Progress (phase + overall percent) is written to the job row from a
+  separate session, so pollers see it while the import transaction is still
+  open; a timer thread refreshes the heartbeat independently of progress
+  reports, so a long phase does not look like a lost worker
+- Cancellation: queued jobs are cancelled immediately; running jobs get
+  ``cancel_requested`` and abort at the next progress report (rollback)
+- Running jobs whose heartbeat is older than QUIZ_JOB_STALE_SECONDS (worker
+  killed/recycled) are marked failed
+"""
+
+from __future__ import annotations
+
+import logging
+import os
+import socket
+import threading
+import time
+import uuid
+from dataclasses import asdict
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from sqlalchemy import func, select, update
+from sqlalchemy.orm import Session
+
+from .import_service import ImportCancelled, QuizImportService
+from .job_model import QuizJob
+
+logger = logging.getLogger(__name__)
+
+JOB_KINDS = ("import", "publish", "unpublish")
+
+JOB_STATUS_QUEUED = "queued"
+JOB_STATUS_RUNNING = "running"
+JOB_STATUS_SUCCEEDED = "succeeded"
+JOB_STATUS_FAILED = "failed"
+JOB_STATUS_CANCELLED = "cancelled"
+ACTIVE_STATUSES = (JOB_STATUS_QUEUED, JOB_STATUS_RUNNING)
+TERMINAL_STATUSES = (JOB_STATUS_SUCCEEDED, JOB_STATUS_FAILED, JOB_STATUS_CANCELLED)
+
+DEFAULT_POLL_SECONDS = 2.0
+DEFAULT_STALE_SECONDS = 300
+DEFAULT_IDLE_SECONDS = 60.0
+
+# Minimum interval between progress writes (percent changes are always written)
+PROGRESS_WRITE_INTERVAL = 1.0
+# Upper bound for the heartbeat interval (otherwise a third of the stale limit)
+HEARTBEAT_MAX_INTERVAL = 30.0
+
+
+class JobConflictError(Exception):
+    """Raised when a release already has a queued/running job."""
+
+    def __init__(self, job: Dict[str, Any]):
+        super().__init__(
+            f"Job {job['job_id']} ({job['kind']}) is already {job['status']} for {job['release_id']}"
+        )
+        self.job = job
+
+
+def _now() -> datetime:
+    return datetime.now(timezone.utc)
+
+
+def _config_value(key: str, default: Any) -> Any:
+    """Read a setting from Flask config (if in app context), else the environment."""
+    try:
+        from flask import current_app
+
+        if current_app:
+            value = current_app.config.get(key)
+            if value is not None:
+                return value
+    except Exception:
+        pass
+    return os.getenv(key, default)
+
+
+def get_stale_seconds() -> int:
+    try:
+        return int(_config_value("QUIZ_JOB_STALE_SECONDS", DEFAULT_STALE_SECONDS))
+    except (TypeError, ValueError):
+        return DEFAULT_STALE_SECONDS
+
+
+def get_poll_seconds() -> float:
+    try:
+        return float(_config_value("QUIZ_JOB_POLL_SECONDS", DEFAULT_POLL_SECONDS))
+    except (TypeError, ValueError):
+        return DEFAULT_POLL_SECONDS
+
+
+def make_worker_id() -> str:
+    return f"{socket.gethostname()}:{os.getpid()}:{threading.get_ident()}"
+
+
+def _session_factory():
+    from src.app.extensions.sqlalchemy_ext import get_quiz_session
+
+    return get_quiz_session()
+
+
+# =============================================================================
+# Queue operations
+# =============================================================================
+
+def job_to_dict(job: QuizJob) -> Dict[str, Any]:
+    """Serialize a job for the admin API."""
+    return {
+        "job_id": job.id,
+        "kind": job.kind,
+        "release_id": job.release_id,
+        "status": job.status,
+        "phase": job.phase,
+        "progress": job.progress,
+        "message": job.message,
+        "params": job.params,
+        "result": job.result,
+        "error": job.error,
+        "cancel_requested": job.cancel_requested,
+        "request_id": job.request_id,
+        "created_by": job.created_by,
+        "created_at": job.created_at.isoformat() if job.created_at else None,
+        "started_at": job.started_at.isoformat() if job.started_at else None,
+        "finished_at": job.finished_at.isoformat() if job.finished_at else None,
+        "heartbeat_at": job.heartbeat_at.isoformat() if job.heartbeat_at else None,
+    }
+
+
+def enqueue_job(
+    session: Session,
+    kind: str,
+    release_id: str,
+    params: Optional[Dict[str, Any]] = None,
+    request_id: Optional[str] = None,
+    created_by: Optional[str] = None,
+) -> QuizJob:
+    """Queue a job. Commits the session.
+
+    Raises:
+        ValueError: Unknown job kind
+        JobConflictError: The release already has a queued/running job
+    """
+    if kind not in JOB_KINDS:
+        raise ValueError(f"Unknown job kind: {kind}")
+
+    # Serialize enqueue per release (transaction-scoped advisory lock)
+    session.execute(select(func.pg_advisory_xact_lock(func.hashtext(f"quiz_jobs:{release_id}"))))
+    active = session.execute(
+        select(QuizJob)
+        .where(QuizJob.release_id == release_id, QuizJob.status.in_(ACTIVE_STATUSES))
+        .order_by(QuizJob.created_at)
+        .limit(1)
+    ).scalar_one_or_none()
+    if active is not None:
+        snapshot = job_to_dict(active)
+        session.rollback()
+        raise JobConflictError(snapshot)
+
+    job = QuizJob(
+        id=str(uuid.uuid4()),
+        kind=kind,
+        release_id=release_id,
+        status=JOB_STATUS_QUEUED,
+        progress=0,
+        params=params or {},
+        request_id=request_id,
+        created_by=created_by,
+        created_at=_now(),
+    )
+    session.add(job)
+    session.commit()
+    logger.info(f"Queued {kind} job {job.id} for release {release_id}")
+    return job
+
+
+def get_job(session: Session, job_id: str) -> Optional[QuizJob]:
+    return session.get(QuizJob, job_id)
+
+
+def list_jobs(
+    session: Session,
+    release_id: Optional[str] = None,
+    limit: int = 20,
+) -> List[QuizJob]:
+    stmt = select(QuizJob).order_by(QuizJob.created_at.desc()).limit(limit)
+    if release_id:
+        stmt = stmt.where(QuizJob.release_id == release_id)
+    return list(session.execute(stmt).scalars())
+
+
+def request_cancel(session: Session, job_id: str) -> Optional[QuizJob]:
+    """Cancel a queued job or flag a running job for cancellation. Commits."""
+    job = session.execute(
+        select(QuizJob).where(QuizJob.id == job_id).with_for_update()
+    ).scalar_one_or_none()
+    if job is None:
+        return None
+    if job.status == JOB_STATUS_QUEUED:
+        job.status = JOB_STATUS_CANCELLED
+        job.cancel_requested = True
+        job.finished_at = _now()
+        job.message = "Cancelled before start"
+    elif job.status == JOB_STATUS_RUNNING:
+        job.cancel_requested = True
+        job.message = "Cancellation requested"
+    session.commit()
+    return job
+
+
+def fail_stale_jobs(session: Session, stale_after_seconds: Optional[int] = None) -> int:
+    """Mark running jobs without a recent heartbeat as failed. Commits."""
+    stale_after = stale_after_seconds if stale_after_seconds is not None else get_stale_seconds()
+    cutoff = _now() - timedelta(seconds=stale_after)
+    result = session.execute(
+        update(QuizJob)
+        .where(QuizJob.status == JOB_STATUS_RUNNING, QuizJob.heartbeat_at < cutoff)
+        .values(
+            status=JOB_STATUS_FAILED,
+            error="Worker lost (no heartbeat); the import transaction was rolled back",
+            finished_at=_now(),
+        )
+    )
+    session.commit()
+    if result.rowcount:
+        logger.warning(f"Marked {result.rowcount} stale job(s) as failed")
+    return result.rowcount or 0
+
+
+def claim_next_job(
+    session: Session,
+    worker_id: str,
+    job_id: Optional[str] = None,
+) -> Optional[str]:
+    """Atomically move the oldest queued job (or ``job_id``) to running. Commits.
+
+    Returns:
+        Claimed job id, or None if nothing claimable (empty queue, or the
+        job was already claimed/cancelled)
+    """
+    stmt = select(QuizJob).where(QuizJob.status == JOB_STATUS_QUEUED)
+    if job_id is not None:
+        stmt = stmt.where(QuizJob.id == job_id)
+    job = session.execute(
+        stmt.order_by(QuizJob.created_at).limit(1).with_for_update(skip_locked=True)
+    ).scalar_one_or_none()
+    if job is None:
+        session.rollback()
+        return None
+    now = _now()
+    job.status = JOB_STATUS_RUNNING
+    job.worker_id = worker_id
+    job.started_at = now
+    job.heartbeat_at = now
+    job.phase = "starting"
+    session.commit()
+    return job.id
+
+
+# =============================================================================
+# Execution
+# =============================================================================
+
+class JobProgressReporter:
+    """Progress callback for QuizImportService that persists to the job row.
+
+    Writes are throttled (percent change or PROGRESS_WRITE_INTERVAL) and use
+    their own short session. Raises ImportCancelled once the job has been
+    flagged for cancellation.
+    """
+
+    def __init__(self, job_id: str):
+        self.job_id = job_id
+        self._last_write = 0.0
+        self._last_percent = -1
+        self._last_phase: Optional[str] = None
+
+    def __call__(self, phase: str, percent: int, message: str = "") -> None:
+        now = time.monotonic()
+        if (
+            percent == self._last_percent
+            and phase == self._last_phase
+            and now - self._last_write < PROGRESS_WRITE_INTERVAL
+        ):
+            return
+        self._last_write = now
+        self._last_percent = percent
+        self._last_phase = phase
+
+        with _session_factory() as session:
+            job = session.get(QuizJob, self.job_id)
+            if job is None:
+                return
+            job.phase = phase
+            job.progress = max(0, min(100, percent))
+            job.message = message or None
+            job.heartbeat_at = _now()
+            cancel = job.cancel_requested
+        if cancel:
+            raise ImportCancelled(f"Job {self.job_id} cancelled")
+
+
+class JobHeartbeat:
+    """Timer thread that refreshes ``heartbeat_at`` while a job runs.
+
+    Progress reports are not enough: one phase (a large UPSERT, a slow
+    transcode) can take longer than QUIZ_JOB_STALE_SECONDS without any, and
+    fail_stale_jobs() would then fail a job that is still running. Beats every
+    third of the stale limit (at most HEARTBEAT_MAX_INTERVAL), each in its own
+    short session; only running jobs are touched.
+    """
+
+    def __init__(self, job_id: str, interval: Optional[float] = None):
+        self.job_id = job_id
+        if interval is None:
+            interval = min(HEARTBEAT_MAX_INTERVAL, max(get_stale_seconds() / 3, 1.0))
+        self.interval = interval
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def __enter__(self) -> "JobHeartbeat":
+        self._thread = threading.Thread(
+            target=self._run,
+            name=f"quiz-job-heartbeat-{self.job_id[:8]}",
+            daemon=True,
+        )
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval):
+            try:
+                with _session_factory() as session:
+                    session.execute(
+                        update(QuizJob)
+                        .where(QuizJob.id == self.job_id, QuizJob.status == JOB_STATUS_RUNNING)
+                        .values(heartbeat_at=_now())
+                    )
+            except Exception as e:  # next beat retries; a lost DB also fails the job itself
+                logger.warning(f"Heartbeat of job {self.job_id} failed: {e}")
+
+
+def _finish_job(
+    job_id: str,
+    status: str,
+    result: Optional[Dict[str, Any]] = None,
+    error: Optional[str] = None,
+) -> None:
+    with _session_factory() as session:
+        job = session.get(QuizJob, job_id)
+        if job is None:
+            return
+        job.status = status
+        job.result = result
+        job.error = error
+        job.finished_at = _now()
+        job.heartbeat_at = job.finished_at
+        if status == JOB_STATUS_SUCCEEDED:
+            job.phase = "done"
+            job.progress = 100
+            job.message = None
+        elif status == JOB_STATUS_CANCELLED:
+            job.message = "Cancelled"
+
+
+def run_job(job_id: str, project_root: Optional[Path] = None) -> Optional[str]:
+    """Execute a claimed (running) job to completion.
+
+    Returns:
+        Final job status, or None if the job does not exist
+    """
+    with _session_factory() as session:
+        job = session.get(QuizJob, job_id)
+        if job is None:
+            return None
+        kind, release_id = job.kind, job.release_id
+        params = dict(job.params or {})
+        request_id = job.request_id or f"job-{job_id[:8]}"
+
+    reporter = JobProgressReporter(job_id)
+    service = QuizImportService(project_root=project_root, workers=params.get("workers"))
+    logger.info(f"Running {kind} job {job_id} for release {release_id}")
+
+    try:
+        with JobHeartbeat(job_id), _session_factory() as session:
+            if kind == "import":
+                result = service.import_release(
+                    session=session,
+                    units_path=params["units_path"],
+                    audio_path=params["audio_path"],
+                    release_id=release_id,
+                    dry_run=bool(params.get("dry_run", False)),
+                    request_id=request_id,
+                    verify=bool(params.get("verify", False)),
+                    force=bool(params.get("force", False)),
+                    progress=reporter,
+                )
+            else:
+                reporter(kind, 10, release_id)
+                method = service.publish_release if kind == "publish" else service.unpublish_release
+                result = method(session=session, release_id=release_id, request_id=request_id)
+    except ImportCancelled:
+        _finish_job(job_id, JOB_STATUS_CANCELLED, error="Cancelled")
+        return JOB_STATUS_CANCELLED
+    except Exception as e:
+        logger.error(f"Job {job_id} crashed: {e}", exc_info=True)
+        _finish_job(job_id, JOB_STATUS_FAILED, error=str(e))
+        return JOB_STATUS_FAILED
+
+    payload = asdict(result)
+    if getattr(result, "cancelled", False):
+        status = JOB_STATUS_CANCELLED
+    elif result.success:
+        status = JOB_STATUS_SUCCEEDED
+    else:
+        status = JOB_STATUS_FAILED
+    error = "; ".join(result.errors) if result.errors and status == JOB_STATUS_FAILED else None
+    _finish_job(job_id, status, result=payload, error=error)
+    logger.info(f"Job {job_id} finished: {status}")
+    return status
+
+
+def run_pending_jobs(
+    project_root: Optional[Path] = None,
+    worker_id: Optional[str] = None,
+    max_jobs: Optional[int] = None,
+) -> int:
+    """Claim and run queued jobs until the queue is empty (or max_jobs ran).
+
+    Returns:
+        Number of jobs executed
+    """
+    worker_id = worker_id or make_worker_id()
+    executed = 0
+    with _session_factory() as session:
+        fail_stale_jobs(session)
+    while max_jobs is None or executed < max_jobs:
+        with _session_factory() as session:
+            job_id = claim_next_job(session, worker_id)
+        if job_id is None:
+            break
+        run_job(job_id, project_root=project_root)
+        executed += 1
+    return executed
+
+
+class LocalJobWorker:
+    """Daemon thread that drains the job queue inside the web process.
+
+    Started on demand (enqueue); exits after ``idle_seconds`` without work so
+    idle gunicorn workers do not poll the DB forever.
+    """
+
+    def __init__(self, idle_seconds: float = DEFAULT_IDLE_SECONDS):
+        self.idle_seconds = idle_seconds
+        self._lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def ensure_running(self, app, project_root: Optional[Path] = None) -> None:
+        """Start the worker thread if needed and wake it up."""
+        with self._lock:
+            self._wakeup.set()
+            if self._thread is not None and self._thread.is_alive():
+                return
+            self._thread = threading.Thread(
+                target=self._run,
+                args=(app, project_root),
+                name="quiz-job-worker",
+                daemon=True,
+            )
+            self._thread.start()
+
+    def _run(self, app, project_root: Optional[Path]) -> None:
+        idle_since = time.monotonic()
+        with app.app_context():
+            poll = get_poll_seconds()
+            while True:
+                self._wakeup.clear()
+                try:
+                    executed = run_pending_jobs(project_root=project_root)
+                except Exception as e:
+                    logger.error(f"Job worker loop failed: {e}", exc_info=True)
+                    executed = 0
+                if executed:
+                    idle_since = time.monotonic()
+                elif time.monotonic() - idle_since >= self.idle_seconds:
+                    with self._lock:
+                        # Re-check under the lock so a concurrent enqueue is not lost
+                        if not self._wakeup.is_set():
+                            self._thread = None
+                            return
+                self._wakeup.wait(timeout=poll)
+
+
+_local_worker = LocalJobWorker()
+
+
+def start_local_worker(app, project_root: Optional[Path] = None) -> bool:
+    """Start/wake the in-process worker unless QUIZ_JOBS_LOCAL_WORKER is off.
+
+    Returns:
+        True if the local worker was started/woken
+    """
+    enabled = app.config.get("QUIZ_JOBS_LOCAL_WORKER", True)
+    if isinstance(enabled, str):
+        enabled = enabled.strip().lower() not in {"0", "false", "no", "off"}
+    if not enabled:
+        return False
+    _local_worker.ensure_running(app, project_root)
+    return True
@@ -0,0 +1,168 @@
+"""HTTP delivery of quiz media (``/quiz-media/...``).
+
+URLs mirror the layout of the media volume:
+
+- ``/quiz-media/store/<aa>/<sha256><ext>``: content-addressed store. The
+  import writes these URLs into question/answer media ``src``; the content
+  of a URL never changes, so it is cached for a year as ``immutable``
+- ``/quiz-media/releases/<release_id>/<dir>/<file>``: files of a release
+  directory (a re-upload may replace them): short max-age, revalidated via
+  ETag
+
+Design:
+- Only media extensions (ALLOWED_MEDIA_EXTENSIONS plus transcoded outputs)
+  below store/ and releases/ are served; no dotfiles or ``..``, and the resolved path must
+  stay inside the media root
+- Without offload, Flask serves the file with ``send_file(conditional=True)``:
+  Range requests (206/416) and If-None-Match/If-Modified-Since (304)
+- With QUIZ_MEDIA_ACCEL_REDIRECT set (production), the response only carries
+  headers plus ``X-Accel-Redirect: <prefix><path>``; nginx streams the file
+  from an internal location (sendfile, ranges, conditional requests) and
+  the sync worker is free immediately. nginx keeps our Content-Type and
+  Cache-Control.
+- ``preload_links`` turns a run's media manifest
+  (``services.build_media_manifest``) into ``Link: rel=preload`` values for
+  the play page. They pick what quiz-play.js will pick: the smallest audio
+  variant and the first image format, each with a ``type`` so browsers that
+  cannot play it skip the preload instead of fetching a file they won't use.
+"""
+
+from __future__ import annotations
+
+import mimetypes
+import re
+from dataclasses import dataclass
+from pathlib import Path, PurePosixPath
+from typing import Any, Dict, List, Optional, Sequence
+from urllib.parse import quote
+
+from flask import Response, send_file
+
+from .media_store import MEDIA_STORE_DIRNAME
+from .media_transcode import TRANSCODED_MEDIA_EXTENSIONS
+from .validation import ALLOWED_MEDIA_EXTENSIONS
+
+MEDIA_URL_PREFIX = "/quiz-media"
+RELEASES_DIRNAME = "releases"
+IMMUTABLE_MAX_AGE = 365 * 24 * 3600
+RELEASE_MEDIA_MAX_AGE = 300
+
+# Rendered image widths, must match IMAGE_SIZES / IMAGE_SIZES_COMPACT in quiz-play.js
+IMAGE_PRELOAD_SIZES = "(max-width: 720px) 100vw, 720px"
+IMAGE_PRELOAD_SIZES_COMPACT = "200px"
+
+SERVED_EXTENSIONS = ALLOWED_MEDIA_EXTENSIONS | TRANSCODED_MEDIA_EXTENSIONS
+
+_STORE_FILENAME = re.compile(r"^[0-9a-f]{64}(\.[a-z0-9]+)?$")
+
+
+@dataclass
+class ResolvedMedia:
+    """A media file that may be served."""
+    path: Path  # absolute, symlinks resolved
+    relative_path: str  # below the media root (for X-Accel-Redirect)
+    sha256: Optional[str] = None  # store files only
+
+    @property
+    def immutable(self) -> bool:
+        return self.sha256 is not None
+
+
+def store_media_url(sha256: str, suffix: str) -> str:
+    """Public URL of a store file (see ``media_store.store_path_for``)."""
+    return f"{MEDIA_URL_PREFIX}/{MEDIA_STORE_DIRNAME}/{sha256[:2]}/{sha256}{suffix.lower()}"
+
+
+def resolve_media_path(media_root: Path, media_path: str) -> Optional[ResolvedMedia]:
+    """Map a ``/quiz-media/<media_path>`` request to a file, or None (404)."""
+    parts = PurePosixPath(media_path).parts
+    if not parts or any(p in ("/", ".", "..") or p.startswith(".") or "\\" in p for p in parts):
+        return None
+    if PurePosixPath(media_path).suffix.lower() not in SERVED_EXTENSIONS:
+        return None
+
+    sha256 = None
+    if parts[0] == MEDIA_STORE_DIRNAME:
+        if len(parts) != 3 or not _STORE_FILENAME.match(parts[2]) or parts[1] != parts[2][:2]:
+            return None
+        sha256 = parts[2][:64]
+    elif parts[0] != RELEASES_DIRNAME or len(parts) < 3:
+        return None
+
+    root = Path(media_root).resolve()
+    try:
+        path = root.joinpath(*parts).resolve(strict=True)
+    except OSError:
+        return None
+    if not path.is_relative_to(root) or not path.is_file():
+        return None
+    return ResolvedMedia(path=path, relative_path="/".join(parts), sha256=sha256)
+
+
+def send_media(media: ResolvedMedia, accel_prefix: Optional[str] = None) -> Response:
+    """Build the response for a resolved media file (must run in a request)."""
+    max_age = IMMUTABLE_MAX_AGE if media.immutable else RELEASE_MEDIA_MAX_AGE
+    if accel_prefix:
+        mimetype = mimetypes.guess_type(media.path.name)[0] or "application/octet-stream"
+        response = Response(status=200, mimetype=mimetype)
+        response.headers["X-Accel-Redirect"] = (
+            f"{accel_prefix.rstrip('/')}/{quote(media.relative_path)}"
+        )
+    else:
+        response = send_file(
+            media.path,
+            conditional=True,
+            etag=media.sha256 or True,
+            max_age=max_age,
+        )
+    response.cache_control.public = True
+    response.cache_control.max_age = max_age
+    if media.immutable:
+        response.cache_control.immutable = True
+    return response
+
+
+def _bare_type(mime: str) -> str:
+    """``audio/ogg; codecs="opus"`` -> ``audio/ogg`` (for Link header parameters)."""
+    return mime.split(";")[0].strip()
+
+
+def _preload_link(item: Dict[str, Any]) -> Optional[str]:
+    src = item.get("src")
+    if not isinstance(src, str) or not src.startswith("/"):
+        return None
+
+    if item.get("type") == "audio":
+        variants = [v for v in item.get("variants") or [] if v.get("src") and v.get("mime")]
+        if variants:
+            best = min(variants, key=lambda v: v.get("bytes") or float("inf"))
+            # Bare media type: the codecs parameter is quoted (AUDIO_PROFILES) and
+            # cannot be nested inside the quoted link parameter
+            return f'<{best["src"]}>; rel=preload; as=audio; type="{_bare_type(best["mime"])}"'
+        return f"<{src}>; rel=preload; as=audio"
+
+    if item.get("type") == "image":
+        srcset = [d for d in item.get("srcset") or [] if d.get("src") and d.get("type") and d.get("width")]
+        if not srcset:
+            return f"<{src}>; rel=preload; as=image"
+        mime = _bare_type(srcset[0]["type"])
+        candidates = ", ".join(
+            f'{d["src"]} {d["width"]}w' for d in srcset if _bare_type(d["type"]) == mime
+        )
+        sizes = IMAGE_PRELOAD_SIZES_COMPACT if item.get("answer_id") else IMAGE_PRELOAD_SIZES
+        return (
+            f'<{src}>; rel=preload; as=image; type="{mime}"; '
+            f'imagesrcset="{candidates}"; imagesizes="{sizes}"'
+        )
+    return None
+
+
+def preload_links(manifest: Sequence[Dict[str, Any]]) -> List[str]:
+    """``Link`` header values preloading the media of manifest entries."""
+    links: List[str] = []
+    for entry in manifest:
+        for item in entry.get("media") or []:
+            link = _preload_link(item)
+            if link and link not in links:
+                links.append(link)
+    return links
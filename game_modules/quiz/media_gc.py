@@ -0,0 +1,399 @@
+"""Garbage collection for media/releases and the content-addressed store.
+
+Every dashboard upload creates a new ``release_<timestamp>_<suffix>``
+directory and nothing removed old ones. This module computes which release
+directories are still reachable and deletes (or archives) the rest.
+
+A release directory is kept if any of these hold:
+- it is published, or ``media/current`` points at it
+- current topics/questions reference it via ``release_id`` (this is what
+  served content and in-flight runs read from)
+- a queued/running content job targets it
+- it is among the ``keep_last`` most recent releases
+- it is a draft / unknown directory modified within ``keep_drafts_days``
+  (covers uploads that have not written a DB record yet)
+
+Store files (``media/store``) are kept while a kept release links to them
+(same inode via hardlink or symlink target), while question/answer media
+URLs point at them (``/quiz-media/store/...``, written by the import), while
+the ``current`` or a ``releases/*`` content snapshot still references them
+(the database may already point at newer media than the snapshot being
+served or re-publishable), or while younger than ``STORE_GRACE_SECONDS`` (upload streamed but not yet
+linked).
+
+Reclaimable bytes count an inode only if every link to it is collected, so
+hardlinked media are not double counted. All filesystem operations go
+through an IORateLimiter so the GC can run on the production box.
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import os
+import re
+import shutil
+import time
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Set, Tuple
+
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from .config import get_content_snapshot_dir
+from .content_snapshot import CURRENT_LINK, RELEASES_DIRNAME, ContentSnapshot
+from .job_model import QuizJob
+from .media_store import MEDIA_STORE_DIRNAME
+from .models import QuizQuestion, QuizTopic
+from .release_model import QuizContentRelease
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_KEEP_DRAFTS_DAYS = 30
+DEFAULT_KEEP_LAST = 3
+STORE_GRACE_SECONDS = 24 * 3600
+
+_ACTIVE_JOB_STATUSES = ("queued", "running")
+
+FileKey = Tuple[int, int]  # (st_dev, st_ino)
+
+
+class IORateLimiter:
+    """Token-bucket limiter for filesystem operations and bytes.
+
+    Args:
+        ops_per_sec: Max filesystem operations (stat/unlink/rename) per second
+        bytes_per_sec: Max bytes deleted/moved per second
+    """
+
+    def __init__(self, ops_per_sec: Optional[float] = None, bytes_per_sec: Optional[float] = None):
+        self.ops_per_sec = ops_per_sec if ops_per_sec and ops_per_sec > 0 else None
+        self.bytes_per_sec = bytes_per_sec if bytes_per_sec and bytes_per_sec > 0 else None
+        self._start = time.monotonic()
+        self._ops = 0
+        self._bytes = 0
+
+    def throttle(self, ops: int = 1, nbytes: int = 0) -> None:
+        self._ops += ops
+        self._bytes += nbytes
+        wait = 0.0
+        elapsed = time.monotonic() - self._start
+        if self.ops_per_sec:
+            wait = max(wait, self._ops / self.ops_per_sec - elapsed)
+        if self.bytes_per_sec:
+            wait = max(wait, self._bytes / self.bytes_per_sec - elapsed)
+        if wait > 0:
+            time.sleep(wait)
+
+
+@dataclass
+class GCPolicy:
+    """Retention policy for the media GC."""
+    keep_drafts_days: int = DEFAULT_KEEP_DRAFTS_DAYS
+    keep_last: int = DEFAULT_KEEP_LAST
+
+
+@dataclass
+class CollectedRelease:
+    release_id: str
+    files: int = 0
+    bytes: int = 0
+    status: Optional[str] = None
+
+
+@dataclass
+class MediaGCReport:
+    """Result of a GC run (dry run or applied)."""
+    dry_run: bool
+    action: str  # "delete" or "archive"
+    kept: Dict[str, List[str]] = field(default_factory=dict)  # release_id -> reasons
+    collected: List[CollectedRelease] = field(default_factory=list)
+    store_files_collected: int = 0
+    reclaimable_bytes: int = 0
+    errors: List[str] = field(default_factory=list)
+
+    def to_dict(self) -> Dict[str, object]:
+        return {
+            "dry_run": self.dry_run,
+            "action": self.action,
+            "kept": self.kept,
+            "collected": [vars(r) for r in self.collected],
+            "store_files_collected": self.store_files_collected,
+            "reclaimable_bytes": self.reclaimable_bytes,
+            "errors": self.errors,
+        }
+
+
+def _walk_files(root: Path, limiter: IORateLimiter) -> Iterator[Tuple[Path, os.stat_result]]:
+    """Yield (path, lstat) for regular files/symlinks below root, throttled."""
+    stack = [root]
+    while stack:
+        current = stack.pop()
+        try:
+            entries = list(os.scandir(current))
+        except OSError:
+            continue
+        for entry in entries:
+            limiter.throttle()
+            try:
+                st = entry.stat(follow_symlinks=False)
+            except OSError:
+                continue
+            if entry.is_dir(follow_symlinks=False):
+                stack.append(Path(entry.path))
+            else:
+                yield Path(entry.path), st
+
+
+def _current_release(media_root: Path, releases_root: Path) -> Optional[str]:
+    """Release directory that media/current points at (if it is a symlink into releases/)."""
+    current = media_root / "current"
+    if not current.is_symlink():
+        return None
+    try:
+        target = current.resolve()
+    except OSError:
+        return None
+    if target.parent == releases_root.resolve():
+        return target.name
+    return None
+
+
+# sha256 of store files in media URLs (media_delivery.store_media_url)
+_STORE_URL_HASH = re.compile(r"/store/[0-9a-f]{2}/([0-9a-f]{64})")
+
+
+def _referenced_store_hashes(session: Session) -> Set[str]:
+    """sha256 of store files referenced by question or answer media URLs."""
+    hashes: Set[str] = set()
+    for media, answers in session.execute(select(QuizQuestion.media, QuizQuestion.answers)):
+        hashes.update(_STORE_URL_HASH.findall(json.dumps([media, answers])))
+    return hashes
+
+
+def _snapshot_store_hashes(snapshot_dir: Optional[Path]) -> Set[str]:
+    """sha256 of store files referenced by the ``current`` and ``releases/*`` snapshots."""
+    hashes: Set[str] = set()
+    if snapshot_dir is None:
+        return hashes
+    snapshot_dir = Path(snapshot_dir)
+    links = [snapshot_dir / CURRENT_LINK]
+    releases_dir = snapshot_dir / RELEASES_DIRNAME
+    if releases_dir.is_dir():
+        links.extend(releases_dir.iterdir())
+    paths = {link.resolve() for link in links if link.is_symlink() and link.exists()}
+    for path in sorted(paths):
+        # An unreadable snapshot aborts the run (SnapshotError/OSError) rather
+        # than collecting media it may still reference
+        snapshot = ContentSnapshot(path)
+        try:
+            for question_id in snapshot.question_ids():
+                question = snapshot.get_question(question_id)
+                hashes.update(_STORE_URL_HASH.findall(json.dumps([question.media, question.answers])))
+        finally:
+            snapshot.close()
+    return hashes
+
+
+def compute_kept_releases(
+    session: Session,
+    media_root: Path,
+    release_dirs: Dict[str, float],
+    policy: GCPolicy,
+    now: Optional[datetime] = None,
+) -> Dict[str, List[str]]:
+    """Return release_id -> reasons for every release directory that must be kept.
+
+    Args:
+        session: Quiz DB session
+        media_root: Media root (contains releases/ and current)
+        release_dirs: release_id -> directory mtime (epoch seconds)
+        policy: Retention policy
+    """
+    now = now or datetime.now(timezone.utc)
+    kept: Dict[str, List[str]] = {}
+
+    def keep(release_id: Optional[str], reason: str) -> None:
+        if release_id and release_id in release_dirs:
+            kept.setdefault(release_id, []).append(reason)
+
+    releases = {r.release_id: r for r in session.execute(select(QuizContentRelease)).scalars()}
+    for release in releases.values():
+        if release.status == "published":
+            keep(release.release_id, "published")
+
+    keep(_current_release(media_root, media_root / "releases"), "media/current")
+
+    for (release_id,) in session.execute(select(QuizTopic.release_id).distinct()):
+        keep(release_id, "referenced by topics")
+    for (release_id,) in session.execute(select(QuizQuestion.release_id).distinct()):
+        keep(release_id, "referenced by questions")
+
+    for (release_id,) in session.execute(
+        select(QuizJob.release_id).where(QuizJob.status.in_(_ACTIVE_JOB_STATUSES)).distinct()
+    ):
+        keep(release_id, "active job")
+
+    def last_activity(release_id: str) -> datetime:
+        mtime = datetime.fromtimestamp(release_dirs[release_id], timezone.utc)
+        release = releases.get(release_id)
+        if release is not None:
+            stamps = [s for s in (release.updated_at, release.created_at, release.imported_at) if s]
+            stamps = [s if s.tzinfo else s.replace(tzinfo=timezone.utc) for s in stamps]
+            mtime = max([mtime, *stamps])
+        return mtime
+
+    activity = {release_id: last_activity(release_id) for release_id in release_dirs}
+    cutoff = now - timedelta(days=policy.keep_drafts_days)
+    for release_id, last in activity.items():
+        release = releases.get(release_id)
+        if last >= cutoff and (release is None or release.status == "draft"):
+            keep(release_id, f"draft newer than {policy.keep_drafts_days}d")
+
+    newest = sorted(activity, key=lambda rid: activity[rid], reverse=True)[: max(policy.keep_last, 0)]
+    for release_id in newest:
+        keep(release_id, f"among {policy.keep_last} most recent")
+
+    return kept
+
+
+def collect_media_garbage(
+    session: Session,
+    media_root: Path,
+    policy: Optional[GCPolicy] = None,
+    dry_run: bool = True,
+    archive_dir: Optional[Path] = None,
+    limiter: Optional[IORateLimiter] = None,
+) -> MediaGCReport:
+    """Find unreachable release directories / store files and delete or archive them.
+
+    Args:
+        session: Quiz DB session (read-only use)
+        media_root: Media root directory
+        policy: Retention policy (defaults: 30 days, keep last 3)
+        dry_run: Only report (default)
+        archive_dir: Move collected releases here instead of deleting
+            (store files are always deleted; their content lives on in the
+            archived release directories)
+        limiter: I/O rate limiter (default: unthrottled)
+
+    Returns:
+        MediaGCReport
+    """
+    media_root = Path(media_root)
+    policy = policy or GCPolicy()
+    limiter = limiter or IORateLimiter()
+    releases_root = media_root / "releases"
+    store_root = media_root / MEDIA_STORE_DIRNAME
+    report = MediaGCReport(dry_run=dry_run, action="archive" if archive_dir else "delete")
+
+    release_dirs: Dict[str, float] = {}
+    if releases_root.is_dir():
+        for entry in os.scandir(releases_root):
+            limiter.throttle()
+            if entry.is_dir(follow_symlinks=False):
+                release_dirs[entry.name] = entry.stat(follow_symlinks=False).st_mtime
+
+    report.kept = compute_kept_releases(session, media_root, release_dirs, policy)
+    collected_ids = sorted(set(release_dirs) - set(report.kept))
+
+    # Inodes still referenced by kept releases (hardlinks and symlink targets)
+    live: Set[FileKey] = set()
+    for release_id in report.kept:
+        for path, st in _walk_files(releases_root / release_id, limiter):
+            if path.is_symlink():
+                try:
+                    st = path.stat()
+                except OSError:
+                    continue
+            live.add((st.st_dev, st.st_ino))
+
+    # inode -> [links among candidates, st_nlink, size]; an inode is reclaimed
+    # only when all of its links are collected
+    candidate_links: Dict[FileKey, List[int]] = {}
+
+    def add_candidate(st: os.stat_result) -> None:
+        key = (st.st_dev, st.st_ino)
+        entry = candidate_links.setdefault(key, [0, st.st_nlink, st.st_size])
+        entry[0] += 1
+
+    for release_id in collected_ids:
+        collected = CollectedRelease(
+            release_id=release_id,
+            status=getattr(session.get(QuizContentRelease, release_id), "status", None),
+        )
+        for _path, st in _walk_files(releases_root / release_id, limiter):
+            collected.files += 1
+            collected.bytes += st.st_size
+            add_candidate(st)
+        report.collected.append(collected)
+
+    store_candidates: List[Tuple[Path, os.stat_result]] = []
+    grace_cutoff = time.time() - STORE_GRACE_SECONDS
+    if store_root.is_dir():
+        referenced = _referenced_store_hashes(session) | _snapshot_store_hashes(get_content_snapshot_dir())
+        for path, st in _walk_files(store_root, limiter):
+            if path.parent.name == ".tmp" and st.st_mtime >= grace_cutoff:
+                continue
+            if (st.st_dev, st.st_ino) in live or st.st_mtime >= grace_cutoff:
+                continue
+            if path.name[:64] in referenced:
+                continue
+            store_candidates.append((path, st))
+            add_candidate(st)
+    report.store_files_collected = len(store_candidates)
+
+    report.reclaimable_bytes = sum(
+        size for links, nlink, size in candidate_links.values() if links >= nlink
+    )
+
+    logger.info(
+        f"Media GC: {len(report.kept)} release(s) kept, {len(collected_ids)} collectable, "
+        f"{len(store_candidates)} store file(s), {report.reclaimable_bytes} bytes reclaimable "
+        f"({'dry run' if dry_run else report.action})"
+    )
+    if dry_run:
+        return report
+
+    for collected in report.collected:
+        release_path = releases_root / collected.release_id
+        try:
+            if archive_dir is not None:
+                archive_dir.mkdir(parents=True, exist_ok=True)
+                limiter.throttle(nbytes=collected.bytes)
+                shutil.move(str(release_path), str(Path(archive_dir) / collected.release_id))
+            else:
+                _remove_tree(release_path, limiter)
+            logger.info(f"[OK] {report.action} release directory {collected.release_id}")
+        except OSError as e:
+            report.errors.append(f"{collected.release_id}: {e}")
+            logger.error(f"Media GC failed for {collected.release_id}: {e}")
+
+    for path, st in store_candidates:
+        try:
+            limiter.throttle(nbytes=st.st_size)
+            path.unlink()
+        except OSError as e:
+            report.errors.append(f"{path.name}: {e}")
+
+    return report
+
+
+def _remove_tree(root: Path, limiter: IORateLimiter) -> None:
+    """Delete a directory tree file by file (throttled), then its directories."""
+    dirs: List[Path] = []
+    for dirpath, dirnames, filenames in os.walk(root, topdown=True, followlinks=False):
+        dirs.append(Path(dirpath))
+        for name in filenames + [d for d in dirnames if (Path(dirpath) / d).is_symlink()]:
+            path = Path(dirpath) / name
+            try:
+                size = path.lstat().st_size
+            except OSError:
+                size = 0
+            limiter.throttle(nbytes=size)
+            path.unlink(missing_ok=True)
+    for directory in reversed(dirs):
+        limiter.throttle()
+        directory.rmdir()
@@ -0,0 +1,190 @@
+"""Content-addressed media store for dashboard uploads.
+
+Uploaded media are streamed to disk in chunks while their SHA256 is
+computed, then stored once under ``<media_root>/store/<aa>/<sha256><ext>``.
+A release's ``audio/<filename>`` entry is a hardlink to the stored file
+(symlink if hardlinks are not possible, copy as a last resort), so the same
+MP3 uploaded into several releases occupies disk space once.
+
+Design:
+- Size limits (per file, per request) are enforced while streaming; a file
+  exceeding them is discarded before it reaches the store
+- Store files are written via temp file + rename and made read-only; they
+  are never modified in place (a changed upload is a new hash)
+- The computed hash is recorded in the release manifest with the linked
+  file's size/mtime, so the import reuses it instead of rehashing
+"""
+
+from __future__ import annotations
+
+import hashlib
+import logging
+import os
+import shutil
+import stat
+import uuid
+from dataclasses import dataclass
+from pathlib import Path
+from typing import BinaryIO, Optional
+
+logger = logging.getLogger(__name__)
+
+MEDIA_STORE_DIRNAME = "store"
+STREAM_CHUNK_SIZE = 1024 * 1024
+
+
+class MediaTooLargeError(ValueError):
+    """Raised when an upload exceeds the per-file or per-request size limit."""
+
+    def __init__(self, filename: str, limit: int, scope: str):
+        super().__init__(f"{filename} exceeds the {scope} upload limit of {limit} bytes")
+        self.filename = filename
+        self.limit = limit
+        self.scope = scope
+
+
+@dataclass
+class StoredMedia:
+    """A media file stored in the content-addressed store."""
+    sha256: str
+    size: int
+    path: Path
+    deduplicated: bool
+
+
+def get_media_store_root(media_root: Path) -> Path:
+    return Path(media_root) / MEDIA_STORE_DIRNAME
+
+
+def store_path_for(store_root: Path, sha256: str, suffix: str = "") -> Path:
+    return Path(store_root) / sha256[:2] / f"{sha256}{suffix.lower()}"
+
+
+def store_stream(
+    stream: BinaryIO,
+    filename: str,
+    store_root: Path,
+    max_file_bytes: Optional[int] = None,
+    max_total_bytes: Optional[int] = None,
+) -> StoredMedia:
+    """Stream an upload into the store, hashing on the fly.
+
+    Args:
+        stream: Readable binary stream (e.g. ``FileStorage.stream``)
+        filename: Original (sanitized) filename, used for the extension and errors
+        store_root: Store directory (``get_media_store_root(media_root)``)
+        max_file_bytes: Per-file limit (None = unlimited)
+        max_total_bytes: Remaining per-request budget (None = unlimited)
+
+    Returns:
+        StoredMedia for the (possibly pre-existing) store file
+
+    Raises:
+        MediaTooLargeError: A limit was exceeded (nothing is stored)
+        OSError: Filesystem errors
+    """
+    store_root = Path(store_root)
+    tmp_dir = store_root / ".tmp"
+    tmp_dir.mkdir(parents=True, exist_ok=True)
+    tmp_path = tmp_dir / f"{uuid.uuid4().hex}.part"
+
+    digest = hashlib.sha256()
+    size = 0
+    try:
+        with open(tmp_path, "wb") as out:
+            while True:
+                chunk = stream.read(STREAM_CHUNK_SIZE)
+                if not chunk:
+                    break
+                size += len(chunk)
+                if max_file_bytes is not None and size > max_file_bytes:
+                    raise MediaTooLargeError(filename, max_file_bytes, "per-file")
+                if max_total_bytes is not None and size > max_total_bytes:
+                    raise MediaTooLargeError(filename, max_total_bytes, "per-request")
+                digest.update(chunk)
+                out.write(chunk)
+
+        sha256 = digest.hexdigest()
+        target = store_path_for(store_root, sha256, Path(filename).suffix)
+        if target.exists():
+            return StoredMedia(sha256=sha256, size=size, path=target, deduplicated=True)
+
+        target.parent.mkdir(parents=True, exist_ok=True)
+        os.chmod(tmp_path, stat.S_IRUSR | stat.S_IRGRP | stat.S_IROTH)
+        os.replace(tmp_path, target)
+        return StoredMedia(sha256=sha256, size=size, path=target, deduplicated=False)
+    finally:
+        tmp_path.unlink(missing_ok=True)
+
+
+def link_into_release(stored: Path, destination: Path) -> str:
+    """Atomically point ``destination`` at a store file.
+
+    Returns:
+        "hardlink", "symlink" or "copy"
+    """
+    destination = Path(destination)
+    tmp_path = destination.with_name(f".{destination.name}.{uuid.uuid4().hex}.tmp")
+    try:
+        try:
+            os.link(stored, tmp_path)
+            method = "hardlink"
+        except OSError:
+            try:
+                os.symlink(os.path.relpath(stored, destination.parent), tmp_path)
+                method = "symlink"
+            except OSError:
+                shutil.copy2(stored, tmp_path)
+                method = "copy"
+        os.replace(tmp_path, destination)
+        return method
+    finally:
+        if tmp_path.is_symlink() or tmp_path.exists():
+            tmp_path.unlink()
+
+
+def add_file_to_store(source: Path, sha256: str, store_root: Path, hardlink: bool = False) -> Path:
+    """Make sure the store holds ``source`` (whose hash is already known).
+
+    Used by the import for release media that did not come through
+    ``store_stream`` (CLI/rsync imports). Release files stay writable, so
+    they are copied: a hardlink would share the inode, and an in-place edit
+    of the release file would change the store file behind its hash. The
+    copy is made read-only.
+
+    Args:
+        source: File to add
+        sha256: Its hash (the store key)
+        store_root: Store directory
+        hardlink: ``source`` is a private, read-only file of the caller (e.g.
+            a transcode output in ``store/.tmp``); link it instead of copying
+            (falls back to a copy)
+
+    Returns:
+        Path of the store file
+    """
+    source = Path(source)
+    store_root = Path(store_root)
+    target = store_path_for(store_root, sha256, source.suffix)
+    if target.exists():
+        return target
+
+    tmp_dir = store_root / ".tmp"
+    tmp_dir.mkdir(parents=True, exist_ok=True)
+    tmp_path = tmp_dir / f"{uuid.uuid4().hex}.part"
+    try:
+        linked = False
+        if hardlink:
+            try:
+                os.link(source.resolve(), tmp_path)
+                linked = True
+            except OSError:
+                pass
+        if not linked:
+            shutil.copy2(source, tmp_path)
+            os.chmod(tmp_path, stat.S_IRUSR | stat.S_IRGRP | stat.S_IROTH)
+        target.parent.mkdir(parents=True, exist_ok=True)
+        os.replace(tmp_path, target)
+        return target
+    finally:
+        tmp_path.unlink(missing_ok=True)
@@ -0,0 +1,613 @@
+"""Import-time media transcoding: audio variants and image derivatives.
+
+Media arrive as uploaded: high-bitrate WAV/MP3 audio, PNG/JPEG images of
+any size. During import every referenced file is probed and re-encoded with
+ffmpeg:
+
+- audio: speech-bitrate variants (AUDIO_PROFILES) plus the duration. The
+  question media JSON lists the variants with MIME type and size, so the
+  client can pick the smallest one it can play; the duration feeds the
+  question timer
+- images: resized derivatives (IMAGE_FORMATS x IMAGE_WIDTHS) listed as a
+  ``srcset`` with dimensions, so a 300 px answer tile does not download a
+  4 MB PNG
+
+Outputs are ordinary media store files (immutable ``/quiz-media/store/...``
+URLs). Results are cached by source hash in ``store/<aa>/<sha256><suffix>``
+records (TRANSCODE_RECORD_SUFFIX / IMAGE_RECORD_SUFFIX):
+- a record is reused while its version matches and all of its output files
+  still exist, so re-imports and other releases with the same file never
+  run ffmpeg again
+- media GC keeps a record as long as its source file is referenced (it
+  shares the source's hash prefix) and outputs while question media
+  reference them
+
+Design:
+- One ffmpeg/ffprobe subprocess per call, ``-threads 1``; the import pool
+  (QUIZ_IMPORT_WORKERS) decides how many run in parallel
+- Outputs that are not smaller than the source are dropped
+- Formats the local ffmpeg cannot write (e.g. AVIF before ffmpeg 6) are
+  skipped; GIFs are left alone (animation)
+- Without ffmpeg on PATH nothing new is transcoded; cached records are still
+  used and the original file keeps being served
+"""
+
+from __future__ import annotations
+
+import functools
+import hashlib
+import json
+import os
+import shutil
+import stat
+import subprocess
+import uuid
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Any, Callable, Dict, FrozenSet, List, Optional, Sequence, Tuple, Union
+
+from .fs_utils import atomic_write_text
+from .media_store import add_file_to_store, store_path_for
+from .validation import ALLOWED_IMAGE_EXTENSIONS
+
+# Bump when AUDIO_PROFILES change: cached records are ignored and re-created
+TRANSCODE_VERSION = 1
+TRANSCODE_RECORD_SUFFIX = ".transcode.json"
+# Bump when IMAGE_FORMATS / IMAGE_WIDTHS change
+IMAGE_DERIVATIVE_VERSION = 1
+IMAGE_RECORD_SUFFIX = ".derivatives.json"
+FFMPEG_TIMEOUT_SECONDS = 300
+FFPROBE_TIMEOUT_SECONDS = 60
+
+
+@dataclass(frozen=True)
+class AudioProfile:
+    """An ffmpeg output profile for one streaming variant."""
+    name: str
+    suffix: str
+    mime: str  # for HTMLMediaElement.canPlayType
+    args: Tuple[str, ...]
+
+
+AUDIO_PROFILES: Tuple[AudioProfile, ...] = (
+    AudioProfile(
+        name="opus",
+        suffix=".opus",
+        mime='audio/ogg; codecs="opus"',
+        args=("-c:a", "libopus", "-b:a", "32k", "-ac", "1", "-application", "voip", "-f", "ogg"),
+    ),
+    AudioProfile(
+        name="aac",
+        suffix=".m4a",
+        mime='audio/mp4; codecs="mp4a.40.2"',
+        args=("-c:a", "aac", "-b:a", "48k", "-ac", "1", "-movflags", "+faststart", "-f", "mp4"),
+    ),
+)
+
+
+@dataclass(frozen=True)
+class ImageFormat:
+    """An ffmpeg output format for image derivatives."""
+    name: str
+    suffix: str
+    mime: str  # <source type="...">
+    encoder: str
+    muxer: str
+    args: Tuple[str, ...]
+    alpha: bool  # keeps transparency
+
+
+# In order of preference (the client lists <source> elements in this order)
+IMAGE_FORMATS: Tuple[ImageFormat, ...] = (
+    ImageFormat(
+        name="avif",
+        suffix=".avif",
+        mime="image/avif",
+        encoder="libaom-av1",
+        muxer="avif",
+        args=("-c:v", "libaom-av1", "-still-picture", "1", "-crf", "32", "-b:v", "0",
+              "-cpu-used", "6", "-pix_fmt", "yuv420p"),
+        alpha=False,
+    ),
+    ImageFormat(
+        name="webp",
+        suffix=".webp",
+        mime="image/webp",
+        encoder="libwebp",
+        muxer="webp",
+        args=("-c:v", "libwebp", "-quality", "80", "-compression_level", "4"),
+        alpha=True,
+    ),
+)
+IMAGE_WIDTHS: Tuple[int, ...] = (320, 640, 1280)
+
+# Extensions of transcoded outputs (served from the store besides ALLOWED_MEDIA_EXTENSIONS)
+TRANSCODED_MEDIA_EXTENSIONS: FrozenSet[str] = frozenset(
+    [p.suffix for p in AUDIO_PROFILES] + [f.suffix for f in IMAGE_FORMATS]
+)
+
+# Pixel formats with an alpha channel (pal8 may carry PNG transparency)
+_ALPHA_PIX_FMT_PREFIXES = ("rgba", "bgra", "argb", "abgr", "ya", "yuva", "gbrap", "pal8")
+
+
+@dataclass
+class AudioVariant:
+    """A transcoded variant stored in the media store."""
+    profile: str
+    sha256: str
+    suffix: str
+    mime: str
+    bytes: int
+
+
+@dataclass
+class TranscodedAudio:
+    """Duration and variants of one source audio file."""
+    sha256: str
+    bytes: int
+    duration: Optional[float] = None  # seconds
+    variants: List[AudioVariant] = field(default_factory=list)
+    cached: bool = False
+    error: Optional[str] = None
+
+
+@dataclass
+class ImageDerivative:
+    """A resized, re-encoded image stored in the media store."""
+    format: str
+    sha256: str
+    suffix: str
+    mime: str
+    width: int
+    height: int
+    bytes: int
+
+
+@dataclass
+class ImageDerivatives:
+    """Dimensions and derivatives of one source image."""
+    sha256: str
+    bytes: int
+    width: Optional[int] = None
+    height: Optional[int] = None
+    derivatives: List[ImageDerivative] = field(default_factory=list)
+    cached: bool = False
+    error: Optional[str] = None
+
+
+ProcessedMedia = Union[TranscodedAudio, ImageDerivatives]
+
+
+@dataclass
+class TranscodeJob:
+    """Work item for ``transcode_media`` (picklable for process pools)."""
+    source: Path
+    sha256: str
+    store_root: Path
+
+
+def ffmpeg_available() -> bool:
+    return shutil.which("ffmpeg") is not None and shutil.which("ffprobe") is not None
+
+
+def is_image_file(name: Union[str, Path]) -> bool:
+    return Path(name).suffix.lower() in ALLOWED_IMAGE_EXTENSIONS
+
+
+# ---------------------------------------------------------------------------
+# Records (cache by source hash)
+# ---------------------------------------------------------------------------
+
+def transcode_record_path(store_root: Path, sha256: str) -> Path:
+    return Path(store_root) / sha256[:2] / f"{sha256}{TRANSCODE_RECORD_SUFFIX}"
+
+
+def image_record_path(store_root: Path, sha256: str) -> Path:
+    return Path(store_root) / sha256[:2] / f"{sha256}{IMAGE_RECORD_SUFFIX}"
+
+
+def _read_record(path: Path, version: int) -> Optional[Dict[str, Any]]:
+    try:
+        data = json.loads(path.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return None
+    if not isinstance(data, dict) or data.get("version") != version:
+        return None
+    return data
+
+
+def _write_record(path: Path, payload: Dict[str, Any]) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    atomic_write_text(path, json.dumps(payload, indent=2))
+
+
+def _outputs_exist(store_root: Path, outputs: Sequence[Any]) -> bool:
+    # An output collected by media GC means: transcode again
+    return all(store_path_for(store_root, o.sha256, o.suffix).is_file() for o in outputs)
+
+
+def load_transcode_record(store_root: Path, sha256: str) -> Optional[TranscodedAudio]:
+    """Return the cached audio result for a source hash, or None if missing/stale."""
+    data = _read_record(transcode_record_path(store_root, sha256), TRANSCODE_VERSION)
+    if data is None:
+        return None
+    try:
+        record = TranscodedAudio(
+            sha256=sha256,
+            bytes=int(data["bytes"]),
+            duration=data.get("duration"),
+            variants=[AudioVariant(**entry) for entry in data.get("variants") or []],
+            cached=True,
+        )
+    except (KeyError, TypeError, ValueError):
+        return None
+    return record if _outputs_exist(store_root, record.variants) else None
+
+
+def load_image_record(store_root: Path, sha256: str) -> Optional[ImageDerivatives]:
+    """Return the cached image result for a source hash, or None if missing/stale."""
+    data = _read_record(image_record_path(store_root, sha256), IMAGE_DERIVATIVE_VERSION)
+    if data is None:
+        return None
+    try:
+        record = ImageDerivatives(
+            sha256=sha256,
+            bytes=int(data["bytes"]),
+            width=data.get("width"),
+            height=data.get("height"),
+            derivatives=[ImageDerivative(**entry) for entry in data.get("derivatives") or []],
+            cached=True,
+        )
+    except (KeyError, TypeError, ValueError):
+        return None
+    return record if _outputs_exist(store_root, record.derivatives) else None
+
+
+# ---------------------------------------------------------------------------
+# ffmpeg helpers
+# ---------------------------------------------------------------------------
+
+def _ffprobe(path: Path, entries: str, stream: bool) -> Dict[str, Any]:
+    """Run ffprobe and return the format or first video stream section ({} on failure)."""
+    args = ["ffprobe", "-v", "error", "-show_entries", entries, "-of", "json"]
+    if stream:
+        args[3:3] = ["-select_streams", "v:0"]
+    try:
+        completed = subprocess.run(
+            [*args, str(path)],
+            capture_output=True,
+            text=True,
+            timeout=FFPROBE_TIMEOUT_SECONDS,
+            check=True,
+        )
+        data = json.loads(completed.stdout)
+    except (OSError, subprocess.SubprocessError, ValueError):
+        return {}
+    if stream:
+        streams = data.get("streams") or [{}]
+        return streams[0] if isinstance(streams[0], dict) else {}
+    return data.get("format") or {}
+
+
+def probe_duration(path: Path) -> Optional[float]:
+    """Return the duration of an audio file in seconds (ffprobe), or None."""
+    try:
+        duration = float(_ffprobe(path, "format=duration", stream=False).get("duration"))
+    except (TypeError, ValueError):
+        return None
+    return round(duration, 3) if duration > 0 else None
+
+
+def probe_image(path: Path) -> Tuple[Optional[int], Optional[int], str]:
+    """Return (width, height, pix_fmt) of an image (ffprobe)."""
+    info = _ffprobe(path, "stream=width,height,pix_fmt", stream=True)
+    width, height = info.get("width"), info.get("height")
+    if not isinstance(width, int) or not isinstance(height, int) or width <= 0 or height <= 0:
+        return None, None, ""
+    return width, height, str(info.get("pix_fmt") or "")
+
+
+@functools.lru_cache(maxsize=None)
+def _ffmpeg_capabilities() -> Tuple[FrozenSet[str], FrozenSet[str]]:
+    """(encoders, muxers) supported by the local ffmpeg."""
+    found = []
+    for flag in ("-encoders", "-muxers"):
+        try:
+            output = subprocess.run(
+                ["ffmpeg", "-hide_banner", flag],
+                capture_output=True,
+                text=True,
+                timeout=FFPROBE_TIMEOUT_SECONDS,
+                check=True,
+            ).stdout
+        except (OSError, subprocess.SubprocessError):
+            output = ""
+        # " V....D libwebp  ..." / "  E webp  ..."
+        found.append(frozenset(
+            parts[1] for parts in (line.split() for line in output.splitlines()) if len(parts) > 1
+        ))
+    return found[0], found[1]
+
+
+def supported_image_formats() -> Tuple[ImageFormat, ...]:
+    encoders, muxers = _ffmpeg_capabilities()
+    return tuple(f for f in IMAGE_FORMATS if f.encoder in encoders and f.muxer in muxers)
+
+
+def derivative_widths(width: int) -> List[int]:
+    """Target widths for a source: every IMAGE_WIDTHS step below it, capped at the largest."""
+    widths = {w for w in IMAGE_WIDTHS if w < width}
+    widths.add(min(width, IMAGE_WIDTHS[-1]))
+    return sorted(widths)
+
+
+def _run_ffmpeg(source: Path, output: Path, args: Sequence[str]) -> None:
+    subprocess.run(
+        [
+            "ffmpeg", "-nostdin", "-hide_banner", "-loglevel", "error", "-y",
+            "-i", str(source), "-map_metadata", "-1", "-threads", "1",
+            *args, str(output),
+        ],
+        capture_output=True,
+        timeout=FFMPEG_TIMEOUT_SECONDS,
+        check=True,
+    )
+
+
+def _ffmpeg_error(label: str, exc: Exception) -> str:
+    if isinstance(exc, subprocess.CalledProcessError):
+        stderr = (exc.stderr or b"").decode("utf-8", errors="replace").strip()
+        return f"ffmpeg ({label}) failed: {stderr[-300:] or exc.returncode}"
+    return f"ffmpeg ({label}) failed: {exc}"
+
+
+def _encode_into_store(
+    source: Path,
+    store_root: Path,
+    suffix: str,
+    args: Sequence[str],
+    max_bytes: int,
+) -> Optional[Tuple[str, int]]:
+    """Encode ``source`` and add the output to the store.
+
+    Returns:
+        (sha256, size) of the output, or None if it is not smaller than max_bytes
+
+    Raises:
+        OSError / subprocess.SubprocessError on ffmpeg or filesystem failures
+    """
+    tmp_dir = store_root / ".tmp"
+    tmp_dir.mkdir(parents=True, exist_ok=True)
+    tmp_path = tmp_dir / f"{uuid.uuid4().hex}{suffix}"
+    try:
+        _run_ffmpeg(source, tmp_path, args)
+        size = tmp_path.stat().st_size
+        if size >= max_bytes:
+            return None
+        with open(tmp_path, "rb") as f:
+            sha256 = hashlib.file_digest(f, "sha256").hexdigest()
+        os.chmod(tmp_path, stat.S_IRUSR | stat.S_IRGRP | stat.S_IROTH)
+        add_file_to_store(tmp_path, sha256, store_root, hardlink=True)
+        return sha256, size
+    finally:
+        tmp_path.unlink(missing_ok=True)
+
+
+# ---------------------------------------------------------------------------
+# Workers (module-level so process pools can pickle them)
+# ---------------------------------------------------------------------------
+
+def transcode_audio(job: TranscodeJob) -> TranscodedAudio:
+    """Probe and transcode one audio file.
+
+    Failures are returned in ``error`` instead of raised. A record is only
+    written when every profile succeeded, so a partial result is retried on
+    the next import.
+    """
+    store_root = Path(job.store_root)
+    cached = load_transcode_record(store_root, job.sha256)
+    if cached is not None:
+        return cached
+
+    source = Path(job.source)
+    try:
+        size = source.stat().st_size
+    except OSError as e:
+        return TranscodedAudio(sha256=job.sha256, bytes=0, error=str(e))
+
+    result = TranscodedAudio(sha256=job.sha256, bytes=size, duration=probe_duration(source))
+    if result.duration is None:
+        result.error = "ffprobe could not read a duration"
+        return result
+
+    for profile in AUDIO_PROFILES:
+        try:
+            stored = _encode_into_store(
+                source, store_root, profile.suffix, ("-vn", *profile.args), size
+            )
+        except (OSError, subprocess.SubprocessError) as e:
+            result.error = _ffmpeg_error(profile.name, e)
+            continue
+        if stored is not None:
+            result.variants.append(
+                AudioVariant(
+                    profile=profile.name,
+                    sha256=stored[0],
+                    suffix=profile.suffix,
+                    mime=profile.mime,
+                    bytes=stored[1],
+                )
+            )
+
+    if result.error is None:
+        try:
+            _write_record(
+                transcode_record_path(store_root, job.sha256),
+                {
+                    "version": TRANSCODE_VERSION,
+                    "bytes": result.bytes,
+                    "duration": result.duration,
+                    "variants": [asdict(v) for v in result.variants],
+                },
+            )
+        except OSError as e:
+            result.error = f"could not write transcode record: {e}"
+    return result
+
+
+def derive_image(job: TranscodeJob) -> ImageDerivatives:
+    """Probe one image and write its resized derivatives.
+
+    Same error/record semantics as ``transcode_audio``.
+    """
+    store_root = Path(job.store_root)
+    cached = load_image_record(store_root, job.sha256)
+    if cached is not None:
+        return cached
+
+    source = Path(job.source)
+    try:
+        size = source.stat().st_size
+    except OSError as e:
+        return ImageDerivatives(sha256=job.sha256, bytes=0, error=str(e))
+
+    width, height, pix_fmt = probe_image(source)
+    result = ImageDerivatives(sha256=job.sha256, bytes=size, width=width, height=height)
+    if width is None or height is None:
+        result.error = "ffprobe could not read the image size"
+        return result
+
+    has_alpha = pix_fmt.startswith(_ALPHA_PIX_FMT_PREFIXES)
+    if source.suffix.lower() != ".gif":
+        formats = [f for f in supported_image_formats() if f.alpha or not has_alpha]
+        for image_format in formats:
+            for target_width in derivative_widths(width):
+                target_height = max(1, round(height * target_width / width))
+                args = (
+                    "-frames:v", "1",
+                    "-vf", f"scale={target_width}:{target_height}:flags=lanczos",
+                    *image_format.args,
+                    "-f", image_format.muxer,
+                )
+                try:
+                    stored = _encode_into_store(
+                        source, store_root, image_format.suffix, args, size
+                    )
+                except (OSError, subprocess.SubprocessError) as e:
+                    result.error = _ffmpeg_error(f"{image_format.name} {target_width}w", e)
+                    continue
+                if stored is not None:
+                    result.derivatives.append(
+                        ImageDerivative(
+                            format=image_format.name,
+                            sha256=stored[0],
+                            suffix=image_format.suffix,
+                            mime=image_format.mime,
+                            width=target_width,
+                            height=target_height,
+                            bytes=stored[1],
+                        )
+                    )
+
+    if result.error is None:
+        try:
+            _write_record(
+                image_record_path(store_root, job.sha256),
+                {
+                    "version": IMAGE_DERIVATIVE_VERSION,
+                    "bytes": result.bytes,
+                    "width": result.width,
+                    "height": result.height,
+                    "derivatives": [asdict(d) for d in result.derivatives],
+                },
+            )
+        except OSError as e:
+            result.error = f"could not write derivatives record: {e}"
+    return result
+
+
+def load_cached_media(job: TranscodeJob) -> Optional[ProcessedMedia]:
+    """Cached result for an audio file or image, or None."""
+    if is_image_file(job.source):
+        return load_image_record(job.store_root, job.sha256)
+    return load_transcode_record(job.store_root, job.sha256)
+
+
+def transcode_media(job: TranscodeJob) -> ProcessedMedia:
+    """Audio variants or image derivatives for one file (pool worker)."""
+    if is_image_file(job.source):
+        return derive_image(job)
+    return transcode_audio(job)
+
+
+def is_usable(result: ProcessedMedia) -> bool:
+    """Whether a (possibly partial) result has metadata worth writing to the media JSON."""
+    if isinstance(result, ImageDerivatives):
+        return result.width is not None
+    return result.duration is not None
+
+
+# ---------------------------------------------------------------------------
+# Media JSON
+# ---------------------------------------------------------------------------
+
+def audio_media_fields(
+    transcoded: TranscodedAudio,
+    store_url: Callable[[str, str], str],
+) -> Dict[str, Any]:
+    """Media JSON fields for a transcoded source (``src`` is set by the caller).
+
+    Args:
+        transcoded: Result for the source file
+        store_url: ``(sha256, suffix) -> URL`` (media_delivery.store_media_url)
+    """
+    fields: Dict[str, Any] = {"bytes": transcoded.bytes}
+    if transcoded.duration is not None:
+        fields["duration"] = transcoded.duration
+    if transcoded.variants:
+        fields["variants"] = [
+            {
+                "src": store_url(variant.sha256, variant.suffix),
+                "mime": variant.mime,
+                "bytes": variant.bytes,
+            }
+            for variant in sorted(transcoded.variants, key=lambda v: v.bytes)
+        ]
+    return fields
+
+
+def image_media_fields(
+    image: ImageDerivatives,
+    store_url: Callable[[str, str], str],
+) -> Dict[str, Any]:
+    """Media JSON fields for an image: dimensions and a ``srcset`` list.
+
+    ``srcset`` entries are grouped by format in IMAGE_FORMATS order, each
+    group by ascending width.
+    """
+    fields: Dict[str, Any] = {"bytes": image.bytes}
+    if image.width is not None and image.height is not None:
+        fields["width"] = image.width
+        fields["height"] = image.height
+    if image.derivatives:
+        order = {f.name: i for i, f in enumerate(IMAGE_FORMATS)}
+        fields["srcset"] = [
+            {
+                "src": store_url(d.sha256, d.suffix),
+                "type": d.mime,
+                "width": d.width,
+                "height": d.height,
+                "bytes": d.bytes,
+            }
+            for d in sorted(image.derivatives, key=lambda d: (order.get(d.format, 99), d.width))
+        ]
+    return fields
+
+
+def media_fields(
+    result: ProcessedMedia,
+    store_url: Callable[[str, str], str],
+) -> Dict[str, Any]:
+    if isinstance(result, ImageDerivatives):
+        return image_media_fields(result, store_url)
+    return audio_media_fields(result, store_url)
@@ -0,0 +1,102 @@
+"""Quiz counters for ``/metrics`` (exposed by ``src.app.extensions.metrics``).
+
+Incremented by the routes once an action succeeded (runs, answers,
+timeouts, jokers), by the caches on lookup and around PIN hashing. Label
+values are bounded: topic ids, answer results, timeout sources and cache
+names.
+
+Uses prometheus_client directly: importing ``src.app`` from here would
+import the app package (and this module again) while services load.
+"""
+
+from __future__ import annotations
+
+import functools
+import logging
+import os
+import time
+from typing import Any, Callable, Sequence, TypeVar
+
+
+def _prepare_multiproc_dir() -> None:
+    """Same as ``src.app.extensions.metrics``: whichever module is imported
+    first creates the directory before ``prometheus_client`` is imported."""
+    path = os.environ.get("PROMETHEUS_MULTIPROC_DIR")
+    if not path:
+        return
+    try:
+        os.makedirs(path, exist_ok=True)
+    except OSError as e:
+        logging.getLogger(__name__).warning(f"PROMETHEUS_MULTIPROC_DIR unusable, metrics per process: {e}")
+        del os.environ["PROMETHEUS_MULTIPROC_DIR"]
+
+
+_prepare_multiproc_dir()
+
+try:  # optional: metrics are disabled without prometheus_client
+    import prometheus_client
+except ImportError:  # pragma: no cover - depends on environment
+    prometheus_client = None
+
+F = TypeVar("F", bound=Callable[..., Any])
+
+HASH_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5)
+
+
+class _NoopMetric:
+    def labels(self, *args: Any, **kwargs: Any) -> "_NoopMetric":
+        return self
+
+    def inc(self, amount: float = 1) -> None:
+        pass
+
+    def observe(self, amount: float) -> None:
+        pass
+
+
+def _counter(name: str, documentation: str, labelnames: Sequence[str] = ()) -> Any:
+    if prometheus_client is None:
+        return _NoopMetric()
+    return prometheus_client.Counter(name, documentation, labelnames)
+
+
+RUNS_STARTED = _counter("quiz_runs_started", "New quiz runs", ("topic_id",))
+RUNS_FINISHED = _counter("quiz_runs_finished", "Finished quiz runs", ("topic_id",))
+ANSWERS = _counter("quiz_answers", "Recorded answers", ("result",))
+# source: "answer" (submitted after the deadline) or "auto" (expired question synced by /state)
+TIMEOUTS = _counter("quiz_timeouts", "Timeouts applied to questions", ("source",))
+JOKERS_USED = _counter("quiz_jokers_used", "50:50 jokers used")
+# cache: "content_snapshot" (question lookups), "validation" (import)
+CACHE_LOOKUPS = _counter("quiz_cache_lookups", "Cache lookups", ("cache", "result"))
+PIN_HASH_SECONDS = (
+    prometheus_client.Histogram(
+        "quiz_pin_hash_duration_seconds",
+        "PIN hashing and verification time (argon2)",
+        ("operation",),
+        buckets=HASH_BUCKETS,
+    )
+    if prometheus_client is not None
+    else _NoopMetric()
+)
+
+# Pre-bound children for the hot paths
+SNAPSHOT_HITS = CACHE_LOOKUPS.labels(cache="content_snapshot", result="hit")
+SNAPSHOT_MISSES = CACHE_LOOKUPS.labels(cache="content_snapshot", result="miss")
+
+
+def timed_pin_hash(operation: str) -> Callable[[F], F]:
+    """Observe the decorated PIN hash/verify function in ``quiz_pin_hash_duration_seconds``."""
+    child = PIN_HASH_SECONDS.labels(operation=operation)
+
+    def decorator(func: F) -> F:
+        @functools.wraps(func)
+        def wrapper(*args: Any, **kwargs: Any) -> Any:
+            start = time.perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                child.observe(time.perf_counter() - start)
+
+        return wrapper  # type: ignore[return-value]
+
+    return decorator
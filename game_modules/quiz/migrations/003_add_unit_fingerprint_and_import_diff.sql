@@ -0,0 +1,13 @@
+-- Migration: Differential re-import support
+-- Date: 2026-10-19
+-- Description:
+--   - quiz_topics.content_hash stores the fingerprint (SHA256 of canonical JSON)
+--     of the unit file last imported into the topic; unchanged units are skipped
+--   - quiz_content_releases.import_diff stores the structured diff of the last
+--     import (added/changed/removed questions, changed answer keys)
+
+ALTER TABLE quiz_topics
+ADD COLUMN IF NOT EXISTS content_hash VARCHAR(64) NULL;
+
+ALTER TABLE quiz_content_releases
+ADD COLUMN IF NOT EXISTS import_diff TEXT NULL;
@@ -0,0 +1,32 @@
+-- Migration: Background jobs for content import/publish/unpublish
+-- Date: 2026-10-19
+-- Description:
+--   - quiz_jobs stores queued/running/finished content jobs with per-phase
+--     progress, cancellation flag and result payload (see job_model.py)
+
+CREATE TABLE IF NOT EXISTS quiz_jobs (
+    id VARCHAR(36) PRIMARY KEY,
+    kind VARCHAR(20) NOT NULL,
+    release_id VARCHAR(50) NOT NULL,
+    status VARCHAR(20) NOT NULL DEFAULT 'queued',
+    phase VARCHAR(30) NULL,
+    progress INTEGER NOT NULL DEFAULT 0,
+    message TEXT NULL,
+    params JSONB NULL,
+    result JSONB NULL,
+    error TEXT NULL,
+    cancel_requested BOOLEAN NOT NULL DEFAULT FALSE,
+    request_id VARCHAR(100) NULL,
+    created_by VARCHAR(100) NULL,
+    worker_id VARCHAR(100) NULL,
+    created_at TIMESTAMPTZ NOT NULL DEFAULT NOW(),
+    started_at TIMESTAMPTZ NULL,
+    finished_at TIMESTAMPTZ NULL,
+    heartbeat_at TIMESTAMPTZ NULL
+);
+
+CREATE INDEX IF NOT EXISTS ix_quiz_jobs_status_created
+ON quiz_jobs (status, created_at);
+
+CREATE INDEX IF NOT EXISTS ix_quiz_jobs_release_created
+ON quiz_jobs (release_id, created_at);
@@ -94,6 +94,7 @@ class QuizTopic(QuizBase):
     authors: Mapped[Optional[List[str]]] = mapped_column(ARRAY(String), nullable=True, server_default='{}')  # List of author names
     based_on: Mapped[Optional[dict]] = mapped_column(JSONB, nullable=True)  # Source information: {chapter_title, chapter_url, course_title, course_url}
     release_id: Mapped[Optional[str]] = mapped_column(String(50), nullable=True)  # Release tracking for production imports
+    content_hash: Mapped[Optional[str]] = mapped_column(String(64), nullable=True)  # Fingerprint of imported unit JSON (differential re-import)
     is_active: Mapped[bool] = mapped_column(Boolean, nullable=False, default=True)
     order_index: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
     created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False, default=datetime.utcnow)
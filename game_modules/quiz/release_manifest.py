@@ -0,0 +1,211 @@
+"""Per-release content manifest (media/releases/<id>/release_manifest.json).
+
+The manifest records what a release directory contains so that unit uploads
+do not have to rescan it:
+
+- units: slug -> file, question count, fingerprint, referenced audio files
+- media: filename -> size, mtime_ns, sha256 (same entry format as the audio
+  checksum manifest, so the import can reuse the hashes)
+
+Design:
+- Each upload updates only the entries it touched (O(upload), not O(release))
+- Writes are atomic (temp file + os.replace) and serialized per release with
+  an flock on a sidecar lock file (several gunicorn workers)
+- A missing or unreadable manifest (releases created before the manifest
+  existed, manual edits) is rebuilt once from a full directory scan
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Dict, List, Mapping, Optional, Tuple
+
+from .fs_utils import atomic_write_text, exclusive_lock
+from .import_service import _sha256_file, fingerprint_unit_data
+
+logger = logging.getLogger(__name__)
+
+RELEASE_MANIFEST_FILENAME = "release_manifest.json"
+RELEASE_MANIFEST_VERSION = 1
+_LOCK_FILENAME = ".release_manifest.lock"
+
+
+def release_manifest_path(release_path: Path) -> Path:
+    return Path(release_path) / RELEASE_MANIFEST_FILENAME
+
+
+def _audio_refs(unit_data: Mapping[str, Any]) -> List[str]:
+    """Audio filenames referenced by a unit (question and answer media)."""
+    refs = set()
+    for q in unit_data.get("questions") or []:
+        if not isinstance(q, dict):
+            continue
+        media_lists = [q.get("media") or []]
+        media_lists.extend((a.get("media") or []) for a in q.get("answers") or [] if isinstance(a, dict))
+        for media_list in media_lists:
+            for media in media_list:
+                if isinstance(media, dict) and media.get("type") == "audio" and media.get("seed_src"):
+                    refs.add(Path(media["seed_src"]).name)
+    return sorted(refs)
+
+
+def unit_manifest_entry(
+    unit_data: Mapping[str, Any],
+    unit_file: Path,
+    fingerprint: Optional[str] = None,
+) -> Dict[str, Any]:
+    """Manifest entry for a unit JSON file that was just written.
+
+    ``fingerprint`` may be passed when the caller already computed it.
+    """
+    try:
+        size = unit_file.stat().st_size
+    except OSError:
+        size = None
+    return {
+        "file": unit_file.name,
+        "questions": len(unit_data.get("questions") or []),
+        "bytes": size,
+        "fingerprint": fingerprint or fingerprint_unit_data(unit_data),
+        "audio_refs": _audio_refs(unit_data),
+    }
+
+
+def media_manifest_entry(media_file: Path, sha256: Optional[str] = None) -> Dict[str, Any]:
+    """Manifest entry for a media file (hashes the file unless sha256 is given)."""
+    st = media_file.stat()
+    return {
+        "size": st.st_size,
+        "mtime_ns": st.st_mtime_ns,
+        "sha256": sha256 or _sha256_file(media_file),
+    }
+
+
+def _summarize(manifest: Dict[str, Any]) -> Dict[str, Any]:
+    units = manifest["units"]
+    media = manifest["media"]
+    referenced = {ref for entry in units.values() for ref in entry.get("audio_refs", [])}
+    manifest["totals"] = {
+        "units": len(units),
+        "questions": sum(entry.get("questions", 0) for entry in units.values()),
+        "media": len(media),
+        "media_bytes": sum(entry.get("size", 0) for entry in media.values()),
+    }
+    manifest["missing_media"] = sorted(referenced - set(media))
+    return manifest
+
+
+def _empty_manifest(release_id: str) -> Dict[str, Any]:
+    return {
+        "version": RELEASE_MANIFEST_VERSION,
+        "release_id": release_id,
+        "updated_at": None,
+        "units": {},
+        "media": {},
+    }
+
+
+def load_release_manifest(release_path: Path) -> Optional[Dict[str, Any]]:
+    """Read the manifest; None if missing, unreadable or from another version."""
+    try:
+        data = json.loads(release_manifest_path(release_path).read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return None
+    if (
+        not isinstance(data, dict)
+        or data.get("version") != RELEASE_MANIFEST_VERSION
+        or not isinstance(data.get("units"), dict)
+        or not isinstance(data.get("media"), dict)
+    ):
+        return None
+    return data
+
+
+def scan_release_manifest(
+    release_path: Path,
+    release_id: str,
+    known_media: Optional[Mapping[str, Dict[str, Any]]] = None,
+) -> Dict[str, Any]:
+    """Build a manifest from a full scan of units/ and audio/ (one-time fallback).
+
+    ``known_media`` entries whose size and mtime still match are reused
+    instead of rehashing the file.
+    """
+    release_path = Path(release_path)
+    known_media = known_media or {}
+    manifest = _empty_manifest(release_id)
+
+    for unit_file in sorted((release_path / "units").glob("*.json")):
+        try:
+            unit_data = json.loads(unit_file.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            # Best effort: malformed files are reported by the import, not here
+            continue
+        if isinstance(unit_data, dict):
+            manifest["units"][unit_file.stem] = unit_manifest_entry(unit_data, unit_file)
+
+    audio_dir = release_path / "audio"
+    if audio_dir.is_dir():
+        for media_file in sorted(audio_dir.iterdir()):
+            if not media_file.is_file():
+                continue
+            known = known_media.get(media_file.name)
+            st = media_file.stat()
+            if known and known.get("size") == st.st_size and known.get("mtime_ns") == st.st_mtime_ns:
+                manifest["media"][media_file.name] = dict(known)
+            else:
+                manifest["media"][media_file.name] = media_manifest_entry(media_file)
+
+    return _summarize(manifest)
+
+
+def _write_manifest(release_path: Path, manifest: Dict[str, Any]) -> None:
+    """Atomically write the manifest (temp file + rename)."""
+    atomic_write_text(
+        release_manifest_path(release_path),
+        json.dumps(manifest, ensure_ascii=False, indent=2, sort_keys=True),
+    )
+
+
+def update_release_manifest(
+    release_path: Path,
+    release_id: str,
+    units: Optional[Mapping[str, Dict[str, Any]]] = None,
+    media: Optional[Mapping[str, Dict[str, Any]]] = None,
+) -> Dict[str, Any]:
+    """Apply changed unit/media entries to the manifest and write it atomically.
+
+    If no valid manifest exists yet, the release directory is scanned once
+    instead (the scan already sees the files written by this upload).
+
+    Args:
+        release_path: media/releases/<release_id>
+        release_id: Release ID
+        units: slug -> entry from unit_manifest_entry()
+        media: filename -> entry from media_manifest_entry()
+
+    Returns:
+        The updated manifest (with "totals" and "missing_media")
+    """
+    release_path = Path(release_path)
+    with exclusive_lock(release_path / _LOCK_FILENAME):
+        manifest = load_release_manifest(release_path)
+        if manifest is None:
+            logger.info(f"Release manifest missing for {release_id}; rebuilding from directory scan")
+            manifest = scan_release_manifest(release_path, release_id, known_media=media)
+        else:
+            manifest["units"].update(units or {})
+            manifest["media"].update(media or {})
+        manifest["updated_at"] = datetime.now(timezone.utc).isoformat()
+        _summarize(manifest)
+        _write_manifest(release_path, manifest)
+    return manifest
+
+
+def manifest_counts(manifest: Mapping[str, Any]) -> Tuple[int, int, int]:
+    """(units_count, questions_count, audio_count) for QuizContentRelease."""
+    totals = manifest.get("totals") or {}
+    return totals.get("units", 0), totals.get("questions", 0), totals.get("media", 0)
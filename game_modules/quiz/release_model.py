@@ -42,4 +42,6 @@ class QuizContentRelease(QuizBase):
     
     # Optional: checksum manifest (JSON of file hashes)
     checksum_manifest: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
-
+    
+    # Optional: diff of the last import against the DB (JSON, see ReleaseDiff)
+    import_diff: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
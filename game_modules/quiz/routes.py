@@ -4,6 +4,7 @@ Public routes (no webapp auth required):
 - /games/quiz - Topic selection
 - /games/quiz/<topic_id> - Topic entry (login/resume)
 - /games/quiz/<topic_id>/play - Quiz gameplay
+- /quiz-media/<path> - Question/answer media (store or release files)
 
 API routes:
 - /api/quiz/topics - List active topics
@@ -22,10 +23,11 @@ API routes:
 
 from __future__ import annotations
 
+import itertools
 import logging
 import uuid
-from functools import wraps
-from typing import Callable, Any
+from functools import partial, wraps
+from typing import Callable, Any, Optional
 import os
 import time
 from datetime import datetime, timezone
@@ -41,15 +43,21 @@ from flask import (
 from flask_jwt_extended import jwt_required
 from sqlalchemy.exc import IntegrityError
 
-from src.app.extensions.sqlalchemy_ext import get_quiz_session as get_session
+from src.app.extensions.sqlalchemy_ext import (
+    close_quiz_request_sessions,
+    get_quiz_session,
+    quiz_request_session as get_session,
+)
 from src.app.auth import Role
 from src.app.auth.decorators import require_role
+from . import metrics as quiz_metrics
 from . import services
 
 logger = logging.getLogger(__name__)
 
 
-_quiz_debug_counter = 0
+# itertools.count: next() is atomic, safe with threaded workers
+_quiz_debug_counter = itertools.count(1)
 
 
 def _quiz_debug_enabled() -> bool:
@@ -57,13 +65,11 @@ def _quiz_debug_enabled() -> bool:
 
 
 def _quiz_debug_log(event: str, **fields: Any) -> None:
-    global _quiz_debug_counter
     if not _quiz_debug_enabled():
         return
-    _quiz_debug_counter += 1
     logger.info(
         "[quiz-debug:%s] %s %s",
-        _quiz_debug_counter,
+        next(_quiz_debug_counter),
         event,
         {"ts_ms": int(time.time() * 1000), **{k: v for k, v in fields.items() if v is not None}},
     )
@@ -158,6 +164,12 @@ def add_trace_id_header(response):
     return response
 
 
+@blueprint.teardown_request
+def _close_request_sessions(exc):
+    """Close the request-scoped quiz session (see quiz_request_session)."""
+    close_quiz_request_sessions()
+
+
 # ============================================================================
 # Session Management
 # ============================================================================
@@ -202,7 +214,7 @@ def ensure_quiz_session() -> str:
 # Authentication Decorator
 # ============================================================================
 
-def quiz_auth_required(f: Callable) -> Callable:
+def quiz_auth_required(f: Optional[Callable] = None, *, readonly: bool = False) -> Callable:
     """Decorator to require quiz player authentication.
     
     AUTH-SEMANTIK: Zwei Modi, EINE Session-Infrastruktur:
@@ -211,7 +223,15 @@ def quiz_auth_required(f: Callable) -> Callable:
     
     Returns 401 if no valid session exists. HTML routes must call
     ensure_quiz_session() first to establish the session.
+
+    ``@quiz_auth_required(readonly=True)`` is for routes that only read: the
+    session check (which writes last_seen_at) commits in its own primary
+    session instead of the request session, so the route's read-only blocks
+    still go to the read replica.
     """
+    if f is None:
+        return partial(quiz_auth_required, readonly=readonly)
+
     @wraps(f)
     def decorated(*args: Any, **kwargs: Any) -> Any:
         token = _get_request_quiz_session_token()
@@ -220,7 +240,7 @@ def quiz_auth_required(f: Callable) -> Callable:
             quiz_log("QUIZ_AUTH_NO_SESSION", level="warn", code="NO_SESSION")
             return jsonify({"error": "No session", "code": "NO_SESSION"}), 401
         
-        with get_session() as session:
+        with (get_quiz_session() if readonly else get_session()) as session:
             player = services.verify_session(session, token)
             if not player:
                 quiz_log("QUIZ_AUTH_INVALID_SESSION", level="warn", code="INVALID_SESSION")
@@ -334,6 +354,19 @@ def quiz_play(topic_id: str):
                 player_name=player_name,
             )
         )
+
+        # Resuming: let the browser fetch the next questions' media while
+        # the page boots (same files quiz-play.js will pick)
+        run = services.get_current_run(session, player.id, topic_id) if player else None
+        if run is not None:
+            from .media_delivery import preload_links
+
+            manifest = services.build_media_manifest(
+                session, run, start=run.current_index, limit=services.PRELOAD_QUESTIONS
+            )
+            links = preload_links(manifest)
+            if links:
+                response.headers["Link"] = ", ".join(links)
         
         # Set cookie in response
         response.set_cookie(
@@ -373,6 +406,27 @@ def quiz_play_redirect(topic_id: str):
     return redirect(url_for('quiz.quiz_play', topic_id=topic_id), code=301)
 
 
+# ============================================================================
+# Media Routes
+# ============================================================================
+
+@blueprint.route("/quiz-media/<path:media_path>")
+def quiz_media(media_path: str):
+    """Serve question/answer media (store or release files).
+
+    Supports Range and conditional requests; store URLs are cached as
+    immutable. In production the transfer is handed to nginx via
+    X-Accel-Redirect (QUIZ_MEDIA_ACCEL_REDIRECT).
+    """
+    from .config import get_media_accel_prefix, get_media_root
+    from .media_delivery import resolve_media_path, send_media
+
+    media = resolve_media_path(get_media_root(), media_path)
+    if media is None:
+        return "", 404
+    return send_media(media, get_media_accel_prefix())
+
+
 # ============================================================================
 # API Routes - Public
 # ============================================================================
@@ -380,7 +434,7 @@ def quiz_play_redirect(topic_id: str):
 @blueprint.route("/api/quiz/topics")
 def api_get_topics():
     """Get list of active quiz topics."""
-    with get_session() as session:
+    with get_session(readonly=True) as session:
         topics = services.get_active_topics(session)
         return jsonify({
             "topics": [
@@ -404,7 +458,7 @@ def api_get_leaderboard(topic_id: str):
     limit = request.args.get("limit", 15, type=int)
     limit = min(max(limit, 1), 50)  # Clamp to 1-50
     
-    with get_session() as session:
+    with get_session(readonly=True) as session:
         topic = services.get_topic(session, topic_id)
         if not topic:
             return jsonify({"error": "Topic not found"}), 404
@@ -632,6 +686,8 @@ def api_start_run(topic_id: str):
         quiz_log("QUIZ_RUN_START_OK", level="info", 
                  run_id=state.run_id, topic_id=topic_id, is_new=is_new,
                  status=state.status, current_index=state.current_index)
+        if is_new:
+            quiz_metrics.RUNS_STARTED.labels(topic_id=topic_id).inc()
         
         return jsonify({
             "success": True,
@@ -647,6 +703,7 @@ def api_start_run(topic_id: str):
                 "question_started_at_ms": state.question_started_at_ms,
                 "deadline_at_ms": state.deadline_at_ms,
                 "answers": state.answers,
+                "media_manifest": services.build_media_manifest(session, run),
             }
         })
 
@@ -662,6 +719,7 @@ def api_restart_run(topic_id: str):
         
         run = services.restart_run(session, g.quiz_player_id, topic_id)
         state = services.get_run_state(session, run)
+        quiz_metrics.RUNS_STARTED.labels(topic_id=topic_id).inc()
 
         _quiz_debug_log(
             "api_restart_run",
@@ -684,6 +742,7 @@ def api_restart_run(topic_id: str):
                 "question_started_at_ms": state.question_started_at_ms,
                 "deadline_at_ms": state.deadline_at_ms,
                 "answers": state.answers,
+                "media_manifest": services.build_media_manifest(session, run),
             }
         })
 
@@ -720,6 +779,7 @@ def api_get_current_run():
                 "question_started_at_ms": state.question_started_at_ms,
                 "deadline_at_ms": state.deadline_at_ms,
                 "answers": state.answers,
+                "media_manifest": services.build_media_manifest(session, run),
             }
         })
 
@@ -857,6 +917,9 @@ def api_submit_answer(run_id: str):
                  earned_points=result.earned_points, running_score=result.running_score,
                  level_completed=result.level_completed, level_perfect=result.level_perfect,
                  finished=result.finished)
+        quiz_metrics.ANSWERS.labels(result=result.result).inc()
+        if result.result == "timeout":
+            quiz_metrics.TIMEOUTS.labels(source="answer").inc()
         
         return jsonify({
             "success": True,
@@ -1017,6 +1080,8 @@ def api_get_run_state(run_id: str):
                     run_id=run.id,
                     question_index=run.post_answer_question_index,
                 )
+                quiz_metrics.ANSWERS.labels(result="timeout").inc()
+                quiz_metrics.TIMEOUTS.labels(source="auto").inc()
         except IntegrityError:
             session.rollback()
             session.expire_all()
@@ -1192,6 +1257,7 @@ def api_use_joker(run_id: str):
         quiz_log("QUIZ_JOKER_USE_OK", level="info", 
                  run_id=run_id, question_index=question_index,
                  disabled_count=len(disabled_ids), joker_remaining=run.joker_remaining)
+        quiz_metrics.JOKERS_USED.inc()
         
         return jsonify({
             "success": True,
@@ -1252,6 +1318,7 @@ def api_finish_run(run_id: str):
         quiz_log("QUIZ_RUN_FINISH_OK", level="info", 
                  run_id=run_id, total_score=result.total_score, 
                  tokens_count=result.tokens_count, player_rank=player_rank)
+        quiz_metrics.RUNS_FINISHED.labels(topic_id=run.topic_id).inc()
         
         return jsonify({
             "success": True,
@@ -1267,41 +1334,22 @@ def api_finish_run(run_id: str):
 # API Routes - Questions (for gameplay)
 # ============================================================================
 
-# Media-based time bonus in seconds (for audio/visual media loading)
-MEDIA_TIME_BONUS_SECONDS = 10
-
 @blueprint.route("/api/quiz/questions/<question_id>")
-@quiz_auth_required
+@quiz_auth_required(readonly=True)
 def api_get_question(question_id: str):
     """Get question details (for displaying during gameplay).
     
-    Returns time_limit_bonus_s if question or any answer has media.
+    Returns time_limit_bonus_s if question or any answer has media
+    (same bonus as the server-side timer, see services.media_bonus_seconds).
     """
-    with get_session() as session:
-        from .models import QuizQuestion
-        from sqlalchemy import select
-        
-        stmt = select(QuizQuestion).where(QuizQuestion.id == question_id)
-        question = session.execute(stmt).scalar_one_or_none()
+    with get_session(readonly=True) as session:
+        question = services.get_question(session, question_id)
         
         if not question:
             return jsonify({"error": "Question not found"}), 404
         
-        # Check if question has media that warrants bonus time
-        has_media = False
-        
-        # Check question-level media
-        if question.media and isinstance(question.media, list) and len(question.media) > 0:
-            has_media = True
-        
-        # Check answer-level media
-        if not has_media and question.answers:
-            for ans in question.answers:
-                ans_media = ans.get("media", [])
-                if ans_media and len(ans_media) > 0:
-                    has_media = True
-                    break
-        
+        media_bonus = services.media_bonus_seconds(question.media, question.answers)
+
         response = {
             "id": question.id,
             "difficulty": question.difficulty,
@@ -1315,8 +1363,8 @@ def api_get_question(question_id: str):
         }
         
         # Add time bonus for media-rich questions
-        if has_media:
-            response["time_limit_bonus_s"] = MEDIA_TIME_BONUS_SECONDS
+        if media_bonus:
+            response["time_limit_bonus_s"] = media_bonus
         
         return jsonify(response)
 
@@ -12,7 +12,9 @@ Includes:
 from __future__ import annotations
 
 import hashlib
+import itertools
 import logging
+import math
 import os
 import random
 import secrets
@@ -27,6 +29,8 @@ from sqlalchemy import select, and_, desc, asc, func, or_
 from sqlalchemy.orm import Session
 
 from .config import get_quiz_mechanics_version
+from .content_snapshot import QuestionRecord, TopicRecord, get_active_snapshot
+from .metrics import SNAPSHOT_HITS, SNAPSHOT_MISSES, timed_pin_hash
 from .models import (
     QuizPlayer,
     QuizSession,
@@ -41,7 +45,8 @@ from .models import (
 logger = logging.getLogger(__name__)
 
 
-_debug_counter = 0
+# itertools.count: next() is atomic, safe with threaded workers
+_debug_counter = itertools.count(1)
 
 
 def _quiz_debug_enabled() -> bool:
@@ -56,13 +61,11 @@ def _quiz_debug_enabled() -> bool:
 
 
 def _quiz_debug_log(event: str, **fields: Any) -> None:
-    global _debug_counter
     if not _quiz_debug_enabled():
         return
-    _debug_counter += 1
     logger.info(
         "[quiz-debug:%s] %s %s",
-        _debug_counter,
+        next(_debug_counter),
         event,
         {k: v for k, v in fields.items() if v is not None},
     )
@@ -76,6 +79,9 @@ TIMER_SECONDS_NAMED = 40
 TIMER_SECONDS_ANON = 240
 JOKERS_PER_RUN = 2
 MEDIA_BONUS_SECONDS = 10  # Additional time for questions with media
+MEDIA_BONUS_MAX_SECONDS = 60  # Cap incl. audio durations recorded by the import
+PRELOAD_QUESTIONS = 2  # Questions whose media the play page preloads (Link headers)
+MEDIA_MANIFEST_FIELDS = ("label", "bytes", "duration", "width", "height", "variants", "srcset")
 QUESTIONS_PER_RUN = 10
 DIFFICULTY_LEVELS_V1 = 5
 DIFFICULTY_LEVELS_V2 = 3
@@ -199,6 +205,7 @@ def normalize_name(name: str) -> str:
 # PIN Hashing (simplified for game use)
 # ============================================================================
 
+@timed_pin_hash("hash")
 def hash_pin(pin: str) -> str:
     """Hash a 4-character PIN using argon2."""
     # Normalize to uppercase
@@ -206,6 +213,7 @@ def hash_pin(pin: str) -> str:
     return argon2.hash(normalized)
 
 
+@timed_pin_hash("verify")
 def verify_pin(plain: str, hashed: str) -> bool:
     """Verify PIN against stored hash."""
     normalized = plain.upper().strip()
@@ -553,9 +561,16 @@ def logout_player(session: Session, token: str) -> bool:
 # Topics
 # ============================================================================
 
-def get_active_topics(session: Session) -> List[QuizTopic]:
+def get_active_topics(session: Session) -> List[QuizTopic | TopicRecord]:
     """Get all active quiz topics ordered by order_index.
+    
+    Served from the published content snapshot when one is active
+    (see content_snapshot), else from the database.
     """
+    snapshot = get_active_snapshot()
+    if snapshot is not None:
+        return snapshot.active_topics()
+
     stmt = select(QuizTopic).where(
         QuizTopic.is_active
     ).order_by(QuizTopic.order_index)
@@ -563,12 +578,34 @@ def get_active_topics(session: Session) -> List[QuizTopic]:
     return list(session.execute(stmt).scalars().all())
 
 
-def get_topic(session: Session, topic_id: str) -> Optional[QuizTopic]:
-    """Get a specific topic by ID."""
+def get_topic(session: Session, topic_id: str) -> Optional[QuizTopic | TopicRecord]:
+    """Get a specific topic by ID (snapshot first, like get_active_topics)."""
+    snapshot = get_active_snapshot()
+    if snapshot is not None:
+        return snapshot.get_topic(topic_id)
+
     stmt = select(QuizTopic).where(QuizTopic.id == topic_id)
     return session.execute(stmt).scalar_one_or_none()
 
 
+def get_question(session: Session, question_id: str) -> Optional[QuizQuestion | QuestionRecord]:
+    """Get a question by ID.
+    
+    Uses the active content snapshot; falls back to the database for ids the
+    snapshot does not contain (runs started before the snapshot was swapped).
+    """
+    snapshot = get_active_snapshot()
+    if snapshot is not None:
+        question = snapshot.get_question(question_id)
+        if question is not None:
+            SNAPSHOT_HITS.inc()
+            return question
+
+    SNAPSHOT_MISSES.inc()
+    stmt = select(QuizQuestion).where(QuizQuestion.id == question_id)
+    return session.execute(stmt).scalar_one_or_none()
+
+
 # ============================================================================
 # Run Lifecycle
 # ============================================================================
@@ -630,6 +667,90 @@ def get_run_state(session: Session, run: QuizRun) -> RunState:
     )
 
 
+def _get_questions(session: Session, question_ids: List[str]) -> Dict[str, QuizQuestion | QuestionRecord]:
+    """Get several questions by ID (snapshot first, one query for the rest)."""
+    found: Dict[str, QuizQuestion | QuestionRecord] = {}
+    snapshot = get_active_snapshot()
+    if snapshot is not None:
+        for question_id in question_ids:
+            question = snapshot.get_question(question_id)
+            if question is not None:
+                found[question_id] = question
+
+    missing = [qid for qid in question_ids if qid not in found]
+    if found:
+        SNAPSHOT_HITS.inc(len(found))
+    if missing:
+        SNAPSHOT_MISSES.inc(len(missing))
+        stmt = select(QuizQuestion).where(QuizQuestion.id.in_(missing))
+        for question in session.execute(stmt).scalars():
+            found[question.id] = question
+    return found
+
+
+def _manifest_media_item(media: Any, answer_id: Optional[str] = None) -> Optional[Dict[str, Any]]:
+    if not isinstance(media, dict) or media.get("type") not in ("audio", "image"):
+        return None
+    src = media.get("src") or media.get("url")
+    if not src:
+        return None
+    item: Dict[str, Any] = {"type": media["type"], "src": src}
+    for key in MEDIA_MANIFEST_FIELDS:
+        if media.get(key) is not None:
+            item[key] = media[key]
+    if answer_id is not None:
+        item["answer_id"] = answer_id
+    return item
+
+
+def build_media_manifest(
+    session: Session,
+    run: QuizRun,
+    start: int = 0,
+    limit: Optional[int] = None,
+) -> List[Dict[str, Any]]:
+    """Media of a run's questions in question order, for preloading.
+
+    Each entry is ``{"question_index", "question_id", "media": [...]}``;
+    media items carry ``type``, ``src`` and whatever the import recorded
+    (``bytes``, ``duration``, ``variants``, ``srcset``, ...). Answer media
+    has an ``answer_id``. Questions without media are left out.
+
+    Args:
+        session: DB session
+        run: The run
+        start: First question index to include
+        limit: Number of questions to include (None = to the end of the run)
+    """
+    run_questions = run.run_questions if isinstance(run.run_questions, list) else []
+    end = len(run_questions) if limit is None else min(len(run_questions), start + limit)
+    selected = [
+        (index, rq["question_id"])
+        for index, rq in enumerate(run_questions[:end])
+        if index >= start and isinstance(rq, dict) and rq.get("question_id")
+    ]
+    questions = _get_questions(session, [question_id for _, question_id in selected])
+
+    manifest: List[Dict[str, Any]] = []
+    for index, question_id in selected:
+        question = questions.get(question_id)
+        if question is None:
+            continue
+        media = question.media if isinstance(question.media, list) else [question.media]
+        items = [item for item in (_manifest_media_item(m) for m in media) if item]
+        for answer in question.answers if isinstance(question.answers, list) else []:
+            if isinstance(answer, dict) and isinstance(answer.get("media"), list):
+                answer_id = str(answer.get("id"))
+                items.extend(
+                    item
+                    for item in (_manifest_media_item(m, answer_id) for m in answer["media"])
+                    if item
+                )
+        if items:
+            manifest.append({"question_index": index, "question_id": question_id, "media": items})
+    return manifest
+
+
 def start_run(session: Session, player_id: str, topic_id: str, force_new: bool = False) -> Tuple[QuizRun, bool]:
     """Start a new run or return existing in-progress run.
     
@@ -745,15 +866,19 @@ def _build_run_questions(session: Session, player_id: str, topic_id: str) -> Lis
 
     # Get all active questions for topic grouped by difficulty
     # Visibility controlled by is_active flag only (releases = import history only)
-    stmt = select(QuizQuestion).where(
-        and_(
-            QuizQuestion.topic_id == topic_id,
-            QuizQuestion.is_active
+    snapshot = get_active_snapshot()
+    if snapshot is not None:
+        all_questions = snapshot.topic_questions(topic_id)
+    else:
+        stmt = select(QuizQuestion).where(
+            and_(
+                QuizQuestion.topic_id == topic_id,
+                QuizQuestion.is_active
+            )
         )
-    )
-    all_questions = list(session.execute(stmt).scalars().all())
+        all_questions = list(session.execute(stmt).scalars().all())
     
-    questions_by_difficulty: Dict[int, List[QuizQuestion]] = {d: [] for d in difficulty_order}
+    questions_by_difficulty: Dict[int, List[QuizQuestion | QuestionRecord]] = {d: [] for d in difficulty_order}
     for q in all_questions:
         if q.difficulty in questions_by_difficulty:
             questions_by_difficulty[q.difficulty].append(q)
@@ -811,9 +936,9 @@ def _build_run_questions(session: Session, player_id: str, topic_id: str) -> Lis
 
 def _get_question_history(session: Session, player_id: str, topic_id: str) -> Tuple[set, set]:
     """Get question IDs from last 3 runs and set of incorrectly answered ones."""
-    # Get last 3 runs (any status)
-    stmt = (
-        select(QuizRun)
+    # Last 3 runs (any status); their answers in one query
+    recent_runs = (
+        select(QuizRun.id)
         .where(
             and_(
                 QuizRun.player_id == player_id,
@@ -822,21 +947,19 @@ def _get_question_history(session: Session, player_id: str, topic_id: str) -> Tu
         )
         .order_by(desc(QuizRun.created_at))
         .limit(HISTORY_RUNS_COUNT)
+        .scalar_subquery()
+    )
+    stmt = select(QuizRunAnswer.question_id, QuizRunAnswer.result).where(
+        QuizRunAnswer.run_id.in_(recent_runs)
     )
-    runs = list(session.execute(stmt).scalars().all())
     
     history_ids = set()
     wrong_ids = set()
     
-    for run in runs:
-        # Get answers for this run
-        stmt = select(QuizRunAnswer).where(QuizRunAnswer.run_id == run.id)
-        answers = session.execute(stmt).scalars().all()
-        
-        for a in answers:
-            history_ids.add(a.question_id)
-            if a.result in ("wrong", "timeout"):
-                wrong_ids.add(a.question_id)
+    for question_id, result in session.execute(stmt):
+        history_ids.add(question_id)
+        if result in ("wrong", "timeout"):
+            wrong_ids.add(question_id)
     
     return history_ids, wrong_ids
 
@@ -875,24 +998,46 @@ def _get_base_timer_seconds(is_anonymous: bool) -> int:
     return TIMER_SECONDS_ANON if is_anonymous else TIMER_SECONDS_NAMED
 
 
+def media_bonus_seconds(media: Any, answers: Any = None) -> int:
+    """Extra seconds for the media of a question and its answers.
+
+    Any media gives MEDIA_BONUS_SECONDS. Audio with a known ``duration``
+    (recorded by the import) adds its length on top, capped at
+    MEDIA_BONUS_MAX_SECONDS.
+
+    Returns:
+        Bonus in seconds (0 without media)
+    """
+    items = [m for m in media if isinstance(m, dict)] if isinstance(media, list) else []
+    for answer in answers if isinstance(answers, list) else []:
+        answer_media = answer.get("media") if isinstance(answer, dict) else None
+        if isinstance(answer_media, list):
+            items.extend(m for m in answer_media if isinstance(m, dict))
+    if not items:
+        return 0
+
+    audio_seconds = sum(
+        float(m["duration"])
+        for m in items
+        if m.get("type") == "audio" and isinstance(m.get("duration"), (int, float))
+    )
+    return min(MEDIA_BONUS_MAX_SECONDS, MEDIA_BONUS_SECONDS + math.ceil(audio_seconds))
+
+
 def calculate_time_limit(question_data: dict, is_anonymous: bool) -> int:
     """Calculate time limit for a question based on user type and media content.
     
     Args:
-        question_data: Question dict with optional 'media' field
+        question_data: Question dict with optional 'media' and 'answers' fields
         is_anonymous: Whether the player is anonymous
         
     Returns:
-        Time limit in seconds (named=40, anon=240, +10 for media)
+        Time limit in seconds (named=40, anon=240, + media_bonus_seconds)
     """
     base_time = _get_base_timer_seconds(is_anonymous)
-    
-    # Check if question has media (images, audio)
-    media = question_data.get('media')
-    if media and isinstance(media, list) and len(media) > 0:
-        return base_time + MEDIA_BONUS_SECONDS
-    
-    return base_time
+    return base_time + media_bonus_seconds(
+        question_data.get('media'), question_data.get('answers')
+    )
 
 
 def start_question(session: Session, run: QuizRun, question_index: int, started_at_ms: int = None, time_limit_seconds: int = None) -> bool:
@@ -930,9 +1075,12 @@ def start_question(session: Session, run: QuizRun, question_index: int, started_
     # Always compute server-side time limit (ignore client override)
     question_config = run.run_questions[question_index]
     question_id = question_config["question_id"]
-    question = session.get(QuizQuestion, question_id)
-    question_media = question.media if question else None
-    time_limit_seconds = calculate_time_limit({"media": question_media}, run.player.is_anonymous)
+    question = get_question(session, question_id)
+    question_data = {
+        "media": question.media if question else None,
+        "answers": question.answers if question else None,
+    }
+    time_limit_seconds = calculate_time_limit(question_data, run.player.is_anonymous)
     
     run.question_started_at = server_now
     run.expires_at = server_now + timedelta(seconds=time_limit_seconds)
@@ -1000,8 +1148,7 @@ def submit_answer(
     question_config = run.run_questions[question_index]
     question_id = question_config["question_id"]
     
-    stmt = select(QuizQuestion).where(QuizQuestion.id == question_id)
-    question = session.execute(stmt).scalar_one_or_none()
+    question = get_question(session, question_id)
     
     if not question:
         return AnswerResult(
@@ -1168,8 +1315,7 @@ def use_joker(session: Session, run: QuizRun, question_index: int) -> Tuple[bool
     question_config = run.run_questions[question_index]
     question_id = question_config["question_id"]
     
-    stmt = select(QuizQuestion).where(QuizQuestion.id == question_id)
-    question = session.execute(stmt).scalar_one_or_none()
+    question = get_question(session, question_id)
     
     if not question:
         return (False, [], "QUESTION_NOT_FOUND")
@@ -64,12 +64,12 @@ class UnitMediaSchema:
     """Media item for quiz unit (audio or image).
     
     In seed JSON: seed_src points to local file relative to JSON.
-    After import: src contains final URL (/static/quiz-media/...).
+    After import: src contains final URL (/quiz-media/store/... for audio).
     """
     id: str  # Unique within question/answer context (e.g., "m1", "m2")
     type: str  # "audio" or "image"
     seed_src: Optional[str] = None  # Local path relative to JSON (seed time only)
-    src: Optional[str] = None  # Final URL after import (/static/quiz-media/...)
+    src: Optional[str] = None  # Final URL after import (/quiz-media/...)
     label: Optional[str] = None  # Display label (e.g., "Audio 1", "Bild 1")
     alt: Optional[str] = None  # Alt text for images (accessibility)
     caption: Optional[str] = None  # Optional caption
@@ -321,6 +321,10 @@ SLUG_PATTERN = re.compile(r'^[a-z0-9_]+$')
 MEDIA_ID_PATTERN = re.compile(r'^[a-zA-Z0-9_]+$')  # Simple alphanumeric IDs
 SUPPORTED_SCHEMA_VERSIONS = {'quiz_unit_v1', 'quiz_unit_v2'}
 
+# Bump whenever validate_quiz_unit or the Unit*Schema dataclasses change, so
+# cached validation results (validation_cache.py) are not reused.
+VALIDATOR_VERSION = 1
+
 
 def _validate_media_item(
     media_data: Dict[str, Any],
@@ -0,0 +1,121 @@
+"""Validate-once cache for quiz unit JSON.
+
+A unit is validated on upload and again in phase 1 of the import of its
+release (and of every re-import). Validation only depends on the unit's
+content, so validated units are kept in a process-local LRU keyed by
+``(VALIDATOR_VERSION, fingerprint)``, the fingerprint being the canonical
+JSON hash from ``fingerprint_unit_data``.
+
+Design:
+- The upload route and the import (local job worker thread, thread pool)
+  run in the same process and share the cache; an import started right
+  after its uploads validates nothing
+- Entries are the validated QuizUnitSchema objects themselves and are
+  shared between callers; they must be treated as read-only
+- Only successful validations are cached; invalid units are re-validated so
+  the error report is always current
+- Bounded by the total number of cached questions (MAX_CACHED_QUESTIONS)
+- Not persisted: rebuilding the dataclasses from a serialized form costs as
+  much as validating them (see benchmarks/bench_validation.py)
+"""
+
+from __future__ import annotations
+
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Optional, Tuple
+
+from . import validation
+from .validation import QuizUnitSchema, validate_quiz_unit
+from .metrics import CACHE_LOOKUPS
+
+# Roughly 1 KB of memory per cached question
+MAX_CACHED_QUESTIONS = 20_000
+
+
+@dataclass
+class ValidatedUnit:
+    """Validation result (fresh or from the cache)."""
+    unit: QuizUnitSchema
+    fingerprint: str
+    cached: bool = False
+
+
+class _ValidationCache:
+    """Thread-safe LRU of validated units, bounded by question count."""
+
+    def __init__(self, max_questions: int):
+        self.max_questions = max_questions
+        self._entries: "OrderedDict[Tuple[int, str], QuizUnitSchema]" = OrderedDict()
+        self._questions = 0
+        self._lock = threading.Lock()
+
+    def get(self, fingerprint: str) -> Optional[QuizUnitSchema]:
+        key = (validation.VALIDATOR_VERSION, fingerprint)
+        with self._lock:
+            unit = self._entries.get(key)
+            if unit is not None:
+                self._entries.move_to_end(key)
+            return unit
+
+    def put(self, fingerprint: str, unit: QuizUnitSchema) -> None:
+        size = len(unit.questions)
+        if size > self.max_questions:
+            return
+        key = (validation.VALIDATOR_VERSION, fingerprint)
+        with self._lock:
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self._questions -= len(previous.questions)
+            self._entries[key] = unit
+            self._questions += size
+            while self._questions > self.max_questions:
+                _, evicted = self._entries.popitem(last=False)
+                self._questions -= len(evicted.questions)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._questions = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+_cache = _ValidationCache(MAX_CACHED_QUESTIONS)
+
+
+def clear_validation_cache() -> None:
+    """Drop all cached validation results (tests, benchmarks)."""
+    _cache.clear()
+
+
+def validate_unit_cached(
+    data: Any,
+    fingerprint: str,
+    filename: str = "",
+    use_cache: bool = True,
+) -> ValidatedUnit:
+    """Validate parsed unit JSON, reusing the result for identical content.
+
+    Args:
+        data: Parsed unit JSON
+        fingerprint: ``fingerprint_unit_data(data)`` (both callers need it anyway)
+        filename: Filename for error messages (not part of the cache key)
+        use_cache: False always validates (and does not store the result)
+
+    Raises:
+        ValidationError: If validation fails (failures are never cached)
+    """
+    if use_cache:
+        unit = _cache.get(fingerprint)
+        if unit is not None:
+            CACHE_LOOKUPS.labels(cache="validation", result="hit").inc()
+            return ValidatedUnit(unit=unit, fingerprint=fingerprint, cached=True)
+        CACHE_LOOKUPS.labels(cache="validation", result="miss").inc()
+
+    unit = validate_quiz_unit(data, filename)
+    if use_cache:
+        _cache.put(fingerprint, unit)
+    return ValidatedUnit(unit=unit, fingerprint=fingerprint)
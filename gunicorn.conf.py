@@ -0,0 +1,75 @@
+"""gunicorn settings read from the working directory (/app in the image).
+
+Worker model (environment, read at startup):
+
+- ``GUNICORN_WORKERS`` (default 2, for the 1-vCPU server)
+- ``GUNICORN_WORKER_CLASS``: ``sync`` (default), ``gthread`` or ``gevent``
+- ``GUNICORN_THREADS`` (default 1; gunicorn switches ``sync`` to
+  ``gthread`` when it is above 1)
+- ``GUNICORN_PRELOAD`` (default true, false for ``gevent``): import and
+  create the app once in the master; forked workers are ready at once. Code
+  changes then need a restart (``kill -HUP`` does not reload the app).
+  gevent workers monkey-patch after the fork, too late for locks and
+  sockets created by a preloaded app.
+
+Threads and greenlets share the worker's engines and pools; keep
+``QUIZ_DB_POOL_SIZE + QUIZ_DB_MAX_OVERFLOW`` at least at the thread count.
+``gevent`` needs the ``gevent`` and ``psycogreen`` packages (not in
+requirements.txt); psycopg2 is made cooperative in ``post_worker_init``.
+
+With preload the master's DB connections (opened to verify the databases)
+are closed in ``when_ready``, before any worker exists, and every worker
+drops inherited pool state in ``post_fork``.
+
+Command-line flags take precedence over this file.
+"""
+
+import os
+import sys
+
+workers = int(os.environ.get("GUNICORN_WORKERS", "2"))
+worker_class = os.environ.get("GUNICORN_WORKER_CLASS", "sync")
+threads = int(os.environ.get("GUNICORN_THREADS", "1"))
+preload_app = os.environ.get(
+    "GUNICORN_PRELOAD", "false" if worker_class == "gevent" else "true"
+).lower() in ("1", "true", "yes")
+
+
+def _dispose_engines(close):
+    # Only loaded in the master with preload_app
+    sqlalchemy_ext = sys.modules.get("src.app.extensions.sqlalchemy_ext")
+    if sqlalchemy_ext is not None:
+        sqlalchemy_ext.dispose_engines(close=close)
+
+
+def when_ready(server):
+    """Close the preloaded app's DB connections before workers are forked."""
+    _dispose_engines(close=True)
+
+
+def post_fork(server, worker):
+    """Never share a pooled connection with the master or sibling workers."""
+    _dispose_engines(close=False)
+
+
+def post_worker_init(worker):
+    """gevent: let psycopg2 yield to other greenlets while waiting for PostgreSQL."""
+    if worker.cfg.worker_class_str != "gevent":
+        return
+    try:
+        from psycogreen.gevent import patch_psycopg
+    except ImportError:
+        worker.log.warning("psycogreen not installed: database calls block the gevent worker")
+        return
+    patch_psycopg()
+
+
+def child_exit(server, worker):
+    """Drop the live gauges of an exited worker from the Prometheus multiprocess dir."""
+    if not os.environ.get("PROMETHEUS_MULTIPROC_DIR"):
+        return
+    try:
+        from prometheus_client import multiprocess
+    except ImportError:
+        return
+    multiprocess.mark_process_dead(worker.pid)
@@ -8,6 +8,12 @@ Commands:
     publish-release   Publish a previously imported release
     unpublish-release Unpublish a release (rollback)
     list-releases     List available content releases
+    run-quiz-jobs     Execute queued content jobs (import/publish)
+    gc-media          Delete/archive unreachable release media
+    rotate-import-logs Compress/delete old import logs
+    build-assets      Fingerprint/minify/precompress static assets
+    build-templates   Precompile Jinja templates (bytecode cache)
+    startup-profile   Show import/create_app time of a worker start
 
 Usage:
     python manage.py import-content --help
@@ -39,16 +45,55 @@ def cli():
     pass
 
 
-def _init_cli_app() -> None:
-    """Initialize app config/DB for CLI commands."""
+def _init_cli_app():
+    """Initialize app config/DB for CLI commands. Returns the Flask app."""
     from src.app import create_app
     from src.app.extensions.sqlalchemy_ext import get_quiz_engine
     env_name = os.environ.get("ENV") or os.environ.get("FLASK_ENV")
-    create_app(env_name)
+    app = create_app(env_name)
     if get_quiz_engine() is None:
         raise RuntimeError("Quiz DB not initialized. Set QUIZ_DB_* or QUIZ_DATABASE_URL.")
     if get_quiz_engine().dialect.name == "sqlite":
         raise RuntimeError("Quiz DB must be PostgreSQL (sqlite not supported).")
+    return app
+
+
+def _echo_release_diff(diff: dict, limit: int = 20) -> None:
+    """Print a release diff (see ReleaseDiff.to_dict) in a compact form."""
+    summary = diff.get("summary", {})
+    click.echo("\nDiff against database:")
+    click.echo(
+        f"  Units:     +{summary.get('units_added', 0)} added, "
+        f"~{summary.get('units_changed', 0)} changed, "
+        f"={summary.get('units_unchanged', 0)} unchanged"
+    )
+    click.echo(
+        f"  Questions: +{summary.get('questions_added', 0)} added, "
+        f"~{summary.get('questions_changed', 0)} changed, "
+        f"-{summary.get('questions_removed', 0)} removed (kept in DB)"
+    )
+    sections = (
+        ("Added units", diff.get("units_added", [])),
+        ("Changed units", diff.get("units_changed", [])),
+        ("Added questions", diff.get("questions_added", [])),
+        ("Changed questions", diff.get("questions_changed", [])),
+        ("Removed questions", diff.get("questions_removed", [])),
+    )
+    for title, items in sections:
+        if not items:
+            continue
+        click.echo(f"  {title}:")
+        for item in items[:limit]:
+            click.echo(f"    - {item}")
+        if len(items) > limit:
+            click.echo(f"    ... and {len(items) - limit} more")
+    answer_keys = diff.get("answer_keys_changed", [])
+    if answer_keys:
+        click.echo("  Changed answer keys:")
+        for entry in answer_keys[:limit]:
+            click.echo(f"    - {entry['question_id']}: {entry['old']} -> {entry['new']}")
+        if len(answer_keys) > limit:
+            click.echo(f"    ... and {len(answer_keys) - limit} more")
 
 
 @cli.command('import-content')
@@ -56,7 +101,13 @@ def _init_cli_app() -> None:
 @click.option('--audio-path', required=True, help='Path to audio files directory')
 @click.option('--release', required=True, help='Release ID (e.g., 2026-01-06_1430)')
 @click.option('--dry-run', is_flag=True, help='Validate without writing to database')
-def import_content(units_path, audio_path, release, dry_run):
+@click.option('--workers', type=int, default=None,
+              help='Validation/hashing pool size (default: QUIZ_IMPORT_WORKERS, 1 = serial)')
+@click.option('--verify', is_flag=True,
+              help='Rehash all audio files (ignore checksum manifest)')
+@click.option('--force', is_flag=True,
+              help='Rewrite all units, even those whose content fingerprint is unchanged')
+def import_content(units_path, audio_path, release, dry_run, workers, verify, force):
     """Import quiz content from JSON files."""
     from game_modules.quiz.import_service import QuizImportService
     from src.app.extensions.sqlalchemy_ext import get_quiz_session
@@ -65,7 +116,7 @@ def import_content(units_path, audio_path, release, dry_run):
         _init_cli_app()
         request_id = os.getenv("REQUEST_ID") or f"cli-{uuid.uuid4().hex[:12]}"
         click.echo(f"Request ID: {request_id}")
-        service = QuizImportService()
+        service = QuizImportService(workers=workers)
 
         with get_quiz_session() as session:
             result = service.import_release(
@@ -75,13 +126,23 @@ def import_content(units_path, audio_path, release, dry_run):
                 release_id=release,
                 dry_run=dry_run,
                 request_id=request_id,
+                verify=verify,
+                force=force,
             )
 
         if result.success:
             click.echo("[OK] Import successful")
             click.echo(f"  Units: {result.units_imported}")
             click.echo(f"  Questions: {result.questions_imported}")
-            click.echo(f"  Audio files: {result.audio_files_processed}")
+            click.echo(
+                f"  Audio files: {result.audio_files_processed}"
+                f" ({result.audio_hashes_reused} hashes reused)"
+            )
+            if not dry_run:
+                click.echo(f"  Unchanged units skipped: {result.units_skipped}")
+
+            if result.diff is not None:
+                _echo_release_diff(result.diff)
 
             if result.warnings:
                 click.echo(f"\nWarnings: {len(result.warnings)}")
@@ -224,6 +285,268 @@ def list_releases():
         sys.exit(4)
 
 
+@cli.command('run-quiz-jobs')
+@click.option('--once', is_flag=True, help='Drain the queue once and exit')
+@click.option('--poll', type=float, default=None,
+              help='Poll interval in seconds (default: QUIZ_JOB_POLL_SECONDS)')
+def run_quiz_jobs(once, poll):
+    """Execute queued content jobs (import/publish/unpublish).
+
+    Dedicated worker for deployments that set QUIZ_JOBS_LOCAL_WORKER=false.
+    Safe to run several instances: jobs are claimed with SKIP LOCKED.
+    """
+    import time
+    from game_modules.quiz import jobs
+
+    try:
+        _init_cli_app()
+        interval = poll if poll is not None else jobs.get_poll_seconds()
+        worker_id = jobs.make_worker_id()
+        click.echo(f"Job worker: {worker_id}")
+
+        while True:
+            executed = jobs.run_pending_jobs(worker_id=worker_id)
+            if executed:
+                click.echo(f"[OK] Executed {executed} job(s)")
+            if once:
+                sys.exit(0)
+            time.sleep(interval)
+
+    except KeyboardInterrupt:
+        sys.exit(0)
+    except Exception as e:
+        click.echo(f"[FAIL] Fatal error: {e}", err=True)
+        logger.exception("Job worker failed with exception")
+        sys.exit(4)
+
+
+@cli.command('gc-media')
+@click.option('--dry-run/--apply', default=True,
+              help='Only report (default) or actually delete/archive')
+@click.option('--archive-dir', type=click.Path(file_okay=False), default=None,
+              help='Move collected releases here instead of deleting them')
+@click.option('--keep-drafts-days', type=int, default=None,
+              help='Keep drafts touched within N days (default: QUIZ_MEDIA_GC_KEEP_DRAFTS_DAYS or 30)')
+@click.option('--keep-last', type=int, default=None,
+              help='Always keep the N most recent releases (default: QUIZ_MEDIA_GC_KEEP_LAST or 3)')
+@click.option('--max-ops-per-sec', type=float, default=200.0, show_default=True,
+              help='Filesystem operations per second (0 = unlimited)')
+@click.option('--max-mb-per-sec', type=float, default=20.0, show_default=True,
+              help='MiB deleted/moved per second (0 = unlimited)')
+@click.option('--json', 'as_json', is_flag=True, help='Output JSON report')
+def gc_media(dry_run, archive_dir, keep_drafts_days, keep_last, max_ops_per_sec, max_mb_per_sec, as_json):
+    """Garbage-collect orphaned media releases and store files.
+
+    Keeps published releases, media/current, releases referenced by current
+    topics/questions (in-flight runs), releases with active jobs, recent
+    drafts and the newest releases. Everything else is reported (dry run)
+    or deleted/archived (--apply).
+    """
+    import json as json_lib
+    from game_modules.quiz.media_gc import GCPolicy, IORateLimiter, collect_media_garbage
+    from src.app.config.runtime_paths import get_media_dir
+    from src.app.extensions.sqlalchemy_ext import get_quiz_session
+
+    try:
+        app = _init_cli_app()
+        media_root = Path(app.config.get("MEDIA_DIR") or get_media_dir())
+        policy = GCPolicy(
+            keep_drafts_days=keep_drafts_days if keep_drafts_days is not None
+            else int(app.config.get("QUIZ_MEDIA_GC_KEEP_DRAFTS_DAYS", 30)),
+            keep_last=keep_last if keep_last is not None
+            else int(app.config.get("QUIZ_MEDIA_GC_KEEP_LAST", 3)),
+        )
+        limiter = IORateLimiter(
+            ops_per_sec=max_ops_per_sec,
+            bytes_per_sec=max_mb_per_sec * 1024 * 1024,
+        )
+
+        with get_quiz_session() as session:
+            report = collect_media_garbage(
+                session,
+                media_root,
+                policy=policy,
+                dry_run=dry_run,
+                archive_dir=Path(archive_dir) if archive_dir else None,
+                limiter=limiter,
+            )
+
+        if as_json:
+            click.echo(json_lib.dumps(report.to_dict(), indent=2))
+        else:
+            click.echo(f"Media root: {media_root}")
+            click.echo(f"Kept releases: {len(report.kept)}")
+            for release_id, reasons in sorted(report.kept.items()):
+                click.echo(f"  = {release_id}: {', '.join(reasons)}")
+            verb = "Would " + report.action if dry_run else report.action.capitalize() + "d"
+            click.echo(f"{verb} releases: {len(report.collected)}")
+            for collected in report.collected:
+                click.echo(
+                    f"  - {collected.release_id} ({collected.status or 'no DB record'}): "
+                    f"{collected.files} files, {collected.bytes / 1024 / 1024:.1f} MiB"
+                )
+            click.echo(f"Orphaned store files: {report.store_files_collected}")
+            click.echo(f"Reclaimable: {report.reclaimable_bytes / 1024 / 1024:.1f} MiB")
+
+        if report.errors:
+            for error in report.errors:
+                click.echo(f"  - {error}", err=True)
+            sys.exit(4)
+        sys.exit(0)
+
+    except Exception as e:
+        click.echo(f"[FAIL] Fatal error: {e}", err=True)
+        logger.exception("Media GC failed with exception")
+        sys.exit(4)
+
+
+@cli.command('rotate-import-logs')
+@click.option('--compress-after-days', type=int, envvar='QUIZ_IMPORT_LOG_COMPRESS_DAYS',
+              default=7, show_default=True, help='Gzip logs older than N days')
+@click.option('--delete-after-days', type=int, envvar='QUIZ_IMPORT_LOG_RETENTION_DAYS',
+              default=180, show_default=True, help='Delete logs older than N days')
+def rotate_import_logs(compress_after_days, delete_after_days):
+    """Compress and expire data/import_logs (run daily from cron).
+
+    Updates the per-release log index so the admin log view still finds
+    compressed logs. Does not need a database connection.
+    """
+    from game_modules.quiz.import_logs import rotate_import_logs as rotate
+    from src.app.config.runtime_paths import get_data_dir
+
+    logs_dir = get_data_dir(Path(__file__).parent) / "import_logs"
+    if not logs_dir.is_dir():
+        click.echo(f"No import logs at {logs_dir}")
+        sys.exit(0)
+
+    try:
+        result = rotate(
+            logs_dir,
+            compress_after_days=compress_after_days,
+            delete_after_days=delete_after_days,
+        )
+    except OSError as e:
+        click.echo(f"[FAIL] Log rotation failed: {e}", err=True)
+        sys.exit(4)
+
+    click.echo(
+        f"[OK] Import logs: {result.compressed} compressed, {result.deleted} deleted, "
+        f"{result.bytes_freed / 1024 / 1024:.1f} MiB freed"
+    )
+    sys.exit(0)
+
+
+@cli.command('build-assets')
+@click.option('--static-dir', type=click.Path(file_okay=False, path_type=Path),
+              default=Path(__file__).parent / 'static', show_default=True,
+              help='Static folder to fingerprint')
+def build_assets(static_dir):
+    """Write fingerprinted, minified and precompressed assets to static/dist.
+
+    Run at image build time; the app loads static/dist/asset-manifest.json
+    once at startup. Minification needs rjsmin/rcssmin, .br needs Brotli.
+    """
+    from src.app.services.assets import build_assets as build, rcssmin, rjsmin, brotli
+
+    try:
+        result = build(static_dir)
+    except (OSError, UnicodeDecodeError) as e:
+        click.echo(f"[FAIL] Asset build failed: {e}", err=True)
+        sys.exit(4)
+
+    missing = [name for name, module in (('rjsmin', rjsmin), ('rcssmin', rcssmin), ('Brotli', brotli))
+               if module is None]
+    if missing:
+        click.echo(f"[WARN] Not installed (skipped): {', '.join(missing)}")
+    for rel in result.skipped:
+        click.echo(f"  skipped ES module with relative imports: {rel}")
+    click.echo(
+        f"[OK] {len(result.manifest)} assets: {result.source_bytes / 1024:.0f} KiB source, "
+        f"{result.output_bytes / 1024:.0f} KiB built, {result.gzip_bytes / 1024:.0f} KiB gzip, "
+        f"{result.brotli_bytes / 1024:.0f} KiB brotli"
+    )
+    sys.exit(0)
+
+
+@cli.command('build-templates')
+@click.option('--cache-dir', type=click.Path(file_okay=False, path_type=Path), default=None,
+              help='Cache directory (default: JINJA_BYTECODE_CACHE_DIR)')
+def build_templates(cache_dir):
+    """Precompile all Jinja templates into the bytecode cache.
+
+    Run at image build time from the directory the app runs in. Templates
+    changed later are recompiled on first use. Does not need a database.
+    """
+    from src.app.config import BaseConfig
+    from src.app.services.template_cache import build_template_cache
+
+    cache_dir = cache_dir or Path(BaseConfig.JINJA_BYTECODE_CACHE_DIR)
+    if str(cache_dir).lower() == 'off':
+        click.echo("[FAIL] JINJA_BYTECODE_CACHE_DIR is 'off'", err=True)
+        sys.exit(2)
+
+    try:
+        result = build_template_cache(Path(__file__).resolve().parent / 'templates', cache_dir)
+    except OSError as e:
+        click.echo(f"[FAIL] Template cache build failed: {e}", err=True)
+        sys.exit(4)
+
+    for name, error in result.failed:
+        click.echo(f"  failed: {name}: {error}", err=True)
+    if result.failed:
+        click.echo(f"[FAIL] {len(result.failed)} templates do not compile", err=True)
+        sys.exit(2)
+    click.echo(f"[OK] {result.compiled} templates compiled into {result.cache_dir}")
+    sys.exit(0)
+
+
+@cli.command('startup-profile')
+@click.option('--top', type=int, default=15, show_default=True,
+              help='Number of packages/modules to list')
+@click.option('--json', 'as_json', is_flag=True, help='Output JSON')
+def startup_profile(top, as_json):
+    """Print where app startup time goes (imports, create_app stages).
+
+    Runs create_app in a fresh interpreter with `python -X importtime`, so it
+    needs the server's environment (FLASK_ENV, secrets, database URLs) and
+    connects to both databases like a worker without --preload.
+    """
+    import json
+    import subprocess
+
+    from src.app.services.startup_profile import profile_startup
+
+    try:
+        profile = profile_startup(Path(__file__).parent)
+    except (RuntimeError, OSError, subprocess.TimeoutExpired) as e:
+        click.echo(f"[FAIL] Startup profile failed: {e}", err=True)
+        sys.exit(4)
+
+    if as_json:
+        click.echo(json.dumps(profile.to_dict(limit=top), indent=2))
+        sys.exit(0)
+
+    total = profile.import_seconds + profile.create_app_seconds
+    click.echo(
+        f"Startup: {total * 1000:.0f} ms (imports {profile.import_seconds * 1000:.0f} ms, "
+        f"create_app {profile.create_app_seconds * 1000:.0f} ms)"
+    )
+    click.echo("\ncreate_app stages:")
+    for name, ms in profile.stages_ms.items():
+        click.echo(f"  {name:14s} {ms:8.1f} ms")
+    click.echo("\nImport time by package (self):")
+    for name, ms in profile.by_package()[:top]:
+        click.echo(f"  {name:30s} {ms:8.1f} ms")
+    click.echo("\nSlowest modules (cumulative):")
+    for record in profile.slowest_modules(top):
+        click.echo(f"  {record.module:50s} {record.cumulative_us / 1000:8.1f} ms")
+    if profile.eager_lazy_modules:
+        click.echo(
+            f"\n[WARN] Imported at startup although loaded on demand: {', '.join(profile.eager_lazy_modules)}"
+        )
+    sys.exit(0)
+
+
 @cli.command("ensure-dev-admin")
 def ensure_dev_admin():
     """Ensure DEV admin user exists (admin/change-me by default). DEV only."""
@@ -280,7 +603,11 @@ def quiz_db_report(as_json, minimal):
     import json as json_lib
     from game_modules.quiz.models import QuizTopic, QuizQuestion, QuizRun, QuizScore
     from game_modules.quiz.release_model import QuizContentRelease
-    from src.app.extensions.sqlalchemy_ext import get_quiz_engine, get_quiz_session
+    from src.app.extensions.sqlalchemy_ext import (
+        get_quiz_engine,
+        get_quiz_session,
+        quiz_read_replica_status,
+    )
     
     try:
         _init_cli_app()
@@ -290,7 +617,7 @@ def quiz_db_report(as_json, minimal):
             click.echo("[FAIL] Wrong DB: quiz module requires PostgreSQL (got sqlite). Set QUIZ_DB_* or QUIZ_DATABASE_URL.", err=True)
             sys.exit(2)
 
-        with get_quiz_session() as session:
+        with get_quiz_session(readonly=True) as session:
             counts = {
                 "quiz_topics": session.query(QuizTopic).count(),
                 "quiz_questions": session.query(QuizQuestion).count(),
@@ -322,6 +649,7 @@ def quiz_db_report(as_json, minimal):
 
             report = {
                 "db_dialect": dialect,
+                "read_replica": quiz_read_replica_status(),
                 "counts": counts,
                 "published_releases": published_releases,
                 "current_release_id": current_release_id,
@@ -333,6 +661,10 @@ def quiz_db_report(as_json, minimal):
         
         click.echo("Quiz DB Report (read-only)")
         click.echo(f"DB dialect: {dialect}")
+        replica = report["read_replica"]
+        if replica is not None:
+            source = "replica" if replica["usable"] else "primary"
+            click.echo(f"Read from: {source} (replica {replica['reason']})")
         click.echo("=" * 30)
         click.echo("Counts:")
         for key, value in counts.items():
@@ -35,6 +35,7 @@ def check_passlib_argon2():
 def main():
     check_module("psycopg2", "psycopg2")
     check_module("argon2", "argon2-cffi")
+    check_module("prometheus_client", "prometheus-client")
     check_passlib_argon2()
 
     if errors:
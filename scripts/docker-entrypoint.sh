@@ -112,6 +112,16 @@ PY
 wait_for_postgres_url "AUTH_DATABASE_URL"
 wait_for_postgres_url "QUIZ_DATABASE_URL"
 
+# Prometheus multiprocess directory (set here, not in the image: build steps
+# import the app without /app/data). Samples of a previous container run
+# would be aggregated into /metrics, so start empty. Set it empty to disable.
+export PROMETHEUS_MULTIPROC_DIR="${PROMETHEUS_MULTIPROC_DIR-/app/data/metrics}"
+if [ -n "${PROMETHEUS_MULTIPROC_DIR:-}" ]; then
+    rm -rf "$PROMETHEUS_MULTIPROC_DIR"
+    mkdir -p "$PROMETHEUS_MULTIPROC_DIR"
+    echo "Prometheus multiprocess dir: $PROMETHEUS_MULTIPROC_DIR"
+fi
+
 echo "=== Starting application ==="
 
 # Execute the main command (typically gunicorn)
@@ -86,6 +86,7 @@ def main():
     from src.app.extensions.sqlalchemy_ext import init_quiz_engine, get_quiz_engine
     from game_modules.quiz.models import QuizBase
     from game_modules.quiz.release_model import QuizContentRelease  # noqa: F401
+    from game_modules.quiz.job_model import QuizJob  # noqa: F401
 
     class FakeApp:
         def __init__(self):
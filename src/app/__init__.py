@@ -5,17 +5,24 @@ from __future__ import annotations
 import hashlib
 import logging
 import os
+import time
 import uuid
+from contextlib import contextmanager
 from datetime import datetime
 from functools import lru_cache
 from logging.handlers import RotatingFileHandler
 from pathlib import Path
+from typing import Dict, Iterator
 
 from flask import Flask, flash, jsonify, redirect, render_template, request, url_for
 from werkzeug.middleware.proxy_fix import ProxyFix
 
 from .extensions import register_extensions
+from .extensions.metrics import register_metrics
+from .extensions.query_stats import register_query_stats
 from .routes import register_blueprints
+from .services.assets import register_asset_manifest
+from .services.template_cache import register_template_cache
 
 # Import load_config from the config.py module (bypassing the config package)
 from .config import load_config
@@ -48,8 +55,9 @@ def _verify_critical_dependencies() -> list[str]:
     try:
         from passlib.hash import argon2 as passlib_argon2
 
-        # Verify it can actually hash (not just import)
-        _ = passlib_argon2.hash("test")
+        # Verify it can actually hash (not just import); minimal cost settings,
+        # the default ones take ~200ms per worker start
+        _ = passlib_argon2.using(rounds=1, memory_cost=8, parallelism=1).hash("test")
         logging.getLogger(__name__).debug("passlib argon2 backend: OK")
     except Exception as e:
         errors.append(
@@ -109,6 +117,7 @@ def _verify_media_storage(app: Flask) -> None:
     required_dirs = [
         media_root / "quiz",
         media_root / "releases",
+        media_root / "store",
     ]
 
     try:
@@ -129,15 +138,33 @@ def _verify_media_storage(app: Flask) -> None:
         )
         raise RuntimeError(
             "Media storage not writable. Ensure /app/media is a read-write mount "
-            "and required directories exist (quiz, releases)."
+            "and required directories exist (quiz, releases, store)."
         ) from e
 
 
+@contextmanager
+def _startup_stage(timings: Dict[str, float], name: str) -> Iterator[None]:
+    """Record the duration of a ``create_app`` stage in milliseconds."""
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        timings[name] = (time.perf_counter() - start) * 1000
+
+
 def create_app(env_name: str | None = None) -> Flask:
-    """Create and configure the Flask application instance."""
+    """Create and configure the Flask application instance.
+
+    Stage durations (ms) end up in ``app.extensions["startup_timings"]``
+    (``manage.py startup-profile``). The DB connections opened to verify the
+    databases stay in the pools; under gunicorn ``--preload`` they are closed
+    before workers are forked (``gunicorn.conf.py``).
+    """
+    timings: Dict[str, float] = {}
 
     # Verify critical dependencies at startup
-    dep_errors = _verify_critical_dependencies()
+    with _startup_stage(timings, "dependencies"):
+        dep_errors = _verify_critical_dependencies()
     if dep_errors:
         logger = logging.getLogger(__name__)
         for err in dep_errors:
@@ -147,17 +174,18 @@ def create_app(env_name: str | None = None) -> Flask:
     template_dir = project_root / "templates"
     static_dir = project_root / "static"
 
-    app = Flask(
-        __name__,
-        instance_relative_config=True,
-        template_folder=str(template_dir),
-        static_folder=str(static_dir),
-    )
-    load_config(app, env_name)
+    with _startup_stage(timings, "config"):
+        app = Flask(
+            __name__,
+            instance_relative_config=True,
+            template_folder=str(template_dir),
+            static_folder=str(static_dir),
+        )
+        load_config(app, env_name)
 
-    is_test_env = env_name == "test" or app.config.get("TESTING") is True
-    if not is_test_env:
-        _verify_media_storage(app)
+        is_test_env = env_name == "test" or app.config.get("TESTING") is True
+        if not is_test_env:
+            _verify_media_storage(app)
 
     # Apply ProxyFix to correctly handle X-Forwarded-* headers from Nginx
     # This ensures url_for(_external=True) generates https:// URLs when behind HTTPS proxy
@@ -168,8 +196,9 @@ def create_app(env_name: str | None = None) -> Flask:
     from .extensions.sqlalchemy_ext import init_quiz_engine as init_quiz_db
 
     try:
-        init_auth_db(app)
-        _verify_auth_db_connection(app, require_postgres=not is_test_env)
+        with _startup_stage(timings, "auth_db"):
+            init_auth_db(app)
+            _verify_auth_db_connection(app, require_postgres=not is_test_env)
     except Exception as e:
         if not is_test_env:
             app.logger.error(f"FATAL: Auth DB initialization failed: {e}")
@@ -183,8 +212,9 @@ def create_app(env_name: str | None = None) -> Flask:
             )
 
     try:
-        init_quiz_db(app)
-        _verify_quiz_db_connection(app, require_postgres=not is_test_env)
+        with _startup_stage(timings, "quiz_db"):
+            init_quiz_db(app)
+            _verify_quiz_db_connection(app, require_postgres=not is_test_env)
     except Exception as e:
         if not is_test_env:
             app.logger.error(f"FATAL: Quiz DB initialization failed: {e}")
@@ -198,25 +228,31 @@ def create_app(env_name: str | None = None) -> Flask:
             )
 
     # Add build ID for cache busting and deployment verification
-    import time
-
     app.config["APP_BUILD_ID"] = time.strftime("%Y%m%d%H%M%S")
 
     # Store dependency check results for health endpoint
     app.config["_STARTUP_DEP_WARNINGS"] = dep_errors
 
     # Legacy env-based credential hydration removed. All auth now uses DB-backed flows.
-    register_extensions(app)
-    register_blueprints(app)
-    register_context_processors(app)
-    register_auth_context(app)
-    register_security_headers(app)
-    register_maintenance_commands(app)
-    register_error_handlers(app)
-    setup_logging(app)
-    
+    with _startup_stage(timings, "extensions"):
+        register_extensions(app)
+        register_query_stats(app)
+        register_metrics(app)
+    with _startup_stage(timings, "blueprints"):
+        register_blueprints(app)
+    with _startup_stage(timings, "app_hooks"):
+        register_asset_manifest(app)
+        register_template_cache(app)
+        register_context_processors(app)
+        register_auth_context(app)
+        register_security_headers(app)
+        register_maintenance_commands(app)
+        register_error_handlers(app)
+        setup_logging(app)
+
     # Quiz unit tooling is maintained separately under scripts/quiz_units.
 
+    app.extensions["startup_timings"] = timings
     return app
 
 
@@ -263,7 +299,14 @@ def register_context_processors(app: Flask) -> None:
         asset_path = Path(asset_path_str)
         return hashlib.sha256(asset_path.read_bytes()).hexdigest()[:12]
 
+    manifest = app.extensions.get("asset_manifest", {})
+
     def asset_url(filename: str) -> str:
+        # Fingerprinted build output (manage.py build-assets); else ?v=<hash>
+        built = manifest.get(filename)
+        if built:
+            return url_for("static", filename=f"dist/{built}")
+
         static_root = Path(app.static_folder or "static")
         asset_path = static_root.joinpath(*filename.split("/"))
         if not asset_path.is_file():
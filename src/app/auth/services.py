@@ -22,6 +22,7 @@ from werkzeug.security import (
     check_password_hash,
 )  # supports scrypt, pbkdf2_sha256, etc.
 
+from ..extensions.metrics import timed_hash
 from ..extensions.sqlalchemy_ext import get_session
 from .models import User, RefreshToken, ResetToken
 
@@ -35,6 +36,7 @@ class AccountStatus:
 
 
 # Password hashing
+@timed_hash("hash")
 def hash_password(plain: str) -> str:
     algo = current_app.config.get("AUTH_HASH_ALGO", "argon2")
     if algo == "argon2":
@@ -61,6 +63,7 @@ def hash_password(plain: str) -> str:
             return hashed.decode("utf-8")
 
 
+@timed_hash("verify")
 def verify_password(plain: str, hashed: str) -> bool:
     """Verify a password against a stored hash.
 
@@ -83,6 +83,31 @@ class BaseConfig:
 
     # Quiz DB (PostgreSQL-only). Must be configured explicitly.
     QUIZ_DATABASE_URL = os.getenv("QUIZ_DATABASE_URL")
+    # Optional read replica for read-only quiz endpoints (leaderboard, topics, questions, reports).
+    # Used while its replay lag is <= QUIZ_DB_READ_MAX_LAG_SECONDS (checked every
+    # QUIZ_DB_READ_CHECK_SECONDS); otherwise reads go to the primary.
+    QUIZ_DATABASE_READ_URL = os.getenv("QUIZ_DATABASE_READ_URL")
+    QUIZ_DB_READ_MAX_LAG_SECONDS = float(os.getenv("QUIZ_DB_READ_MAX_LAG_SECONDS", "5"))
+    QUIZ_DB_READ_CHECK_SECONDS = float(os.getenv("QUIZ_DB_READ_CHECK_SECONDS", "5"))
+
+    # Connection pools (PostgreSQL engines). Per worker process, so keep
+    # workers * (AUTH + QUIZ pool size + max overflow) below max_connections.
+    AUTH_DB_POOL_SIZE = int(os.getenv("AUTH_DB_POOL_SIZE", "2"))
+    AUTH_DB_MAX_OVERFLOW = int(os.getenv("AUTH_DB_MAX_OVERFLOW", "3"))
+    QUIZ_DB_POOL_SIZE = int(os.getenv("QUIZ_DB_POOL_SIZE", "5"))
+    QUIZ_DB_MAX_OVERFLOW = int(os.getenv("QUIZ_DB_MAX_OVERFLOW", "5"))
+    # Seconds to wait for a free connection before failing the request
+    DB_POOL_TIMEOUT = float(os.getenv("DB_POOL_TIMEOUT", "10"))
+    # Replace connections older than N seconds; pre-ping drops dead ones on checkout
+    DB_POOL_RECYCLE = int(os.getenv("DB_POOL_RECYCLE", "1800"))
+    DB_POOL_PRE_PING = os.getenv("DB_POOL_PRE_PING", "true").lower() in ("1", "true", "yes")
+    # Per-connection statement_timeout (0 = off) and application_name ("<name>:auth|quiz")
+    DB_STATEMENT_TIMEOUT_MS = int(os.getenv("DB_STATEMENT_TIMEOUT_MS", "30000"))
+    DB_APPLICATION_NAME = os.getenv("DB_APPLICATION_NAME", "games_hispanistica")
+    # Per-request SQL stats: X-DB-Queries/Server-Timing headers (DevConfig: on) and
+    # a WARNING log naming the most repeated statement above N statements (0 = off)
+    DB_QUERY_STATS_HEADER = os.getenv("DB_QUERY_STATS_HEADER", "false").lower() in ("1", "true", "yes")
+    DB_QUERY_WARN_COUNT = int(os.getenv("DB_QUERY_WARN_COUNT", "25"))
 
     # Hashing (argon2 or bcrypt)
     AUTH_HASH_ALGO = os.getenv("AUTH_HASH_ALGO", "argon2")
@@ -116,6 +141,39 @@ class BaseConfig:
         os.getenv("QUIZ_ANONYMOUS_PLAYER_RETENTION_HOURS", "3")
     )
 
+    # Content import: worker pool for unit validation + audio hashing.
+    # QUIZ_IMPORT_WORKERS=0 -> auto (min(8, cpu_count)); 1 -> serial.
+    # QUIZ_IMPORT_POOL: "thread" (default) or "process".
+    QUIZ_IMPORT_WORKERS = int(os.getenv("QUIZ_IMPORT_WORKERS", "0"))
+    QUIZ_IMPORT_POOL = os.getenv("QUIZ_IMPORT_POOL", "thread")
+
+    # Content jobs (import/publish) run from the quiz_jobs table.
+    # QUIZ_JOBS_LOCAL_WORKER=false -> only `manage.py run-quiz-jobs` executes them.
+    QUIZ_JOBS_LOCAL_WORKER = os.getenv("QUIZ_JOBS_LOCAL_WORKER", "true").lower() in ("1", "true", "yes")
+    QUIZ_JOB_POLL_SECONDS = float(os.getenv("QUIZ_JOB_POLL_SECONDS", "2"))
+    QUIZ_JOB_STALE_SECONDS = int(os.getenv("QUIZ_JOB_STALE_SECONDS", "300"))
+    QUIZ_JOB_SSE_MAX_SECONDS = int(os.getenv("QUIZ_JOB_SSE_MAX_SECONDS", "25"))
+
+    # Dashboard media upload limits, enforced while streaming (0 = unlimited).
+    QUIZ_UPLOAD_MAX_FILE_BYTES = int(os.getenv("QUIZ_UPLOAD_MAX_FILE_BYTES", str(50 * 1024 * 1024)))
+    QUIZ_UPLOAD_MAX_REQUEST_BYTES = int(os.getenv("QUIZ_UPLOAD_MAX_REQUEST_BYTES", str(200 * 1024 * 1024)))
+
+    # Media GC retention (manage.py gc-media)
+    QUIZ_MEDIA_GC_KEEP_DRAFTS_DAYS = int(os.getenv("QUIZ_MEDIA_GC_KEEP_DRAFTS_DAYS", "30"))
+    QUIZ_MEDIA_GC_KEEP_LAST = int(os.getenv("QUIZ_MEDIA_GC_KEEP_LAST", "3"))
+
+    # /quiz-media offload to nginx (internal location, e.g. "/_quiz_media/"); empty -> Flask serves
+    QUIZ_MEDIA_ACCEL_REDIRECT = os.getenv("QUIZ_MEDIA_ACCEL_REDIRECT", "")
+
+    # Import-time media transcoding (audio variants + durations, image derivatives; needs ffmpeg)
+    QUIZ_MEDIA_TRANSCODE = os.getenv("QUIZ_MEDIA_TRANSCODE", "true").lower() in ("1", "true", "yes")
+
+    # Published content snapshot (mmap, shared by all workers); "off" -> read from DB
+    QUIZ_CONTENT_SNAPSHOT_DIR = os.getenv("QUIZ_CONTENT_SNAPSHOT_DIR", str(DATA_DIR / "content_snapshots"))
+
+    # Compiled Jinja templates (manage.py build-templates at image build); "off" -> no cache
+    JINJA_BYTECODE_CACHE_DIR = os.getenv("JINJA_BYTECODE_CACHE_DIR", str(PROJECT_ROOT / "build" / "jinja_cache"))
+
 
 class DevConfig(BaseConfig):
     """Development configuration."""
@@ -129,6 +187,8 @@ class DevConfig(BaseConfig):
     TEMPLATES_AUTO_RELOAD = True
     SEND_FILE_MAX_AGE_DEFAULT = 0
 
+    DB_QUERY_STATS_HEADER = True
+
 
 CONFIG_MAPPING = {
     "development": DevConfig,
@@ -0,0 +1,250 @@
+"""Prometheus metrics (``GET /metrics``, text exposition format).
+
+Per-request metrics for ``METRICS_PATH_PREFIXES`` (``/api/quiz/``,
+``/auth/``): latency histogram by endpoint/method/status, DB time histogram
+and statement counter (from ``query_stats``). Account password hashing is
+timed with ``@timed_hash``; the quiz module registers its own metrics (runs,
+answers, timeouts, jokers, cache hits, PIN hashing;
+``game_modules.quiz.metrics``). Connection pool state and counters come
+from ``pool_metrics`` and are copied into Prometheus metrics at most every
+``POOL_SYNC_SECONDS`` per worker.
+
+gunicorn workers: with ``PROMETHEUS_MULTIPROC_DIR`` set (Docker
+entrypoint: ``/app/data/metrics``, emptied on container start) every worker
+writes its samples to files there and ``/metrics`` aggregates them,
+whichever worker answers the scrape. ``gunicorn.conf.py`` drops the live
+gauges of exited workers. The variable must be set before the process
+starts. A missing directory is created; if that fails, metrics stay per
+process.
+
+Without ``prometheus_client`` installed the metric objects are no-ops and
+``/metrics`` answers 404.
+"""
+
+from __future__ import annotations
+
+import functools
+import logging
+import os
+import threading
+import time
+from typing import Any, Callable, Dict, Optional, Sequence, Tuple, TypeVar
+
+from flask import Flask, Response, g, request
+
+
+def _prepare_multiproc_dir() -> None:
+    """Create ``PROMETHEUS_MULTIPROC_DIR`` or fall back to per-process metrics.
+
+    Creating a metric opens its file in that directory, so a missing one
+    would break every import of the app (CLI commands, image build steps).
+    Must run before ``prometheus_client`` is imported.
+    """
+    path = os.environ.get("PROMETHEUS_MULTIPROC_DIR")
+    if not path:
+        return
+    try:
+        os.makedirs(path, exist_ok=True)
+    except OSError as e:
+        logging.getLogger(__name__).warning(f"PROMETHEUS_MULTIPROC_DIR unusable, metrics per process: {e}")
+        del os.environ["PROMETHEUS_MULTIPROC_DIR"]
+
+
+_prepare_multiproc_dir()
+
+try:  # optional: metrics are disabled without prometheus_client
+    import prometheus_client
+    from prometheus_client import CollectorRegistry, multiprocess
+except ImportError:  # pragma: no cover - depends on environment
+    prometheus_client = None
+
+METRICS_PATH_PREFIXES: Tuple[str, ...] = ("/api/quiz/", "/auth/")
+
+REQUEST_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+DB_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0)
+HASH_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5)
+
+# Pool state is copied into Prometheus at most this often per worker
+POOL_SYNC_SECONDS = 5.0
+
+F = TypeVar("F", bound=Callable[..., Any])
+
+
+class _NoopMetric:
+    """Stands in for a metric when prometheus_client is not installed."""
+
+    def labels(self, *args: Any, **kwargs: Any) -> "_NoopMetric":
+        return self
+
+    def inc(self, amount: float = 1) -> None:
+        pass
+
+    def observe(self, amount: float) -> None:
+        pass
+
+    def set(self, value: float) -> None:
+        pass
+
+
+_NOOP = _NoopMetric()
+
+
+def metrics_enabled() -> bool:
+    return prometheus_client is not None
+
+
+def _metric(cls_name: str, name: str, *args: Any, **kwargs: Any) -> Any:
+    if prometheus_client is None:
+        return _NOOP
+    try:
+        return getattr(prometheus_client, cls_name)(name, *args, **kwargs)
+    except ValueError:
+        # Already registered: this module was imported under a second name
+        # (``app.extensions`` vs ``src.app.extensions``)
+        return prometheus_client.REGISTRY._names_to_collectors[name]
+
+
+def counter(name: str, documentation: str, labelnames: Sequence[str] = ()) -> Any:
+    return _metric("Counter", name, documentation, labelnames)
+
+
+def histogram(name: str, documentation: str, labelnames: Sequence[str] = (), buckets=REQUEST_BUCKETS) -> Any:
+    return _metric("Histogram", name, documentation, labelnames, buckets=buckets)
+
+
+def gauge(name: str, documentation: str, labelnames: Sequence[str] = ()) -> Any:
+    # livesum: summed over the running workers (multiprocess mode)
+    return _metric("Gauge", name, documentation, labelnames, multiprocess_mode="livesum")
+
+
+HTTP_REQUEST_SECONDS = histogram(
+    "http_request_duration_seconds",
+    "Request latency",
+    ("endpoint", "method", "status"),
+)
+HTTP_REQUEST_DB_SECONDS = histogram(
+    "http_request_db_seconds",
+    "DB time per request (all engines)",
+    ("endpoint",),
+    buckets=DB_BUCKETS,
+)
+HTTP_REQUEST_DB_QUERIES = counter(
+    "http_request_db_queries",
+    "SQL statements executed by requests",
+    ("endpoint",),
+)
+PASSWORD_HASH_SECONDS = histogram(
+    "auth_password_hash_duration_seconds",
+    "Account password hashing and verification time",
+    ("operation",),
+    buckets=HASH_BUCKETS,
+)
+
+DB_POOL_IN_USE = gauge("db_pool_connections_in_use", "Checked-out connections", ("pool",))
+DB_POOL_IDLE = gauge("db_pool_connections_idle", "Idle pooled connections", ("pool",))
+DB_POOL_OVERFLOW = gauge("db_pool_connections_overflow", "Connections beyond pool_size", ("pool",))
+# pool_metrics counter name -> Prometheus counter
+_POOL_COUNTERS = {
+    "checkouts": counter("db_pool_checkouts", "Connection checkouts", ("pool",)),
+    "checkout_wait_seconds_sum": counter(
+        "db_pool_checkout_wait_seconds", "Time spent waiting for a connection", ("pool",)
+    ),
+    "timeouts": counter("db_pool_timeouts", "Checkouts that hit DB_POOL_TIMEOUT", ("pool",)),
+    "connects": counter("db_pool_connects", "New DB connections", ("pool",)),
+    "invalidations": counter("db_pool_invalidations", "Invalidated connections", ("pool",)),
+}
+
+_pool_sync_lock = threading.Lock()
+_pool_synced: Dict[Tuple[str, str], float] = {}
+_pool_synced_at = 0.0
+
+
+def timed_hash(operation: str) -> Callable[[F], F]:
+    """Observe the decorated hash/verify function in ``auth_password_hash_duration_seconds``."""
+    histogram_child = PASSWORD_HASH_SECONDS.labels(operation=operation)
+
+    def decorator(func: F) -> F:
+        @functools.wraps(func)
+        def wrapper(*args: Any, **kwargs: Any) -> Any:
+            start = time.perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                histogram_child.observe(time.perf_counter() - start)
+
+        return wrapper  # type: ignore[return-value]
+
+    return decorator
+
+
+def sync_pool_metrics(force: bool = False) -> None:
+    """Copy ``pool_metrics_snapshot()`` into the Prometheus pool metrics.
+
+    Counters advance by the change since the last sync of this worker.
+    """
+    global _pool_synced_at
+    from .pool_metrics import pool_metrics_snapshot
+
+    now = time.monotonic()
+    if not force and now - _pool_synced_at < POOL_SYNC_SECONDS:
+        return
+    if not _pool_sync_lock.acquire(blocking=False):
+        return
+    try:
+        _pool_synced_at = now
+        for pool, state in pool_metrics_snapshot().items():
+            DB_POOL_IN_USE.labels(pool=pool).set(state["in_use"])
+            DB_POOL_IDLE.labels(pool=pool).set(state["idle"])
+            DB_POOL_OVERFLOW.labels(pool=pool).set(state["overflow"])
+            for key, metric in _POOL_COUNTERS.items():
+                previous = _pool_synced.get((pool, key), 0)
+                if state[key] > previous:
+                    metric.labels(pool=pool).inc(state[key] - previous)
+                _pool_synced[(pool, key)] = state[key]
+    finally:
+        _pool_sync_lock.release()
+
+
+def render_metrics() -> Tuple[bytes, str]:
+    """Exposition-format body and content type (all workers in multiprocess mode)."""
+    sync_pool_metrics(force=True)
+    multiproc_dir = os.environ.get("PROMETHEUS_MULTIPROC_DIR")
+    if multiproc_dir and os.path.isdir(multiproc_dir):
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+    else:
+        registry = prometheus_client.REGISTRY
+    return prometheus_client.generate_latest(registry), prometheus_client.CONTENT_TYPE_LATEST
+
+
+def _is_measured(path: str) -> bool:
+    return path.startswith(METRICS_PATH_PREFIXES)
+
+
+def register_metrics(app: Flask) -> None:
+    """Time requests below ``METRICS_PATH_PREFIXES`` (no-op without prometheus_client)."""
+    if prometheus_client is None:
+        app.logger.info("prometheus_client not installed; /metrics disabled")
+        return
+
+    @app.before_request
+    def _start_request_timer():
+        if _is_measured(request.path):
+            g._metrics_start = time.perf_counter()
+
+    @app.after_request
+    def _observe_request(response: Response) -> Response:
+        start: Optional[float] = g.pop("_metrics_start", None)
+        if start is None:
+            return response
+        endpoint = request.endpoint or "unmatched"
+        HTTP_REQUEST_SECONDS.labels(
+            endpoint=endpoint, method=request.method, status=str(response.status_code)
+        ).observe(time.perf_counter() - start)
+        stats = g.get("query_stats")
+        if stats is not None:
+            HTTP_REQUEST_DB_SECONDS.labels(endpoint=endpoint).observe(stats.duration_seconds)
+            if stats.count:
+                HTTP_REQUEST_DB_QUERIES.labels(endpoint=endpoint).inc(stats.count)
+        sync_pool_metrics()
+        return response
@@ -0,0 +1,156 @@
+"""Connection pool metrics for the SQLAlchemy engines.
+
+Counters are per worker process. For each engine (``auth``, ``quiz``) we
+record:
+
+- checkouts and the time spent waiting for a connection (queue wait plus
+  connect time for new connections), as sum/max and histogram buckets
+- pool timeouts (``DB_POOL_TIMEOUT`` exceeded)
+- new connections, and those opened beyond ``pool_size`` (overflow)
+- invalidated connections (e.g. dropped by ``pool_pre_ping``)
+
+``pool_metrics_snapshot()`` adds the current pool state (size, in use,
+overflow) so pools can be sized against Postgres ``max_connections``.
+"""
+
+from __future__ import annotations
+
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Tuple
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.pool import QueuePool
+
+# Upper bounds (seconds) of the checkout wait histogram
+CHECKOUT_WAIT_BUCKETS: Tuple[float, ...] = (0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0)
+
+
+@dataclass
+class PoolMetrics:
+    """Counters of one engine's pool (thread-safe)."""
+    name: str
+    checkouts: int = 0
+    checkout_wait_seconds_sum: float = 0.0
+    checkout_wait_seconds_max: float = 0.0
+    # Cumulative counts per CHECKOUT_WAIT_BUCKETS bound (Prometheus style)
+    checkout_wait_buckets: List[int] = field(default_factory=lambda: [0] * len(CHECKOUT_WAIT_BUCKETS))
+    timeouts: int = 0
+    connects: int = 0
+    overflow_connects: int = 0
+    invalidations: int = 0
+    _lock: threading.Lock = field(default_factory=threading.Lock, repr=False, compare=False)
+
+    def record_checkout(self, wait_seconds: float) -> None:
+        with self._lock:
+            self.checkouts += 1
+            self.checkout_wait_seconds_sum += wait_seconds
+            self.checkout_wait_seconds_max = max(self.checkout_wait_seconds_max, wait_seconds)
+            for i, bound in enumerate(CHECKOUT_WAIT_BUCKETS):
+                if wait_seconds <= bound:
+                    self.checkout_wait_buckets[i] += 1
+
+    def record_timeout(self) -> None:
+        with self._lock:
+            self.timeouts += 1
+
+    def record_connect(self, overflow: bool) -> None:
+        with self._lock:
+            self.connects += 1
+            if overflow:
+                self.overflow_connects += 1
+
+    def record_invalidation(self) -> None:
+        with self._lock:
+            self.invalidations += 1
+
+    def to_dict(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "checkouts": self.checkouts,
+                "checkout_wait_seconds_sum": round(self.checkout_wait_seconds_sum, 6),
+                "checkout_wait_seconds_max": round(self.checkout_wait_seconds_max, 6),
+                "checkout_wait_buckets": dict(zip(CHECKOUT_WAIT_BUCKETS, self.checkout_wait_buckets)),
+                "timeouts": self.timeouts,
+                "connects": self.connects,
+                "overflow_connects": self.overflow_connects,
+                "invalidations": self.invalidations,
+            }
+
+
+_metrics: Dict[str, PoolMetrics] = {}
+_engines: Dict[str, Engine] = {}
+_registry_lock = threading.Lock()
+
+
+def get_pool_metrics(name: str) -> PoolMetrics:
+    """Metrics of the pool named ``name`` (created on first use)."""
+    with _registry_lock:
+        if name not in _metrics:
+            _metrics[name] = PoolMetrics(name=name)
+        return _metrics[name]
+
+
+class InstrumentedQueuePool(QueuePool):
+    """QueuePool that times checkouts.
+
+    Metrics are looked up by the pool's logging name (``pool_logging_name``),
+    which survives ``engine.dispose()`` recreating the pool.
+    """
+
+    def _do_get(self):
+        metrics = get_pool_metrics(self._orig_logging_name or "default")
+        start = time.perf_counter()
+        try:
+            connection = super()._do_get()
+        except PoolTimeoutError:
+            metrics.record_timeout()
+            raise
+        metrics.record_checkout(time.perf_counter() - start)
+        return connection
+
+
+def instrument_engine(engine: Engine, name: str) -> None:
+    """Attach connect/invalidate listeners and register the engine for snapshots.
+
+    The engine must have been created with ``poolclass=InstrumentedQueuePool``
+    and ``pool_logging_name=name``.
+    """
+    metrics = get_pool_metrics(name)
+
+    @event.listens_for(engine, "connect")
+    def _on_connect(dbapi_connection, connection_record):
+        # QueuePool counts overflow from -pool_size; > 0 means beyond pool_size
+        metrics.record_connect(overflow=engine.pool.overflow() > 0)
+
+    @event.listens_for(engine, "invalidate")
+    def _on_invalidate(dbapi_connection, connection_record, exception):
+        metrics.record_invalidation()
+
+    with _registry_lock:
+        _engines[name] = engine
+
+
+def pool_metrics_snapshot() -> Dict[str, Dict[str, Any]]:
+    """Counters plus current pool state for each instrumented engine."""
+    with _registry_lock:
+        engines = dict(_engines)
+
+    snapshot: Dict[str, Dict[str, Any]] = {}
+    for name, engine in engines.items():
+        pool = engine.pool
+        state = get_pool_metrics(name).to_dict()
+        state.update(
+            {
+                "pool_size": pool.size(),
+                "max_overflow": pool._max_overflow,
+                "in_use": pool.checkedout(),
+                "idle": pool.checkedin(),
+                "overflow": max(0, pool.overflow()),
+            }
+        )
+        snapshot[name] = state
+    return snapshot
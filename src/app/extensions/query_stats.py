@@ -0,0 +1,182 @@
+"""Per-request SQL statement counts and DB time.
+
+Every engine created by ``sqlalchemy_ext`` gets cursor-execute listeners
+(``instrument_query_stats``). Statements are recorded into every collector
+active in the current context (``collect_queries()``), so a request-level
+collector and a test's budget can nest.
+
+``register_query_stats(app)`` opens a collector per request and, after the
+request:
+
+- logs ``[db] {...}`` (path, endpoint, status, queries, db_ms) at DEBUG, or
+  at WARNING with the most repeated statement once the request runs more
+  than ``DB_QUERY_WARN_COUNT`` statements (typical N+1 signature)
+- adds ``X-DB-Queries`` and ``Server-Timing: db;dur=..`` headers when
+  ``DB_QUERY_STATS_HEADER`` is on (DevConfig)
+
+Tests assert budgets with ``assert_max_queries(n)`` (or the
+``query_budget`` fixture in ``tests/conftest.py``).
+"""
+
+from __future__ import annotations
+
+import logging
+import time
+from collections import Counter
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from flask import Flask, Response, g, request
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+logger = logging.getLogger(__name__)
+
+# Defaults when the app config does not set them (see BaseConfig)
+QUERY_STATS_DEFAULTS: Dict[str, Any] = {
+    "DB_QUERY_STATS_HEADER": False,
+    "DB_QUERY_WARN_COUNT": 25,
+}
+
+
+@dataclass
+class QueryStats:
+    """Statements executed while a collector was active."""
+    count: int = 0
+    duration_seconds: float = 0.0
+    by_engine: Counter = field(default_factory=Counter)
+    by_statement: Counter = field(default_factory=Counter)
+    # Full statement list (only with capture=True; tests)
+    statements: Optional[List[str]] = None
+
+    def record(self, engine_name: str, statement: str, duration: float) -> None:
+        self.count += 1
+        self.duration_seconds += duration
+        self.by_engine[engine_name] += 1
+        self.by_statement[statement] += 1
+        if self.statements is not None:
+            self.statements.append(statement)
+
+    def most_repeated(self) -> Optional[Tuple[str, int]]:
+        if not self.by_statement:
+            return None
+        return self.by_statement.most_common(1)[0]
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "queries": self.count,
+            "db_ms": round(self.duration_seconds * 1000, 2),
+            "by_engine": dict(self.by_engine),
+        }
+
+
+_active: ContextVar[Tuple[QueryStats, ...]] = ContextVar("query_stats_active", default=())
+
+
+def _push(stats: QueryStats) -> None:
+    _active.set(_active.get() + (stats,))
+
+
+def _pop(stats: QueryStats) -> None:
+    _active.set(tuple(s for s in _active.get() if s is not stats))
+
+
+@contextmanager
+def collect_queries(capture: bool = False) -> Iterator[QueryStats]:
+    """Record statements executed in this context (thread/greenlet) into a new ``QueryStats``."""
+    stats = QueryStats(statements=[] if capture else None)
+    _push(stats)
+    try:
+        yield stats
+    finally:
+        _pop(stats)
+
+
+def instrument_query_stats(engine: Engine, name: str) -> None:
+    """Attach the cursor-execute listeners to ``engine``."""
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def _before(conn, cursor, statement, parameters, context, executemany):
+        if _active.get():
+            conn.info.setdefault("query_stats_start", []).append(time.perf_counter())
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def _after(conn, cursor, statement, parameters, context, executemany):
+        collectors = _active.get()
+        starts = conn.info.get("query_stats_start")
+        if not collectors or not starts:
+            return
+        duration = time.perf_counter() - starts.pop()
+        for stats in collectors:
+            stats.record(name, statement, duration)
+
+
+class QueryBudgetExceeded(AssertionError):
+    """More statements than the budget allowed."""
+
+
+@contextmanager
+def assert_max_queries(budget: int) -> Iterator[QueryStats]:
+    """Fail if the block executes more than ``budget`` statements.
+
+    The message lists the statements and their repeat counts, so an N+1 shows
+    up as one statement executed many times.
+    """
+    with collect_queries(capture=True) as stats:
+        yield stats
+    if stats.count > budget:
+        repeated = "\n".join(
+            f"  {count}x {statement.strip()[:200]}"
+            for statement, count in stats.by_statement.most_common()
+        )
+        raise QueryBudgetExceeded(f"{stats.count} queries executed, budget is {budget}:\n{repeated}")
+
+
+def _setting(app: Flask, key: str) -> Any:
+    value = app.config.get(key)
+    return QUERY_STATS_DEFAULTS[key] if value is None else value
+
+
+def register_query_stats(app: Flask) -> None:
+    """Collect statements per request; log them and (dev) expose them as headers."""
+
+    @app.before_request
+    def _start_query_stats():
+        g.query_stats = QueryStats()
+        _push(g.query_stats)
+
+    @app.after_request
+    def _report_query_stats(response: Response) -> Response:
+        stats: Optional[QueryStats] = g.get("query_stats")
+        if stats is None:
+            return response
+
+        if _setting(app, "DB_QUERY_STATS_HEADER"):
+            db_ms = stats.duration_seconds * 1000
+            response.headers["X-DB-Queries"] = str(stats.count)
+            response.headers.add("Server-Timing", f'db;dur={db_ms:.1f};desc="{stats.count} queries"')
+
+        if stats.count:
+            log_data = {
+                "event": "DB_QUERIES",
+                "path": request.path,
+                "endpoint": request.endpoint,
+                "status": response.status_code,
+                **stats.to_dict(),
+            }
+            warn_count = int(_setting(app, "DB_QUERY_WARN_COUNT"))
+            if warn_count and stats.count > warn_count:
+                statement, repeats = stats.most_repeated()
+                log_data["most_repeated"] = {"statement": statement.strip()[:200], "count": repeats}
+                logger.warning("[db] %s", log_data, extra=log_data)
+            else:
+                logger.debug("[db] %s", log_data, extra=log_data)
+        return response
+
+    @app.teardown_request
+    def _stop_query_stats(exc):
+        stats = g.pop("query_stats", None)
+        if stats is not None:
+            _pop(stats)
@@ -3,23 +3,149 @@
 Provides a create_engine+sessionmaker and helper contextmanager `get_session()`.
 The auth migration uses a separate AUTH database by default (data/db/auth.db), but
 this extension can accept any SQLAlchemy URL via config (AUTH_DATABASE_URL).
+
+PostgreSQL engines get a configurable, instrumented pool (see
+``_engine_options`` and ``pool_metrics``): size/overflow per engine
+(``AUTH_DB_*``, ``QUIZ_DB_*``), shared ``DB_POOL_TIMEOUT``/``DB_POOL_RECYCLE``/
+``DB_POOL_PRE_PING`` and a per-connection ``statement_timeout`` and
+``application_name``.
+
+Read replica (optional, ``QUIZ_DATABASE_READ_URL``): ``get_quiz_session(
+readonly=True)`` uses the replica while it is reachable and its replay lag
+is at most ``QUIZ_DB_READ_MAX_LAG_SECONDS``, else the primary. The check is
+cached for ``QUIZ_DB_READ_CHECK_SECONDS``; replica connections run with
+``default_transaction_read_only`` so a misrouted write fails loudly.
+
+All engines count statements and DB time per request (``query_stats``).
+
+Quiz routes use ``quiz_request_session()``: one session per request (on
+``flask.g``) shared by the auth decorator and the route, closed at request
+teardown. Engines and sessionmakers are module globals written once by
+``init_*_engine`` at app creation and only read afterwards, so they are safe
+for threaded (gthread) and gevent workers; sessions are never shared across
+requests.
+
+``dispose_engines()`` makes the engines fork-safe: ``gunicorn.conf.py``
+closes the master's connections before workers are forked (``--preload``)
+and makes every worker start with empty pools.
 """
 
 from __future__ import annotations
 
+import logging
+import threading
+import time
 from contextlib import contextmanager
-from typing import Iterator, Optional
+from typing import Any, Dict, Iterator, Optional
 
-from sqlalchemy import create_engine
+from flask import g, has_request_context
+from sqlalchemy import create_engine, text
 from sqlalchemy.engine import make_url
+from sqlalchemy.exc import DBAPIError, SQLAlchemyError
 from sqlalchemy.orm import Session, sessionmaker
 
+from .pool_metrics import InstrumentedQueuePool, instrument_engine
+from .query_stats import instrument_query_stats
+
+# Defaults when the app config does not set them (see BaseConfig)
+POOL_DEFAULTS: Dict[str, Any] = {
+    "AUTH_DB_POOL_SIZE": 2,
+    "AUTH_DB_MAX_OVERFLOW": 3,
+    "QUIZ_DB_POOL_SIZE": 5,
+    "QUIZ_DB_MAX_OVERFLOW": 5,
+    "DB_POOL_TIMEOUT": 10.0,
+    "DB_POOL_RECYCLE": 1800,
+    "DB_POOL_PRE_PING": True,
+    "DB_STATEMENT_TIMEOUT_MS": 30000,
+    "DB_APPLICATION_NAME": "games_hispanistica",
+    "QUIZ_DB_READ_MAX_LAG_SECONDS": 5.0,
+    "QUIZ_DB_READ_CHECK_SECONDS": 5.0,
+}
+
+logger = logging.getLogger(__name__)
+
+# Replay lag in seconds; 0 on a primary (or a plain database standing in for
+# a replica) and on a replica that has replayed everything it received.
+REPLICA_LAG_SQL = text(
+    """
+    SELECT CASE
+        WHEN NOT pg_is_in_recovery() THEN 0
+        WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0
+        ELSE COALESCE(EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()), 0)
+    END
+    """
+)
+
 _engine = None
 _SessionLocal: sessionmaker | None = None
 
 _quiz_engine = None
 _QuizSessionLocal: sessionmaker | None = None
 
+_quiz_read_engine = None
+_QuizReadSessionLocal: sessionmaker | None = None
+
+
+def _pool_setting(app, key: str) -> Any:
+    if app is not None and app.config.get(key) is not None:
+        return app.config[key]
+    return POOL_DEFAULTS[key]
+
+
+def _engine_options(
+    app,
+    db_url: str,
+    name: str,
+    prefix: Optional[str] = None,
+    read_only: bool = False,
+) -> Dict[str, Any]:
+    """``create_engine`` keyword arguments for the ``auth``/``quiz`` engine.
+
+    Only PostgreSQL gets pool settings; SQLite (tests, legacy auth.db)
+    keeps SQLAlchemy's defaults.
+
+    Args:
+        name: Engine name (metrics, application_name)
+        prefix: Pool size config prefix (default: ``name.upper()``)
+        read_only: Start every transaction read-only (replica engine)
+    """
+    if make_url(db_url).get_backend_name() != "postgresql":
+        return {"future": True}
+
+    prefix = prefix or name.upper()
+    connect_args: Dict[str, Any] = {
+        "application_name": f"{_pool_setting(app, 'DB_APPLICATION_NAME')}:{name}",
+    }
+    options = []
+    statement_timeout = int(_pool_setting(app, "DB_STATEMENT_TIMEOUT_MS"))
+    if statement_timeout > 0:
+        options.append(f"-c statement_timeout={statement_timeout}")
+    if read_only:
+        options.append("-c default_transaction_read_only=on")
+    if options:
+        connect_args["options"] = " ".join(options)
+
+    return {
+        "future": True,
+        "poolclass": InstrumentedQueuePool,
+        "pool_logging_name": name,
+        "pool_size": int(_pool_setting(app, f"{prefix}_DB_POOL_SIZE")),
+        "max_overflow": int(_pool_setting(app, f"{prefix}_DB_MAX_OVERFLOW")),
+        "pool_timeout": float(_pool_setting(app, "DB_POOL_TIMEOUT")),
+        "pool_recycle": int(_pool_setting(app, "DB_POOL_RECYCLE")),
+        "pool_pre_ping": bool(_pool_setting(app, "DB_POOL_PRE_PING")),
+        "connect_args": connect_args,
+    }
+
+
+def _create_engine(app, db_url: str, name: str, **kwargs: Any):
+    options = _engine_options(app, db_url, name, **kwargs)
+    engine = create_engine(db_url, **options)
+    if options.get("poolclass") is InstrumentedQueuePool:
+        instrument_engine(engine, name)
+    instrument_query_stats(engine, name)
+    return engine
+
 
 def init_engine(app) -> None:
     global _engine, _SessionLocal
@@ -27,7 +153,7 @@ def init_engine(app) -> None:
     if not db_url:
         raise RuntimeError("AUTH_DATABASE_URL is not configured")
 
-    _engine = create_engine(db_url, future=True)
+    _engine = _create_engine(app, db_url, "auth")
     _SessionLocal = sessionmaker(
         bind=_engine, autoflush=False, autocommit=False, expire_on_commit=False
     )
@@ -63,8 +189,93 @@ def _resolve_quiz_db_url(app) -> Optional[str]:
     return None
 
 
+def _resolve_quiz_read_db_url(app) -> Optional[str]:
+    """Read replica URL: QUIZ_DATABASE_READ_URL (env, then app config)."""
+    import os
+
+    if os.getenv("QUIZ_DATABASE_READ_URL"):
+        return os.getenv("QUIZ_DATABASE_READ_URL")
+    if app is not None:
+        return app.config.get("QUIZ_DATABASE_READ_URL") or None
+    return None
+
+
+class ReplicaHealth:
+    """Cached answer to "may read-only sessions use the replica right now?"."""
+
+    def __init__(self, max_lag_seconds: float, check_seconds: float) -> None:
+        self.max_lag_seconds = max_lag_seconds
+        self.check_seconds = check_seconds
+        self.usable = False
+        self.lag_seconds: Optional[float] = None
+        self.reason = "not checked"
+        self.checked_at: Optional[float] = None
+        self._lock = threading.Lock()
+
+    def is_usable(self, engine) -> bool:
+        now = time.monotonic()
+        with self._lock:
+            if self.checked_at is not None and now - self.checked_at < self.check_seconds:
+                return self.usable
+            # Other threads keep the previous answer while this one checks
+            self.checked_at = now
+        self.check(engine)
+        return self.usable
+
+    def check(self, engine) -> None:
+        try:
+            with engine.connect() as conn:
+                lag = float(conn.execute(REPLICA_LAG_SQL).scalar() or 0)
+        except SQLAlchemyError as exc:
+            usable, lag, reason = False, None, f"unreachable ({exc.__class__.__name__})"
+        else:
+            usable = lag <= self.max_lag_seconds
+            reason = "ok" if usable else f"lag {lag:.1f}s > {self.max_lag_seconds:g}s"
+
+        if usable != self.usable:
+            log = logger.info if usable else logger.warning
+            log(f"Quiz read replica {'in use' if usable else 'bypassed'}: {reason}")
+        self.usable, self.lag_seconds, self.reason = usable, lag, reason
+
+    def mark_unusable(self, reason: str) -> None:
+        with self._lock:
+            self.checked_at = time.monotonic()
+        if self.usable:
+            logger.warning(f"Quiz read replica bypassed: {reason}")
+        self.usable, self.reason = False, reason
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {"usable": self.usable, "lag_seconds": self.lag_seconds, "reason": self.reason}
+
+
+_replica_health: Optional[ReplicaHealth] = None
+
+
+def _init_quiz_read_engine(app, auth_url: Optional[str]) -> None:
+    global _quiz_read_engine, _QuizReadSessionLocal, _replica_health
+
+    _quiz_read_engine = _QuizReadSessionLocal = _replica_health = None
+    read_url = _resolve_quiz_read_db_url(app)
+    if not read_url:
+        return
+    if _should_enforce_quiz_auth_guard(app) and auth_url:
+        _assert_quiz_not_auth_db(auth_url, read_url)
+
+    _quiz_read_engine = _create_engine(app, read_url, "quiz_read", prefix="QUIZ", read_only=True)
+    _QuizReadSessionLocal = sessionmaker(
+        bind=_quiz_read_engine, autoflush=False, autocommit=False, expire_on_commit=False
+    )
+    _replica_health = ReplicaHealth(
+        max_lag_seconds=float(_pool_setting(app, "QUIZ_DB_READ_MAX_LAG_SECONDS")),
+        check_seconds=float(_pool_setting(app, "QUIZ_DB_READ_CHECK_SECONDS")),
+    )
+
+
 def init_quiz_engine(app) -> None:
-    """Initialize SQLAlchemy engine for quiz module (PostgreSQL-only)."""
+    """Initialize SQLAlchemy engine for quiz module (PostgreSQL-only).
+
+    Also sets up the optional read replica engine (QUIZ_DATABASE_READ_URL).
+    """
     global _quiz_engine, _QuizSessionLocal
     import os
 
@@ -81,10 +292,11 @@ def init_quiz_engine(app) -> None:
     if _should_enforce_quiz_auth_guard(app) and auth_url:
         _assert_quiz_not_auth_db(auth_url, db_url)
 
-    _quiz_engine = create_engine(db_url, future=True)
+    _quiz_engine = _create_engine(app, db_url, "quiz")
     _QuizSessionLocal = sessionmaker(
         bind=_quiz_engine, autoflush=False, autocommit=False, expire_on_commit=False
     )
+    _init_quiz_read_engine(app, auth_url)
 
 
 def _should_enforce_quiz_auth_guard(app) -> bool:
@@ -126,6 +338,29 @@ def get_quiz_engine():
     return _quiz_engine
 
 
+def get_quiz_read_engine():
+    """Replica engine, or None without QUIZ_DATABASE_READ_URL."""
+    return _quiz_read_engine
+
+
+def quiz_read_replica_status() -> Optional[Dict[str, Any]]:
+    """Last replica check (None without a replica)."""
+    return _replica_health.to_dict() if _replica_health is not None else None
+
+
+def dispose_engines(close: bool = True) -> None:
+    """Drop the pooled connections of all engines (gunicorn ``--preload``).
+
+    ``close=True`` closes them (master before forking workers);
+    ``close=False`` only forgets them so a forked worker never uses, or
+    closes, a socket it shares with its parent. Each engine opens new
+    connections on the next checkout.
+    """
+    for engine in (_engine, _quiz_engine, _quiz_read_engine):
+        if engine is not None:
+            engine.dispose(close=close)
+
+
 @contextmanager
 def get_session() -> Iterator[Session]:
     """Yield SQLAlchemy session and ensure rollback/close."""
@@ -142,17 +377,99 @@ def get_session() -> Iterator[Session]:
         session.close()
 
 
-@contextmanager
-def get_quiz_session() -> Iterator[Session]:
-    """Yield SQLAlchemy session for quiz DB and ensure rollback/close."""
+def _quiz_session_factory(readonly: bool) -> sessionmaker:
     if _QuizSessionLocal is None:
         raise RuntimeError("Quiz engine not initialized — call init_quiz_engine(app) first")
-    session = _QuizSessionLocal()
+    if (
+        readonly
+        and _QuizReadSessionLocal is not None
+        and _replica_health is not None
+        and _replica_health.is_usable(_quiz_read_engine)
+    ):
+        return _QuizReadSessionLocal
+    return _QuizSessionLocal
+
+
+def _quiz_session_failed(factory: sessionmaker, exc: Exception) -> None:
+    if factory is _QuizReadSessionLocal and isinstance(exc, DBAPIError) and exc.connection_invalidated:
+        # Replica went away mid-request: route reads to the primary until the next check
+        _replica_health.mark_unusable(f"connection lost ({exc.__class__.__name__})")
+
+
+@contextmanager
+def get_quiz_session(readonly: bool = False) -> Iterator[Session]:
+    """Yield SQLAlchemy session for quiz DB and ensure rollback/close.
+
+    Args:
+        readonly: The caller only reads; use the read replica if one is
+            configured and healthy (falls back to the primary)
+    """
+    factory = _quiz_session_factory(readonly)
+    session = factory()
     try:
         yield session
         session.commit()
-    except Exception:
+    except Exception as exc:
         session.rollback()
+        _quiz_session_failed(factory, exc)
         raise
     finally:
         session.close()
+
+
+class _RequestSession:
+    """A request's quiz session and how many ``with`` blocks are using it."""
+
+    __slots__ = ("session", "factory", "depth")
+
+    def __init__(self, factory: sessionmaker) -> None:
+        self.session = factory()
+        self.factory = factory
+        self.depth = 0
+
+
+@contextmanager
+def quiz_request_session(readonly: bool = False) -> Iterator[Session]:
+    """Request-scoped quiz session (``get_quiz_session`` outside a request).
+
+    All blocks of one request share one session, so the player loaded by the
+    auth decorator is still in the identity map for the route. The outermost
+    block commits (rolls back on error); nested blocks join it. Read-only
+    blocks reuse the request's primary session once one exists (they see the
+    request's own writes), else get a replica session.
+
+    Sessions live on ``flask.g`` (one per request, thread and greenlet);
+    ``close_quiz_request_sessions()`` closes them at request teardown.
+    """
+    if not has_request_context():
+        with get_quiz_session(readonly=readonly) as session:
+            yield session
+        return
+
+    scoped: Dict[str, _RequestSession] = g.setdefault("_quiz_sessions", {})
+    entry = scoped.get("primary")
+    if entry is None and readonly:
+        entry = scoped.get("read")
+    if entry is None:
+        factory = _quiz_session_factory(readonly)
+        key = "read" if factory is _QuizReadSessionLocal else "primary"
+        entry = scoped[key] = _RequestSession(factory)
+
+    entry.depth += 1
+    try:
+        yield entry.session
+        if entry.depth == 1:
+            entry.session.commit()
+    except Exception as exc:
+        if entry.depth == 1:
+            entry.session.rollback()
+            _quiz_session_failed(entry.factory, exc)
+        raise
+    finally:
+        entry.depth -= 1
+
+
+def close_quiz_request_sessions() -> None:
+    """Close the request's quiz sessions (teardown; no-op without any)."""
+    for entry in g.pop("_quiz_sessions", {}).values():
+        entry.session.close()
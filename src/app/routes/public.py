@@ -63,6 +63,40 @@ def health_check():
     }), 200
 
 
+@blueprint.get("/health/db-pools")
+@limiter.exempt
+def health_db_pools():
+    """Connection pool metrics of this worker (see extensions.pool_metrics).
+
+    Per engine (``auth``, ``quiz``): checkouts, checkout wait time
+    (sum/max/buckets), timeouts, connects, overflow connects,
+    invalidations, and current pool_size/in_use/idle/overflow; plus the
+    last read replica check (null without QUIZ_DATABASE_READ_URL).
+    """
+    from ..extensions.pool_metrics import pool_metrics_snapshot
+    from ..extensions.sqlalchemy_ext import quiz_read_replica_status
+
+    return jsonify({
+        "pools": pool_metrics_snapshot(),
+        "quiz_read_replica": quiz_read_replica_status(),
+    }), 200
+
+
+@blueprint.get("/metrics")
+@limiter.exempt
+def metrics():
+    """Prometheus metrics of all workers (see extensions.metrics).
+
+    404 when prometheus_client is not installed.
+    """
+    from ..extensions.metrics import metrics_enabled, render_metrics
+
+    if not metrics_enabled():
+        return jsonify({"error": "metrics disabled"}), 404
+    body, content_type = render_metrics()
+    return make_response(body, 200, {"Content-Type": content_type, "Cache-Control": "no-store"})
+
+
 @blueprint.get("/impressum")
 def impressum_page():
     """Render the legal notice (Impressum) page."""
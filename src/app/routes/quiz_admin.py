@@ -16,8 +16,8 @@ from datetime import datetime, timezone
 from pathlib import Path
 from typing import Any, Dict, List, Optional
 
-from flask import Blueprint, Response, current_app, g, jsonify, render_template, request
-from flask_jwt_extended import jwt_required
+from flask import Blueprint, Response, current_app, jsonify, render_template, request
+from flask_jwt_extended import get_jwt_identity, jwt_required
 
 from ..auth import Role
 from ..auth.decorators import require_role
@@ -47,10 +47,14 @@ def get_project_root() -> Path:
     return get_repo_root(Path(current_app.root_path).parent.parent)
 
 
+def get_media_root() -> Path:
+    """Get the media root directory."""
+    return Path(current_app.config.get("MEDIA_DIR") or get_media_dir(get_project_root()))
+
+
 def get_media_releases_path() -> Path:
     """Get the media/releases directory path."""
-    media_root = Path(current_app.config.get("MEDIA_DIR") or get_media_dir(get_project_root()))
-    return media_root / "releases"
+    return get_media_root() / "releases"
 
 
 # =============================================================================
@@ -93,16 +97,34 @@ def list_releases() -> Response:
         return jsonify({"error": "internal_error", "message": str(e)}), 500
 
 
+def _manifest_summary(manifest: Optional[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
+    """Compact view of a release manifest for the admin API."""
+    if manifest is None:
+        return None
+    return {
+        "updated_at": manifest.get("updated_at"),
+        "totals": manifest.get("totals"),
+        "missing_media": manifest.get("missing_media", []),
+        "units": {slug: entry.get("questions", 0) for slug, entry in sorted(manifest["units"].items())},
+    }
+
+
 @blueprint.get("/api/releases/<release_id>")
 @jwt_required()
 @require_role(Role.ADMIN)
 def get_release(release_id: str) -> Response:
     """Get a single release by ID.
     
+    Includes ``diff``: the structured diff recorded by the last import
+    (units added/changed/unchanged, questions added/changed/removed,
+    changed answer keys) or null, and ``manifest``: per-unit question counts
+    and missing media from the release manifest (null if none was written).
+    
     Returns:
-        200: {"release_id": str, "status": str, ...}
+        200: {"release_id": str, "status": str, "diff": {...} | null, "manifest": {...} | null, ...}
         404: {"error": "not_found"}
     """
+    from game_modules.quiz.release_manifest import load_release_manifest
     from game_modules.quiz.release_model import QuizContentRelease
     from src.app.extensions.sqlalchemy_ext import get_quiz_session
     
@@ -125,32 +147,95 @@ def get_release(release_id: str) -> Response:
                 "published_at": release.published_at.isoformat() if release.published_at else None,
                 "unpublished_at": release.unpublished_at.isoformat() if release.unpublished_at else None,
                 "created_at": release.created_at.isoformat() if release.created_at else None,
+                "diff": json.loads(release.import_diff) if release.import_diff else None,
+                "manifest": _manifest_summary(load_release_manifest(get_media_releases_path() / release_id)),
             }), 200
     except Exception as e:
         current_app.logger.error(f"Failed to get release: {e}")
         return jsonify({"error": "internal_error", "message": str(e)}), 500
 
 
+def _job_urls(job_id: str) -> Dict[str, str]:
+    return {
+        "status_url": f"{blueprint.url_prefix}/api/jobs/{job_id}",
+        "events_url": f"{blueprint.url_prefix}/api/jobs/{job_id}/events",
+    }
+
+
+def _wants_wait() -> bool:
+    return request.args.get("wait", "").lower() in {"1", "true", "yes"}
+
+
+def _submit_release_job(
+    kind: str,
+    release_id: str,
+    params: Dict[str, Any],
+    request_id: str,
+    wait: bool,
+) -> tuple[Optional[Dict[str, Any]], Optional[Response]]:
+    """Queue a job and either run it inline (wait) or hand it to the worker.
+
+    Returns:
+        (job dict, None) on success, (None, error response) on conflict
+    """
+    from game_modules.quiz import jobs
+    from src.app.extensions.sqlalchemy_ext import get_quiz_session
+
+    try:
+        with get_quiz_session() as session:
+            job = jobs.enqueue_job(
+                session,
+                kind,
+                release_id,
+                params=params,
+                request_id=request_id,
+                created_by=get_jwt_identity(),
+            )
+            job_id = job.id
+    except jobs.JobConflictError as e:
+        return None, (jsonify({
+            "ok": False,
+            "error": "job_conflict",
+            "message": str(e),
+            "job": e.job,
+            **_job_urls(e.job["job_id"]),
+        }), 409)
+
+    if wait:
+        with get_quiz_session() as session:
+            claimed = jobs.claim_next_job(session, jobs.make_worker_id(), job_id=job_id)
+        if claimed:
+            jobs.run_job(job_id, project_root=get_project_root())
+    else:
+        jobs.start_local_worker(current_app._get_current_object(), get_project_root())
+
+    with get_quiz_session() as session:
+        return jobs.job_to_dict(jobs.get_job(session, job_id)), None
+
+
 @blueprint.post("/api/releases/<release_id>/import")
 @jwt_required()
 @require_role(Role.ADMIN)
 def import_release(release_id: str) -> Response:
-    """Import a release (creates draft).
+    """Queue an import of a release (creates draft).
     
-    Calls the import service directly (not CLI subprocess).
+    The import runs as a background job (see game_modules.quiz.jobs) so large
+    releases do not block a gunicorn worker or hit the worker timeout.
+    Poll ``status_url`` or follow ``events_url`` (SSE) for progress.
+
+    Query params:
+        verify=1: force a full audio rehash (ignores checksum manifest)
+        force=1: rewrite all units even if their fingerprint is unchanged
+        wait=1: run the job inside this request and return the final state
     
     Returns:
-        200: {"ok": true, "units_imported": N, "questions_imported": N, ...}
-        400: {"ok": false, "errors": [...]}
+        202: {"ok": true, "job_id": "...", "status": "queued", "status_url": ..., "events_url": ...}
+        200/400 (wait=1): {"ok": bool, "job_id": ..., "units_imported": N, ..., "errors": [...]}
         404: {"error": "not_found"}
+        409: {"ok": false, "error": "job_conflict", "job": {...}}
     """
-    from game_modules.quiz.import_service import QuizImportService
-    from game_modules.quiz.release_model import QuizContentRelease
-    from src.app.extensions.sqlalchemy_ext import get_quiz_session
-    
     try:
         request_id = (request.headers.get("X-Request-ID") or "").strip() or f"import-{secrets.token_hex(8)}"
-        project_root = get_project_root()
         releases_path = get_media_releases_path()
         release_path = releases_path / release_id
         
@@ -163,8 +248,6 @@ def import_release(release_id: str) -> Response:
         
         units_path = str(release_path / "units")
         audio_path = str(release_path / "audio")
-        
-        service = QuizImportService(project_root=project_root)
 
         current_app.logger.info(
             "Import request received: request_id=%s release_id=%s units_path=%s audio_path=%s",
@@ -173,71 +256,89 @@ def import_release(release_id: str) -> Response:
             units_path,
             audio_path,
         )
-        
-        with get_quiz_session() as session:
-            result = service.import_release(
-                session=session,
-                units_path=units_path,
-                audio_path=audio_path,
-                release_id=release_id,
-                dry_run=False,
-                request_id=request_id,
-            )
-        
+
+        params = {
+            "units_path": units_path,
+            "audio_path": audio_path,
+            "verify": request.args.get("verify", "").lower() in {"1", "true", "yes"},
+            "force": request.args.get("force", "").lower() in {"1", "true", "yes"},
+        }
+        wait = _wants_wait()
+        job, error_response = _submit_release_job("import", release_id, params, request_id, wait)
+        if error_response is not None:
+            return error_response
+
+        if not wait:
+            return jsonify({
+                "ok": True,
+                "job_id": job["job_id"],
+                "release_id": release_id,
+                "request_id": request_id,
+                "status": job["status"],
+                **_job_urls(job["job_id"]),
+            }), 202
+
+        result = job["result"] or {}
+        succeeded = job["status"] == "succeeded"
         return jsonify({
-            "ok": result.success,
-            "release_id": result.release_id,
-            "request_id": result.request_id,
-            "units_imported": result.units_imported,
-            "questions_imported": result.questions_imported,
-            "audio_files_processed": result.audio_files_processed,
-            "errors": result.errors,
-            "warnings": result.warnings,
-            "dry_run": result.dry_run
-        }), 200 if result.success else 400
+            "ok": succeeded,
+            "job_id": job["job_id"],
+            "status": job["status"],
+            "release_id": release_id,
+            "request_id": request_id,
+            "units_imported": result.get("units_imported", 0),
+            "questions_imported": result.get("questions_imported", 0),
+            "audio_files_processed": result.get("audio_files_processed", 0),
+            "audio_hashes_reused": result.get("audio_hashes_reused", 0),
+            "units_skipped": result.get("units_skipped", 0),
+            "diff": result.get("diff"),
+            "errors": result.get("errors") or ([job["error"]] if job["error"] else []),
+            "warnings": result.get("warnings", []),
+            "dry_run": result.get("dry_run", False),
+        }), 200 if succeeded else 400
     except Exception as e:
         current_app.logger.error(f"Import failed: {e}", exc_info=True)
-        # Rollback session to prevent cascading errors
-        from src.app.extensions.sqlalchemy_ext import get_quiz_session
-        try:
-            with get_quiz_session() as session:
-                session.rollback()
-        except Exception:
-            pass  # Best effort rollback
         return jsonify({"ok": False, "error": str(e)}), 500
 
 
+def _publish_response(job: Dict[str, Any], release_id: str) -> Response:
+    result = job["result"] or {}
+    succeeded = job["status"] == "succeeded"
+    return jsonify({
+        "ok": succeeded,
+        "job_id": job["job_id"],
+        "release_id": release_id,
+        "units_affected": result.get("units_affected", 0),
+        "snapshot": result.get("snapshot"),
+        "errors": result.get("errors") or ([job["error"]] if job["error"] else []),
+    }), 200 if succeeded else 400
+
+
 @blueprint.post("/api/releases/<release_id>/publish")
 @jwt_required()
 @require_role(Role.ADMIN)
 def publish_release(release_id: str) -> Response:
-    """Mark a release as published (workflow/history tracking only).
+    """Mark a release as published and activate its content snapshot.
     
-    NOTE: This does NOT affect unit visibility in the frontend.
-    Unit visibility is controlled solely by the is_active flag on each unit.
-    Publish/unpublish are now optional workflow markers for import history.
+    With QUIZ_CONTENT_SNAPSHOT_DIR set, publish compiles the current content
+    (or reuses the release's earlier snapshot) and atomically points the game
+    routes at it; unit visibility within it is still the is_active flag.
+    Without snapshots this is a workflow marker only.
     
-    Only one release can be published at a time.
+    Only one release can be published at a time. Runs as a job inline so it
+    is serialized against a running import.
     
     Returns:
-        200: {"ok": true, "units_affected": N}
+        200: {"ok": true, "units_affected": N, "snapshot": "<file>" | null}
         400: {"ok": false, "errors": [...]}
+        409: {"ok": false, "error": "job_conflict"}
     """
-    from game_modules.quiz.import_service import QuizImportService
-    from src.app.extensions.sqlalchemy_ext import get_quiz_session
-    
     try:
-        service = QuizImportService(project_root=get_project_root())
-        
-        with get_quiz_session() as session:
-            result = service.publish_release(session, release_id)
-        
-        return jsonify({
-            "ok": result.success,
-            "release_id": result.release_id,
-            "units_affected": result.units_affected,
-            "errors": result.errors
-        }), 200 if result.success else 400
+        request_id = (request.headers.get("X-Request-ID") or "").strip() or f"publish-{secrets.token_hex(8)}"
+        job, error_response = _submit_release_job("publish", release_id, {}, request_id, wait=True)
+        if error_response is not None:
+            return error_response
+        return _publish_response(job, release_id)
     except Exception as e:
         current_app.logger.error(f"Publish failed: {e}", exc_info=True)
         return jsonify({"ok": False, "error": str(e)}), 500
@@ -247,33 +348,169 @@ def publish_release(release_id: str) -> Response:
 @jwt_required()
 @require_role(Role.ADMIN)
 def unpublish_release(release_id: str) -> Response:
-    """Mark a release as unpublished (workflow/history tracking only).
+    """Mark a release as unpublished.
     
-    NOTE: This does NOT affect unit visibility in the frontend.
-    Unit visibility is controlled solely by the is_active flag on each unit.
-    To hide units, use the unit toggle/delete endpoints instead.
+    If the release's content snapshot is active, the pointer is removed and
+    the game routes read from the database again. To hide units, use the
+    unit toggle/delete endpoints instead.
     
     Returns:
         200: {"ok": true, "units_affected": N}
         400: {"ok": false, "errors": [...]}
+        409: {"ok": false, "error": "job_conflict"}
     """
-    from game_modules.quiz.import_service import QuizImportService
+    try:
+        request_id = (request.headers.get("X-Request-ID") or "").strip() or f"unpublish-{secrets.token_hex(8)}"
+        job, error_response = _submit_release_job("unpublish", release_id, {}, request_id, wait=True)
+        if error_response is not None:
+            return error_response
+        return _publish_response(job, release_id)
+    except Exception as e:
+        current_app.logger.error(f"Unpublish failed: {e}", exc_info=True)
+        return jsonify({"ok": False, "error": str(e)}), 500
+
+
+# =============================================================================
+# API Routes - Jobs
+# =============================================================================
+
+@blueprint.get("/api/jobs")
+@jwt_required()
+@require_role(Role.ADMIN)
+def list_jobs() -> Response:
+    """List recent jobs (newest first).
+    
+    Query params:
+        release_id: filter by release
+        limit: max items (default 20, max 100)
+    
+    Returns:
+        200: {"items": [...]}
+    """
+    from game_modules.quiz import jobs
     from src.app.extensions.sqlalchemy_ext import get_quiz_session
     
     try:
-        service = QuizImportService(project_root=get_project_root())
-        
+        limit = max(1, min(100, request.args.get("limit", 20, type=int)))
         with get_quiz_session() as session:
-            result = service.unpublish_release(session, release_id)
-        
-        return jsonify({
-            "ok": result.success,
-            "release_id": result.release_id,
-            "units_affected": result.units_affected,
-            "errors": result.errors
-        }), 200 if result.success else 400
+            items = [
+                jobs.job_to_dict(job)
+                for job in jobs.list_jobs(session, release_id=request.args.get("release_id"), limit=limit)
+            ]
+        return jsonify({"items": items}), 200
     except Exception as e:
-        current_app.logger.error(f"Unpublish failed: {e}", exc_info=True)
+        current_app.logger.error(f"Failed to list jobs: {e}", exc_info=True)
+        return jsonify({"error": "internal_error", "message": str(e)}), 500
+
+
+@blueprint.get("/api/jobs/<job_id>")
+@jwt_required()
+@require_role(Role.ADMIN)
+def get_job(job_id: str) -> Response:
+    """Get job status and progress (polling endpoint).
+    
+    Returns:
+        200: {"job_id": ..., "status": ..., "phase": ..., "progress": 0-100, ...}
+        404: {"error": "not_found"}
+    """
+    from game_modules.quiz import jobs
+    from src.app.extensions.sqlalchemy_ext import get_quiz_session
+    
+    try:
+        with get_quiz_session() as session:
+            job = jobs.get_job(session, job_id)
+            if job is None:
+                return jsonify({"error": "not_found", "message": f"Job not found: {job_id}"}), 404
+            return jsonify(jobs.job_to_dict(job)), 200
+    except Exception as e:
+        current_app.logger.error(f"Failed to get job {job_id}: {e}", exc_info=True)
+        return jsonify({"error": "internal_error", "message": str(e)}), 500
+
+
+@blueprint.get("/api/jobs/<job_id>/events")
+@jwt_required()
+@require_role(Role.ADMIN)
+def job_events(job_id: str) -> Response:
+    """Stream job progress as Server-Sent Events.
+    
+    Emits ``progress`` events on change and a final ``done`` event. The
+    stream closes after QUIZ_JOB_SSE_MAX_SECONDS (sync gunicorn workers must
+    not be held for the whole import); EventSource reconnects automatically.
+    
+    Returns:
+        200: text/event-stream
+        404: {"error": "not_found"}
+    """
+    import time
+
+    from flask import stream_with_context
+
+    from game_modules.quiz import jobs
+    from src.app.extensions.sqlalchemy_ext import get_quiz_session
+
+    with get_quiz_session() as session:
+        if jobs.get_job(session, job_id) is None:
+            return jsonify({"error": "not_found", "message": f"Job not found: {job_id}"}), 404
+
+    max_seconds = float(current_app.config.get("QUIZ_JOB_SSE_MAX_SECONDS", 25))
+    interval = min(1.0, jobs.get_poll_seconds())
+
+    def generate():
+        deadline = time.monotonic() + max_seconds
+        last_payload = None
+        yield "retry: 2000\n\n"
+        while True:
+            with get_quiz_session() as session:
+                job = jobs.get_job(session, job_id)
+                data = jobs.job_to_dict(job) if job is not None else None
+            if data is None:
+                yield "event: done\ndata: {}\n\n"
+                return
+            payload = json.dumps(data)
+            if data["status"] in jobs.TERMINAL_STATUSES:
+                yield f"event: done\ndata: {payload}\n\n"
+                return
+            if payload != last_payload:
+                yield f"event: progress\ndata: {payload}\n\n"
+                last_payload = payload
+            if time.monotonic() >= deadline:
+                return
+            time.sleep(interval)
+
+    return Response(
+        stream_with_context(generate()),
+        mimetype="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+@blueprint.post("/api/jobs/<job_id>/cancel")
+@jwt_required()
+@require_role(Role.ADMIN)
+def cancel_job(job_id: str) -> Response:
+    """Cancel a queued job or request cancellation of a running one.
+    
+    A running import aborts at its next progress report and rolls back.
+    
+    Returns:
+        200: {"ok": true, "job": {...}}
+        404: {"error": "not_found"}
+        409: {"ok": false, "error": "job_finished"}
+    """
+    from game_modules.quiz import jobs
+    from src.app.extensions.sqlalchemy_ext import get_quiz_session
+    
+    try:
+        with get_quiz_session() as session:
+            job = jobs.request_cancel(session, job_id)
+            if job is None:
+                return jsonify({"error": "not_found", "message": f"Job not found: {job_id}"}), 404
+            data = jobs.job_to_dict(job)
+        if data["status"] in (jobs.JOB_STATUS_SUCCEEDED, jobs.JOB_STATUS_FAILED):
+            return jsonify({"ok": False, "error": "job_finished", "job": data}), 409
+        return jsonify({"ok": True, "job": data}), 200
+    except Exception as e:
+        current_app.logger.error(f"Failed to cancel job {job_id}: {e}", exc_info=True)
         return jsonify({"ok": False, "error": str(e)}), 500
 
 
@@ -295,7 +532,7 @@ def list_units() -> Response:
     Returns:
         200: {"items": [{"slug": str, "title": str, ...}]}
     """
-    from game_modules.quiz.models import QuizTopic
+    from game_modules.quiz.models import QuizQuestion, QuizTopic
     from src.app.extensions.sqlalchemy_ext import get_quiz_session
     from sqlalchemy import or_, func
     
@@ -323,6 +560,13 @@ def list_units() -> Response:
                 query = query.filter(QuizTopic.release_id == release_filter)
             
             units = query.order_by(QuizTopic.order_index, QuizTopic.id).all()
+            # One grouped count instead of loading every topic's questions
+            question_counts = dict(
+                session.query(QuizQuestion.topic_id, func.count(QuizQuestion.id))
+                .filter(QuizQuestion.topic_id.in_([u.id for u in units]))
+                .group_by(QuizQuestion.topic_id)
+                .all()
+            ) if units else {}
             
             items = [
                 {
@@ -333,7 +577,7 @@ def list_units() -> Response:
                     "order_index": u.order_index,
                     "release_id": u.release_id,
                     "created_at": u.created_at.isoformat() if u.created_at else None,
-                    "questions_count": len(u.questions) if u.questions else 0,
+                    "questions_count": question_counts.get(u.id, 0),
                 }
                 for u in units
             ]
@@ -379,6 +623,20 @@ def get_unit(slug: str) -> Response:
         return jsonify({"error": "internal_error", "message": str(e)}), 500
 
 
+def _apply_unit_changes_to_snapshot(changes: Dict[str, Dict[str, Any]]) -> None:
+    """Mirror dashboard unit edits into the published content snapshot."""
+    from game_modules.quiz.config import get_content_snapshot_dir
+    from game_modules.quiz.content_snapshot import SnapshotError, apply_topic_updates
+
+    snapshot_dir = get_content_snapshot_dir()
+    if snapshot_dir is None or not changes:
+        return
+    try:
+        apply_topic_updates(snapshot_dir, changes)
+    except (OSError, SnapshotError) as e:
+        current_app.logger.error(f"Failed to update content snapshot: {e}")
+
+
 @blueprint.patch("/api/units")
 @jwt_required()
 @require_role(Role.ADMIN)
@@ -406,6 +664,7 @@ def bulk_update_units() -> Response:
     
     try:
         updated_count = 0
+        changes: Dict[str, Dict[str, Any]] = {}
         
         with get_quiz_session() as session:
             for update in updates:
@@ -420,17 +679,20 @@ def bulk_update_units() -> Response:
                 # Only allow updating these fields
                 if "is_active" in update:
                     unit.is_active = bool(update["is_active"])
+                    changes.setdefault(slug, {})["is_active"] = unit.is_active
                     updated_count += 1
                 
                 if "order_index" in update:
                     try:
                         unit.order_index = int(update["order_index"])
+                        changes.setdefault(slug, {})["order_index"] = unit.order_index
                         updated_count += 1
                     except (ValueError, TypeError):
                         pass
             
             session.commit()
         
+        _apply_unit_changes_to_snapshot(changes)
         return jsonify({"ok": True, "updated_count": updated_count}), 200
     except Exception as e:
         current_app.logger.error(f"Bulk update failed: {e}")
@@ -460,6 +722,7 @@ def delete_unit(slug: str) -> Response:
             unit.is_active = False
             session.commit()
         
+        _apply_unit_changes_to_snapshot({slug: {"is_active": False}})
         return jsonify({"ok": True}), 200
     except Exception as e:
         current_app.logger.error(f"Delete failed: {e}")
@@ -476,7 +739,10 @@ def delete_unit(slug: str) -> Response:
 def upload_unit() -> Response:
     """Upload a quiz unit (1 JSON + 0-n media files).
     
-    Stores files in a release directory (new or existing).
+    Stores files in a release directory (new or existing). Media files are
+    streamed into the content-addressed store (hashed on the fly, size limits
+    QUIZ_UPLOAD_MAX_FILE_BYTES / QUIZ_UPLOAD_MAX_REQUEST_BYTES) and linked
+    into the release's audio/ directory.
     
     Request: multipart/form-data
         - unit_json: File (required)
@@ -486,21 +752,52 @@ def upload_unit() -> Response:
     Returns:
         200: {"ok": true, "release_id": str, "slug": str, ...}
         400: {"error": "validation_error", "message": str}
+        413: {"error": "payload_too_large", "message": str}
     """
     import re
+    from werkzeug.exceptions import RequestEntityTooLarge
     from werkzeug.utils import secure_filename
-    from game_modules.quiz.validation import validate_quiz_unit, ValidationError
+    from game_modules.quiz.config import get_upload_max_file_bytes, get_upload_max_request_bytes
+    from game_modules.quiz.import_service import fingerprint_unit_data
+    from game_modules.quiz.media_store import (
+        MediaTooLargeError,
+        get_media_store_root,
+        link_into_release,
+        store_stream,
+    )
+    from game_modules.quiz.release_manifest import (
+        manifest_counts,
+        media_manifest_entry,
+        unit_manifest_entry,
+        update_release_manifest,
+    )
+    from game_modules.quiz.validation import ValidationError
+    from game_modules.quiz.validation_cache import validate_unit_cached
     
     request_id = (request.headers.get("X-Request-ID") or "").strip() or f"upload-{secrets.token_hex(8)}"
 
+    # Werkzeug spools the multipart body to disk when request.files is first
+    # accessed; limit it there (also for chunked bodies without Content-Length)
+    max_request_bytes = get_upload_max_request_bytes()
+    max_file_bytes = get_upload_max_file_bytes()
+    if max_request_bytes is not None:
+        request.max_content_length = max_request_bytes
+    try:
+        files = request.files
+    except RequestEntityTooLarge:
+        return jsonify({
+            "error": "payload_too_large",
+            "message": f"Upload exceeds the per-request limit of {max_request_bytes} bytes"
+        }), 413
+
     # Check for JSON file
-    if "unit_json" not in request.files:
+    if "unit_json" not in files:
         return jsonify({
             "error": "missing_file",
             "message": "JSON file is required (unit_json)"
         }), 400
     
-    json_file = request.files["unit_json"]
+    json_file = files["unit_json"]
     if not json_file.filename:
         return jsonify({
             "error": "missing_file",
@@ -508,8 +805,15 @@ def upload_unit() -> Response:
         }), 400
     
     # Parse and validate JSON
+    json_bytes = json_file.read(-1 if max_file_bytes is None else max_file_bytes + 1)
+    if max_file_bytes is not None and len(json_bytes) > max_file_bytes:
+        return jsonify({
+            "error": "payload_too_large",
+            "message": f"{json_file.filename} exceeds the per-file upload limit of {max_file_bytes} bytes",
+            "filename": json_file.filename,
+        }), 413
     try:
-        json_content = json_file.read().decode("utf-8")
+        json_content = json_bytes.decode("utf-8")
         unit_data = json.loads(json_content)
     except json.JSONDecodeError as e:
         return jsonify({
@@ -522,9 +826,13 @@ def upload_unit() -> Response:
             "message": "JSON file must be UTF-8 encoded"
         }), 400
     
-    # Validate full unit schema (v1/v2)
+    # Validate full unit schema (v1/v2); the result is cached by content
+    # fingerprint, so the import of this release does not validate it again
+    unit_fingerprint = fingerprint_unit_data(unit_data)
     try:
-        validated_unit = validate_quiz_unit(unit_data, json_file.filename or "upload")
+        validated_unit = validate_unit_cached(
+            unit_data, unit_fingerprint, json_file.filename or "upload"
+        ).unit
     except ValidationError as e:
         return jsonify({
             "error": "validation_error",
@@ -540,25 +848,66 @@ def upload_unit() -> Response:
             "message": f"Invalid slug format: '{slug}'. Must be lowercase alphanumeric + underscore."
         }), 400
     
-    # Extract audio references from JSON
+    # Extract audio references from the validated unit
     detected_refs = []
-    questions = unit_data.get("questions", [])
-    for q in questions:
-        # Question-level media
-        for media in q.get("media", []):
-            if media.get("type") == "audio" and media.get("seed_src"):
-                detected_refs.append(media["seed_src"])
-        # Answer-level media
-        for answer in q.get("answers", []):
-            for media in answer.get("media", []):
-                if media.get("type") == "audio" and media.get("seed_src"):
-                    detected_refs.append(media["seed_src"])
+    for q in validated_unit.questions:
+        # Question-level media, then answer-level media
+        media_items = list(q.media)
+        for answer in q.answers:
+            media_items.extend(answer.media)
+        for media in media_items:
+            if media.type == "audio" and media.seed_src:
+                detected_refs.append(media.seed_src)
     
     # Resolve release ID (optional: upload into existing release)
     release_id = (request.form.get("release_id") or "").strip()
     if not release_id:
         release_id = generate_release_id()
     
+    # Stream media into the content-addressed store first, so a rejected
+    # (oversized) upload leaves the release untouched
+    stored_media = {}
+    remaining_bytes = max_request_bytes
+    store_root = get_media_store_root(get_media_root())
+    for media_file in files.getlist("media_files[]"):
+        if not media_file.filename:
+            continue
+        filename = secure_filename(media_file.filename)
+        try:
+            stored = store_stream(
+                media_file.stream,
+                filename,
+                store_root,
+                max_file_bytes=max_file_bytes,
+                max_total_bytes=remaining_bytes,
+            )
+        except MediaTooLargeError as e:
+            current_app.logger.warning(
+                "Upload rejected (size limit): request_id=%s slug=%s filename=%s limit=%s scope=%s",
+                request_id,
+                slug,
+                filename,
+                e.limit,
+                e.scope,
+            )
+            return jsonify({
+                "error": "payload_too_large",
+                "message": str(e),
+                "filename": filename,
+            }), 413
+        except OSError as e:
+            current_app.logger.warning(
+                "Upload media failed (store): request_id=%s slug=%s filename=%s error=%s",
+                request_id,
+                slug,
+                filename,
+                e,
+            )
+            continue
+        if remaining_bytes is not None:
+            remaining_bytes -= stored.size
+        stored_media[filename] = stored
+
     # Create release directory (if missing)
     releases_path = get_media_releases_path()
     release_path = releases_path / release_id
@@ -626,41 +975,39 @@ def upload_unit() -> Response:
         json_size,
     )
     
-    # Save media files
+    # Link stored media into the release (hash is known; no rehash)
     uploaded_files = []
-    media_files = request.files.getlist("media_files[]")
-    
-    for media_file in media_files:
-        if media_file.filename:
-            filename = secure_filename(media_file.filename)
-            media_filepath = audio_path / filename
-            try:
-                media_file.save(str(media_filepath))
-                media_size = None
-                try:
-                    media_size = media_filepath.stat().st_size
-                except OSError:
-                    media_size = media_file.content_length
-                uploaded_files.append(filename)
-                current_app.logger.info(
-                    "Upload media saved: request_id=%s release_id=%s slug=%s filename=%s path=%s bytes=%s",
-                    request_id,
-                    release_id,
-                    slug,
-                    filename,
-                    media_filepath,
-                    media_size,
-                )
-            except OSError as e:
-                current_app.logger.warning(
-                    "Upload media failed: request_id=%s release_id=%s slug=%s filename=%s path=%s error=%s",
-                    request_id,
-                    release_id,
-                    slug,
-                    filename,
-                    media_filepath,
-                    e,
-                )
+    media_entries: Dict[str, Dict[str, Any]] = {}
+    
+    for filename, stored in stored_media.items():
+        media_filepath = audio_path / filename
+        try:
+            link_method = link_into_release(stored.path, media_filepath)
+            media_entries[filename] = media_manifest_entry(media_filepath, sha256=stored.sha256)
+            uploaded_files.append(filename)
+            current_app.logger.info(
+                "Upload media saved: request_id=%s release_id=%s slug=%s filename=%s path=%s "
+                "bytes=%s sha256=%s link=%s deduplicated=%s",
+                request_id,
+                release_id,
+                slug,
+                filename,
+                media_filepath,
+                stored.size,
+                stored.sha256,
+                link_method,
+                stored.deduplicated,
+            )
+        except OSError as e:
+            current_app.logger.warning(
+                "Upload media failed: request_id=%s release_id=%s slug=%s filename=%s path=%s error=%s",
+                request_id,
+                release_id,
+                slug,
+                filename,
+                media_filepath,
+                e,
+            )
     
     # Determine missing files
     missing_files = []
@@ -683,24 +1030,28 @@ def upload_unit() -> Response:
     from game_modules.quiz.release_model import QuizContentRelease
     from src.app.extensions.sqlalchemy_ext import get_quiz_session
     
-    # Recompute counts based on filesystem (units/audio) to avoid destructive updates
+    # Counts come from the release manifest, updated with only this upload's
+    # entries (no rescan of units/ and audio/ per upload)
     try:
-        unit_files = list(units_path.glob("*.json"))
-        units_count = len(unit_files)
-        questions_count = 0
-        for unit_file in unit_files:
-            try:
-                with open(unit_file, "r", encoding="utf-8") as f:
-                    data = json.load(f)
-                questions_count += len(data.get("questions", []))
-            except Exception:
-                # Best effort: ignore malformed files here; validation happens on import
-                pass
-        audio_count = len(list(audio_path.glob("*")))
-    except Exception:
-        units_count = 1
-        questions_count = len(questions)
-        audio_count = len(uploaded_files)
+        manifest = update_release_manifest(
+            release_path,
+            release_id,
+            units={slug: unit_manifest_entry(unit_data, json_filepath, fingerprint=unit_fingerprint)},
+            media=media_entries,
+        )
+        units_count, questions_count, audio_count = manifest_counts(manifest)
+    except OSError as e:
+        current_app.logger.error(
+            "Upload failed (manifest write): request_id=%s release_id=%s slug=%s error=%s",
+            request_id,
+            release_id,
+            slug,
+            e,
+        )
+        return jsonify({
+            "error": "filesystem_error",
+            "message": f"Failed to update release manifest: {e}"
+        }), 500
     
     try:
         with get_quiz_session() as session:
@@ -749,12 +1100,14 @@ def upload_unit() -> Response:
         "release_id": release_id,
         "request_id": request_id,
         "slug": slug,
-        "title": unit_data.get("title", slug),
-        "questions_count": len(questions),
+        "title": validated_unit.title or slug,
+        "questions_count": len(validated_unit.questions),
         "detected_refs": detected_refs,
         "uploaded_files": uploaded_files,
         "missing_files": missing_files,
-        "schema_version": validated_unit.schema_version
+        "schema_version": validated_unit.schema_version,
+        "release_totals": manifest["totals"],
+        "release_missing_media": manifest["missing_media"],
     }), 200
 
 
@@ -762,58 +1115,126 @@ def upload_unit() -> Response:
 # API Routes - Logs
 # =============================================================================
 
+def _import_logs_dir() -> Path:
+    return Path(current_app.config.get("DATA_DIR") or get_data_dir(get_project_root())) / "import_logs"
+
+
 @blueprint.get("/api/logs/<release_id>")
 @jwt_required()
 @require_role(Role.ADMIN)
 def get_release_logs(release_id: str) -> Response:
     """Get import logs for a release.
     
-    Returns the latest log file content for the given release.
+    Returns the last 200 lines of the latest log file for the given release
+    (looked up via the per-release log index, read backwards from the end).
+    ``offset`` is the byte position to continue from with the stream endpoint.
     
     Returns:
-        200: {"logs": str, "filename": str}
+        200: {"logs": str, "filename": str, "offset": int, "compressed": bool}
         404: {"error": "not_found"}
     """
-    import glob
-    
-    logs_dir = Path(current_app.config.get("DATA_DIR") or get_data_dir(get_project_root())) / "import_logs"
+    from game_modules.quiz.import_logs import find_latest_log, tail_lines
+
+    logs_dir = _import_logs_dir()
     
     if not logs_dir.exists():
         return jsonify({"logs": "", "filename": None}), 200
     
-    # Find log files for this release (optionally filter by request_id)
-    request_id = (request.args.get("request_id") or "").strip()
-    if request_id:
-        import re
-
-        safe_request_id = re.sub(r"[^a-zA-Z0-9._-]+", "-", request_id).strip("-")
-        pattern = f"*_{release_id}_{safe_request_id}*.log"
-    else:
-        pattern = f"*_{release_id}_*.log"
-    log_files = list(logs_dir.glob(pattern))
-    if not log_files and not request_id:
-        # Backwards compatibility for legacy log naming (no request_id suffix)
-        legacy_pattern = f"*_{release_id}.log"
-        log_files = list(logs_dir.glob(legacy_pattern))
-    
-    if not log_files:
-        return jsonify({"logs": "", "filename": None}), 200
+    request_id = (request.args.get("request_id") or "").strip() or None
+    latest_log = find_latest_log(logs_dir, release_id, request_id=request_id)
     
-    # Get the most recent log file
-    log_files.sort(key=lambda x: x.stat().st_mtime, reverse=True)
-    latest_log = log_files[0]
+    if latest_log is None:
+        return jsonify({"logs": "", "filename": None}), 200
     
     try:
-        # Read last 200 lines max
-        with open(latest_log, "r", encoding="utf-8") as f:
-            lines = f.readlines()
-            tail_lines = lines[-200:] if len(lines) > 200 else lines
-            log_content = "".join(tail_lines)
+        log_content, offset = tail_lines(latest_log)
         
         return jsonify({
             "logs": log_content,
-            "filename": latest_log.name
+            "filename": latest_log.name,
+            "offset": offset,
+            "compressed": latest_log.suffix == ".gz",
         }), 200
     except Exception as e:
         current_app.logger.error(f"Failed to read log file: {e}")
         return jsonify({"error": "read_error", "message": str(e)}), 500
+
+
+@blueprint.get("/api/logs/<release_id>/stream")
+@jwt_required()
+@require_role(Role.ADMIN)
+def stream_release_logs(release_id: str) -> Response:
+    """Follow the latest import log of a release as Server-Sent Events.
+    
+    Emits ``log`` events with newly appended lines; the event id is the byte
+    offset, so a reconnecting EventSource resumes via ``Last-Event-ID``.
+    Query params: ``request_id`` (wait for that request's log), ``offset``.
+    Emits ``done`` once no job for the release is active and the file has
+    stopped growing. The stream closes after QUIZ_JOB_SSE_MAX_SECONDS.
+    
+    Returns:
+        200: text/event-stream
+    """
+    import time
+
+    from flask import stream_with_context
+
+    from game_modules.quiz import jobs
+    from game_modules.quiz.import_logs import find_latest_log, read_from
+    from src.app.extensions.sqlalchemy_ext import get_quiz_session
+
+    logs_dir = _import_logs_dir()
+    request_id = (request.args.get("request_id") or "").strip() or None
+    try:
+        offset = int(request.headers.get("Last-Event-ID") or request.args.get("offset") or 0)
+    except ValueError:
+        offset = 0
+    max_seconds = float(current_app.config.get("QUIZ_JOB_SSE_MAX_SECONDS", 25))
+    interval = min(1.0, jobs.get_poll_seconds())
+
+    def job_active() -> bool:
+        with get_quiz_session() as session:
+            return any(
+                job.status in jobs.ACTIVE_STATUSES
+                for job in jobs.list_jobs(session, release_id=release_id, limit=5)
+            )
+
+    def generate():
+        position = offset
+        log_path = None
+        deadline = time.monotonic() + max_seconds
+        yield "retry: 2000\n\n"
+        while True:
+            if log_path is None:
+                log_path = find_latest_log(logs_dir, release_id, request_id=request_id)
+                if log_path is not None and log_path.suffix == ".gz":
+                    yield f"event: done\ndata: {json.dumps({'filename': log_path.name})}\n\n"
+                    return
+            text = ""
+            if log_path is not None:
+                try:
+                    text, position = read_from(log_path, position)
+                except OSError:
+                    log_path = None
+            if text:
+                data = "".join(f"data: {line}\n" for line in text.splitlines())
+                yield f"id: {position}\nevent: log\n{data}\n"
+            elif not job_active():
+                # The job may have written its last lines after the read above
+                if log_path is not None:
+                    text, position = read_from(log_path, position)
+                    if text:
+                        data = "".join(f"data: {line}\n" for line in text.splitlines())
+                        yield f"id: {position}\nevent: log\n{data}\n"
+                payload = {"filename": log_path.name if log_path else None, "offset": position}
+                yield f"event: done\ndata: {json.dumps(payload)}\n\n"
+                return
+            if time.monotonic() >= deadline:
+                return
+            time.sleep(interval)
+
+    return Response(
+        stream_with_context(generate()),
+        mimetype="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
@@ -0,0 +1,259 @@
+"""Fingerprinted static assets (``manage.py build-assets``).
+
+The build copies every file below ``static/`` to ``static/dist/`` under a
+content-hashed name (``js/games/quiz-play.3f2a9c1b4d5e.js``), minifies CSS
+and JavaScript when ``rcssmin``/``rjsmin`` are installed, and writes ``.gz``
+(and ``.br`` with ``Brotli`` installed) siblings for text assets. The
+mapping ``logical path -> dist path`` goes to
+``static/dist/asset-manifest.json``.
+
+At runtime the manifest is loaded once (``register_asset_manifest``):
+``asset_url`` is a dict lookup and ``/static/dist/...`` is answered with
+``Cache-Control: immutable`` and the precompressed sibling the client
+accepts. Without a build (local dev) nothing changes: ``asset_url`` falls
+back to the ``?v=<hash>`` URL of the source file.
+
+Not fingerprinted: ES modules with relative imports (their imports would
+point at unhashed names) and files below ``dist/`` itself.
+"""
+
+from __future__ import annotations
+
+import gzip
+import hashlib
+import json
+import logging
+import mimetypes
+import os
+import posixpath
+import re
+import shutil
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from flask import Flask, Response, request, send_file
+from werkzeug.security import safe_join
+
+logger = logging.getLogger(__name__)
+
+try:  # optional: minifiers and Brotli are only needed for the build
+    import rjsmin
+except ImportError:  # pragma: no cover - depends on environment
+    rjsmin = None
+
+try:
+    import rcssmin
+except ImportError:  # pragma: no cover - depends on environment
+    rcssmin = None
+
+try:
+    import brotli
+except ImportError:  # pragma: no cover - depends on environment
+    brotli = None
+
+
+ASSET_BUILD_DIRNAME = "dist"
+ASSET_MANIFEST_FILENAME = "asset-manifest.json"
+ASSET_MANIFEST_VERSION = 1
+ASSET_HASH_LENGTH = 12
+ASSET_MAX_AGE = 365 * 24 * 3600
+COMPRESSIBLE_SUFFIXES = frozenset({".css", ".js", ".mjs", ".json", ".map", ".svg", ".txt", ".xml"})
+COMPRESS_MIN_BYTES = 1024
+
+# (Accept-Encoding token, sibling suffix), preferred first
+PRECOMPRESSED_ENCODINGS = (("br", ".br"), ("gzip", ".gz"))
+
+_CSS_URL = re.compile(r"""url\(\s*(['"]?)([^'")\s]+)\1\s*\)""")
+_RELATIVE_JS_IMPORT = re.compile(r"""\bfrom\s*['"]\.{1,2}/|\bimport\s*\(?\s*['"]\.{1,2}/""")
+
+
+@dataclass
+class AssetBuildResult:
+    """Summary of a ``build_assets`` run."""
+    manifest: Dict[str, str] = field(default_factory=dict)
+    skipped: List[str] = field(default_factory=list)  # ES modules with relative imports
+    source_bytes: int = 0
+    output_bytes: int = 0
+    gzip_bytes: int = 0
+    brotli_bytes: int = 0
+
+
+def fingerprinted_name(relative_path: str, content: bytes) -> str:
+    """``css/app.css`` -> ``css/app.<sha256[:12]>.css``."""
+    digest = hashlib.sha256(content).hexdigest()[:ASSET_HASH_LENGTH]
+    stem, suffix = posixpath.splitext(relative_path)
+    return f"{stem}.{digest}{suffix}"
+
+
+def _minify(relative_path: str, text: str) -> str:
+    if ".min." in posixpath.basename(relative_path):
+        return text
+    suffix = posixpath.splitext(relative_path)[1]
+    if suffix == ".css" and rcssmin is not None:
+        return rcssmin.cssmin(text)
+    if suffix in (".js", ".mjs") and rjsmin is not None:
+        return rjsmin.jsmin(text)
+    return text
+
+
+def _rewrite_css_urls(relative_path: str, text: str, manifest: Dict[str, str]) -> str:
+    """Point relative ``url()`` references of a dist CSS file at their targets.
+
+    The CSS moves one directory down (``dist/``), so relative references are
+    rewritten to the fingerprinted file if it is already built, else to the
+    source file.
+    """
+    source_dir = posixpath.dirname(relative_path)
+    output_dir = posixpath.join(ASSET_BUILD_DIRNAME, source_dir)
+
+    def replace(match: re.Match) -> str:
+        quote, url = match.group(1), match.group(2)
+        if url.startswith(("/", "#", "data:")) or "://" in url:
+            return match.group(0)
+        path, sep, rest = url.partition("?")
+        if not sep:
+            path, sep, rest = url.partition("#")
+        target = posixpath.normpath(posixpath.join(source_dir, path))
+        if target.startswith("../"):
+            return match.group(0)
+        target = posixpath.join(ASSET_BUILD_DIRNAME, manifest[target]) if target in manifest else target
+        return f"url({quote}{posixpath.relpath(target, output_dir)}{sep}{rest}{quote})"
+
+    return _CSS_URL.sub(replace, text)
+
+
+def _write_compressed(path: Path, content: bytes, result: AssetBuildResult) -> None:
+    gzipped = gzip.compress(content, compresslevel=9, mtime=0)
+    if len(gzipped) < len(content):
+        path.with_name(path.name + ".gz").write_bytes(gzipped)
+        result.gzip_bytes += len(gzipped)
+    if brotli is not None:
+        compressed = brotli.compress(content, quality=11)
+        if len(compressed) < len(content):
+            path.with_name(path.name + ".br").write_bytes(compressed)
+            result.brotli_bytes += len(compressed)
+
+
+def build_assets(static_root: Path) -> AssetBuildResult:
+    """Rebuild ``static/dist/`` and its manifest from the files in ``static/``.
+
+    CSS is processed last so its ``url()`` references can point at the
+    fingerprinted images/fonts. The manifest is written last (atomically).
+    """
+    static_root = Path(static_root)
+    build_root = static_root / ASSET_BUILD_DIRNAME
+    if build_root.exists():
+        shutil.rmtree(build_root)
+    build_root.mkdir(parents=True)
+
+    sources = []
+    for path in static_root.rglob("*"):
+        parts = path.relative_to(static_root).parts
+        if path.is_file() and parts[0] != ASSET_BUILD_DIRNAME and not any(p.startswith(".") for p in parts):
+            sources.append("/".join(parts))
+    sources.sort(key=lambda rel: (rel.endswith(".css"), rel))
+
+    result = AssetBuildResult()
+    for rel in sources:
+        content = (static_root / rel).read_bytes()
+        suffix = posixpath.splitext(rel)[1].lower()
+        if suffix in (".js", ".mjs") and _RELATIVE_JS_IMPORT.search(content.decode("utf-8", "replace")):
+            result.skipped.append(rel)
+            continue
+
+        if suffix in (".css", ".js", ".mjs"):
+            text = _minify(rel, content.decode("utf-8"))
+            if suffix == ".css":
+                text = _rewrite_css_urls(rel, text, result.manifest)
+            output = text.encode("utf-8")
+        else:
+            output = content
+
+        built = fingerprinted_name(rel, output)
+        target = build_root / built
+        target.parent.mkdir(parents=True, exist_ok=True)
+        target.write_bytes(output)
+        if suffix in COMPRESSIBLE_SUFFIXES and len(output) >= COMPRESS_MIN_BYTES:
+            _write_compressed(target, output, result)
+
+        result.manifest[rel] = built
+        result.source_bytes += len(content)
+        result.output_bytes += len(output)
+
+    manifest_path = build_root / ASSET_MANIFEST_FILENAME
+    tmp_path = manifest_path.with_suffix(".json.tmp")
+    tmp_path.write_text(
+        json.dumps(
+            {"version": ASSET_MANIFEST_VERSION, "assets": result.manifest},
+            indent=2,
+            sort_keys=True,
+        ),
+        encoding="utf-8",
+    )
+    os.replace(tmp_path, manifest_path)
+    return result
+
+
+def load_asset_manifest(static_root: Path) -> Dict[str, str]:
+    """Read ``static/dist/asset-manifest.json`` (empty dict without a build)."""
+    path = Path(static_root) / ASSET_BUILD_DIRNAME / ASSET_MANIFEST_FILENAME
+    try:
+        payload = json.loads(path.read_text(encoding="utf-8"))
+    except FileNotFoundError:
+        return {}
+    except (OSError, ValueError) as exc:
+        logger.warning(f"Ignoring unreadable asset manifest {path}: {exc}")
+        return {}
+    if payload.get("version") != ASSET_MANIFEST_VERSION or not isinstance(payload.get("assets"), dict):
+        logger.warning(f"Ignoring asset manifest {path}: unsupported version")
+        return {}
+    return payload["assets"]
+
+
+def send_built_asset(build_root: Path, filename: str) -> Optional[Response]:
+    """Serve a file below ``static/dist/`` (None if it does not exist).
+
+    Sends the ``.br``/``.gz`` sibling when the client accepts it; the
+    content is immutable because the name carries its hash.
+    """
+    path_str = safe_join(str(build_root), filename)
+    if path_str is None or filename.endswith((".br", ".gz")):
+        return None
+    path = Path(path_str)
+    if not path.is_file():
+        return None
+
+    mimetype = mimetypes.guess_type(path.name)[0] or "application/octet-stream"
+    encoding = None
+    for token, suffix in PRECOMPRESSED_ENCODINGS:
+        sibling = path.with_name(path.name + suffix)
+        if request.accept_encodings[token] and sibling.is_file():
+            path, encoding = sibling, token
+            break
+
+    response = send_file(path, mimetype=mimetype, conditional=True, etag=True, max_age=ASSET_MAX_AGE)
+    if encoding:
+        response.headers["Content-Encoding"] = encoding
+    response.vary.add("Accept-Encoding")
+    response.cache_control.public = True
+    response.cache_control.immutable = True
+    return response
+
+
+def register_asset_manifest(app: Flask) -> None:
+    """Load the asset manifest once and serve ``/static/dist/`` with long caching."""
+    static_root = Path(app.static_folder or "static")
+    build_root = static_root / ASSET_BUILD_DIRNAME
+    manifest = load_asset_manifest(static_root)
+    app.extensions["asset_manifest"] = manifest
+    if manifest:
+        app.logger.info(f"[OK] Asset manifest loaded: {len(manifest)} fingerprinted files")
+
+    prefix = f"{app.static_url_path}/{ASSET_BUILD_DIRNAME}/"
+
+    @app.before_request
+    def _serve_built_asset():
+        if request.method in ("GET", "HEAD") and request.path.startswith(prefix):
+            return send_built_asset(build_root, request.path[len(prefix):])
+        return None
@@ -0,0 +1,153 @@
+"""Startup profile of the web app (``manage.py startup-profile``).
+
+``create_app`` runs in a fresh interpreter under ``python -X importtime``,
+so the numbers are those of a worker that is not preloaded: import time
+per top-level package and per module, the ``create_app`` stages
+(``app.extensions["startup_timings"]``) and the rarely used quiz modules
+that were imported although they should only load on first use
+(``LAZY_MODULES``).
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import subprocess
+import sys
+from collections import defaultdict
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, List, Mapping, Optional, Tuple
+
+# Admin-only code paths (content import, validation, jobs, media GC); the
+# routes import them inside the view functions
+LAZY_MODULES: Tuple[str, ...] = (
+    "game_modules.quiz.import_service",
+    "game_modules.quiz.import_logs",
+    "game_modules.quiz.jobs",
+    "game_modules.quiz.media_gc",
+    "game_modules.quiz.media_transcode",
+    "game_modules.quiz.release_manifest",
+    "game_modules.quiz.validation",
+    "game_modules.quiz.validation_cache",
+)
+
+_RESULT_PREFIX = "STARTUP_PROFILE "
+
+_PROFILE_SCRIPT = f"""
+import json, os, sys, time
+start = time.perf_counter()
+from src.app import create_app
+imported = time.perf_counter()
+app = create_app(os.environ.get("ENV") or os.environ.get("FLASK_ENV"))
+created = time.perf_counter()
+print({_RESULT_PREFIX!r} + json.dumps({{
+    "import_seconds": imported - start,
+    "create_app_seconds": created - imported,
+    "stages_ms": app.extensions.get("startup_timings", {{}}),
+    "eager_lazy_modules": [m for m in {LAZY_MODULES!r} if m in sys.modules],
+}}))
+"""
+
+
+@dataclass(frozen=True)
+class ImportRecord:
+    """One line of ``-X importtime`` output (times in microseconds)."""
+
+    module: str
+    self_us: int
+    cumulative_us: int
+    depth: int
+
+
+@dataclass
+class StartupProfile:
+    import_seconds: float
+    create_app_seconds: float
+    stages_ms: Dict[str, float] = field(default_factory=dict)
+    imports: List[ImportRecord] = field(default_factory=list)
+    eager_lazy_modules: List[str] = field(default_factory=list)
+
+    def by_package(self) -> List[Tuple[str, float]]:
+        """Import self time (ms) per top-level package, slowest first."""
+        totals: Dict[str, int] = defaultdict(int)
+        for record in self.imports:
+            totals[record.module.split(".", 1)[0]] += record.self_us
+        return sorted(((name, us / 1000) for name, us in totals.items()), key=lambda item: -item[1])
+
+    def slowest_modules(self, limit: int) -> List[ImportRecord]:
+        """Modules with the highest cumulative import time."""
+        return sorted(self.imports, key=lambda record: -record.cumulative_us)[:limit]
+
+    def to_dict(self, limit: int = 20) -> Dict[str, object]:
+        return {
+            "import_seconds": round(self.import_seconds, 4),
+            "create_app_seconds": round(self.create_app_seconds, 4),
+            "stages_ms": {name: round(ms, 1) for name, ms in self.stages_ms.items()},
+            "packages_ms": [
+                {"package": name, "self_ms": round(ms, 1)} for name, ms in self.by_package()[:limit]
+            ],
+            "slowest_modules": [
+                {"module": r.module, "cumulative_ms": round(r.cumulative_us / 1000, 1)}
+                for r in self.slowest_modules(limit)
+            ],
+            "eager_lazy_modules": self.eager_lazy_modules,
+        }
+
+
+def parse_importtime(output: str) -> List[ImportRecord]:
+    """Parse ``python -X importtime`` lines (other stderr lines are ignored)."""
+    records: List[ImportRecord] = []
+    for line in output.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        parts = line[len("import time:"):].split("|")
+        if len(parts) != 3 or not parts[0].strip().isdigit():
+            continue  # header line
+        name = parts[2].rstrip()
+        module = name.lstrip()
+        records.append(
+            ImportRecord(
+                module=module,
+                self_us=int(parts[0]),
+                cumulative_us=int(parts[1]),
+                depth=(len(name) - len(module) - 1) // 2,
+            )
+        )
+    return records
+
+
+def profile_startup(
+    project_root: Path,
+    env: Optional[Mapping[str, str]] = None,
+    timeout: float = 120.0,
+) -> StartupProfile:
+    """Run ``create_app`` in a subprocess and collect its startup profile.
+
+    Raises:
+        RuntimeError: ``create_app`` failed (message ends with its stderr)
+    """
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", _PROFILE_SCRIPT],
+        cwd=project_root,
+        env=dict(os.environ if env is None else env),
+        capture_output=True,
+        text=True,
+        timeout=timeout,
+    )
+    payload = next(
+        (line[len(_RESULT_PREFIX):] for line in result.stdout.splitlines() if line.startswith(_RESULT_PREFIX)),
+        None,
+    )
+    if result.returncode != 0 or payload is None:
+        errors = [line for line in result.stderr.splitlines() if not line.startswith("import time:")]
+        raise RuntimeError("create_app failed:\n" + "\n".join(errors[-20:]))
+
+    data = json.loads(payload)
+    return StartupProfile(
+        import_seconds=data["import_seconds"],
+        create_app_seconds=data["create_app_seconds"],
+        stages_ms=data["stages_ms"],
+        imports=parse_importtime(result.stderr),
+        eager_lazy_modules=data["eager_lazy_modules"],
+    )
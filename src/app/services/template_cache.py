@@ -0,0 +1,90 @@
+"""Jinja2 bytecode cache (``manage.py build-templates``).
+
+The image build compiles every template below ``templates/`` into
+``JINJA_BYTECODE_CACHE_DIR`` (default ``build/jinja_cache``), so a fresh
+worker loads compiled template code instead of parsing and compiling each
+template on its first render. ``register_template_cache`` wires the
+directory into ``app.jinja_env``; ``"off"`` disables it.
+
+Invalidation is Jinja's own: a cache entry is keyed by template name and
+path and stores a checksum of the source plus the Jinja and Python
+versions. A changed template (or interpreter) misses and is recompiled and
+rewritten on first use; the build clears the directory first, so entries
+of deleted templates do not pile up. The build must run at the path the
+app runs from (``/app`` in the image), because the path is part of the key.
+"""
+
+from __future__ import annotations
+
+import logging
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import List, Optional, Tuple
+
+from flask import Flask
+from jinja2 import FileSystemBytecodeCache, TemplateError
+from jinja2.bccache import Bucket
+
+logger = logging.getLogger(__name__)
+
+TEMPLATE_EXTENSIONS = ("html",)
+
+
+class TolerantBytecodeCache(FileSystemBytecodeCache):
+    """FileSystemBytecodeCache whose write failures never break rendering."""
+
+    def dump_bytecode(self, bucket: Bucket) -> None:
+        try:
+            super().dump_bytecode(bucket)
+        except OSError as e:  # read-only or full disk: render uncached
+            logger.debug(f"Jinja bytecode cache not written ({self.directory}): {e}")
+
+
+@dataclass
+class TemplateCacheBuild:
+    cache_dir: Path
+    compiled: int = 0
+    failed: List[Tuple[str, str]] = field(default_factory=list)
+
+
+def get_template_cache_dir(app: Flask) -> Optional[Path]:
+    value = str(app.config.get("JINJA_BYTECODE_CACHE_DIR") or "").strip()
+    if not value or value.lower() == "off":
+        return None
+    return Path(value)
+
+
+def register_template_cache(app: Flask) -> None:
+    """Use the bytecode cache directory for ``app.jinja_env`` (if configured and usable)."""
+    cache_dir = get_template_cache_dir(app)
+    if cache_dir is None:
+        return
+    try:
+        cache_dir.mkdir(parents=True, exist_ok=True)
+    except OSError as e:
+        app.logger.warning(f"Jinja bytecode cache disabled, {cache_dir} not usable: {e}")
+        return
+    app.jinja_env.bytecode_cache = TolerantBytecodeCache(str(cache_dir))
+
+
+def build_template_cache(template_dir: Path, cache_dir: Path) -> TemplateCacheBuild:
+    """Compile all templates below ``template_dir`` into ``cache_dir``.
+
+    Uses a bare Flask app so the Jinja environment has the same options as
+    the one ``create_app`` builds (no config or databases needed).
+    """
+    app = Flask("src.app", template_folder=str(template_dir.resolve()))
+    app.config["JINJA_BYTECODE_CACHE_DIR"] = str(cache_dir)
+    cache_dir.mkdir(parents=True, exist_ok=True)
+    register_template_cache(app)
+    app.jinja_env.bytecode_cache.clear()
+
+    result = TemplateCacheBuild(cache_dir=cache_dir)
+    for name in app.jinja_env.list_templates(extensions=TEMPLATE_EXTENSIONS):
+        try:
+            app.jinja_env.get_template(name)
+        except TemplateError as e:
+            result.failed.append((name, str(e)))
+        else:
+            result.compiled += 1
+    return result
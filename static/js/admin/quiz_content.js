@@ -374,19 +374,85 @@ async function loadReleaseLogs() {
   }
 }
 
+/**
+ * Follow the import log of a release while a job runs (Server-Sent Events).
+ * Appends new lines to the log panel; returns a function that stops following.
+ */
+function followReleaseLog(releaseId, requestId) {
+  if (!window.EventSource) return () => {};
+
+  const params = new URLSearchParams();
+  if (requestId) params.set('request_id', requestId);
+  const source = new EventSource(`${API.baseUrl}/logs/${releaseId}/stream?${params}`);
+  let started = false;
+
+  source.addEventListener('log', (event) => {
+    if (!started) {
+      DOM.logContent.textContent = '';
+      started = true;
+    }
+    DOM.logContent.textContent += `${event.data}\n`;
+    DOM.logContent.scrollTop = DOM.logContent.scrollHeight;
+  });
+  source.addEventListener('done', () => source.close());
+
+  return () => source.close();
+}
+
+const JOB_PHASE_LABELS = {
+  starting: 'Start',
+  validate: 'Validierung',
+  audio: 'Audio-Prüfsummen',
+  transcode: 'Medien-Transkodierung',
+  diff: 'Vergleich',
+  write: 'Schreiben',
+  commit: 'Abschluss',
+};
+
+/**
+ * Poll a background job until it reaches a terminal status.
+ * Calls onProgress(job) on every poll and resolves with the final job.
+ */
+async function waitForJob(jobId, onProgress, intervalMs = 1000) {
+  for (;;) {
+    const job = await API.get(`/jobs/${jobId}`);
+    if (onProgress) onProgress(job);
+    if (['succeeded', 'failed', 'cancelled'].includes(job.status)) {
+      return job;
+    }
+    await new Promise((resolve) => setTimeout(resolve, intervalMs));
+  }
+}
+
 async function importRelease() {
   if (!state.selectedRelease) return;
 
   const releaseId = state.selectedRelease.release_id;
-  showReleaseActionResult('Import wird ausgeführt...', 'loading');
+  showReleaseActionResult('Import wird gestartet...', 'loading');
   
   DOM.btnImport.disabled = true;
   DOM.btnImport.innerHTML = '<span class="material-symbols-rounded md3-spinner">progress_activity</span> Importiere...';
 
   try {
-    const result = await API.post(`/releases/${releaseId}/import`);
-    
-    if (result.ok) {
+    const queued = await API.post(`/releases/${releaseId}/import`);
+    if (!queued.ok) {
+      showReleaseActionResult(`Fehler: ${queued.errors?.join(', ') || queued.error}`, 'error');
+      return;
+    }
+
+    const stopFollowingLog = followReleaseLog(releaseId, queued.request_id);
+    const job = await waitForJob(queued.job_id, (current) => {
+      if (current.status === 'queued') {
+        showReleaseActionResult('Import wartet auf Ausführung...', 'loading');
+        return;
+      }
+      const phase = JOB_PHASE_LABELS[current.phase] || current.phase || '';
+      showReleaseActionResult(`Import läuft… ${current.progress}% (${phase})`, 'loading');
+    });
+    stopFollowingLog();
+    const result = job.result || {};
+
+    if (job.status === 'succeeded') {
       showReleaseActionResult(
         `✓ Import erfolgreich: ${result.units_imported} Units, ${result.questions_imported} Fragen`,
         'success'
@@ -394,8 +460,10 @@ async function importRelease() {
       await loadReleases();
       selectRelease(releaseId);
       loadUnits();
+    } else if (job.status === 'cancelled') {
+      showReleaseActionResult('Import abgebrochen, keine Änderungen übernommen.', 'error');
     } else {
-      showReleaseActionResult(`Fehler: ${result.errors?.join(', ') || result.error}`, 'error');
+      showReleaseActionResult(`Fehler: ${result.errors?.join(', ') || job.error}`, 'error');
     }
   } catch (error) {
     showReleaseActionResult(`Fehler: ${error.message}`, 'error');
@@ -794,7 +862,10 @@ async function submitUpload(event) {
     const result = await API.upload(formData);
     
     if (result.ok) {
-      showUploadSuccess(`✓ Upload erfolgreich: Release "${result.release_id}" erstellt`);
+      const totals = result.release_totals || {};
+      showUploadSuccess(
+        `✓ Upload erfolgreich: Release "${result.release_id}" enthält ${totals.units ?? 1} Units, ${totals.questions ?? result.questions_count} Fragen`
+      );
       resetUploadPreview();
       loadReleases();
     } else {
@@ -379,6 +379,7 @@
     currentIndex: 0,
     nextQuestionIndex: null, // ✅ TEIL 3: Track next question from backend
     runQuestions: [],
+    mediaManifest: [], // Media of the run's questions (URLs, bytes, durations) for preloading
     jokerRemaining: 2,
     jokerUsedOn: [],
     // ✅ SERVER-BASED TIMER FIELDS (New)
@@ -492,6 +493,8 @@
       }
       state.currentIndex = runData.current_index;
       state.runQuestions = runData.run_questions || [];
+      state.mediaManifest = runData.media_manifest || [];
+      preloadRunMedia(state.currentIndex);
       state.jokerRemaining = runData.joker_remaining;
       state.jokerUsedOn = runData.joker_used_on || [];
       
@@ -1590,6 +1593,9 @@
     
     // Render question
     renderQuestion();
+
+    // Fetch the following questions' media while this one is played
+    preloadRunMedia(state.currentIndex + 1);
     
     // Switch to QUESTION view
     state.currentView = VIEW.QUESTION;
@@ -2028,7 +2034,7 @@
       const answerMedia = answer.media || [];
       const audioItem = answerMedia.find(m => m.type === 'audio');
       const hasAudio = !!audioItem;
-      const audioSrc = audioItem ? audioItem.src : '';
+      const audioSrc = audioItem ? pickAudioSrc(audioItem) : '';
       const audioCaption = audioItem ? (audioItem.caption || audioItem.label || '') : '';
       
       // Build audio elements HTML (only if audio exists)
@@ -3474,7 +3480,8 @@
    * AudioController manages a single Audio instance for the entire quiz.
    * Only one audio can play at a time. Buttons toggle Play↔Pause.
    * 
-   * media.src wird beim Seeding aus seed_src erzeugt und zeigt auf /static/quiz-media/...
+   * media.src wird beim Import aus seed_src erzeugt und zeigt auf /quiz-media/store/...
+   * (bzw. die kleinste abspielbare Variante, siehe pickAudioSrc).
    * Reihenfolge im JSON bestimmt Labels (Audio 1, Audio 2...), falls label fehlt.
    */
   const AudioController = (function() {
@@ -3599,6 +3606,97 @@
     });
   }
   
+  const audioTypeProbe = document.createElement('audio');
+
+  /**
+   * Pick the smallest audio variant this browser can play.
+   * The import adds transcoded variants ({src, mime, bytes}) next to the
+   * original src; falls back to src if none is playable.
+   *
+   * @param {Object} m - Audio media item
+   * @returns {string} URL to play
+   */
+  function pickAudioSrc(m) {
+    const fallback = m.src || m.url || '';
+    const variants = Array.isArray(m.variants) ? m.variants : [];
+    let best = null;
+    for (const v of variants) {
+      if (!v || !v.src || !v.mime || !audioTypeProbe.canPlayType(v.mime)) continue;
+      if (!best || (v.bytes || Infinity) < (best.bytes || Infinity)) best = v;
+    }
+    return best ? best.src : fallback;
+  }
+
+  // Questions ahead whose media is preloaded (PRELOAD_QUESTIONS in services.py)
+  const PRELOAD_AHEAD = 2;
+  const preloadedMedia = new Set();
+  const preloadedAudio = [];
+
+  /**
+   * Preload media of the questions starting at fromIndex, using the run's
+   * media_manifest. Picks the same files the renderer will use (smallest
+   * playable audio variant, first image format) so they come from the HTTP
+   * cache (store URLs are immutable) when the question is shown.
+   *
+   * @param {number} fromIndex - First question index to preload
+   */
+  function preloadRunMedia(fromIndex) {
+    const manifest = Array.isArray(state.mediaManifest) ? state.mediaManifest : [];
+    for (const entry of manifest) {
+      if (!entry || entry.question_index < fromIndex || entry.question_index >= fromIndex + PRELOAD_AHEAD) continue;
+      for (const m of Array.isArray(entry.media) ? entry.media : []) {
+        if (m.type === 'audio') {
+          const src = pickAudioSrc(m);
+          if (!src || preloadedMedia.has(src)) continue;
+          preloadedMedia.add(src);
+          const audio = new Audio();
+          audio.preload = 'auto';
+          audio.src = src;
+          preloadedAudio.push(audio);
+        } else if (m.type === 'image' && m.src && !preloadedMedia.has(m.src)) {
+          preloadedMedia.add(m.src);
+          const link = document.createElement('link');
+          link.rel = 'preload';
+          link.as = 'image';
+          const srcset = Array.isArray(m.srcset) ? m.srcset.filter(d => d && d.src && d.type && d.width) : [];
+          if (srcset.length) {
+            const type = srcset[0].type;
+            link.type = type;
+            link.imageSrcset = srcset.filter(d => d.type === type).map(d => `${d.src} ${d.width}w`).join(', ');
+            link.imageSizes = m.answer_id ? IMAGE_SIZES_COMPACT : IMAGE_SIZES;
+          }
+          link.href = m.src;
+          document.head.appendChild(link);
+        }
+      }
+    }
+  }
+
+  // Rendered image width (see .quiz-media__image in quiz.css)
+  const IMAGE_SIZES = '(max-width: 720px) 100vw, 720px';
+  const IMAGE_SIZES_COMPACT = '200px';
+
+  /**
+   * Build <source> elements from the srcset list the import writes for
+   * images ({src, type, width, height}, grouped by format, best first).
+   * The browser picks the first supported type and the width it needs.
+   *
+   * @param {Object} m - Image media item
+   * @param {string} sizes - sizes attribute
+   * @returns {string} HTML string (empty without derivatives)
+   */
+  function renderImageSources(m, sizes) {
+    const byType = new Map();
+    for (const d of Array.isArray(m.srcset) ? m.srcset : []) {
+      if (!d || !d.src || !d.type || !d.width) continue;
+      if (!byType.has(d.type)) byType.set(d.type, []);
+      byType.get(d.type).push(`${d.src} ${d.width}w`);
+    }
+    return Array.from(byType, ([type, candidates]) =>
+      `<source type="${escapeHtml(type)}" srcset="${escapeHtml(candidates.join(', '))}" sizes="${sizes}">`
+    ).join('');
+  }
+
   /**
    * Render media array (v2 format) to HTML
    * Uses custom MD3 audio buttons instead of native <audio controls>
@@ -3632,7 +3730,7 @@
       const gridClass = isCompact ? 'quiz-media-grid quiz-media-grid--compact' : 'quiz-media-grid';
       
       const audioHtml = audioItems.map((m, idx) => {
-        const src = m.src || m.url || '';
+        const src = pickAudioSrc(m);
         const mediaId = m.id || `m${idx + 1}`;
         const audioId = answerId ? `${answerId}_${mediaId}` : mediaId;
         const label = m.label || `Audio ${idx + 1}`;
@@ -3690,10 +3788,16 @@
         if (!src) return '';
         
         const imgClass = isCompact ? 'quiz-media__item quiz-media__item--image quiz-media__item--compact' : 'quiz-media__item quiz-media__item--image';
+        const sources = renderImageSources(m, isCompact ? IMAGE_SIZES_COMPACT : IMAGE_SIZES);
+        // Intrinsic size avoids layout shift while the image loads
+        const dimensions = m.width && m.height
+          ? ` width="${Number(m.width)}" height="${Number(m.height)}"`
+          : '';
+        const img = `<img src="${escapeHtml(src)}" alt="${escapeHtml(alt)}" class="quiz-media__image" loading="lazy" decoding="async"${dimensions}>`;
         
         return `
           <figure class="${imgClass}">
-            <img src="${escapeHtml(src)}" alt="${escapeHtml(alt)}" class="quiz-media__image" loading="lazy">
+            ${sources ? `<picture>${sources}${img}</picture>` : img}
             ${caption ? `<figcaption class="quiz-media__caption">${escapeHtml(caption)}</figcaption>` : ''}
           </figure>
         `;
@@ -1,4 +1,14 @@
 """Shared pytest fixtures for all tests."""
 
+import pytest
+
 # Import quiz fixtures to make them available to test_quiz_routing.py
 pytest_plugins = ["tests.test_quiz_module"]
+
+
+@pytest.fixture
+def query_budget():
+    """``with query_budget(n): ...`` fails when the block runs more than n SQL statements."""
+    from src.app.extensions.query_stats import assert_max_queries
+
+    return assert_max_queries
@@ -0,0 +1,102 @@
+"""Tests for the fingerprinted asset build (manage.py build-assets)."""
+
+from __future__ import annotations
+
+import gzip
+import json
+from pathlib import Path
+
+import pytest
+from flask import Flask, render_template_string
+
+from src.app import register_context_processors
+from src.app.services.assets import (
+    ASSET_BUILD_DIRNAME,
+    ASSET_MANIFEST_FILENAME,
+    build_assets,
+    fingerprinted_name,
+    register_asset_manifest,
+)
+
+
+SCRIPT = "function quiz() {\n  return 'quiz';\n}\n" * 100
+
+
+@pytest.fixture
+def static_root(tmp_path: Path) -> Path:
+    root = tmp_path / "static"
+    (root / "js" / "games").mkdir(parents=True)
+    (root / "js" / "modules").mkdir(parents=True)
+    (root / "css" / "games").mkdir(parents=True)
+    (root / "img").mkdir()
+    (root / "js" / "games" / "quiz.js").write_text(SCRIPT, encoding="utf-8")
+    (root / "js" / "modules" / "entry.js").write_text("import { x } from './x.js';\n", encoding="utf-8")
+    (root / "img" / "logo.png").write_bytes(b"\x89PNG" + bytes(100))
+    (root / "css" / "games" / "quiz.css").write_text(
+        ".logo { background: url('../../img/logo.png'); }\n"
+        ".icon { background: url(\"/static/fonts/icons.woff2\"); }\n",
+        encoding="utf-8",
+    )
+    return root
+
+
+def _app(static_root: Path) -> Flask:
+    app = Flask(__name__, static_folder=str(static_root))
+    app.config["TESTING"] = True
+    register_asset_manifest(app)
+    register_context_processors(app)
+    return app
+
+
+def test_build_writes_fingerprinted_files_and_manifest(static_root: Path) -> None:
+    result = build_assets(static_root)
+    build_root = static_root / ASSET_BUILD_DIRNAME
+
+    manifest = json.loads((build_root / ASSET_MANIFEST_FILENAME).read_text(encoding="utf-8"))
+    assert manifest["assets"] == result.manifest
+    assert set(result.manifest) == {"js/games/quiz.js", "css/games/quiz.css", "img/logo.png"}
+    assert result.skipped == ["js/modules/entry.js"]
+
+    built_js = build_root / result.manifest["js/games/quiz.js"]
+    assert result.manifest["js/games/quiz.js"] == fingerprinted_name("js/games/quiz.js", built_js.read_bytes())
+    assert gzip.decompress((built_js.parent / f"{built_js.name}.gz").read_bytes()) == built_js.read_bytes()
+
+    # Relative url() points at the fingerprinted image; absolute URLs stay
+    css = (build_root / result.manifest["css/games/quiz.css"]).read_text(encoding="utf-8")
+    assert f"url('../../{result.manifest['img/logo.png']}')" in css
+    assert 'url("/static/fonts/icons.woff2")' in css
+    assert not (build_root / f"{result.manifest['css/games/quiz.css']}.gz").exists()  # too small
+
+
+def test_asset_url_uses_manifest_and_falls_back_without_build(static_root: Path) -> None:
+    template = "{{ asset_url('js/games/quiz.js') }}"
+
+    app = _app(static_root)
+    with app.test_request_context():
+        assert render_template_string(template).startswith("/static/js/games/quiz.js?v=")
+
+    result = build_assets(static_root)
+    app = _app(static_root)
+    with app.test_request_context():
+        assert render_template_string(template) == f"/static/dist/{result.manifest['js/games/quiz.js']}"
+
+
+def test_built_assets_are_immutable_and_precompressed(static_root: Path) -> None:
+    result = build_assets(static_root)
+    client = _app(static_root).test_client()
+    url = f"/static/dist/{result.manifest['js/games/quiz.js']}"
+
+    response = client.get(url, headers={"Accept-Encoding": "gzip, deflate"})
+    assert response.status_code == 200
+    assert response.headers["Content-Encoding"] == "gzip"
+    assert response.mimetype == "text/javascript"
+    assert gzip.decompress(response.data).decode("utf-8") == SCRIPT
+    assert response.cache_control.immutable
+    assert response.cache_control.max_age == 365 * 24 * 3600
+    assert "Accept-Encoding" in response.headers["Vary"]
+
+    plain = client.get(url, headers={"Accept-Encoding": "identity"})
+    assert "Content-Encoding" not in plain.headers
+    assert plain.data.decode("utf-8") == SCRIPT
+
+    assert client.get("/static/dist/js/games/missing.0123456789ab.js").status_code == 404
@@ -0,0 +1,131 @@
+"""Tests for the Prometheus metrics (/metrics, extensions.metrics, quiz counters).
+
+NOTE: Quiz module uses JSONB columns and expects PostgreSQL.
+"""
+
+from __future__ import annotations
+
+import os
+import subprocess
+import sys
+import textwrap
+from pathlib import Path
+
+import pytest
+
+prometheus_client = pytest.importorskip("prometheus_client")
+from prometheus_client.parser import text_string_to_metric_families  # noqa: E402
+
+from src.app.extensions.metrics import register_metrics, render_metrics  # noqa: E402
+from src.app.extensions.query_stats import register_query_stats  # noqa: E402
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+
+
+def _samples() -> dict:
+    body, content_type = render_metrics()
+    assert content_type.startswith("text/plain")
+    samples = {}
+    for family in text_string_to_metric_families(body.decode("utf-8")):
+        for sample in family.samples:
+            samples[(sample.name, tuple(sorted(sample.labels.items())))] = sample.value
+    return samples
+
+
+def _value(samples: dict, name: str, **labels) -> float:
+    return samples.get((name, tuple(sorted(labels.items()))), 0.0)
+
+
+@pytest.fixture
+def metrics_client(quiz_app, seeded_quiz_db_v2):
+    register_query_stats(quiz_app)
+    register_metrics(quiz_app)
+    return quiz_app.test_client()
+
+
+def test_quiz_flow_metrics(metrics_client) -> None:
+    client = metrics_client
+    before = _samples()
+
+    client.post("/api/quiz/auth/name-pin", json={"name": "Metrics", "pin": "TEST"})
+    run_id = client.post("/api/quiz/test_topic_v2/run/start", json={"force_new": True}).get_json()["run"]["run_id"]
+    client.post(f"/api/quiz/run/{run_id}/question/start", json={"question_index": 0, "started_at_ms": 1000000})
+    assert client.post(f"/api/quiz/run/{run_id}/joker", json={"question_index": 0}).status_code == 200
+    client.post(
+        f"/api/quiz/run/{run_id}/answer",
+        json={"question_index": 0, "selected_answer_id": 1, "answered_at_ms": 1001000},
+    )
+
+    after = _samples()
+
+    def delta(name: str, **labels) -> float:
+        return _value(after, name, **labels) - _value(before, name, **labels)
+
+    assert delta("quiz_runs_started_total", topic_id="test_topic_v2") == 1
+    assert delta("quiz_answers_total", result="correct") == 1
+    assert delta("quiz_jokers_used_total") == 1
+    assert delta("quiz_pin_hash_duration_seconds_count", operation="hash") == 1
+    assert delta("quiz_cache_lookups_total", cache="content_snapshot", result="miss") >= 1
+
+    labels = {"endpoint": "quiz.api_submit_answer", "method": "POST", "status": "200"}
+    assert delta("http_request_duration_seconds_count", **labels) == 1
+    assert delta("http_request_db_seconds_count", endpoint="quiz.api_submit_answer") == 1
+    assert delta("http_request_db_queries_total", endpoint="quiz.api_submit_answer") >= 1
+
+    # Pool state is copied on scrape
+    assert ("db_pool_checkouts_total", (("pool", "quiz"),)) in after
+
+
+def test_unmeasured_paths_are_not_timed(metrics_client) -> None:
+    before = _samples()
+    metrics_client.get("/quiz-media/missing.mp3")
+    after = _samples()
+    assert not any(
+        name == "http_request_duration_seconds_count" and after[(name, labels)] != before.get((name, labels))
+        for name, labels in after
+    )
+
+
+def test_multiprocess_dir_aggregates_workers(tmp_path: Path) -> None:
+    """Two processes increment the same counter; a third one scrapes the sum."""
+    env = {**os.environ, "PROMETHEUS_MULTIPROC_DIR": str(tmp_path), "PYTHONPATH": str(PROJECT_ROOT)}
+    worker = textwrap.dedent(
+        """
+        from game_modules.quiz import metrics
+        metrics.RUNS_STARTED.labels(topic_id="t").inc()
+        """
+    )
+    for _ in range(2):
+        subprocess.run([sys.executable, "-c", worker], env=env, check=True, cwd=PROJECT_ROOT)
+
+    scrape = textwrap.dedent(
+        """
+        from src.app.extensions.metrics import render_metrics
+        print(render_metrics()[0].decode())
+        """
+    )
+    output = subprocess.run(
+        [sys.executable, "-c", scrape], env=env, check=True, cwd=PROJECT_ROOT, capture_output=True, text=True
+    ).stdout
+    assert 'quiz_runs_started_total{topic_id="t"} 2.0' in output
+
+
+def test_missing_multiprocess_dir_does_not_break_imports(tmp_path: Path) -> None:
+    """Build steps import the app before the entrypoint creates the directory."""
+    blocker = tmp_path / "file"
+    blocker.write_text("", encoding="utf-8")
+    script = textwrap.dedent(
+        """
+        from game_modules.quiz import metrics
+        from src.app.extensions.metrics import render_metrics
+        metrics.JOKERS_USED.inc()
+        print(render_metrics()[0].decode())
+        """
+    )
+    for multiproc_dir in (tmp_path / "missing" / "metrics", blocker / "metrics"):
+        env = {**os.environ, "PROMETHEUS_MULTIPROC_DIR": str(multiproc_dir), "PYTHONPATH": str(PROJECT_ROOT)}
+        output = subprocess.run(
+            [sys.executable, "-c", script], env=env, check=True, cwd=PROJECT_ROOT, capture_output=True, text=True
+        ).stdout
+        assert "quiz_jokers_used_total 1.0" in output
+    assert (tmp_path / "missing" / "metrics").is_dir()
@@ -0,0 +1,142 @@
+"""SQL query budgets for the quiz API (N+1 guard).
+
+Budgets are the current statement counts per request. A change that adds
+queries to an endpoint fails here; lower the budget when an endpoint gets
+cheaper.
+
+NOTE: Quiz module uses JSONB columns and expects PostgreSQL.
+"""
+
+from __future__ import annotations
+
+import logging
+
+import pytest
+
+from src.app.extensions.query_stats import QueryBudgetExceeded, collect_queries, register_query_stats
+from src.app.extensions.sqlalchemy_ext import get_quiz_session
+
+# Session lookup, player load, last_seen update (the route reuses the
+# decorator's request-scoped session, so the player is loaded once)
+AUTHED_REQUEST_OVERHEAD = 3
+
+QUIZ_API_QUERY_BUDGETS = {
+    "name_pin_login": 3,
+    "topics": 1,
+    "run_start": 10,
+    "run_current": 6,
+    "question_start": 6,
+    "answer": 8,
+    "status": 6,
+    "state": 6,
+    "question": AUTHED_REQUEST_OVERHEAD + 1,
+    "session": 3,
+}
+
+
+@pytest.fixture
+def budget_client(quiz_client, seeded_quiz_db_v2):
+    return quiz_client
+
+
+def _answer(client, run_id: str, index: int) -> None:
+    client.post(
+        f"/api/quiz/run/{run_id}/question/start",
+        json={"question_index": index, "started_at_ms": 1000000 + index * 10000},
+    )
+    response = client.post(
+        f"/api/quiz/run/{run_id}/answer",
+        json={"question_index": index, "selected_answer_id": 1, "answered_at_ms": 1001000 + index * 10000},
+    )
+    assert response.status_code == 200
+
+
+def test_quiz_api_query_budgets(budget_client, query_budget) -> None:
+    client = budget_client
+    budgets = QUIZ_API_QUERY_BUDGETS
+
+    with query_budget(budgets["name_pin_login"]):
+        assert client.post("/api/quiz/auth/name-pin", json={"name": "Budget", "pin": "TEST"}).status_code == 200
+    with query_budget(budgets["topics"]):
+        assert client.get("/api/quiz/topics").status_code == 200
+    with query_budget(budgets["run_start"]):
+        start = client.post("/api/quiz/test_topic_v2/run/start", json={"force_new": True})
+    run_id = start.get_json()["run"]["run_id"]
+    with query_budget(budgets["run_current"]):
+        assert client.get("/api/quiz/run/current?topic_id=test_topic_v2").status_code == 200
+    with query_budget(budgets["question_start"]):
+        client.post(
+            f"/api/quiz/run/{run_id}/question/start",
+            json={"question_index": 0, "started_at_ms": 1000000},
+        )
+    with query_budget(budgets["answer"]):
+        client.post(
+            f"/api/quiz/run/{run_id}/answer",
+            json={"question_index": 0, "selected_answer_id": 1, "answered_at_ms": 1001000},
+        )
+    with query_budget(budgets["status"]):
+        assert client.get(f"/api/quiz/run/{run_id}/status").status_code == 200
+    with query_budget(budgets["state"]):
+        assert client.get(f"/api/quiz/run/{run_id}/state").status_code == 200
+    with query_budget(budgets["question"]):
+        assert client.get("/api/quiz/questions/test_v2_q1_1").status_code == 200
+    with query_budget(budgets["session"]):
+        assert client.get("/api/quiz/auth/session").status_code == 200
+
+
+def test_query_counts_do_not_grow_with_history(budget_client) -> None:
+    """Run start reads the last runs' answers and status reads the run's answers in fixed queries."""
+    client = budget_client
+    client.post("/api/quiz/auth/name-pin", json={"name": "History", "pin": "TEST"})
+
+    start_counts, status_counts = [], []
+    for answered in range(4):
+        with collect_queries() as stats:
+            run_id = client.post("/api/quiz/test_topic_v2/run/start", json={"force_new": True}).get_json()["run"]["run_id"]
+        start_counts.append(stats.count)
+        for index in range(answered + 1):
+            _answer(client, run_id, index)
+        with collect_queries() as stats:
+            client.get(f"/api/quiz/run/{run_id}/status")
+        status_counts.append(stats.count)
+
+    # The first start has no previous run to abandon
+    assert len(set(start_counts[1:])) == 1, start_counts
+    assert len(set(status_counts)) == 1, status_counts
+
+
+def test_budget_failure_lists_repeated_statements(budget_client, query_budget) -> None:
+    from game_modules.quiz.models import QuizQuestion
+
+    with pytest.raises(QueryBudgetExceeded) as excinfo:
+        with query_budget(2):
+            with get_quiz_session() as session:
+                for question_id in ("test_v2_q1_1", "test_v2_q1_2", "test_v2_q1_3"):
+                    session.get(QuizQuestion, question_id)
+
+    assert "3 queries executed, budget is 2" in str(excinfo.value)
+    assert "3x SELECT quiz_questions." in str(excinfo.value)
+
+
+def test_request_stats_header_and_log(quiz_app, budget_client, caplog) -> None:
+    register_query_stats(quiz_app)
+    quiz_app.config.update(DB_QUERY_STATS_HEADER=True, DB_QUERY_WARN_COUNT=3)
+    client = budget_client
+    client.post("/api/quiz/auth/name-pin", json={"name": "Header", "pin": "TEST"})
+
+    response = client.get("/api/quiz/topics")
+    assert response.headers["X-DB-Queries"] == "1"
+    assert response.headers["Server-Timing"].startswith("db;dur=")
+
+    with caplog.at_level(logging.DEBUG, logger="src.app.extensions.query_stats"):
+        client.post("/api/quiz/test_topic_v2/run/start", json={"force_new": True})
+
+    record = caplog.records[-1]
+    assert record.levelno == logging.WARNING
+    assert record.endpoint == "quiz.api_start_run"
+    assert record.queries == QUIZ_API_QUERY_BUDGETS["run_start"]
+    # No statement repeats within run start
+    assert record.most_repeated["count"] == 1
+
+    quiz_app.config["DB_QUERY_STATS_HEADER"] = False
+    assert "X-DB-Queries" not in client.get("/api/quiz/topics").headers
@@ -412,6 +412,8 @@ class TestReleasesAPI:
         data = response.get_json()
         assert data["release_id"] == "test_release_001"
         assert data["status"] == "draft"
+        # No import recorded yet -> no diff
+        assert data["diff"] is None
 
 
 # ============================================================================
@@ -460,6 +462,25 @@ class TestReleaseImportAuth:
         assert response.status_code not in [401, 403], \
             f"Import should not fail with auth error, got {response.status_code}: {response.get_json()}"
 
+    def test_import_job_records_admin_identity(self, admin_app, admin_client, admin_token, tmp_path):
+        """Jobs are attributed to the JWT identity of the admin who queued them."""
+        from game_modules.quiz import jobs
+        from game_modules.quiz.job_model import QuizJob
+        from src.app.extensions.sqlalchemy_ext import get_quiz_session
+
+        QuizJob.__table__.create(bind=get_quiz_engine(), checkfirst=True)
+        admin_app.config["MEDIA_DIR"] = str(tmp_path / "media")
+        (tmp_path / "media" / "releases" / "rel_identity" / "units").mkdir(parents=True)
+
+        response = admin_client.post(
+            "/quiz-admin/api/releases/rel_identity/import?wait=1",
+            headers={"Authorization": f"Bearer {admin_token}", "Accept": "application/json"},
+        )
+
+        job_id = response.get_json()["job_id"]
+        with get_quiz_session() as session:
+            assert jobs.get_job(session, job_id).created_by == "admin_user"
+
     def test_import_with_cookie_auth(self, admin_client, admin_token, seeded_releases):
         """Import with JWT cookie should work (same-origin credentials)."""
         # Set JWT cookie
@@ -956,6 +977,41 @@ class TestUploadValidation:
         assert "release_id" in data
         assert data["release_id"].startswith("release_")
 
+    def test_upload_over_request_limit_is_rejected_while_parsing(self, admin_app, admin_client, admin_token):
+        """The request limit applies to the multipart parse, also without Content-Length."""
+        from io import BytesIO
+
+        admin_app.config["QUIZ_UPLOAD_MAX_REQUEST_BYTES"] = 1000
+        body = BytesIO(
+            b"--b\r\n"
+            b'Content-Disposition: form-data; name="media_files[]"; filename="big.mp3"\r\n\r\n'
+            + b"x" * 5000
+            + b"\r\n--b--\r\n"
+        )
+        response = admin_client.post(
+            "/quiz-admin/api/upload-unit",
+            headers={"Authorization": f"Bearer {admin_token}", "Transfer-Encoding": "chunked"},
+            content_type="multipart/form-data; boundary=b",
+            input_stream=body,
+            environ_overrides={"wsgi.input_terminated": True},  # as set by gunicorn for chunked bodies
+        )
+        assert response.status_code == 413
+        assert response.get_json()["error"] == "payload_too_large"
+
+    def test_upload_json_over_file_limit(self, admin_app, admin_client, admin_token):
+        """The unit JSON is subject to the per-file limit as well."""
+        from io import BytesIO
+
+        admin_app.config["QUIZ_UPLOAD_MAX_FILE_BYTES"] = 100
+        response = admin_client.post(
+            "/quiz-admin/api/upload-unit",
+            headers={"Authorization": f"Bearer {admin_token}"},
+            content_type="multipart/form-data",
+            data={"unit_json": (BytesIO(b" " * 200 + b"{}"), "big.json")},
+        )
+        assert response.status_code == 413
+        assert response.get_json()["filename"] == "big.json"
+
 
 # ============================================================================
 # Release ID Generation Test
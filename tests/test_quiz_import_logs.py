@@ -0,0 +1,111 @@
+"""Tests for the import log index, tail reader and rotation."""
+
+from __future__ import annotations
+
+import gzip
+import os
+import time
+from pathlib import Path
+
+import pytest
+
+from game_modules.quiz import import_logs
+from game_modules.quiz.import_logs import (
+    find_latest_log,
+    read_from,
+    register_log,
+    rotate_import_logs,
+    tail_lines,
+)
+
+
+def _write_log(logs_dir: Path, name: str, lines: int, age_days: float = 0) -> Path:
+    path = logs_dir / name
+    path.write_text("".join(f"line {i}\n" for i in range(lines)), encoding="utf-8")
+    stamp = time.time() - age_days * 86400
+    os.utime(path, (stamp, stamp))
+    return path
+
+
+@pytest.mark.parametrize("lines", [0, 1, 5, 200, 201, 5000])
+def test_tail_lines_matches_readlines(tmp_path: Path, monkeypatch: pytest.MonkeyPatch, lines: int) -> None:
+    monkeypatch.setattr(import_logs, "TAIL_BLOCK_SIZE", 37)  # force many partial blocks
+    path = _write_log(tmp_path, "x.log", lines)
+
+    text, offset = tail_lines(path, max_lines=200)
+
+    expected = path.read_text(encoding="utf-8").splitlines(keepends=True)[-200:]
+    assert text == "".join(expected)
+    assert offset == path.stat().st_size
+
+
+def test_tail_lines_bounded_by_max_bytes(tmp_path: Path) -> None:
+    path = _write_log(tmp_path, "big.log", 100_000)
+
+    text, _ = tail_lines(path, max_lines=100_000, max_bytes=1000)
+
+    assert len(text.encode()) <= 1000
+    assert text.endswith("line 99999\n")
+    assert text.startswith("line ")  # partial first line dropped
+
+
+def test_read_from_returns_complete_lines_only(tmp_path: Path) -> None:
+    path = tmp_path / "follow.log"
+    path.write_bytes(b"one\ntwo\nthr")
+
+    text, offset = read_from(path, 0)
+    assert text == "one\ntwo\n"
+    assert offset == 8
+
+    with open(path, "ab") as f:
+        f.write(b"ee\n")
+    text, offset = read_from(path, offset)
+    assert text == "three\n"
+    assert offset == path.stat().st_size
+
+
+def test_index_finds_latest_and_request_logs(tmp_path: Path) -> None:
+    register_log(tmp_path, "rel_a", "20260101_000000_import_rel_a_req-1.log", "import", "req-1")
+    _write_log(tmp_path, "20260101_000000_import_rel_a_req-1.log", 3)
+    register_log(tmp_path, "rel_a", "20260102_000000_publish_rel_a_req-2.log", "publish", "req-2")
+    _write_log(tmp_path, "20260102_000000_publish_rel_a_req-2.log", 3)
+    # Another release's log must not be picked up
+    _write_log(tmp_path, "20260103_000000_import_rel_b_req-3.log", 3)
+
+    assert find_latest_log(tmp_path, "rel_a").name.endswith("req-2.log")
+    assert find_latest_log(tmp_path, "rel_a", request_id="req-1").name.endswith("req-1.log")
+    assert find_latest_log(tmp_path, "rel_a", request_id="missing") is None
+
+
+def test_legacy_logs_are_indexed_once(tmp_path: Path) -> None:
+    _write_log(tmp_path, "20250101_000000_import_rel_old.log", 3, age_days=2)
+    _write_log(tmp_path, "20250102_000000_import_rel_old_abc.log", 3, age_days=1)
+
+    assert find_latest_log(tmp_path, "rel_old").name == "20250102_000000_import_rel_old_abc.log"
+    assert (tmp_path / "index" / "rel_old.json").exists()
+
+    # A new log is appended after the legacy entries
+    register_log(tmp_path, "rel_old", "20260101_000000_import_rel_old_new.log", "import", "new")
+    _write_log(tmp_path, "20260101_000000_import_rel_old_new.log", 1)
+    assert find_latest_log(tmp_path, "rel_old").name.endswith("_new.log")
+
+
+def test_rotation_compresses_deletes_and_updates_index(tmp_path: Path) -> None:
+    for name, age in [("a_rel_x_1.log", 400), ("b_rel_x_2.log", 30), ("c_rel_x_3.log", 0)]:
+        register_log(tmp_path, "rel_x", name, "import", name[0])
+        _write_log(tmp_path, name, 50, age_days=age)
+
+    result = rotate_import_logs(tmp_path, compress_after_days=7, delete_after_days=180)
+
+    assert (result.compressed, result.deleted) == (1, 1)
+    assert not (tmp_path / "a_rel_x_1.log").exists()
+    assert not (tmp_path / "b_rel_x_2.log").exists()
+    with gzip.open(tmp_path / "b_rel_x_2.log.gz", "rt", encoding="utf-8") as f:
+        assert f.read().endswith("line 49\n")
+    assert (tmp_path / "c_rel_x_3.log").exists()
+
+    gz_log = find_latest_log(tmp_path, "rel_x", request_id="b")
+    assert gz_log.name == "b_rel_x_2.log.gz"
+    text, offset = tail_lines(gz_log, max_lines=2)
+    assert text == "line 48\nline 49\n" and offset == 0
+    assert find_latest_log(tmp_path, "rel_x", request_id="a") is None
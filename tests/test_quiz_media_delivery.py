@@ -0,0 +1,147 @@
+"""Tests for the /quiz-media route (Range, ETag, caching, X-Accel-Redirect)."""
+
+from __future__ import annotations
+
+import hashlib
+import os
+from io import BytesIO
+from pathlib import Path
+from typing import Generator
+
+import pytest
+from flask import Flask
+from flask.testing import FlaskClient
+
+from game_modules.quiz.media_delivery import preload_links
+from game_modules.quiz.media_store import store_stream
+
+
+AUDIO = bytes(range(256)) * 40
+
+
+@pytest.fixture
+def media_root(tmp_path: Path) -> Path:
+    root = tmp_path / "media"
+    release_audio = root / "releases" / "rel_1" / "audio"
+    release_audio.mkdir(parents=True)
+    (release_audio / "clip.mp3").write_bytes(AUDIO)
+    (root / "releases" / "rel_1" / "release_manifest.json").write_text("{}")
+    return root
+
+
+@pytest.fixture
+def media_client(media_root: Path) -> Generator[FlaskClient, None, None]:
+    from game_modules.quiz.routes import blueprint
+
+    app = Flask(__name__)
+    app.config["TESTING"] = True
+    app.config["MEDIA_DIR"] = str(media_root)
+    app.register_blueprint(blueprint)
+    yield app.test_client()
+
+
+def _store_url(media_root: Path) -> str:
+    stored = store_stream(BytesIO(AUDIO), "clip.mp3", media_root / "store")
+    return f"/quiz-media/store/{stored.sha256[:2]}/{stored.sha256}.mp3"
+
+
+def test_store_media_is_immutable_and_supports_conditional_requests(
+    media_client: FlaskClient, media_root: Path
+) -> None:
+    url = _store_url(media_root)
+    sha = hashlib.sha256(AUDIO).hexdigest()
+
+    response = media_client.get(url)
+    assert response.status_code == 200
+    assert response.data == AUDIO
+    assert response.mimetype == "audio/mpeg"
+    assert response.headers["ETag"] == f'"{sha}"'
+    assert response.cache_control.immutable
+    assert response.cache_control.max_age == 365 * 24 * 3600
+
+    not_modified = media_client.get(url, headers={"If-None-Match": f'"{sha}"'})
+    assert not_modified.status_code == 304
+    assert not_modified.cache_control.immutable
+
+
+def test_range_requests(media_client: FlaskClient, media_root: Path) -> None:
+    url = _store_url(media_root)
+
+    partial = media_client.get(url, headers={"Range": "bytes=100-199"})
+    assert partial.status_code == 206
+    assert partial.data == AUDIO[100:200]
+    assert partial.headers["Content-Range"] == f"bytes 100-199/{len(AUDIO)}"
+    assert partial.headers["Accept-Ranges"] == "bytes"
+
+    unsatisfiable = media_client.get(url, headers={"Range": f"bytes={len(AUDIO) + 10}-"})
+    assert unsatisfiable.status_code == 416
+
+
+def test_release_media_is_revalidated(media_client: FlaskClient) -> None:
+    response = media_client.get("/quiz-media/releases/rel_1/audio/clip.mp3")
+    assert response.status_code == 200
+    assert response.data == AUDIO
+    assert not response.cache_control.immutable
+    assert response.cache_control.max_age == 300
+    assert response.headers.get("ETag")
+
+
+@pytest.mark.parametrize(
+    "path",
+    [
+        "releases/rel_1/release_manifest.json",  # not a media file
+        "releases/rel_1/../rel_1/audio/clip.mp3",
+        "releases/rel_1/audio/missing.mp3",
+        "releases/rel_1/audio/.hidden.mp3",
+        "store/00/not-a-hash.mp3",
+        "current/audio/clip.mp3",
+        "releases/rel_1/audio/escape.mp3",  # symlink out of the media root
+    ],
+)
+def test_rejected_paths(media_client: FlaskClient, media_root: Path, tmp_path: Path, path: str) -> None:
+    outside = tmp_path / "secret.mp3"
+    outside.write_bytes(b"secret")
+    os.symlink(outside, media_root / "releases" / "rel_1" / "audio" / "escape.mp3")
+    (media_root / "releases" / "rel_1" / "audio" / ".hidden.mp3").write_bytes(b"x")
+
+    assert media_client.get(f"/quiz-media/{path}").status_code == 404
+
+
+def test_accel_redirect_offloads_transfer(media_client: FlaskClient, media_root: Path) -> None:
+    media_client.application.config["QUIZ_MEDIA_ACCEL_REDIRECT"] = "/_quiz_media/"
+    url = _store_url(media_root)
+
+    response = media_client.get(url, headers={"Range": "bytes=0-9"})
+    assert response.status_code == 200  # nginx answers the range
+    assert response.data == b""
+    assert response.headers["X-Accel-Redirect"] == url.replace("/quiz-media/", "/_quiz_media/")
+    assert response.mimetype == "audio/mpeg"
+    assert response.cache_control.immutable
+
+
+def test_preload_links_match_client_choice() -> None:
+    srcset = [
+        {"src": "/quiz-media/store/a1/a1.avif", "type": "image/avif", "width": 320},
+        {"src": "/quiz-media/store/a2/a2.avif", "type": "image/avif", "width": 640},
+        {"src": "/quiz-media/store/w1/w1.webp", "type": "image/webp", "width": 320},
+    ]
+    manifest = [
+        {
+            "question_index": 3,
+            "question_id": "q",
+            "media": [
+                {"type": "image", "src": "/quiz-media/store/ff/f.png", "srcset": srcset},
+                {"type": "image", "src": "/quiz-media/store/ee/e.png", "answer_id": "2"},
+                {"type": "audio", "src": "/quiz-media/store/dd/d.mp3"},
+                {"type": "audio", "src": "https://example.org/x.mp3"},  # not ours
+            ],
+        }
+    ]
+
+    assert preload_links(manifest) == [
+        '</quiz-media/store/ff/f.png>; rel=preload; as=image; type="image/avif"; '
+        'imagesrcset="/quiz-media/store/a1/a1.avif 320w, /quiz-media/store/a2/a2.avif 640w"; '
+        'imagesizes="(max-width: 720px) 100vw, 720px"',
+        "</quiz-media/store/ee/e.png>; rel=preload; as=image",
+        "</quiz-media/store/dd/d.mp3>; rel=preload; as=audio",
+    ]
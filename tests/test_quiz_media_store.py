@@ -0,0 +1,80 @@
+"""Tests for the content-addressed media store used by dashboard uploads."""
+
+from __future__ import annotations
+
+import hashlib
+from io import BytesIO
+from pathlib import Path
+
+import pytest
+
+from game_modules.quiz import media_store
+from game_modules.quiz.media_store import (
+    MediaTooLargeError,
+    add_file_to_store,
+    link_into_release,
+    store_path_for,
+    store_stream,
+)
+
+
+def test_store_stream_hashes_and_deduplicates(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(media_store, "STREAM_CHUNK_SIZE", 4)
+    store_root = tmp_path / "store"
+    payload = b"ID3 fake mp3 payload"
+    sha256 = hashlib.sha256(payload).hexdigest()
+
+    first = store_stream(BytesIO(payload), "clip.MP3", store_root)
+    assert first.sha256 == sha256
+    assert first.size == len(payload)
+    assert first.path == store_path_for(store_root, sha256, ".mp3")
+    assert first.path.read_bytes() == payload
+    assert first.deduplicated is False
+
+    second = store_stream(BytesIO(payload), "same_clip.mp3", store_root)
+    assert second.deduplicated is True
+    assert second.path == first.path
+    assert list((store_root / ".tmp").iterdir()) == []
+
+    # Two releases share one inode
+    rel_a = tmp_path / "releases" / "a" / "audio"
+    rel_b = tmp_path / "releases" / "b" / "audio"
+    rel_a.mkdir(parents=True)
+    rel_b.mkdir(parents=True)
+    assert link_into_release(first.path, rel_a / "clip.mp3") == "hardlink"
+    link_into_release(second.path, rel_b / "other.mp3")
+    assert (rel_a / "clip.mp3").stat().st_ino == (rel_b / "other.mp3").stat().st_ino
+    assert (rel_b / "other.mp3").read_bytes() == payload
+
+
+@pytest.mark.parametrize(
+    "kwargs,scope",
+    [({"max_file_bytes": 10}, "per-file"), ({"max_total_bytes": 10}, "per-request")],
+)
+def test_store_stream_enforces_limits_while_streaming(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch, kwargs: dict, scope: str
+) -> None:
+    monkeypatch.setattr(media_store, "STREAM_CHUNK_SIZE", 4)
+    store_root = tmp_path / "store"
+
+    with pytest.raises(MediaTooLargeError) as excinfo:
+        store_stream(BytesIO(b"x" * 64), "big.mp3", store_root, **kwargs)
+
+    assert excinfo.value.scope == scope
+    assert list((store_root / ".tmp").iterdir()) == []
+    assert [p for p in store_root.iterdir() if p.name != ".tmp"] == []
+
+
+def test_add_file_to_store_copies_release_files(tmp_path: Path) -> None:
+    release_file = tmp_path / "releases" / "r" / "audio" / "clip.mp3"
+    release_file.parent.mkdir(parents=True)
+    release_file.write_bytes(b"original")
+    sha256 = hashlib.sha256(b"original").hexdigest()
+
+    stored = add_file_to_store(release_file, sha256, tmp_path / "store")
+
+    assert stored.stat().st_ino != release_file.stat().st_ino
+    assert stored.stat().st_mode & 0o222 == 0
+    # Editing the release file in place leaves the store file intact
+    release_file.write_bytes(b"edited!!")
+    assert stored.read_bytes() == b"original"
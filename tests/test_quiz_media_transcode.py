@@ -0,0 +1,174 @@
+"""Tests for import-time audio transcoding (game_modules.quiz.media_transcode)."""
+
+from __future__ import annotations
+
+import json
+import math
+import struct
+import wave
+import zlib
+from pathlib import Path
+
+import pytest
+
+from game_modules.quiz.media_delivery import resolve_media_path
+from game_modules.quiz.media_store import store_path_for
+from game_modules.quiz.media_transcode import (
+    IMAGE_DERIVATIVE_VERSION,
+    TRANSCODE_VERSION,
+    TranscodeJob,
+    derivative_widths,
+    derive_image,
+    ffmpeg_available,
+    image_media_fields,
+    image_record_path,
+    load_image_record,
+    supported_image_formats,
+    transcode_audio,
+    transcode_record_path,
+    load_transcode_record,
+)
+
+SHA = "ab" * 32
+
+
+def _write_record(store_root: Path, variants: list, version: int = TRANSCODE_VERSION) -> None:
+    path = transcode_record_path(store_root, SHA)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(
+        json.dumps({"version": version, "bytes": 1000, "duration": 1.5, "variants": variants})
+    )
+
+
+def _write_sine_wav(path: Path, seconds: float = 1.0, rate: int = 44100) -> None:
+    with wave.open(str(path), "wb") as wav:
+        wav.setnchannels(2)
+        wav.setsampwidth(2)
+        wav.setframerate(rate)
+        frames = bytearray()
+        for i in range(int(seconds * rate)):
+            sample = int(12000 * math.sin(2 * math.pi * 440 * i / rate))
+            frames += struct.pack("<hh", sample, sample)
+        wav.writeframes(bytes(frames))
+
+
+def _write_png(path: Path, width: int, height: int) -> None:
+    """Write an uncompressed RGB noise-like PNG (stdlib only)."""
+    raw = b"".join(
+        b"\x00" + bytes((x * 7 + y * 13) & 0xFF for x in range(width * 3))
+        for y in range(height)
+    )
+
+    def chunk(kind: bytes, data: bytes) -> bytes:
+        return struct.pack(">I", len(data)) + kind + data + struct.pack(">I", zlib.crc32(kind + data))
+
+    header = struct.pack(">IIBBBBB", width, height, 8, 2, 0, 0, 0)
+    path.write_bytes(
+        b"\x89PNG\r\n\x1a\n" + chunk(b"IHDR", header) + chunk(b"IDAT", zlib.compress(raw, 0))
+        + chunk(b"IEND", b"")
+    )
+
+
+def test_transcode_record_requires_current_version_and_variant_files(tmp_path: Path) -> None:
+    store_root = tmp_path / "store"
+    variant = {
+        "profile": "opus",
+        "sha256": "cd" * 32,
+        "suffix": ".opus",
+        "mime": 'audio/ogg; codecs="opus"',
+        "bytes": 10,
+    }
+    _write_record(store_root, [variant])
+    assert load_transcode_record(store_root, SHA) is None  # variant file missing
+
+    variant_path = store_path_for(store_root, variant["sha256"], ".opus")
+    variant_path.parent.mkdir(parents=True, exist_ok=True)
+    variant_path.write_bytes(b"x" * 10)
+    record = load_transcode_record(store_root, SHA)
+    assert record is not None and record.cached
+    assert record.duration == 1.5
+    assert [v.sha256 for v in record.variants] == [variant["sha256"]]
+
+    _write_record(store_root, [variant], version=TRANSCODE_VERSION + 1)
+    assert load_transcode_record(store_root, SHA) is None
+
+    # Variants are served from the store like other media
+    resolved = resolve_media_path(tmp_path, f"store/cd/{'cd' * 32}.opus")
+    assert resolved is not None and resolved.immutable
+
+
+@pytest.mark.skipif(not ffmpeg_available(), reason="ffmpeg/ffprobe not installed")
+def test_transcode_audio_creates_smaller_variants_once(tmp_path: Path) -> None:
+    source = tmp_path / "tone.wav"
+    _write_sine_wav(source)
+    store_root = tmp_path / "store"
+    job = TranscodeJob(source=source, sha256=SHA, store_root=store_root)
+
+    result = transcode_audio(job)
+    assert result.error is None
+    assert not result.cached
+    assert result.duration == pytest.approx(1.0, abs=0.05)
+    assert {v.profile for v in result.variants} == {"opus", "aac"}
+    for variant in result.variants:
+        assert variant.bytes < result.bytes
+        assert store_path_for(store_root, variant.sha256, variant.suffix).is_file()
+
+    again = transcode_audio(job)
+    assert again.cached
+    assert again.variants == result.variants
+
+
+def test_derivative_widths() -> None:
+    assert derivative_widths(4000) == [320, 640, 1280]
+    assert derivative_widths(500) == [320, 500]
+    assert derivative_widths(200) == [200]
+
+
+def test_image_record_and_srcset_fields(tmp_path: Path) -> None:
+    store_root = tmp_path / "store"
+    derivatives = [
+        {"format": fmt, "sha256": f"{idx:02x}" * 32, "suffix": f".{fmt}", "mime": f"image/{fmt}",
+         "width": width, "height": width // 2, "bytes": width}
+        for idx, (fmt, width) in enumerate([("webp", 640), ("webp", 320), ("avif", 320)])
+    ]
+    for d in derivatives:
+        path = store_path_for(store_root, d["sha256"], d["suffix"])
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_bytes(b"x")
+    path = image_record_path(store_root, SHA)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps({
+        "version": IMAGE_DERIVATIVE_VERSION, "bytes": 5000, "width": 2000, "height": 1000,
+        "derivatives": derivatives,
+    }))
+
+    record = load_image_record(store_root, SHA)
+    assert record is not None and record.cached
+    fields = image_media_fields(record, lambda sha, suffix: f"/{sha[:2]}{suffix}")
+    assert fields["width"] == 2000 and fields["height"] == 1000
+    # AVIF first (preferred format), then ascending widths per format
+    assert [(e["type"], e["width"], e["src"]) for e in fields["srcset"]] == [
+        ("image/avif", 320, "/02.avif"),
+        ("image/webp", 320, "/01.webp"),
+        ("image/webp", 640, "/00.webp"),
+    ]
+
+
+@pytest.mark.skipif(not ffmpeg_available(), reason="ffmpeg/ffprobe not installed")
+def test_derive_image_writes_resized_derivatives(tmp_path: Path) -> None:
+    source = tmp_path / "photo.png"
+    _write_png(source, 900, 450)
+    store_root = tmp_path / "store"
+    job = TranscodeJob(source=source, sha256=SHA, store_root=store_root)
+
+    result = derive_image(job)
+    assert result.error is None
+    assert (result.width, result.height) == (900, 450)
+    formats = {f.name for f in supported_image_formats()}
+    assert {d.format for d in result.derivatives} == formats
+    for d in result.derivatives:
+        assert d.width in (320, 640, 900)
+        assert d.height == round(450 * d.width / 900)
+        assert store_path_for(store_root, d.sha256, d.suffix).is_file()
+
+    assert derive_image(job).cached
@@ -638,6 +638,47 @@ class TestRunLifecycle:
         assert data.get("has_run") is True
         assert data.get("run", {}).get("run_id")
     
+    def test_run_media_manifest_and_preload_links(self, quiz_client, seeded_quiz_db_v2):
+        """Run payloads list question media in run order; the play page preloads the next ones."""
+        from game_modules.quiz.media_delivery import preload_links
+        from game_modules.quiz.media_transcode import AUDIO_PROFILES
+        from game_modules.quiz.models import QuizQuestion
+
+        mimes = {profile.name: profile.mime for profile in AUDIO_PROFILES}
+        audio = {
+            "id": "m1",
+            "type": "audio",
+            "src": "/quiz-media/store/aa/a.mp3",
+            "bytes": 4000,
+            "duration": 2.5,
+            "variants": [
+                {"src": "/quiz-media/store/bb/b.m4a", "mime": mimes["aac"], "bytes": 900},
+                {"src": "/quiz-media/store/cc/c.opus", "mime": mimes["opus"], "bytes": 600},
+            ],
+        }
+        with get_session() as session:
+            for question in session.execute(select(QuizQuestion)).scalars():
+                question.media = [audio]
+            session.commit()
+
+        quiz_client.post("/api/quiz/auth/register", json={"name": "PreloadTest", "pin": "1234"})
+        run = quiz_client.post("/api/quiz/test_topic_v2/run/start", json={}).get_json()["run"]
+
+        manifest = run["media_manifest"]
+        assert [entry["question_index"] for entry in manifest] == list(range(10))
+        assert [entry["question_id"] for entry in manifest] == [
+            rq["question_id"] for rq in run["run_questions"]
+        ]
+        assert manifest[0]["media"] == [{k: v for k, v in audio.items() if k != "id"}]
+
+        current = quiz_client.get("/api/quiz/run/current?topic_id=test_topic_v2").get_json()
+        assert current["run"]["media_manifest"] == manifest
+
+        # Link values for the play page: smallest variant, de-duplicated
+        assert preload_links(manifest[:2]) == [
+            '</quiz-media/store/cc/c.opus>; rel=preload; as=audio; type="audio/ogg"'
+        ]
+
     def test_restart_run(self, quiz_client, seeded_quiz_db):
         """Restarting should abandon current run and create new one."""
         # Register and start run
@@ -0,0 +1,150 @@
+"""Tests for read-replica routing (QUIZ_DATABASE_READ_URL, get_quiz_session(readonly=True)).
+
+A second database on the test server stands in for the replica, so routing is
+visible from the data each endpoint returns.
+"""
+
+from __future__ import annotations
+
+from typing import Generator
+
+import pytest
+from sqlalchemy import create_engine, text
+from sqlalchemy.engine import make_url
+from sqlalchemy.exc import DBAPIError, SQLAlchemyError
+
+from src.app.extensions import sqlalchemy_ext
+from src.app.extensions.sqlalchemy_ext import get_quiz_session, quiz_read_replica_status
+from tests.test_quiz_module import QUIZ_TEST_DB_URL
+
+
+REPLICA_DB_NAME = "hispanistica_quiz_replica_test"
+
+
+def _add_topic(session, topic_id: str) -> None:
+    from game_modules.quiz.models import QuizTopic
+
+    session.add(QuizTopic(id=topic_id, title_key=f"{topic_id}.title", description_key="d", is_active=True))
+
+
+@pytest.fixture
+def replica_url() -> Generator[str, None, None]:
+    from game_modules.quiz.models import QuizBase, QuizQuestion, QuizTopic
+
+    admin = create_engine(QUIZ_TEST_DB_URL, isolation_level="AUTOCOMMIT")
+    try:
+        with admin.connect() as conn:
+            exists = conn.execute(
+                text("SELECT 1 FROM pg_database WHERE datname = :name"), {"name": REPLICA_DB_NAME}
+            ).scalar()
+            if not exists:
+                conn.execute(text(f"CREATE DATABASE \"{REPLICA_DB_NAME}\" ENCODING 'UTF8' TEMPLATE template0"))
+    except SQLAlchemyError as exc:
+        pytest.skip(f"Cannot create replica stand-in database: {exc}")
+    finally:
+        admin.dispose()
+
+    url = make_url(QUIZ_TEST_DB_URL).set(database=REPLICA_DB_NAME).render_as_string(hide_password=False)
+    engine = create_engine(url)
+    QuizBase.metadata.create_all(bind=engine)
+    with engine.begin() as conn:
+        conn.execute(QuizQuestion.__table__.delete())
+        conn.execute(QuizTopic.__table__.delete())
+    with engine.begin() as conn:
+        conn.execute(
+            QuizTopic.__table__.insert().values(
+                id="replica_topic", title_key="replica.title", description_key="d", is_active=True
+            )
+        )
+    yield url
+    with engine.begin() as conn:
+        conn.execute(QuizQuestion.__table__.delete())
+        conn.execute(QuizTopic.__table__.delete())
+    engine.dispose()
+
+
+def _init_with_replica(app, url: str, **config) -> None:
+    app.config["QUIZ_DATABASE_READ_URL"] = url
+    app.config.update(config)
+    sqlalchemy_ext.init_quiz_engine(app)
+    with get_quiz_session() as session:
+        _add_topic(session, "primary_topic")
+
+
+def _topic_ids(client) -> set[str]:
+    return {t["topic_id"] for t in client.get("/api/quiz/topics").get_json()["topics"]}
+
+
+def test_readonly_sessions_use_the_replica(quiz_app, replica_url: str) -> None:
+    from game_modules.quiz.models import QuizTopic
+
+    _init_with_replica(quiz_app, replica_url)
+    client = quiz_app.test_client()
+
+    assert _topic_ids(client) == {"replica_topic"}
+    assert client.get("/api/quiz/topics/replica_topic/leaderboard").status_code == 200
+    assert quiz_read_replica_status() == {"usable": True, "lag_seconds": 0.0, "reason": "ok"}
+
+    with get_quiz_session() as session:
+        assert session.get(QuizTopic, "primary_topic") is not None
+
+    # Replica connections are read-only: a misrouted write fails
+    with pytest.raises(DBAPIError, match="read-only transaction"):
+        with get_quiz_session(readonly=True) as session:
+            _add_topic(session, "written_to_replica")
+
+
+def test_authenticated_readonly_route_uses_the_replica(quiz_app, replica_url: str) -> None:
+    from game_modules.quiz.models import QuizPlayer, QuizQuestion
+
+    _init_with_replica(quiz_app, replica_url)
+    engine = create_engine(replica_url)
+    with engine.begin() as conn:
+        conn.execute(
+            QuizQuestion.__table__.insert().values(
+                id="replica_q1",
+                topic_id="replica_topic",
+                difficulty=1,
+                type="single_choice",
+                prompt_key="replica.prompt",
+                explanation_key="replica.explanation",
+                answers=[{"id": "a", "text": "yes", "correct": True}],
+            )
+        )
+    engine.dispose()
+    client = quiz_app.test_client()
+    client.post("/api/quiz/auth/register", json={"name": "ReplicaReader", "pin": "1234"})
+
+    response = client.get("/api/quiz/questions/replica_q1")
+
+    # The session check ran on the primary, the question came from the replica
+    assert response.status_code == 200
+    assert response.get_json()["prompt_key"] == "replica.prompt"
+    with get_quiz_session() as session:
+        player = session.query(QuizPlayer).filter(QuizPlayer.name == "ReplicaReader").one()
+        assert player.last_seen_at is not None
+
+
+def test_falls_back_to_primary_when_replica_is_down(quiz_app) -> None:
+    down_url = make_url(QUIZ_TEST_DB_URL).set(port=1).render_as_string(hide_password=False)
+    _init_with_replica(quiz_app, down_url)
+
+    assert _topic_ids(quiz_app.test_client()) == {"primary_topic"}
+    status = quiz_read_replica_status()
+    assert status["usable"] is False
+    assert status["reason"].startswith("unreachable")
+
+
+def test_falls_back_to_primary_when_replica_lags(quiz_app, replica_url: str, monkeypatch) -> None:
+    monkeypatch.setattr(sqlalchemy_ext, "REPLICA_LAG_SQL", text("SELECT 42.0"))
+    _init_with_replica(quiz_app, replica_url, QUIZ_DB_READ_MAX_LAG_SECONDS=10)
+
+    assert _topic_ids(quiz_app.test_client()) == {"primary_topic"}
+    assert quiz_read_replica_status() == {"usable": False, "lag_seconds": 42.0, "reason": "lag 42.0s > 10s"}
+
+
+def test_no_replica_configured(quiz_app) -> None:
+    assert sqlalchemy_ext.get_quiz_read_engine() is None
+    assert quiz_read_replica_status() is None
+    with get_quiz_session(readonly=True) as session:
+        assert session.get_bind() is sqlalchemy_ext.get_quiz_engine()
@@ -51,6 +51,7 @@ def import_app() -> Generator[Flask, None, None]:
 
     # Create quiz tables
     from game_modules.quiz.models import QuizBase
+    from game_modules.quiz import job_model  # noqa: F401
 
     engine = get_quiz_engine()
     QuizBase.metadata.drop_all(bind=engine)
@@ -77,8 +78,10 @@ def import_app() -> Generator[Flask, None, None]:
 def _cleanup_import_test_data() -> None:
     from game_modules.quiz.models import QuizTopic, QuizQuestion
     from game_modules.quiz.release_model import QuizContentRelease
+    from game_modules.quiz.job_model import QuizJob
 
     with get_session() as session:
+        session.execute(QuizJob.__table__.delete())
         session.execute(QuizQuestion.__table__.delete())
         session.execute(QuizTopic.__table__.delete())
         session.execute(QuizContentRelease.__table__.delete())
@@ -167,3 +170,602 @@ def test_import_upsert_keeps_existing_units(import_app: Flask, tmp_path: Path) -
     assert updated_topic_a is not None
     assert updated_topic_a.title_key == "Variation in der Aussprache (Beta)"
     assert still_topic_b is not None
+
+
+def _write_unit(
+    units_dir: Path,
+    slug: str,
+    questions: int = 12,
+    title: str | None = None,
+    audio: tuple[str, ...] = (),
+) -> None:
+    import json
+
+    unit = {
+        "schema_version": "quiz_unit_v2",
+        "slug": slug,
+        "title": title or f"Unit {slug}",
+        "description": f"Description for {slug}.",
+        "authors": ["Test Author"],
+        "is_active": True,
+        "order_index": 0,
+        "questions": [
+            {
+                "id": f"{slug}_q{idx + 1:02d}",
+                "difficulty": (idx % 3) + 1,
+                "type": "single_choice",
+                "prompt": f"Prompt {idx + 1} for {slug}?",
+                "explanation": f"Explanation {idx + 1}.",
+                "answers": [
+                    {"id": "a1", "text": "Right", "correct": True},
+                    {"id": "a2", "text": "Wrong", "correct": False},
+                ],
+                "media": (
+                    [{"id": "m1", "type": "audio", "seed_src": f"audio/{audio[idx]}"}]
+                    if idx < len(audio)
+                    else []
+                ),
+            }
+            for idx in range(questions)
+        ],
+    }
+    (units_dir / f"{slug}.json").write_text(json.dumps(unit), encoding="utf-8")
+
+
+def test_bulk_import_preserves_topic_is_active_and_stamps_release(
+    import_app: Flask, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    from game_modules.quiz import import_service
+    from game_modules.quiz.import_service import QuizImportService
+    from game_modules.quiz.models import QuizTopic, QuizQuestion
+
+    # Force several INSERT ... ON CONFLICT chunks per table
+    monkeypatch.setattr(import_service, "UPSERT_CHUNK_SIZE", 7)
+
+    units_dir, audio_dir = _prepare_release_dir(tmp_path, "rel_bulk_1")
+    for slug in ("bulk_a", "bulk_b", "bulk_c"):
+        _write_unit(units_dir, slug, questions=12)
+
+    service = QuizImportService(project_root=tmp_path)
+    with get_session() as session:
+        result = service.import_release(
+            session=session,
+            units_path=str(units_dir),
+            audio_path=str(audio_dir),
+            release_id="rel_bulk_1",
+        )
+    assert result.success is True, result.errors
+    assert result.units_imported == 3
+    assert result.questions_imported == 36
+
+    # Admin deactivates a topic; re-import must not re-activate it
+    with get_session() as session:
+        session.query(QuizTopic).filter(QuizTopic.id == "bulk_b").update({"is_active": False})
+        session.commit()
+
+    _write_unit(units_dir, "bulk_b", questions=12, title="Unit bulk_b (updated)")
+    with get_session() as session:
+        result = service.import_release(
+            session=session,
+            units_path=str(units_dir),
+            audio_path=str(audio_dir),
+            release_id="rel_bulk_2",
+        )
+    assert result.success is True, result.errors
+    assert result.questions_imported == 36
+    assert result.units_skipped == 2
+
+    with get_session() as session:
+        topic_b = session.query(QuizTopic).filter(QuizTopic.id == "bulk_b").one()
+        assert topic_b.is_active is False
+        assert topic_b.title_key == "Unit bulk_b (updated)"
+        assert topic_b.release_id == "rel_bulk_2"
+
+        questions = session.query(QuizQuestion).all()
+        assert len(questions) == 36
+        # Unchanged rows are not rewritten, but every row carries the new release
+        assert {q.release_id for q in questions} == {"rel_bulk_2"}
+        topic_a = session.query(QuizTopic).filter(QuizTopic.id == "bulk_a").one()
+        assert topic_a.release_id == "rel_bulk_2"
+        q = session.query(QuizQuestion).filter(QuizQuestion.id == "bulk_a_q01").one()
+        assert q.answers[0] == {"id": "a1", "text": "Right", "correct": True}
+        assert q.media is None
+
+
+@pytest.mark.parametrize("workers,pool", [(1, "thread"), (4, "thread"), (2, "process")])
+def test_pooled_validation_keeps_error_order(tmp_path: Path, workers: int, pool: str) -> None:
+    import hashlib
+    import json
+
+    from game_modules.quiz.import_service import QuizImportService
+
+    units_dir, audio_dir = _prepare_release_dir(tmp_path, "rel_pool")
+    for idx in range(25):
+        _write_unit(units_dir, f"pool_{idx:02d}")
+    # Broken units spread across the sorted order
+    (units_dir / "pool_03.json").write_text("{not json", encoding="utf-8")
+    (units_dir / "pool_11.json").write_text(json.dumps({"slug": "pool_11"}), encoding="utf-8")
+    (units_dir / "pool_19.json").rename(units_dir / "pool_19_renamed.json")
+
+    service = QuizImportService(project_root=tmp_path, workers=workers, pool=pool)
+    result = service.import_release(
+        session=None,
+        units_path=str(units_dir),
+        audio_path=str(audio_dir),
+        release_id="rel_pool",
+        dry_run=True,
+    )
+
+    assert result.success is False
+    assert [e.split(":")[0] for e in result.errors] == [
+        "Validation failed for pool_03.json",
+        "Validation failed for pool_11.json",
+        "Filename mismatch",
+    ]
+    assert "pool_19_renamed.json" in result.errors[2]
+
+    # Hashing matches a plain sha256 of the file
+    audio = audio_dir / "clip.mp3"
+    audio.write_bytes(b"\x00\x01" * 300_000)
+    assert service._compute_audio_hash(audio) == hashlib.sha256(audio.read_bytes()).hexdigest()
+
+
+def test_import_reuses_checksum_manifest(
+    import_app: Flask, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    import hashlib
+    import json
+
+    from game_modules.quiz import import_service
+    from game_modules.quiz.import_service import CHECKSUM_MANIFEST_FILENAME, QuizImportService
+    from game_modules.quiz.release_model import QuizContentRelease
+
+    units_dir, audio_dir = _prepare_release_dir(tmp_path, "rel_manifest")
+    (audio_dir / "one.mp3").write_bytes(b"one" * 1000)
+    (audio_dir / "two.mp3").write_bytes(b"two" * 1000)
+    _write_unit(units_dir, "manifest_unit", audio=("one.mp3", "two.mp3"))
+
+    hashed: list[str] = []
+    real_sha256_file = import_service._sha256_file
+
+    def counting_sha256_file(path: Path) -> str:
+        hashed.append(path.name)
+        return real_sha256_file(path)
+
+    monkeypatch.setattr(import_service, "_sha256_file", counting_sha256_file)
+    service = QuizImportService(project_root=tmp_path, workers=1)
+
+    def run_import(**kwargs):
+        with get_session() as session:
+            return service.import_release(
+                session=session,
+                units_path=str(units_dir),
+                audio_path=str(audio_dir),
+                release_id="rel_manifest",
+                **kwargs,
+            )
+
+    result = run_import()
+    assert result.success is True, result.errors
+    assert result.audio_hashes_reused == 0
+    assert sorted(hashed) == ["one.mp3", "two.mp3"]
+
+    sidecar = json.loads((audio_dir.parent / CHECKSUM_MANIFEST_FILENAME).read_text(encoding="utf-8"))
+    assert sidecar["files"]["one.mp3"]["sha256"] == hashlib.sha256(b"one" * 1000).hexdigest()
+    assert sidecar["files"]["one.mp3"]["size"] == 3000
+    with get_session() as session:
+        release = session.query(QuizContentRelease).filter_by(release_id="rel_manifest").one()
+        assert json.loads(release.checksum_manifest)["files"] == sidecar["files"]
+
+    # Unchanged files are not re-read
+    hashed.clear()
+    result = run_import()
+    assert result.audio_hashes_reused == 2
+    assert hashed == []
+
+    # Changed file (size differs) is rehashed, the other one reused
+    (audio_dir / "two.mp3").write_bytes(b"two" * 2000)
+    result = run_import()
+    assert result.audio_hashes_reused == 1
+    assert hashed == ["two.mp3"]
+
+    # verify=True ignores the manifest
+    hashed.clear()
+    result = run_import(verify=True)
+    assert result.audio_hashes_reused == 0
+    assert sorted(hashed) == ["one.mp3", "two.mp3"]
+
+
+def test_reimport_skips_unchanged_units_and_reports_diff(import_app: Flask, tmp_path: Path) -> None:
+    import json
+
+    from game_modules.quiz.import_service import QuizImportService
+    from game_modules.quiz.models import QuizQuestion
+    from game_modules.quiz.release_model import QuizContentRelease
+
+    units_dir, audio_dir = _prepare_release_dir(tmp_path, "rel_diff")
+    _write_unit(units_dir, "diff_a")
+    _write_unit(units_dir, "diff_b")
+    service = QuizImportService(project_root=tmp_path, workers=1)
+
+    def run_import(**kwargs):
+        with get_session() as session:
+            return service.import_release(
+                session=session,
+                units_path=str(units_dir),
+                audio_path=str(audio_dir),
+                release_id="rel_diff",
+                **kwargs,
+            )
+
+    first = run_import()
+    assert first.success is True, first.errors
+    assert first.diff["units_added"] == ["diff_a", "diff_b"]
+    assert first.diff["summary"]["questions_added"] == 24
+
+    # Key order / whitespace changes do not change the fingerprint
+    path_a = units_dir / "diff_a.json"
+    path_a.write_text(json.dumps(json.loads(path_a.read_text()), indent=4, sort_keys=True))
+    second = run_import()
+    assert second.units_skipped == 2
+    assert second.diff["summary"]["units_unchanged"] == 2
+
+    # Edit diff_b: swap answer key of q01, change prompt of q02, drop q12, add q13
+    unit_b = json.loads((units_dir / "diff_b.json").read_text())
+    questions = unit_b["questions"]
+    questions[0]["answers"][0]["correct"] = False
+    questions[0]["answers"][1]["correct"] = True
+    questions[1]["prompt"] = "A reworded prompt?"
+    added = dict(questions[-1], id="diff_b_q13")
+    questions[-1] = added
+    (units_dir / "diff_b.json").write_text(json.dumps(unit_b))
+
+    preview = run_import(dry_run=True)
+    assert preview.diff["units_changed"] == ["diff_b"]
+    assert preview.diff["units_unchanged"] == ["diff_a"]
+    assert preview.diff["questions_added"] == ["diff_b_q13"]
+    assert preview.diff["questions_changed"] == ["diff_b_q01", "diff_b_q02"]
+    assert preview.diff["questions_removed"] == ["diff_b_q12"]
+    assert preview.diff["answer_keys_changed"] == [
+        {"question_id": "diff_b_q01", "old": "a1", "new": "a2"}
+    ]
+    with get_session() as session:
+        assert session.get(QuizQuestion, "diff_b_q13") is None
+
+    third = run_import()
+    assert third.success is True, third.errors
+    assert third.units_skipped == 1
+    assert third.diff == preview.diff
+    with get_session() as session:
+        assert session.get(QuizQuestion, "diff_b_q13") is not None
+        # Removed questions are reported, not deleted
+        assert session.get(QuizQuestion, "diff_b_q12") is not None
+        release = session.get(QuizContentRelease, "rel_diff")
+        assert json.loads(release.import_diff) == third.diff
+
+
+def test_import_job_runs_with_progress_and_conflicts(import_app: Flask, tmp_path: Path) -> None:
+    from game_modules.quiz import jobs
+    from game_modules.quiz.models import QuizTopic
+
+    units_dir, audio_dir = _prepare_release_dir(tmp_path, "rel_job")
+    _write_unit(units_dir, "job_a")
+    params = {"units_path": str(units_dir), "audio_path": str(audio_dir), "workers": 1}
+
+    with get_session() as session:
+        job_id = jobs.enqueue_job(session, "import", "rel_job", params=params, created_by="admin").id
+    with get_session() as session:
+        with pytest.raises(jobs.JobConflictError):
+            jobs.enqueue_job(session, "publish", "rel_job")
+
+    assert jobs.run_pending_jobs(project_root=tmp_path) == 1
+
+    with get_session() as session:
+        job = jobs.get_job(session, job_id)
+        assert job.status == jobs.JOB_STATUS_SUCCEEDED, job.error
+        assert job.progress == 100
+        assert job.result["units_imported"] == 1
+        assert job.started_at is not None and job.finished_at is not None
+        assert session.get(QuizTopic, "job_a") is not None
+
+        # Finished jobs no longer block the release
+        publish = jobs.enqueue_job(session, "publish", "rel_job")
+    assert jobs.run_pending_jobs(project_root=tmp_path) == 1
+    with get_session() as session:
+        assert jobs.get_job(session, publish.id).status == jobs.JOB_STATUS_SUCCEEDED
+
+
+def test_job_heartbeat_beats_without_progress_reports(import_app: Flask) -> None:
+    import time
+    from datetime import datetime, timedelta, timezone
+
+    from game_modules.quiz import jobs
+
+    with get_session() as session:
+        job_id = jobs.enqueue_job(session, "publish", "rel_heartbeat").id
+    with get_session() as session:
+        assert jobs.claim_next_job(session, "test-worker", job_id=job_id) == job_id
+        # A phase without progress reports that outlives the stale limit
+        jobs.get_job(session, job_id).heartbeat_at = datetime.now(timezone.utc) - timedelta(minutes=10)
+        session.commit()
+
+    with jobs.JobHeartbeat(job_id, interval=0.05):
+        time.sleep(0.3)
+
+    with get_session() as session:
+        assert jobs.fail_stale_jobs(session, stale_after_seconds=60) == 0
+        assert jobs.get_job(session, job_id).status == jobs.JOB_STATUS_RUNNING
+
+
+def test_cancel_running_import_job_rolls_back(
+    import_app: Flask, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    from game_modules.quiz import jobs
+    from game_modules.quiz.models import QuizTopic
+
+    units_dir, audio_dir = _prepare_release_dir(tmp_path, "rel_cancel")
+    _write_unit(units_dir, "cancel_a")
+    _write_unit(units_dir, "cancel_b")
+    params = {"units_path": str(units_dir), "audio_path": str(audio_dir), "workers": 1}
+
+    # Queued jobs are cancelled immediately and never run
+    with get_session() as session:
+        queued_id = jobs.enqueue_job(session, "import", "rel_cancel", params=params).id
+        assert jobs.request_cancel(session, queued_id).status == jobs.JOB_STATUS_CANCELLED
+    assert jobs.run_pending_jobs(project_root=tmp_path) == 0
+
+    # Running job: flag cancellation once the write phase starts
+    original_call = jobs.JobProgressReporter.__call__
+
+    def cancel_on_write(self, phase, percent, message=""):
+        if phase == "write":
+            with get_session() as session:
+                jobs.request_cancel(session, self.job_id)
+        return original_call(self, phase, percent, message)
+
+    monkeypatch.setattr(jobs.JobProgressReporter, "__call__", cancel_on_write)
+
+    with get_session() as session:
+        job_id = jobs.enqueue_job(session, "import", "rel_cancel", params=params).id
+    assert jobs.run_pending_jobs(project_root=tmp_path) == 1
+
+    with get_session() as session:
+        job = jobs.get_job(session, job_id)
+        assert job.status == jobs.JOB_STATUS_CANCELLED
+        assert job.phase == "write"
+        assert session.get(QuizTopic, "cancel_a") is None
+
+
+def test_import_reuses_hashes_from_streamed_upload(
+    import_app: Flask, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    from io import BytesIO
+
+    from game_modules.quiz import import_service
+    from game_modules.quiz.import_service import QuizImportService
+    from game_modules.quiz.media_store import link_into_release, store_stream
+    from game_modules.quiz.release_manifest import media_manifest_entry, update_release_manifest
+
+    units_dir, audio_dir = _prepare_release_dir(tmp_path, "rel_store")
+    _write_unit(units_dir, "store_unit", audio=("clip.mp3",))
+
+    # Upload path: stream into the store, link into the release, record the hash
+    stored = store_stream(BytesIO(b"clip" * 500), "clip.mp3", tmp_path / "media" / "store")
+    link_into_release(stored.path, audio_dir / "clip.mp3")
+    update_release_manifest(
+        audio_dir.parent,
+        "rel_store",
+        media={"clip.mp3": media_manifest_entry(audio_dir / "clip.mp3", sha256=stored.sha256)},
+    )
+
+    def fail_sha256_file(path: Path) -> str:
+        raise AssertionError(f"{path.name} was hashed twice")
+
+    monkeypatch.setattr(import_service, "_sha256_file", fail_sha256_file)
+    with get_session() as session:
+        result = QuizImportService(project_root=tmp_path, workers=1).import_release(
+            session=session,
+            units_path=str(units_dir),
+            audio_path=str(audio_dir),
+            release_id="rel_store",
+        )
+    assert result.success is True, result.errors
+    assert result.audio_hashes_reused == 1
+
+
+def test_import_points_audio_at_media_store(import_app: Flask, tmp_path: Path) -> None:
+    import hashlib
+    import os
+
+    from game_modules.quiz.import_service import QuizImportService
+    from game_modules.quiz.models import QuizQuestion
+
+    units_dir, audio_dir = _prepare_release_dir(tmp_path, "rel_media")
+    _write_unit(units_dir, "media_unit", audio=("clip.mp3",))
+    (audio_dir / "clip.mp3").write_bytes(b"v1" * 100)
+    service = QuizImportService(project_root=tmp_path, workers=1)
+
+    def run_import():
+        with get_session() as session:
+            return service.import_release(
+                session=session,
+                units_path=str(units_dir),
+                audio_path=str(audio_dir),
+                release_id="rel_media",
+            )
+
+    def stored_src() -> str:
+        with get_session() as session:
+            return session.get(QuizQuestion, "media_unit_q01").media[0]["src"]
+
+    assert run_import().success is True
+    sha = hashlib.sha256(b"v1" * 100).hexdigest()
+    assert stored_src() == f"/quiz-media/store/{sha[:2]}/{sha}.mp3"
+    store_file = tmp_path / "media" / "store" / sha[:2] / f"{sha}.mp3"
+    # A read-only copy: an in-place edit of the release file cannot reach it
+    assert store_file.read_bytes() == b"v1" * 100
+    assert not os.path.samefile(store_file, audio_dir / "clip.mp3")
+    assert store_file.stat().st_mode & 0o222 == 0
+
+    # Same unit JSON, replaced audio: the unit is rewritten with the new URL
+    (audio_dir / "clip.mp3").unlink()
+    (audio_dir / "clip.mp3").write_bytes(b"v2" * 100)
+    result = run_import()
+    assert result.diff["units_changed"] == ["media_unit"]
+    new_sha = hashlib.sha256(b"v2" * 100).hexdigest()
+    assert stored_src() == f"/quiz-media/store/{new_sha[:2]}/{new_sha}.mp3"
+
+
+def test_import_adds_cached_audio_variants(import_app: Flask, tmp_path: Path) -> None:
+    import hashlib
+    import json
+
+    from game_modules.quiz.import_service import QuizImportService
+    from game_modules.quiz.media_transcode import TRANSCODE_VERSION, transcode_record_path
+    from game_modules.quiz.models import QuizQuestion, QuizTopic
+
+    units_dir, audio_dir = _prepare_release_dir(tmp_path, "rel_variants")
+    _write_unit(units_dir, "variant_unit", audio=("clip.wav",))
+    (audio_dir / "clip.wav").write_bytes(b"w" * 4000)
+    sha = hashlib.sha256(b"w" * 4000).hexdigest()
+    opus = b"o" * 100
+    opus_sha = hashlib.sha256(opus).hexdigest()
+    store = tmp_path / "media" / "store"
+
+    def run_import(transcode: bool):
+        service = QuizImportService(project_root=tmp_path, workers=1, transcode=transcode)
+        with get_session() as session:
+            result = service.import_release(
+                session=session,
+                units_path=str(units_dir),
+                audio_path=str(audio_dir),
+                release_id="rel_variants",
+            )
+        assert result.success is True
+        with get_session() as session:
+            media = session.get(QuizQuestion, "variant_unit_q01").media[0]
+            content_hash = session.get(QuizTopic, "variant_unit").content_hash
+        return result, media, content_hash
+
+    _, plain, plain_hash = run_import(transcode=False)
+    assert plain == {"type": "audio", "src": f"/quiz-media/store/{sha[:2]}/{sha}.wav"}
+
+    # A cached transcode record (as written by transcode_audio) is used without ffmpeg
+    (store / opus_sha[:2]).mkdir(parents=True, exist_ok=True)
+    (store / opus_sha[:2] / f"{opus_sha}.opus").write_bytes(opus)
+    transcode_record_path(store, sha).write_text(
+        json.dumps(
+            {
+                "version": TRANSCODE_VERSION,
+                "bytes": 4000,
+                "duration": 2.5,
+                "variants": [
+                    {
+                        "profile": "opus",
+                        "sha256": opus_sha,
+                        "suffix": ".opus",
+                        "mime": 'audio/ogg; codecs="opus"',
+                        "bytes": 100,
+                    }
+                ],
+            }
+        )
+    )
+    result, media, content_hash = run_import(transcode=True)
+    assert media == {
+        "type": "audio",
+        "src": f"/quiz-media/store/{sha[:2]}/{sha}.wav",
+        "bytes": 4000,
+        "duration": 2.5,
+        "variants": [
+            {
+                "src": f"/quiz-media/store/{opus_sha[:2]}/{opus_sha}.opus",
+                "mime": 'audio/ogg; codecs="opus"',
+                "bytes": 100,
+            }
+        ],
+    }
+    assert result.diff["units_changed"] == ["variant_unit"]
+    assert content_hash != plain_hash
+
+
+def test_import_serves_images_from_store_with_cached_derivatives(
+    import_app: Flask, tmp_path: Path
+) -> None:
+    import hashlib
+    import json
+
+    from game_modules.quiz.import_service import QuizImportService
+    from game_modules.quiz.media_transcode import IMAGE_DERIVATIVE_VERSION, image_record_path
+    from game_modules.quiz.models import QuizQuestion
+
+    units_dir, audio_dir = _prepare_release_dir(tmp_path, "rel_images")
+    _write_unit(units_dir, "image_unit")
+    unit_path = units_dir / "image_unit.json"
+    unit = json.loads(unit_path.read_text(encoding="utf-8"))
+    unit["questions"][0]["media"] = [{"id": "m1", "type": "image", "seed_src": "images/map.png"}]
+    unit["questions"][1]["media"] = [{"id": "m1", "type": "image", "seed_src": "images/gone.png"}]
+    unit_path.write_text(json.dumps(unit), encoding="utf-8")
+    (audio_dir / "map.png").write_bytes(b"p" * 5000)
+    sha = hashlib.sha256(b"p" * 5000).hexdigest()
+    webp = b"w" * 300
+    webp_sha = hashlib.sha256(webp).hexdigest()
+
+    store = tmp_path / "media" / "store"
+    (store / webp_sha[:2]).mkdir(parents=True, exist_ok=True)
+    (store / webp_sha[:2] / f"{webp_sha}.webp").write_bytes(webp)
+    image_record_path(store, sha).parent.mkdir(parents=True, exist_ok=True)
+    image_record_path(store, sha).write_text(
+        json.dumps(
+            {
+                "version": IMAGE_DERIVATIVE_VERSION,
+                "bytes": 5000,
+                "width": 800,
+                "height": 600,
+                "derivatives": [
+                    {
+                        "format": "webp",
+                        "sha256": webp_sha,
+                        "suffix": ".webp",
+                        "mime": "image/webp",
+                        "width": 320,
+                        "height": 240,
+                        "bytes": 300,
+                    }
+                ],
+            }
+        )
+    )
+
+    service = QuizImportService(project_root=tmp_path, workers=1, transcode=True)
+    with get_session() as session:
+        result = service.import_release(
+            session=session,
+            units_path=str(units_dir),
+            audio_path=str(audio_dir),
+            release_id="rel_images",
+        )
+    assert result.success is True
+    assert any("gone.png" in warning for warning in result.warnings)
+
+    with get_session() as session:
+        found = session.get(QuizQuestion, "image_unit_q01").media[0]
+        missing = session.get(QuizQuestion, "image_unit_q02").media[0]
+    assert found == {
+        "type": "image",
+        "src": f"/quiz-media/store/{sha[:2]}/{sha}.png",
+        "bytes": 5000,
+        "width": 800,
+        "height": 600,
+        "srcset": [
+            {
+                "src": f"/quiz-media/store/{webp_sha[:2]}/{webp_sha}.webp",
+                "type": "image/webp",
+                "width": 320,
+                "height": 240,
+                "bytes": 300,
+            }
+        ],
+    }
+    assert missing == {"type": "image", "src": "images/gone.png"}
+    assert (store / sha[:2] / f"{sha}.png").is_file()
@@ -0,0 +1,121 @@
+"""Tests for the incremental per-release manifest (upload bookkeeping)."""
+
+from __future__ import annotations
+
+import json
+from pathlib import Path
+
+import pytest
+
+from game_modules.quiz import release_manifest
+from game_modules.quiz.release_manifest import (
+    load_release_manifest,
+    manifest_counts,
+    media_manifest_entry,
+    release_manifest_path,
+    unit_manifest_entry,
+    update_release_manifest,
+)
+
+
+def _unit(slug: str, questions: int, audio: tuple[str, ...] = ()) -> dict:
+    return {
+        "slug": slug,
+        "questions": [
+            {
+                "id": f"{slug}_q{idx}",
+                "answers": [{"id": "a1", "text": "x", "correct": True}],
+                "media": (
+                    [{"type": "audio", "seed_src": f"audio/{audio[idx]}"}] if idx < len(audio) else []
+                ),
+            }
+            for idx in range(questions)
+        ],
+    }
+
+
+def _save_unit(release_path: Path, unit: dict) -> Path:
+    units_dir = release_path / "units"
+    units_dir.mkdir(parents=True, exist_ok=True)
+    path = units_dir / f"{unit['slug']}.json"
+    path.write_text(json.dumps(unit), encoding="utf-8")
+    return path
+
+
+def _save_audio(release_path: Path, name: str, payload: bytes) -> Path:
+    audio_dir = release_path / "audio"
+    audio_dir.mkdir(parents=True, exist_ok=True)
+    path = audio_dir / name
+    path.write_bytes(payload)
+    return path
+
+
+@pytest.fixture
+def hash_calls(monkeypatch: pytest.MonkeyPatch) -> list[str]:
+    calls: list[str] = []
+    original = release_manifest._sha256_file
+
+    def counting(path: Path) -> str:
+        calls.append(Path(path).name)
+        return original(path)
+
+    monkeypatch.setattr(release_manifest, "_sha256_file", counting)
+    return calls
+
+
+def test_upload_updates_manifest_incrementally(tmp_path: Path, hash_calls: list[str]) -> None:
+    release_path = tmp_path / "rel_manifest"
+
+    # Legacy release without manifest: first update scans the directory once
+    legacy = _unit("legacy", 3, audio=("old.mp3",))
+    _save_unit(release_path, legacy)
+    _save_audio(release_path, "old.mp3", b"old")
+    first_path = _save_unit(release_path, _unit("first", 2, audio=("a.mp3", "b.mp3")))
+    a_path = _save_audio(release_path, "a.mp3", b"aaa")
+    manifest = update_release_manifest(
+        release_path,
+        "rel_manifest",
+        units={"first": unit_manifest_entry(_unit("first", 2, ("a.mp3", "b.mp3")), first_path)},
+        media={"a.mp3": media_manifest_entry(a_path)},
+    )
+    assert manifest_counts(manifest) == (2, 5, 2)
+    assert manifest["missing_media"] == ["b.mp3"]
+    # a.mp3 was hashed for the upload and reused by the scan
+    assert sorted(hash_calls) == ["a.mp3", "old.mp3"]
+
+    # Next upload touches only its own unit and media; nothing else is reread or rehashed
+    hash_calls.clear()
+    (release_path / "units" / "legacy.json").write_text("not json", encoding="utf-8")
+    second = _unit("second", 4)
+    second_path = _save_unit(release_path, second)
+    b_path = _save_audio(release_path, "b.mp3", b"bbbb")
+    manifest = update_release_manifest(
+        release_path,
+        "rel_manifest",
+        units={"second": unit_manifest_entry(second, second_path)},
+        media={"b.mp3": media_manifest_entry(b_path)},
+    )
+    assert hash_calls == ["b.mp3"]
+    assert manifest_counts(manifest) == (3, 9, 3)
+    assert manifest["missing_media"] == []
+    assert manifest["units"]["legacy"]["questions"] == 3
+
+    on_disk = load_release_manifest(release_path)
+    assert on_disk == manifest
+    assert on_disk["media"]["b.mp3"]["size"] == 4
+    leftovers = [p.name for p in release_path.iterdir() if p.name.endswith(".tmp")]
+    assert leftovers == []
+
+
+def test_invalid_manifest_is_rebuilt(tmp_path: Path) -> None:
+    release_path = tmp_path / "rel_broken"
+    unit = _unit("only", 5)
+    unit_path = _save_unit(release_path, unit)
+    release_manifest_path(release_path).write_text("{broken", encoding="utf-8")
+    assert load_release_manifest(release_path) is None
+
+    manifest = update_release_manifest(
+        release_path, "rel_broken", units={"only": unit_manifest_entry(unit, unit_path)}
+    )
+    assert manifest_counts(manifest) == (1, 5, 0)
+    assert load_release_manifest(release_path)["release_id"] == "rel_broken"
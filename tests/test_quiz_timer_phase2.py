@@ -124,3 +124,17 @@ def test_timer_anonymous_media_bonus_250s(quiz_app):
 
     assert ok is True
     assert run.time_limit_seconds == 250
+
+
+def test_media_bonus_uses_audio_durations():
+    from game_modules.quiz import services
+
+    assert services.media_bonus_seconds(None) == 0
+    assert services.media_bonus_seconds([{"type": "image", "src": "/x.png"}]) == 10
+    assert services.media_bonus_seconds([{"type": "audio", "src": "/a.mp3"}]) == 10
+    assert services.media_bonus_seconds([{"type": "audio", "duration": 4.2}]) == 15
+
+    # Answer audio counts too; the total is capped
+    answers = [{"id": i, "media": [{"type": "audio", "duration": 20}]} for i in range(4)]
+    assert services.media_bonus_seconds([], answers) == services.MEDIA_BONUS_MAX_SECONDS
+    assert services.calculate_time_limit({"media": None, "answers": answers[:1]}, False) == 70
@@ -0,0 +1,100 @@
+"""Tests for the validate-once unit validation cache."""
+
+from __future__ import annotations
+
+import json
+from pathlib import Path
+from typing import Any, Dict, Generator
+
+import pytest
+
+from game_modules.quiz import validation, validation_cache
+from game_modules.quiz.import_service import _load_and_validate_unit, fingerprint_unit_data
+from game_modules.quiz.validation import ValidationError
+from game_modules.quiz.validation_cache import validate_unit_cached
+
+
+def _unit(slug: str, questions: int = 12) -> Dict[str, Any]:
+    return {
+        "schema_version": "quiz_unit_v2",
+        "slug": slug,
+        "title": f"Unit {slug}",
+        "description": "Cache test unit.",
+        "authors": ["Test"],
+        "is_active": True,
+        "order_index": 0,
+        "questions": [
+            {
+                "id": f"{slug}_q{i}",
+                "difficulty": (i % 3) + 1,
+                "type": "single_choice",
+                "prompt": f"Prompt number {i}?",
+                "explanation": f"Explanation number {i}.",
+                "answers": [
+                    {"id": "a1", "text": "Right", "correct": True},
+                    {"id": "a2", "text": "Wrong", "correct": False},
+                ],
+            }
+            for i in range(questions)
+        ],
+    }
+
+
+@pytest.fixture(autouse=True)
+def empty_cache() -> Generator[None, None, None]:
+    validation_cache.clear_validation_cache()
+    yield
+    validation_cache.clear_validation_cache()
+
+
+def test_second_validation_is_a_cache_hit(tmp_path: Path) -> None:
+    data = _unit("cached_unit")
+    fingerprint = fingerprint_unit_data(data)
+
+    first = validate_unit_cached(data, fingerprint, "upload.json")
+    assert not first.cached
+
+    # The import reads the file written by the upload (different whitespace)
+    path = tmp_path / "cached_unit.json"
+    path.write_text(json.dumps(data, indent=2), encoding="utf-8")
+    unit, _, error, import_fingerprint, cached = _load_and_validate_unit(path)
+
+    assert error is None and cached
+    assert import_fingerprint == fingerprint
+    assert unit is first.unit
+
+
+def test_validator_version_is_part_of_the_key(monkeypatch: pytest.MonkeyPatch) -> None:
+    data = _unit("versioned_unit")
+    fingerprint = fingerprint_unit_data(data)
+    validate_unit_cached(data, fingerprint)
+
+    monkeypatch.setattr(validation, "VALIDATOR_VERSION", validation.VALIDATOR_VERSION + 1)
+
+    assert not validate_unit_cached(data, fingerprint).cached
+    assert validate_unit_cached(data, fingerprint).cached
+
+
+def test_failures_are_not_cached() -> None:
+    data = _unit("broken_unit")
+    data["questions"][0]["answers"] = []
+    fingerprint = fingerprint_unit_data(data)
+
+    for _ in range(2):
+        with pytest.raises(ValidationError):
+            validate_unit_cached(data, fingerprint)
+    assert len(validation_cache._cache) == 0
+
+
+def test_cache_is_bounded_by_question_count(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(validation_cache._cache, "max_questions", 30)
+    units = [_unit(f"unit_{n}") for n in range(3)]
+    fingerprints = [fingerprint_unit_data(u) for u in units]
+
+    for data, fingerprint in zip(units, fingerprints):
+        validate_unit_cached(data, fingerprint)
+
+    # 3 x 12 questions > 30: the least recently used unit was evicted
+    assert len(validation_cache._cache) == 2
+    assert validate_unit_cached(units[2], fingerprints[2]).cached
+    assert not validate_unit_cached(units[0], fingerprints[0]).cached
@@ -0,0 +1,45 @@
+"""Tests for the startup profile (manage.py startup-profile)."""
+
+from __future__ import annotations
+
+import os
+from pathlib import Path
+
+from src.app.services.startup_profile import LAZY_MODULES, parse_importtime, profile_startup
+
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+
+IMPORTTIME = """\
+import time: self [us] | cumulative | imported package
+import time:       120 |        120 |       sqlalchemy.util
+import time:       300 |        420 |     sqlalchemy
+[2026-01-01 10:00:00] WARNING in __init__: unrelated log line
+import time:        80 |         80 |   game_modules.quiz.models
+import time:        50 |        550 | src.app
+"""
+
+
+def test_parse_importtime_skips_header_and_other_lines() -> None:
+    records = parse_importtime(IMPORTTIME)
+
+    assert [r.module for r in records] == ["sqlalchemy.util", "sqlalchemy", "game_modules.quiz.models", "src.app"]
+    assert records[0].self_us == 120
+    assert records[1].cumulative_us == 420
+    assert [r.depth for r in records] == [3, 2, 1, 0]
+
+
+def test_create_app_leaves_admin_modules_unimported() -> None:
+    env = {
+        **os.environ,
+        "FLASK_ENV": "test",
+        "FLASK_SECRET_KEY": "test-secret",
+        "JWT_SECRET_KEY": "test-secret",
+    }
+    env.pop("ENV", None)
+
+    profile = profile_startup(PROJECT_ROOT, env=env)
+
+    assert profile.eager_lazy_modules == [], f"imported at startup: {profile.eager_lazy_modules}"
+    assert set(profile.stages_ms) >= {"dependencies", "auth_db", "quiz_db", "blueprints"}
+    assert {r.module for r in profile.imports}.isdisjoint(LAZY_MODULES)
@@ -0,0 +1,86 @@
+"""Tests for the Jinja bytecode cache (manage.py build-templates)."""
+
+from __future__ import annotations
+
+import shutil
+from pathlib import Path
+
+import pytest
+from flask import Flask
+
+from src.app.services.template_cache import build_template_cache, register_template_cache
+
+
+@pytest.fixture
+def template_dir(tmp_path: Path) -> Path:
+    root = tmp_path / "templates"
+    (root / "games").mkdir(parents=True)
+    (root / "base.html").write_text("<main>{% block body %}{% endblock %}</main>", encoding="utf-8")
+    (root / "games" / "quiz.html").write_text(
+        '{% extends "base.html" %}{% block body %}Quiz {{ name }}{% endblock %}', encoding="utf-8"
+    )
+    return root
+
+
+def _app(template_dir: Path, cache_dir: Path | str) -> Flask:
+    app = Flask(__name__, template_folder=str(template_dir))
+    app.config["JINJA_BYTECODE_CACHE_DIR"] = str(cache_dir)
+    register_template_cache(app)
+    return app
+
+
+def _forbid_compile(app: Flask, monkeypatch) -> None:
+    def compile(*args, **kwargs):
+        raise AssertionError("template compiled although it is cached")
+
+    monkeypatch.setattr(app.jinja_env, "compile", compile)
+
+
+def test_build_compiles_all_templates_and_app_uses_them(template_dir, tmp_path, monkeypatch) -> None:
+    cache_dir = tmp_path / "jinja_cache"
+    result = build_template_cache(template_dir, cache_dir)
+    assert result.compiled == 2
+    assert result.failed == []
+    assert len(list(cache_dir.iterdir())) == 2
+
+    app = _app(template_dir, cache_dir)
+    _forbid_compile(app, monkeypatch)
+    assert app.jinja_env.get_template("games/quiz.html").render(name="A") == "<main>Quiz A</main>"
+
+
+def test_changed_template_is_recompiled(template_dir, tmp_path, monkeypatch) -> None:
+    cache_dir = tmp_path / "jinja_cache"
+    build_template_cache(template_dir, cache_dir)
+    (template_dir / "games" / "quiz.html").write_text(
+        '{% extends "base.html" %}{% block body %}Quiz v2 {{ name }}{% endblock %}', encoding="utf-8"
+    )
+
+    app = _app(template_dir, cache_dir)
+    assert app.jinja_env.get_template("games/quiz.html").render(name="A") == "<main>Quiz v2 A</main>"
+
+    # The rewritten entry is used by the next worker
+    fresh = _app(template_dir, cache_dir)
+    _forbid_compile(fresh, monkeypatch)
+    assert fresh.jinja_env.get_template("games/quiz.html").render(name="B") == "<main>Quiz v2 B</main>"
+
+
+def test_build_reports_broken_templates(template_dir, tmp_path) -> None:
+    (template_dir / "broken.html").write_text("{% if %}", encoding="utf-8")
+
+    result = build_template_cache(template_dir, tmp_path / "jinja_cache")
+
+    assert result.compiled == 2
+    assert [name for name, _ in result.failed] == ["broken.html"]
+
+
+def test_unwritable_cache_does_not_break_rendering(template_dir, tmp_path) -> None:
+    cache_dir = tmp_path / "jinja_cache"
+    app = _app(template_dir, cache_dir)
+    shutil.rmtree(cache_dir)
+
+    assert app.jinja_env.get_template("games/quiz.html").render(name="A") == "<main>Quiz A</main>"
+
+
+def test_cache_can_be_turned_off(template_dir) -> None:
+    app = _app(template_dir, "off")
+    assert app.jinja_env.bytecode_cache is None